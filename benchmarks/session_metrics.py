@@ -0,0 +1,19 @@
+"""Time to compute session metrics from utterance code arrays.
+
+Run with ``python -m benchmarks.session_metrics``.
+"""
+from src.analysis_service.metrics import measure_metrics, synthetic_utterances
+
+
+def main() -> None:
+    implementations = [("python", False), ("numpy", True)]
+    print(f"{'utterances':>10} {'impl':6} {'best ms':>9} {'us/utt':>8}")
+    for count in (1_000, 10_000, 50_000, 200_000):
+        arrays = synthetic_utterances(count)
+        for name, use_numpy in implementations:
+            seconds = measure_metrics(arrays, use_numpy=use_numpy)
+            print(f"{count:>10} {name:6} {seconds * 1000:>9.2f} {seconds / count * 1e6:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
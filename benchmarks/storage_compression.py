@@ -0,0 +1,51 @@
+"""Bytes moved and CPU cost of compressing transcript artifacts.
+
+Run with ``python -m benchmarks.storage_compression``.
+"""
+import json
+import random
+
+from src.shared.compressed_storage import available_codecs, measure_codec
+from src.shared.transcript_format import StructuredTranscript, encode_transcript
+
+WORDS = (
+    "i feel like the week was hard but we talked about sleep and work and my sister "
+    "what do you notice when that happens okay right so tell me more about that"
+).split()
+
+
+def synthetic_transcript(utterances: int = 2000, seed: int = 7) -> StructuredTranscript:
+    rng = random.Random(seed)
+    speaker, start, end, text = [], [], [], []
+    clock = 0.0
+    for index in range(utterances):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 30))]
+        speaker.append("A" if index % 2 == 0 else "B")
+        start.append(round(clock, 2))
+        clock += len(words) * 0.35
+        end.append(round(clock, 2))
+        text.append(" ".join(words))
+    return StructuredTranscript(speaker=speaker, start=start, end=end, text=text)
+
+
+def main() -> None:
+    transcript = synthetic_transcript()
+    artifacts = {
+        "transcript.txt": transcript.plain_text().encode("utf-8"),
+        "transcript.columnar.jsonl": encode_transcript(transcript),
+        "analysis.json": json.dumps({"utterances": transcript.text}).encode("utf-8"),
+    }
+    levels = {"gzip": [1, 6, 9], "zstd": [1, 3, 9]}
+    print(f"{'artifact':28} {'codec':6} {'level':>5} {'bytes':>9} {'stored':>9} {'ratio':>6} {'comp ms':>8} {'decomp ms':>9}")
+    for name, payload in artifacts.items():
+        for codec in available_codecs():
+            for level in levels[codec]:
+                result = measure_codec(payload, codec, level)
+                print(
+                    f"{name:28} {codec:6} {level:>5} {result.original_bytes:>9} {result.stored_bytes:>9} "
+                    f"{result.ratio:>6.1f} {result.compress_seconds * 1000:>8.2f} {result.decompress_seconds * 1000:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
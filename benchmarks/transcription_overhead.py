@@ -0,0 +1,27 @@
+"""Framework overhead of the transcription worker around a no-op backend.
+
+Run with ``python -m benchmarks.transcription_overhead [messages]``.
+"""
+import sys
+
+from src.transcription_service.benchmark import benchmark_transcription_overhead
+from src.transcription_service.run_worker import StubTranscriptionBackend
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    report = benchmark_transcription_overhead(StubTranscriptionBackend(), messages=messages)
+
+    print(f"messages: {report.messages} (audio lengths {report.audio_seconds} s)")
+    print(f"throughput: {report.messages_per_second:.1f} msg/s")
+    print(f"overhead per message: {report.overhead_seconds_per_message * 1000:.3f} ms")
+    print(f"backend share of wall time: {report.backend_share:.1%}")
+    print(f"{'step':12} {'mean ms':>9} {'p95 ms':>9} {'share':>7}")
+    for step, summary in report.steps.items():
+        print(f"{step:12} {summary.mean_seconds * 1000:>9.3f} {summary.p95_seconds * 1000:>9.3f} {summary.share:>7.1%}")
+    print(f"peak allocated per message: {report.peak_bytes_per_message / 1024:.1f} KiB")
+    print(f"retained per message: {report.retained_bytes_per_message / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
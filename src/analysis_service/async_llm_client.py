@@ -0,0 +1,255 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+
+import httpx
+from pydantic import BaseModel
+
+from src.analysis_service.chunking import estimate_tokens
+from src.analysis_service.llm_client import LLMClient
+from src.analysis_service.rate_limits import ProviderRateLimiter
+from src.shared.retry import RetryConfig
+
+
+PROMPT_VERSION = "analysis-v1"
+SYSTEM_PROMPT = (
+    "You analyze therapy session transcripts. Reply with a JSON object with the keys "
+    '"summary" (string), "topics" (list of strings) and "sentiment" (number from -1 to 1).'
+)
+
+
+class LLMProviderError(Exception):
+    """Raised when the LLM provider rejects a request or returns an unusable reply."""
+
+
+class InvalidCompletionError(LLMProviderError):
+    """Raised when a completion is not the JSON object that was asked for."""
+
+
+class LLMUnavailableError(LLMProviderError):
+    """Raised when the provider is still overloaded or failing (429 or 5xx) after every retry."""
+
+
+# Errors a completion call ends with once its retries are used up.
+LLM_CALL_ERRORS: tuple[type[BaseException], ...] = (LLMProviderError, httpx.TransportError)
+# Errors after which the same request may succeed later.
+TRANSIENT_LLM_ERRORS: tuple[type[BaseException], ...] = (LLMUnavailableError, httpx.TransportError)
+
+
+class AsyncLLMClient(Protocol):
+    async def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        """Analyze the transcript text and return a dictionary of results."""
+        ...
+
+    async def complete_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        """Run an arbitrary prompt whose reply is a JSON object."""
+        ...
+
+
+class AIMDConfig(BaseModel):
+    """Concurrency grows by increase per window of successes and shrinks by decrease on overload."""
+
+    initial: int = 4
+    minimum: int = 1
+    maximum: int = 64
+    increase: float = 1.0
+    decrease: float = 0.5
+    latency_target_seconds: Optional[float] = None
+
+
+class AIMDConcurrency:
+    """
+    Additive-increase/multiplicative-decrease limit on requests in flight.
+
+    Every successful request raises the limit by increase / limit, so a
+    full window of successes adds about increase. A 429 or 503, or a
+    response slower than latency_target_seconds, multiplies the limit by
+    decrease. Only requests started after the last decrease can trigger
+    another, so one burst of throttled responses shrinks the limit once.
+    """
+
+    def __init__(self, config: AIMDConfig = AIMDConfig(), clock: Callable[[], float] = time.monotonic) -> None:
+        self._config = config
+        self._clock = clock
+        self.limit = float(config.initial)
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to release()."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            return self._clock()
+
+    async def release(self, started_at: float, overloaded: bool = False) -> None:
+        config = self._config
+        latency = self._clock() - started_at
+        slow = config.latency_target_seconds is not None and latency > config.latency_target_seconds
+        async with self._condition:
+            self.in_flight -= 1
+            if overloaded or slow:
+                if started_at > self._last_decrease:
+                    self.limit = max(config.minimum, self.limit * config.decrease)
+                    self._last_decrease = self._clock()
+            else:
+                self.limit = min(config.maximum, self.limit + config.increase / self.limit)
+            self._condition.notify_all()
+
+
+class LLMProviderConfig(BaseModel):
+    base_url: str
+    api_key: str
+    model: str
+    max_output_tokens: int = 1024
+    requests_per_minute: float = 500
+    tokens_per_minute: float = 200_000
+    request_timeout: float = 120.0
+    retry: RetryConfig = RetryConfig()
+    aimd: AIMDConfig = AIMDConfig()
+
+
+class AsyncHTTPLLMClient:
+    """
+    Asyncio client for an OpenAI-compatible chat completions API.
+
+    Each call estimates its token cost (prompt plus max_output_tokens),
+    waits for the shared ProviderRateLimiter, takes an AIMD concurrency
+    slot, and settles the token bucket with the usage the provider reports.
+    Transport errors, 429 and 5xx are retried with full-jitter backoff,
+    honouring Retry-After; 429 and 503 also shrink the concurrency limit.
+    """
+
+    def __init__(
+        self,
+        config: LLMProviderConfig,
+        limiter: Optional[ProviderRateLimiter] = None,
+        concurrency: Optional[AIMDConcurrency] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        self._config = config
+        self._limiter = limiter
+        self.concurrency = concurrency or AIMDConcurrency(config.aimd)
+        self._http = http_client or httpx.AsyncClient(
+            base_url=config.base_url,
+            headers={"authorization": f"Bearer {config.api_key}"},
+            timeout=config.request_timeout,
+        )
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._count_tokens = count_tokens
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        return await self.complete_json(SYSTEM_PROMPT, transcript_text)
+
+    async def complete_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        """Send one system + user message pair and return the reply parsed as a JSON object."""
+        body = {
+            "model": self._config.model,
+            "max_tokens": self._config.max_output_tokens,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+        }
+        estimated_tokens = (
+            self._count_tokens(system_prompt) + self._count_tokens(user_content) + self._config.max_output_tokens
+        )
+        reply = await self._request(body, estimated_tokens)
+        try:
+            return json.loads(reply["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            raise InvalidCompletionError(f"Unusable completion from {self._config.model}: {exc}") from exc
+
+    async def _request(self, body: dict, estimated_tokens: int) -> dict:
+        retry = self._config.retry
+        attempt = 0
+        while True:
+            if self._limiter is not None:
+                await self._limiter.acquire(estimated_tokens)
+            started_at = await self.concurrency.acquire()
+            overloaded = False
+            retry_after = None
+            try:
+                response = await self._http.post("/v1/chat/completions", json=body)
+            except httpx.TransportError as exc:
+                error: Exception = exc
+            else:
+                overloaded = response.status_code in (429, 503)
+                if response.status_code < 400:
+                    reply = response.json()
+                    if self._limiter is not None:
+                        usage = reply.get("usage") or {}
+                        await self._limiter.settle(estimated_tokens, usage.get("total_tokens", estimated_tokens))
+                    return reply
+                if response.status_code != 429 and response.status_code < 500:
+                    raise LLMProviderError(f"Completion failed with {response.status_code}: {response.text}")
+                error = LLMUnavailableError(f"Completion failed with {response.status_code}")
+                retry_after = _parse_retry_after(response)
+            finally:
+                await self.concurrency.release(started_at, overloaded=overloaded)
+
+            attempt += 1
+            if attempt >= retry.max_attempts:
+                raise error
+            delay = self._rng.uniform(0, min(retry.max_delay, retry.base_delay * 2 ** (attempt - 1)))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            await self._sleep(delay)
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class BlockingLLMClient(LLMClient):
+    """
+    Synchronous LLMClient over an AsyncLLMClient.
+
+    The async client runs on a private event loop thread, so every worker
+    thread (and ChunkedLLMAnalysisBackend's chunk pool) shares one loop,
+    one connection pool and one concurrency limit.
+    """
+
+    def __init__(self, client_factory: Callable[[], AsyncLLMClient]) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+
+        async def _create() -> AsyncLLMClient:
+            return client_factory()
+
+        self._client = asyncio.run_coroutine_threadsafe(_create(), self._loop).result()
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        return asyncio.run_coroutine_threadsafe(self._client.analyze_transcript(transcript_text), self._loop).result()
+
+    def complete_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        coroutine = self._client.complete_json(system_prompt, user_content)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        """Close the async client and stop the loop thread."""
+        aclose = getattr(self._client, "aclose", None)
+        if aclose is not None:
+            asyncio.run_coroutine_threadsafe(aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,78 @@
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, Protocol
+
+from pymongo import UpdateOne
+
+
+class ChunkResultStore(Protocol):
+    def get_many(self, fingerprints: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the stored chunk results among fingerprints, keyed by fingerprint."""
+        ...
+
+    def put_many(self, results: dict[str, dict[str, Any]], prompt_version: str, model: str) -> None:
+        """Store chunk results keyed by fingerprint."""
+        ...
+
+
+class InMemoryChunkResultStore:
+    """Process-local ChunkResultStore."""
+
+    def __init__(self) -> None:
+        self._results: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, fingerprints: Iterable[str]) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {fingerprint: self._results[fingerprint] for fingerprint in fingerprints if fingerprint in self._results}
+
+    def put_many(self, results: dict[str, dict[str, Any]], prompt_version: str, model: str) -> None:
+        with self._lock:
+            self._results.update(results)
+
+
+class MongoChunkResultStore:
+    """
+    ChunkResultStore keeping one document per analyzed chunk in MongoDB.
+
+    Documents are keyed by fingerprint and never expire, unlike the LLM
+    response cache, so a backfill after a prompt or model change only pays
+    for chunks it has not analyzed with that prompt and model before.
+    """
+
+    def __init__(self, client, db_name: str = "therapy_analysis") -> None:
+        """Initialize the store with a MongoDB client and database name.
+
+        Args:
+            client: MongoDB client instance.
+            db_name: Database name (default: "therapy_analysis").
+        """
+        self._collection = client[db_name]["analysis_chunks"]
+        self._collection.create_index("fingerprint", unique=True)
+
+    def get_many(self, fingerprints: Iterable[str]) -> dict[str, dict[str, Any]]:
+        return {
+            document["fingerprint"]: document["result"]
+            for document in self._collection.find({"fingerprint": {"$in": list(fingerprints)}})
+        }
+
+    def put_many(self, results: dict[str, dict[str, Any]], prompt_version: str, model: str) -> None:
+        if not results:
+            return
+        saved_at = datetime.now(timezone.utc)
+        self._collection.bulk_write(
+            [
+                UpdateOne(
+                    {"fingerprint": fingerprint},
+                    {"$set": {
+                        "result": result,
+                        "prompt_version": prompt_version,
+                        "model": model,
+                        "saved_at": saved_at,
+                    }},
+                    upsert=True,
+                )
+                for fingerprint, result in results.items()
+            ],
+            ordered=False,
+        )
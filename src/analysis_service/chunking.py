@@ -0,0 +1,202 @@
+import math
+import re
+from typing import Callable, Iterable, Iterator
+
+from pydantic import BaseModel
+
+
+_UTTERANCE_END = re.compile(r"(?<=[.!?])\s+|[\r\n]")
+_WORD = re.compile(r"\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def count_words(text: str) -> int:
+    """Number of whitespace-separated words, without building the word list."""
+    return sum(1 for _ in _WORD.finditer(text))
+
+
+def split_utterances(transcript_text: str) -> list[str]:
+    """Split a plain text transcript into utterances (see iter_utterances)."""
+    return list(iter_utterances([transcript_text]))
+
+
+def iter_utterances(text_chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the utterances of a text stream as soon as each one is complete.
+
+    Every line is split into sentences ending in '.', '!' or '?', and each
+    sentence is an utterance, so a transcript that joins utterances with
+    spaces on one line and one with an utterance per line are split the
+    same way. Utterances are stripped and blank ones are skipped; the result
+    does not depend on how the text is chunked.
+    """
+    buffer = ""
+    for chunk in text_chunks:
+        scanned = len(buffer)
+        buffer += chunk
+        # Everything up to the last line break or sentence end is complete.
+        last_end = None
+        for last_end in _UTTERANCE_END.finditer(buffer, scanned):
+            pass
+        if last_end is not None:
+            yield from _stripped(_UTTERANCE_END.split(buffer[:last_end.start()]))
+            buffer = buffer[last_end.end():]
+    yield from _stripped(_UTTERANCE_END.split(buffer))
+
+
+def _stripped(parts: Iterable[str]) -> Iterator[str]:
+    for part in parts:
+        part = part.strip()
+        if part:
+            yield part
+
+
+class TranscriptChunk(BaseModel):
+    index: int
+    text: str
+    first_utterance: int
+    last_utterance: int
+    token_count: int
+
+
+def chunk_utterances(
+    utterances: Iterable[str],
+    max_tokens: int = 3000,
+    overlap_tokens: int = 200,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> list[TranscriptChunk]:
+    """
+    Group utterances into chunks of at most max_tokens tokens.
+
+    Chunks only break between utterances. Each chunk after the first starts
+    with the trailing utterances of the previous one, up to overlap_tokens,
+    so context that spans a boundary is seen by both chunks. An utterance
+    longer than max_tokens is split on word boundaries as a last resort.
+
+    Args:
+        utterances: Utterance texts in order.
+        max_tokens: Token budget of one chunk.
+        overlap_tokens: Token budget of the context repeated from the
+            previous chunk; must be smaller than max_tokens.
+        count_tokens: Token counter matching the target model.
+
+    Returns:
+        Chunks in order; first_utterance and last_utterance index into
+        utterances (split long utterances keep their original index).
+    """
+    chunker = UtteranceChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens, count_tokens=count_tokens)
+    chunks: list[TranscriptChunk] = []
+    for utterance in utterances:
+        chunks.extend(chunker.add(utterance))
+    chunks.extend(chunker.finish())
+    return chunks
+
+
+class UtteranceChunker:
+    """
+    Incremental chunk_utterances: utterances go in one at a time and each
+    chunk comes out as soon as the next utterance no longer fits in it.
+
+    Args:
+        max_tokens: Token budget of one chunk.
+        overlap_tokens: Token budget of the context repeated from the
+            previous chunk; must be smaller than max_tokens.
+        count_tokens: Token counter matching the target model.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        overlap_tokens: int = 200,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+        self._max_tokens = max_tokens
+        self._overlap_tokens = overlap_tokens
+        self._count_tokens = count_tokens
+        self._utterances = 0
+        self._chunks = 0
+        self._window: list[tuple[int, str, int]] = []
+        self._window_tokens = 0
+
+    def add(self, utterance: str) -> list[TranscriptChunk]:
+        """Add the next utterance; return the chunks it completed."""
+        index = self._utterances
+        self._utterances += 1
+        tokens = self._count_tokens(utterance)
+        if tokens <= self._max_tokens:
+            pieces = [(index, utterance, tokens)]
+        else:
+            pieces = [
+                (index, part, self._count_tokens(part))
+                for part in _split_long_utterance(utterance, self._max_tokens, self._count_tokens)
+            ]
+        completed: list[TranscriptChunk] = []
+        for piece in pieces:
+            if self._window and self._window_tokens + piece[2] > self._max_tokens:
+                completed.append(self._emit())
+                self._window, self._window_tokens = _overlap(
+                    self._window, self._overlap_tokens, self._max_tokens - piece[2]
+                )
+            self._window.append(piece)
+            self._window_tokens += piece[2]
+        return completed
+
+    def finish(self) -> list[TranscriptChunk]:
+        """Return the last, partly filled chunk, if any."""
+        if not self._window:
+            return []
+        chunk = self._emit()
+        self._window, self._window_tokens = [], 0
+        return [chunk]
+
+    def _emit(self) -> TranscriptChunk:
+        chunk = _make_chunk(self._chunks, self._window, self._window_tokens)
+        self._chunks += 1
+        return chunk
+
+
+def _overlap(
+    window: list[tuple[int, str, int]],
+    overlap_tokens: int,
+    room: int,
+) -> tuple[list[tuple[int, str, int]], int]:
+    budget = min(overlap_tokens, room)
+    kept: list[tuple[int, str, int]] = []
+    kept_tokens = 0
+    for piece in reversed(window):
+        if kept_tokens + piece[2] > budget:
+            break
+        kept.insert(0, piece)
+        kept_tokens += piece[2]
+    return kept, kept_tokens
+
+
+def _make_chunk(index: int, window: list[tuple[int, str, int]], tokens: int) -> TranscriptChunk:
+    return TranscriptChunk(
+        index=index,
+        text="\n".join(text for _, text, _ in window),
+        first_utterance=window[0][0],
+        last_utterance=window[-1][0],
+        token_count=tokens,
+    )
+
+
+def _split_long_utterance(utterance: str, max_tokens: int, count_tokens: Callable[[str], int]) -> list[str]:
+    parts: list[str] = []
+    words: list[str] = []
+    tokens = 0
+    for word in utterance.split():
+        word_tokens = count_tokens(word + " ")
+        if words and tokens + word_tokens > max_tokens:
+            parts.append(" ".join(words))
+            words, tokens = [], 0
+        words.append(word)
+        tokens += word_tokens
+    if words:
+        parts.append(" ".join(words))
+    return parts
@@ -0,0 +1,264 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from src.analysis_service.domain import (
+    AnalysisBackend,
+    AnalysisResult,
+    MergeableAnalysisBackend,
+    StreamingAnalysisBackend,
+)
+from src.analysis_service.streaming import WordCountAnalyzer, run_analyzers
+
+
+RESERVED_NAMES = ("backend", "components")
+
+
+class CompositeMember:
+    """
+    A backend run by CompositeAnalysisBackend.
+
+    Args:
+        name: Key the backend's extra is stored under.
+        backend: The analysis backend.
+        timeout_seconds: How long to wait for its result once it starts
+            running (None to wait as long as it takes).
+        use_process: Run it in a worker process instead of a thread, for
+            CPU-bound backends; the backend must then be picklable.
+        max_concurrent: How many transcripts it may analyze at the same
+            time, i.e. the size of its own pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: AnalysisBackend,
+        timeout_seconds: Optional[float] = None,
+        use_process: bool = False,
+        max_concurrent: int = 1,
+    ) -> None:
+        self.name = name
+        self.backend = backend
+        self.timeout_seconds = timeout_seconds
+        self.use_process = use_process
+        self.max_concurrent = max_concurrent
+
+    @property
+    def streams(self) -> bool:
+        """Whether the member is fed the transcript chunk by chunk."""
+        return isinstance(self.backend, StreamingAnalysisBackend) and not self.use_process
+
+
+def _run_backend(backend: AnalysisBackend, transcript_text: str) -> AnalysisResult:
+    return backend.analyze(transcript_text)
+
+
+class _End:
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+
+
+class _ChunkQueue:
+    """Hands the chunks read by the composite to one streaming member."""
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    def put(self, chunk: bytes) -> None:
+        self._queue.put(chunk)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """End the stream; with an error, the member's iteration raises it."""
+        self._queue.put(_End(error))
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self._queue.get()
+            if isinstance(chunk, _End):
+                if chunk.error is not None:
+                    raise chunk.error
+                return
+            yield chunk
+
+
+class _MemberRun:
+    """One member's analysis of one transcript; started is set when it begins running."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.started_at = 0.0
+        self.future: Optional[Future] = None
+
+    def result(self, timeout_seconds: Optional[float]) -> tuple[AnalysisResult, float]:
+        if timeout_seconds is None:
+            return self.future.result()
+        # A member still queued behind its own earlier analyses gets as long to start as to run.
+        if not self.started.wait(timeout_seconds):
+            self.future.cancel()
+            raise FutureTimeoutError()
+        return self.future.result(timeout=max(0.0, self.started_at + timeout_seconds - time.monotonic()))
+
+
+class CompositeAnalysisBackend(StreamingAnalysisBackend):
+    """
+    Runs several analysis backends concurrently over the same transcript.
+
+    The transcript stream is read once: streaming members get every chunk
+    as it arrives, and the others get the whole text once it has been
+    read. Each member runs on its own pool of max_concurrent threads (or,
+    with use_process, processes), so a member whose calls hang only holds
+    up its own later analyses, never those of the other members. Each
+    member's extra is stored under its name, and extra["components"]
+    records its status ("ok", "timeout" or "error"), duration and error
+    message. A member's timeout starts when it starts running; one that has
+    not finished by then is reported as timed out and left to finish in the
+    background (threads cannot be interrupted), so it never holds back the
+    results of the others. The result fails only if every member fails.
+
+    Args:
+        members: The backends to run; names must be unique.
+    """
+
+    def __init__(self, members: Sequence[CompositeMember]) -> None:
+        names = [member.name for member in members]
+        if not members or len(set(names)) != len(names):
+            raise ValueError("Composite members must be a non-empty list with unique names")
+        if any(name in RESERVED_NAMES for name in names):
+            raise ValueError(f"Composite member names must not be one of {RESERVED_NAMES}")
+        self.members = list(members)
+        self._threads = {
+            member.name: ThreadPoolExecutor(
+                max_workers=member.max_concurrent, thread_name_prefix=f"composite-{member.name}"
+            )
+            for member in members
+        }
+        self._processes: dict[str, ProcessPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def analyze_stream(self, chunks: Iterable[bytes]) -> AnalysisResult:
+        runs = {member.name: _MemberRun() for member in self.members}
+        queues: dict[str, _ChunkQueue] = {}
+        for member in self.members:
+            if member.streams:
+                queues[member.name] = _ChunkQueue()
+                self._submit(member, runs[member.name], queues[member.name])
+        whole: Optional[list[bytes]] = [] if len(queues) < len(self.members) else None
+
+        def read() -> Iterator[bytes]:
+            for chunk in chunks:
+                for name, chunk_queue in queues.items():
+                    if not runs[name].future.done():
+                        chunk_queue.put(chunk)
+                if whole is not None:
+                    whole.append(chunk)
+                yield chunk
+
+        try:
+            word_count = run_analyzers(read(), [WordCountAnalyzer()])["word_count"]
+        except BaseException as exc:
+            for chunk_queue in queues.values():
+                chunk_queue.close(exc)
+            raise
+        for chunk_queue in queues.values():
+            chunk_queue.close()
+        if whole is not None:
+            transcript_text = b"".join(whole).decode("utf-8")
+            for member in self.members:
+                if not member.streams:
+                    self._submit(member, runs[member.name], transcript_text)
+
+        extra: dict = {"backend": "composite", "components": {}}
+        errors: list[BaseException] = []
+        for member in self.members:
+            run = runs[member.name]
+            try:
+                result, seconds = run.result(member.timeout_seconds)
+            except FutureTimeoutError as exc:
+                status = {"status": "timeout", "seconds": _seconds_since(run)}
+                errors.append(exc)
+            except Exception as exc:
+                status = {
+                    "status": "error",
+                    "seconds": _seconds_since(run),
+                    "error": f"{type(exc).__name__}: {exc}",
+                }
+                errors.append(exc)
+            else:
+                extra[member.name] = result.extra
+                status = {"status": "ok", "seconds": seconds}
+            extra["components"][member.name] = status
+
+        if len(errors) == len(self.members):
+            raise errors[0]
+        return AnalysisResult(video_id="", word_count=word_count, extra=extra)
+
+    def merge_results(self, results: list[AnalysisResult]) -> Optional[AnalysisResult]:
+        """
+        Merge segment results member by member, with each member's own merge_results.
+
+        A member that did not succeed on every segment is reported with the
+        status of its first failed segment, and its extra is left out, as in
+        a single analysis. Returns None if a member cannot merge its results.
+        """
+        extra: dict = {"backend": "composite", "components": {}}
+        for member in self.members:
+            statuses = [result.extra["components"][member.name] for result in results]
+            seconds = sum(status["seconds"] for status in statuses)
+            failed = [status for status in statuses if status["status"] != "ok"]
+            if failed:
+                extra["components"][member.name] = {**failed[0], "seconds": seconds}
+                continue
+            if not isinstance(member.backend, MergeableAnalysisBackend):
+                return None
+            merged = member.backend.merge_results(
+                [AnalysisResult(video_id="", word_count=0, extra=result.extra[member.name]) for result in results]
+            )
+            if merged is None:
+                return None
+            extra[member.name] = merged.extra
+            extra["components"][member.name] = {"status": "ok", "seconds": seconds}
+        return AnalysisResult(video_id="", word_count=sum(result.word_count for result in results), extra=extra)
+
+    def close(self) -> None:
+        """Shut down the pools and close members that have a close()."""
+        for threads in self._threads.values():
+            threads.shutdown(wait=False, cancel_futures=True)
+        for processes in self._processes.values():
+            processes.shutdown(wait=False, cancel_futures=True)
+        for member in self.members:
+            close = getattr(member.backend, "close", None)
+            if close is not None:
+                close()
+
+    def _submit(self, member: CompositeMember, run: _MemberRun, source: Union[_ChunkQueue, str]) -> None:
+        run.future = self._threads[member.name].submit(self._run_member, member, run, source)
+
+    def _run_member(
+        self,
+        member: CompositeMember,
+        run: _MemberRun,
+        source: Union[_ChunkQueue, str],
+    ) -> tuple[AnalysisResult, float]:
+        run.started_at = time.monotonic()
+        run.started.set()
+        if isinstance(source, _ChunkQueue):
+            result = member.backend.analyze_stream(source)
+        elif member.use_process:
+            # The thread only waits for the process, so the process pool never queues.
+            result = self._process_pool(member).submit(_run_backend, member.backend, source).result()
+        else:
+            result = member.backend.analyze(source)
+        return result, time.monotonic() - run.started_at
+
+    def _process_pool(self, member: CompositeMember) -> ProcessPoolExecutor:
+        with self._lock:
+            if member.name not in self._processes:
+                self._processes[member.name] = ProcessPoolExecutor(max_workers=member.max_concurrent)
+            return self._processes[member.name]
+
+
+def _seconds_since(run: _MemberRun) -> float:
+    return time.monotonic() - run.started_at if run.started.is_set() else 0.0
@@ -1,6 +1,10 @@
 import os
+from typing import Optional
+
 from pydantic import BaseModel
 
+from src.analysis_service.async_llm_client import LLMProviderConfig
+
 from src.analysis_service.rabbitmq_consumer import RabbitMQConsumerConfig
 from src.analysis_service.rabbitmq_publisher import RabbitMQConfig as PublisherConfig
 
@@ -10,6 +14,16 @@ class AnalysisServiceConfig(BaseModel):
     publisher: PublisherConfig
     mongo_uri: str
     mongo_db_name: str
+    llm: Optional[LLMProviderConfig] = None
+    llm_rate_limit_db: str = "/tmp/llm-rate-limits.db"
+    redis_url: Optional[str] = None
+    llm_timeout_seconds: float = 600.0
+    keywords: list[str] = []
+    write_behind_batch_size: Optional[int] = None
+    write_behind_flush_seconds: float = 1.0
+    batch_size: Optional[int] = None
+    llm_max_concurrency: int = 4
+    tag_utterances: bool = False
 
 
 def load_config() -> AnalysisServiceConfig:
@@ -20,16 +34,23 @@ def load_config() -> AnalysisServiceConfig:
 
     transcript_created_queue = os.getenv("TRANSCRIPT_CREATED_QUEUE", "transcript.created")
     analysis_completed_queue = os.getenv("ANALYSIS_COMPLETED_QUEUE", "analysis.completed")
+    transcript_partial_queue = os.getenv("TRANSCRIPT_PARTIAL_QUEUE") or None
 
     mongo_uri = os.getenv("MONGO_URI", "mongodb://mongo:27017/")
     mongo_db_name = os.getenv("MONGO_DB_NAME", "therapy_analysis")
 
+    # Buffer Mongo writes and flush them in bulk; unacked messages must be
+    # able to fill a batch, so prefetch follows the batch size.
+    write_behind_batch_size = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "0")) or None
+
     consumer_config = RabbitMQConsumerConfig(
         host=host,
         port=port,
         username=user,
         password=password,
         queue_name=transcript_created_queue,
+        partial_queue_name=transcript_partial_queue,
+        prefetch_count=write_behind_batch_size,
     )
 
     publisher_config = PublisherConfig(
@@ -40,9 +61,29 @@ def load_config() -> AnalysisServiceConfig:
         queue_name=analysis_completed_queue,
     )
 
+    llm_config = None
+    if os.getenv("LLM_BASE_URL"):
+        llm_config = LLMProviderConfig(
+            base_url=os.environ["LLM_BASE_URL"],
+            api_key=os.getenv("LLM_API_KEY", ""),
+            model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500")),
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "200000")),
+        )
+
     return AnalysisServiceConfig(
         consumer=consumer_config,
         publisher=publisher_config,
         mongo_uri=mongo_uri,
         mongo_db_name=mongo_db_name,
+        llm=llm_config,
+        llm_rate_limit_db=os.getenv("LLM_RATE_LIMIT_DB", "/tmp/llm-rate-limits.db"),
+        redis_url=os.getenv("REDIS_URL") or None,
+        llm_timeout_seconds=float(os.getenv("LLM_ANALYSIS_TIMEOUT_SECONDS", "600")),
+        keywords=[word.strip() for word in os.getenv("ANALYSIS_KEYWORDS", "").split(",") if word.strip()],
+        write_behind_batch_size=write_behind_batch_size,
+        write_behind_flush_seconds=float(os.getenv("WRITE_BEHIND_FLUSH_SECONDS", "1.0")),
+        batch_size=int(os.getenv("ANALYSIS_BATCH_SIZE", "0")) or None,
+        llm_max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        tag_utterances=os.getenv("ANALYSIS_TAG_UTTERANCES", "").lower() in ("1", "true", "yes"),
     )
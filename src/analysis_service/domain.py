@@ -1,8 +1,11 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import Iterable, Iterator, Optional, Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
+from src.shared.timings import timed
+from src.shared.transcript_format import StructuredTranscript, decode_transcript
 from src.transcription_service.domain import TranscriptCreatedEvent
 
 
@@ -10,6 +13,7 @@ class AnalysisResult(BaseModel):
     video_id: str
     word_count: int
     extra: dict = {}
+    timings: dict[str, float] = {}
 
 
 class StorageClient(Protocol):
@@ -17,6 +21,14 @@ class StorageClient(Protocol):
         ...
 
 
+@runtime_checkable
+class ChunkedStorageClient(Protocol):
+    """Storage client that can hand out an object in chunks (e.g. CompressingStorageClient)."""
+
+    def iter_chunks(self, bucket: str, key: str) -> Iterator[bytes]:
+        ...
+
+
 class AnalysisBackend(ABC):
 
     @abstractmethod
@@ -25,6 +37,50 @@ class AnalysisBackend(ABC):
         ...
 
 
+class StreamingAnalysisBackend(AnalysisBackend):
+    """Backend that analyzes UTF-8 transcript bytes as they arrive, chunk by chunk."""
+
+    @abstractmethod
+    def analyze_stream(self, chunks: Iterable[bytes]) -> AnalysisResult:
+        """Analyze a transcript given as a stream of byte chunks."""
+        ...
+
+    def analyze(self, transcript_text: str) -> AnalysisResult:
+        return self.analyze_stream([transcript_text.encode("utf-8")])
+
+
+@runtime_checkable
+class MergeableAnalysisBackend(Protocol):
+    """Backend that can combine the analyses of consecutive transcript segments."""
+
+    def merge_results(self, results: list[AnalysisResult]) -> Optional[AnalysisResult]:
+        """Merge the results of consecutive segments, in order, into the
+        result the backend gives for the whole transcript; None if it cannot."""
+        ...
+
+
+def load_structured_transcript(
+    event: TranscriptCreatedEvent,
+    storage_client: StorageClient,
+    columns: Optional[Iterable[str]] = None,
+) -> Optional[StructuredTranscript]:
+    """Load the structured transcript of an event, decoding only the given columns.
+
+    Args:
+        event: The TranscriptCreatedEvent containing the transcript bucket/keys.
+        storage_client: The storage client to download the transcript.
+        columns: Column names to decode (see src.shared.transcript_format);
+            all columns if None.
+
+    Returns:
+        The StructuredTranscript, or None if only a plain text transcript exists.
+    """
+    if event.structured_key is None:
+        return None
+    data = storage_client.download_file(bucket=event.bucket, key=event.structured_key)
+    return decode_transcript(data, columns=columns)
+
+
 def analyze_transcript(
     event: TranscriptCreatedEvent,
     backend: AnalysisBackend,
@@ -40,15 +96,65 @@ def analyze_transcript(
     Returns:
         The AnalysisResult from the backend.
     """
-    transcript_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
+    timings = dict(event.timings)
+
+    if isinstance(backend, StreamingAnalysisBackend):
+        return _analyze_transcript_stream(event, backend, storage_client, timings)
+
+    with timed(timings, "analysis_download"):
+        transcript_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
     transcript_text = transcript_bytes.decode("utf-8")
     
-    result = backend.analyze(transcript_text)
-
-    if result.video_id != event.video_id:
-        result = AnalysisResult(
-            video_id=event.video_id,
-            word_count=result.word_count,
-            extra=result.extra,
-        )
-    return result
\ No newline at end of file
+    with timed(timings, "analysis_analyze"):
+        result = backend.analyze(transcript_text)
+
+    return AnalysisResult(
+        video_id=event.video_id,
+        word_count=result.word_count,
+        extra=result.extra,
+        timings=timings,
+    )
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _analyze_transcript_stream(
+    event: TranscriptCreatedEvent,
+    backend: StreamingAnalysisBackend,
+    storage_client: StorageClient,
+    timings: dict[str, float],
+) -> AnalysisResult:
+    # Download and analysis interleave, so time spent waiting for chunks is
+    # recorded as analysis_download and the rest as analysis_analyze.
+    download_seconds = 0.0
+
+    def chunks() -> Iterator[bytes]:
+        nonlocal download_seconds
+        started = time.perf_counter()
+        if isinstance(storage_client, ChunkedStorageClient):
+            source = storage_client.iter_chunks(bucket=event.bucket, key=event.key)
+        else:
+            data = storage_client.download_file(bucket=event.bucket, key=event.key)
+            source = (data[offset:offset + STREAM_CHUNK_SIZE] for offset in range(0, len(data), STREAM_CHUNK_SIZE))
+        download_seconds += time.perf_counter() - started
+        while True:
+            started = time.perf_counter()
+            chunk = next(source, None)
+            download_seconds += time.perf_counter() - started
+            if chunk is None:
+                return
+            yield chunk
+
+    started = time.perf_counter()
+    try:
+        result = backend.analyze_stream(chunks())
+    finally:
+        timings["analysis_download"] = download_seconds
+        timings["analysis_analyze"] = time.perf_counter() - started - download_seconds
+
+    return AnalysisResult(
+        video_id=event.video_id,
+        word_count=result.word_count,
+        extra=result.extra,
+        timings=timings,
+    )
@@ -1,12 +1,26 @@
-from src.analysis_service.domain import AnalysisBackend, AnalysisResult
+import json
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.analysis_service.chunk_results import ChunkResultStore
+from src.analysis_service.chunking import (
+    TranscriptChunk,
+    UtteranceChunker,
+    count_words,
+    estimate_tokens,
+    iter_utterances,
+)
+from src.analysis_service.domain import AnalysisBackend, AnalysisResult, StreamingAnalysisBackend
+from src.analysis_service.llm_cache import llm_fingerprint
 from src.analysis_service.llm_client import LLMClient
+from src.analysis_service.streaming import iter_text
 
 class LLMAnalysisBackend(AnalysisBackend):
     def __init__(self, llm_client: LLMClient):
         self.llm_client = llm_client
 
     def analyze(self, transcript_text: str) -> AnalysisResult:
-        word_count = len(transcript_text.split())
+        word_count = count_words(transcript_text)
         llm_result = self.llm_client.analyze_transcript(transcript_text)
         
         return AnalysisResult(
@@ -17,3 +31,179 @@ class LLMAnalysisBackend(AnalysisBackend):
                 "llm_result": llm_result
             }
         )
+
+
+class ChunkedLLMAnalysisBackend(StreamingAnalysisBackend):
+    """
+    LLM analysis of long transcripts in token-budgeted chunks.
+
+    The transcript stream is split into utterances (iter_utterances) and
+    grouped by an UtteranceChunker; each chunk is sent to the LLM as soon as
+    it is complete, so LLM calls overlap with the rest of the download.
+    Calls run concurrently on a pool of max_concurrency threads shared by
+    all analyses on this backend, and the chunk results are merged in chunk
+    order with merge_llm_results, so the result does not depend on which
+    request finished first. analyze() of a str makes the same chunks.
+
+    With a chunk_store, every chunk result is kept under the fingerprint of
+    (chunk text, prompt_version, model) and chunks whose fingerprint is
+    already stored are not sent to the LLM again, so re-analyzing a session
+    after a prompt or model change only pays for the chunks it affects. If
+    a chunk fails, the chunks that succeeded are stored before the error is
+    raised, so a retry only pays for the failed ones.
+
+    Args:
+        llm_client: The LLM client, called once per chunk.
+        max_tokens: Token budget of one chunk.
+        overlap_tokens: Tokens of context repeated from the previous chunk.
+        max_concurrency: Maximum LLM calls in flight.
+        count_tokens: Token counter matching the target model.
+        chunk_store: Optional durable store of chunk results.
+        prompt_version: Prompt template version; required with chunk_store.
+        model: Model name; required with chunk_store.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_tokens: int = 3000,
+        overlap_tokens: int = 200,
+        max_concurrency: int = 4,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        chunk_store: Optional[ChunkResultStore] = None,
+        prompt_version: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        if chunk_store is not None and (prompt_version is None or model is None):
+            raise ValueError("prompt_version and model are required with a chunk_store")
+        self.llm_client = llm_client
+        self._max_tokens = max_tokens
+        self._overlap_tokens = overlap_tokens
+        self._count_tokens = count_tokens
+        self._chunk_store = chunk_store
+        self._prompt_version = prompt_version
+        self._model = model
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-chunk")
+
+    def analyze_stream(self, chunks: Iterable[bytes]) -> AnalysisResult:
+        chunker = UtteranceChunker(
+            max_tokens=self._max_tokens,
+            overlap_tokens=self._overlap_tokens,
+            count_tokens=self._count_tokens,
+        )
+        submitted: list[tuple[TranscriptChunk, Optional[str], Future]] = []
+
+        def submit(completed: list[TranscriptChunk]) -> None:
+            for chunk in completed:
+                fingerprint = None
+                if self._chunk_store is not None:
+                    fingerprint = llm_fingerprint(chunk.text, self._prompt_version, self._model)
+                future = self._executor.submit(self._analyze_chunk, chunk.text, fingerprint)
+                submitted.append((chunk, fingerprint, future))
+
+        word_count = 0
+        try:
+            for utterance in iter_utterances(iter_text(chunks)):
+                word_count += count_words(utterance)
+                submit(chunker.add(utterance))
+            submit(chunker.finish())
+        finally:
+            wait([future for _, _, future in submitted])
+            if self._chunk_store is not None:
+                computed = {
+                    fingerprint: future.result()[0]
+                    for _, fingerprint, future in submitted
+                    if future.exception() is None and not future.result()[1]
+                }
+                if computed:
+                    self._chunk_store.put_many(computed, self._prompt_version, self._model)
+        outcomes = [future.result() for _, _, future in submitted]
+        results = [result for result, _ in outcomes]
+
+        extra = {
+            "backend": "llm",
+            "llm_result": merge_llm_results(results),
+            "chunks": [
+                {
+                    "index": chunk.index,
+                    "first_utterance": chunk.first_utterance,
+                    "last_utterance": chunk.last_utterance,
+                    "token_count": chunk.token_count,
+                    "llm_result": result,
+                }
+                for (chunk, _, _), result in zip(submitted, results)
+            ],
+        }
+        if self._chunk_store is not None:
+            for entry, (_, fingerprint, _) in zip(extra["chunks"], submitted):
+                entry["fingerprint"] = fingerprint
+            reused = sum(1 for _, was_reused in outcomes if was_reused)
+            extra["prompt_version"] = self._prompt_version
+            extra["model"] = self._model
+            extra["reused_chunks"] = reused
+            extra["computed_chunks"] = len(outcomes) - reused
+
+        return AnalysisResult(video_id="", word_count=word_count, extra=extra)
+
+    def merge_results(self, results: list[AnalysisResult]) -> AnalysisResult:
+        """Merge segment results as if their chunks had come from one transcript."""
+        chunks = [
+            {**entry, "index": index}
+            for index, entry in enumerate(entry for result in results for entry in result.extra["chunks"])
+        ]
+        extra = {
+            "backend": "llm",
+            "llm_result": merge_llm_results([entry["llm_result"] for entry in chunks]),
+            "chunks": chunks,
+        }
+        if self._chunk_store is not None:
+            extra["prompt_version"] = self._prompt_version
+            extra["model"] = self._model
+            extra["reused_chunks"] = sum(result.extra["reused_chunks"] for result in results)
+            extra["computed_chunks"] = sum(result.extra["computed_chunks"] for result in results)
+        return AnalysisResult(video_id="", word_count=sum(result.word_count for result in results), extra=extra)
+
+    def _analyze_chunk(self, text: str, fingerprint: Optional[str]) -> tuple[Dict[str, Any], bool]:
+        """LLM result of one chunk, and whether it came from the chunk store."""
+        if fingerprint is not None:
+            stored = self._chunk_store.get_many({fingerprint})
+            if fingerprint in stored:
+                return stored[fingerprint], True
+        return self.llm_client.analyze_transcript(text), False
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def merge_llm_results(results: list[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk LLM results, in chunk order, into one result.
+
+    Keys keep their first-seen order. Per key, lists are concatenated
+    without duplicates (items overlapping chunks both reported appear
+    once), dicts are merged recursively, numbers are averaged over the
+    chunks that report them, and differing strings are kept as a list of
+    distinct values. Any other value keeps its first occurrence.
+    """
+    merged: Dict[str, Any] = {}
+    for key in dict.fromkeys(key for result in results for key in result):
+        values = [result[key] for result in results if key in result]
+        merged[key] = _merge_values(values)
+    return merged
+
+
+def _merge_values(values: list[Any]) -> Any:
+    first = values[0]
+    if all(isinstance(value, list) for value in values):
+        seen: dict[str, Any] = {}
+        for value in values:
+            for item in value:
+                seen.setdefault(json.dumps(item, sort_keys=True, default=str), item)
+        return list(seen.values())
+    if all(isinstance(value, dict) for value in values):
+        return merge_llm_results(values)
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return sum(values) / len(values)
+    if all(isinstance(value, str) for value in values):
+        distinct = list(dict.fromkeys(values))
+        return distinct[0] if len(distinct) == 1 else distinct
+    return first
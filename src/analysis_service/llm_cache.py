@@ -0,0 +1,236 @@
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Protocol
+
+from pydantic import BaseModel
+
+from src.analysis_service.llm_client import LLMClient
+
+
+class SharedCache(Protocol):
+    """Shared cache tier; redis.Redis satisfies this as is."""
+
+    def get(self, name: str) -> Optional[bytes]:
+        ...
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> Any:
+        ...
+
+
+class LLMCacheStats(BaseModel):
+    local_hits: int
+    shared_hits: int
+    misses: int
+    coalesced: int
+    shared_errors: int
+    evictions: int
+    local_entries: int
+    local_bytes: int
+    hit_rate: float
+    mean_hit_seconds: float
+    mean_miss_seconds: float
+
+
+def normalize_transcript_text(text: str) -> str:
+    """Normalize text so trivially different copies of a chunk share a cache key.
+
+    Applies Unicode NFC normalization and collapses all runs of whitespace
+    to single spaces.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def llm_fingerprint(transcript_text: str, prompt_version: str, model: str) -> str:
+    """SHA-256 hex digest identifying one LLM call.
+
+    Covers the normalized text, the prompt template version and the model,
+    so a prompt or model change never reuses an old response.
+    """
+    payload = json.dumps(
+        {"text": normalize_transcript_text(transcript_text), "prompt": prompt_version, "model": model},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def llm_cache_key(transcript_text: str, prompt_version: str, model: str) -> str:
+    """Deterministic cache key for one LLM call (see llm_fingerprint)."""
+    return "llm:" + llm_fingerprint(transcript_text, prompt_version, model)
+
+
+class LRUResponseCache:
+    """
+    In-process LRU of serialized LLM responses bounded by total size.
+
+    Responses are kept as JSON bytes, which both gives an honest size for
+    eviction and hands every caller its own copy of the result.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def size(self) -> tuple[int, int]:
+        """Return (entries, bytes) currently held."""
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class CachingLLMClient(LLMClient):
+    """
+    LLMClient wrapper with a two-tier response cache.
+
+    Lookups go to the in-process LRU first, then to the shared tier (Redis
+    or anything with the same get/set signature), and only then to the
+    wrapped client. A shared-tier hit is copied into the LRU; a fresh
+    response is written to both, with ttl_seconds on the shared tier.
+    Concurrent calls for the same key are coalesced so only one reaches the
+    LLM. Shared-tier failures are counted and treated as misses, so an
+    unavailable Redis only costs cache hits.
+
+    Args:
+        inner: The LLM client to call on a miss.
+        model: Model name, part of the cache key.
+        prompt_version: Version of the prompt template, part of the cache key.
+        local: In-process LRU; a 64 MiB one by default.
+        shared: Optional shared cache tier.
+        ttl_seconds: Expiry of shared-tier entries.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient,
+        model: str,
+        prompt_version: str,
+        local: Optional[LRUResponseCache] = None,
+        shared: Optional[SharedCache] = None,
+        ttl_seconds: int = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._inner = inner
+        self._model = model
+        self._prompt_version = prompt_version
+        self._local = local or LRUResponseCache()
+        self._shared = shared
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._counts = {"local_hits": 0, "shared_hits": 0, "misses": 0, "coalesced": 0, "shared_errors": 0}
+        self._hit_seconds = 0.0
+        self._miss_seconds = 0.0
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        started = self._clock()
+        key = llm_cache_key(transcript_text, self._prompt_version, self._model)
+
+        value = self._local.get(key)
+        if value is not None:
+            self._record("local_hits", self._clock() - started)
+            return json.loads(value)
+
+        with self._lock:
+            pending = self._in_flight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._in_flight[key] = Future()
+        if not leader:
+            value = pending.result()
+            self._record("coalesced", self._clock() - started)
+            return json.loads(value)
+
+        try:
+            value = self._shared_get(key)
+            if value is not None:
+                self._local.put(key, value)
+                self._record("shared_hits", self._clock() - started)
+            else:
+                value = json.dumps(self._inner.analyze_transcript(transcript_text)).encode("utf-8")
+                self._local.put(key, value)
+                self._shared_set(key, value)
+                self._record("misses", self._clock() - started)
+            pending.set_result(value)
+        except BaseException as error:
+            pending.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return json.loads(value)
+
+    def stats(self) -> LLMCacheStats:
+        entries, size = self._local.size()
+        with self._lock:
+            counts = dict(self._counts)
+            hit_seconds, miss_seconds = self._hit_seconds, self._miss_seconds
+        hits = counts["local_hits"] + counts["shared_hits"] + counts["coalesced"]
+        lookups = hits + counts["misses"]
+        return LLMCacheStats(
+            **counts,
+            evictions=self._local.evictions,
+            local_entries=entries,
+            local_bytes=size,
+            hit_rate=hits / lookups if lookups else 0.0,
+            mean_hit_seconds=hit_seconds / hits if hits else 0.0,
+            mean_miss_seconds=miss_seconds / counts["misses"] if counts["misses"] else 0.0,
+        )
+
+    def _record(self, outcome: str, seconds: float) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+            if outcome == "misses":
+                self._miss_seconds += seconds
+            else:
+                self._hit_seconds += seconds
+
+    def _shared_get(self, key: str) -> Optional[bytes]:
+        if self._shared is None:
+            return None
+        try:
+            return self._shared.get(key)
+        except Exception:  # redis.RedisError, socket errors, ...
+            self._count_shared_error()
+            return None
+
+    def _shared_set(self, key: str, value: bytes) -> None:
+        if self._shared is None:
+            return
+        try:
+            self._shared.set(key, value, ex=self._ttl_seconds)
+        except Exception:  # redis.RedisError, socket errors, ...
+            self._count_shared_error()
+
+    def _count_shared_error(self) -> None:
+        with self._lock:
+            self._counts["shared_errors"] += 1
@@ -4,3 +4,9 @@ class LLMClient(Protocol):
     def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
         """Analyze the transcript text and return a dictionary of results."""
         ...
+
+
+class JSONCompletionClient(Protocol):
+    def complete_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        """Run a prompt whose reply is a JSON object and return it parsed."""
+        ...
@@ -0,0 +1,162 @@
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class LocalLLMServer:
+    """
+    Local stand-in for an OpenAI-compatible LLM provider, for offline load tests.
+
+    Serves POST /v1/chat/completions with a JSON analysis of the user
+    message after latency_seconds. Like a real provider it enforces
+    requests-per-minute and tokens-per-minute limits (token buckets holding
+    burst_seconds of allowance) and a cap on concurrent requests, answering 429
+    with a Retry-After header when any is exceeded. A user message starting
+    with "invalid" is rejected with 400.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.01,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        burst_seconds: float = 60.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.burst_seconds = burst_seconds
+        self.requests = 0
+        self.completed = 0
+        self.throttled = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="local-llm-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("content-length", "0"))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path != "/v1/chat/completions":
+                    self._reply(404, {"error": {"message": "not found"}})
+                    return
+
+                text = next((m["content"] for m in body.get("messages", []) if m.get("role") == "user"), "")
+                prompt_tokens = sum(math.ceil(len(m.get("content", "")) / 4) for m in body.get("messages", []))
+                completion_tokens = min(int(body.get("max_tokens", 256)), 64)
+
+                retry_after = server._admit(prompt_tokens + completion_tokens)
+                if retry_after is not None:
+                    self._reply(429, {"error": {"message": "rate limited"}}, retry_after=retry_after)
+                    return
+                try:
+                    if text.startswith("invalid"):
+                        self._reply(400, {"error": {"message": "invalid request"}})
+                        return
+                    time.sleep(server.latency_seconds)
+                    words = text.split()
+                    content = {
+                        "summary": " ".join(words[:8]),
+                        "topics": sorted(set(word.strip(".,!?").lower() for word in words[:5])),
+                        "sentiment": 0.0,
+                        "word_count": len(words),
+                    }
+                    self._reply(200, {
+                        "model": body.get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(content)}}],
+                        "usage": {
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": completion_tokens,
+                            "total_tokens": prompt_tokens + completion_tokens,
+                        },
+                    })
+                    with server._lock:
+                        server.completed += 1
+                finally:
+                    with server._lock:
+                        server.concurrent -= 1
+
+            def _reply(self, status: int, payload: dict, retry_after: Optional[float] = None) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                if retry_after is not None:
+                    self.send_header("retry-after", f"{retry_after:.3f}")
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _admit(self, tokens: int) -> Optional[float]:
+        """Count the request in; return a Retry-After in seconds if it is throttled."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            waits = []
+            if self.max_concurrency is not None and self.concurrent >= self.max_concurrency:
+                waits.append(self.latency_seconds)
+            candidates = (("requests", self.requests_per_minute, 1), ("tokens", self.tokens_per_minute, tokens))
+            limits = [(name, limit, amount) for name, limit, amount in candidates if limit is not None]
+            levels = {}
+            for name, limit, amount in limits:
+                capacity = max(amount, limit / 60 * self.burst_seconds)
+                level, updated_at = self._buckets.get(name, (capacity, now))
+                levels[name] = min(capacity, level + (now - updated_at) * limit / 60)
+                if levels[name] < amount:
+                    waits.append((amount - levels[name]) * 60 / limit)
+            if waits:
+                self.throttled += 1
+                return max(waits)
+            for name, _, amount in limits:
+                self._buckets[name] = (levels[name] - amount, now)
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            return None
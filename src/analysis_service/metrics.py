@@ -0,0 +1,275 @@
+"""Session metrics from tagged utterances.
+
+Utterances are encoded once into parallel code arrays (start, end, role
+code, topic code, emotion code) and every metric is computed on those
+arrays with vectorized NumPy operations: np.bincount for talk time, the
+topic histogram and per-window emotion weights, and np.searchsorted to
+place utterances in timeline windows. A plain Python implementation of the
+same metrics is kept as a reference for tests and benchmarks.
+"""
+import math
+import random
+import time
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy
+from pydantic import BaseModel
+
+from src.analysis_service.utterance_tagging import EMOTIONS
+
+
+ROLES = ("therapist", "patient")
+THERAPIST, PATIENT = range(len(ROLES))
+POSITIVE_EMOTIONS = frozenset({"happy", "hopeful"})
+NEGATIVE_EMOTIONS = frozenset({"sad", "anxious", "angry", "frustrated", "ashamed"})
+# +1 for positive, -1 for negative and 0 for neutral emotions, by emotion code.
+EMOTION_VALENCE = tuple(
+    1 if emotion in POSITIVE_EMOTIONS else -1 if emotion in NEGATIVE_EMOTIONS else 0 for emotion in EMOTIONS
+)
+UNKNOWN = -1
+
+
+class UtteranceArrays(BaseModel):
+    """
+    Utterances as parallel columns; codes index ROLES, topics and EMOTIONS.
+
+    A code of UNKNOWN (-1) marks a missing or unrecognised role, topic or
+    emotion. Columns are lists so the model serializes without NumPy;
+    compute_metrics converts them to arrays once.
+    """
+
+    start: list[float] = []
+    end: list[float] = []
+    role: list[int] = []
+    topic: list[int] = []
+    emotion: list[int] = []
+    topics: list[str] = []
+
+
+class SessionMetrics(BaseModel):
+    talk_time_therapist: float
+    talk_time_patient: float
+    patient_positive_topics: list[str]
+    patient_negative_topics: list[str]
+    emotion_timeline: list[dict[str, Any]]
+    topic_histogram: dict[str, dict[str, int]]
+
+    def to_document(self) -> dict[str, Any]:
+        """Split into the "metrics" and "extra" parts of an analysis_results document."""
+        return {
+            "metrics": {
+                "talk_time_therapist": self.talk_time_therapist,
+                "talk_time_patient": self.talk_time_patient,
+                "patient_positive_topics": self.patient_positive_topics,
+                "patient_negative_topics": self.patient_negative_topics,
+            },
+            "extra": {
+                "emotion_timeline": self.emotion_timeline,
+                "topic_histogram": self.topic_histogram,
+            },
+        }
+
+
+def encode_utterances(records: Iterable[dict[str, Any]]) -> UtteranceArrays:
+    """
+    Encode utterance records (as stored in analysis_results) into code arrays.
+
+    Topics are numbered in order of first appearance.
+    """
+    role_codes = {role: code for code, role in enumerate(ROLES)}
+    emotion_codes = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+    topic_codes: dict[str, int] = {}
+    arrays = UtteranceArrays()
+    for record in records:
+        arrays.start.append(float(record.get("start_time") or 0.0))
+        arrays.end.append(float(record.get("end_time") or 0.0))
+        arrays.role.append(role_codes.get(record.get("role"), UNKNOWN))
+        arrays.emotion.append(emotion_codes.get(record.get("emotion"), UNKNOWN))
+        topic = record.get("topic")
+        if topic:
+            arrays.topic.append(topic_codes.setdefault(topic, len(topic_codes)))
+        else:
+            arrays.topic.append(UNKNOWN)
+    arrays.topics = list(topic_codes)
+    return arrays
+
+
+def assign_roles(records: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Return copies of utterance records with a therapist or patient role.
+
+    The speaker label asking the most questions (utterances ending in '?')
+    is taken as the therapist and the remaining label with the most
+    speaking time as the patient; other labels get no role. Records that
+    already carry a role keep it.
+    """
+    questions: dict[str, int] = {}
+    talk_time: dict[str, float] = {}
+    for record in records:
+        label = record.get("speaker_label") or ""
+        questions[label] = questions.get(label, 0) + (record.get("text") or "").rstrip().endswith("?")
+        duration = (record.get("end_time") or 0.0) - (record.get("start_time") or 0.0)
+        talk_time[label] = talk_time.get(label, 0.0) + max(0.0, duration)
+    # Ties go to the label that speaks first.
+    labels = list(talk_time)
+    therapist = max(labels, key=lambda label: questions[label], default=None)
+    patient = max((label for label in labels if label != therapist), key=lambda label: talk_time[label], default=None)
+    roles = {therapist: ROLES[THERAPIST], patient: ROLES[PATIENT]}
+    return [
+        {**record, "role": record.get("role") or roles.get(record.get("speaker_label") or "")}
+        for record in records
+    ]
+
+
+def compute_metrics(
+    arrays: UtteranceArrays,
+    window_seconds: float = 60.0,
+    use_numpy: bool = True,
+) -> SessionMetrics:
+    """
+    Compute talk time, the patient emotion timeline and the patient topic histogram.
+
+    Talk time is the summed utterance duration per role. The emotion
+    timeline splits the session into window_seconds windows and reports,
+    for each window in which the patient speaks, the emotion with the most
+    patient speaking time; an utterance counts towards the window it starts
+    in (or the first window, if it starts before 0). The topic histogram
+    counts patient utterances per topic with a positive or a negative
+    emotion; topics with more positive than negative utterances are the
+    patient's positive topics and vice versa.
+
+    Args:
+        arrays: Encoded utterances.
+        window_seconds: Width of an emotion timeline window.
+        use_numpy: Use the NumPy implementation (default) or the pure
+            Python reference implementation.
+    """
+    lengths = {len(arrays.start), len(arrays.end), len(arrays.role), len(arrays.topic), len(arrays.emotion)}
+    if len(lengths) > 1:
+        raise ValueError("Utterance columns must have the same length")
+
+    if use_numpy:
+        talk_time, dominant, topic_counts = _aggregate_numpy(arrays, window_seconds)
+    else:
+        talk_time, dominant, topic_counts = _aggregate_python(arrays, window_seconds)
+
+    timeline = [
+        {
+            "time_window": f"{_format_seconds(window * window_seconds)}-{_format_seconds((window + 1) * window_seconds)}",
+            "dominant_emotion": EMOTIONS[code],
+        }
+        for window, code in enumerate(dominant)
+        if code is not None
+    ]
+
+    histogram = {
+        topic: {"positive": positive, "negative": negative}
+        for topic, (positive, negative) in zip(arrays.topics, topic_counts)
+        if positive or negative
+    }
+    positive_topics = sorted(
+        (topic for topic, counts in histogram.items() if counts["positive"] > counts["negative"]),
+        key=lambda topic: (-histogram[topic]["positive"], topic),
+    )
+    negative_topics = sorted(
+        (topic for topic, counts in histogram.items() if counts["negative"] > counts["positive"]),
+        key=lambda topic: (-histogram[topic]["negative"], topic),
+    )
+    return SessionMetrics(
+        talk_time_therapist=round(talk_time[THERAPIST], 3),
+        talk_time_patient=round(talk_time[PATIENT], 3),
+        patient_positive_topics=positive_topics,
+        patient_negative_topics=negative_topics,
+        emotion_timeline=timeline,
+        topic_histogram=histogram,
+    )
+
+
+def _aggregate_numpy(arrays: UtteranceArrays, window_seconds: float):
+    start = numpy.asarray(arrays.start, dtype=numpy.float64)
+    duration = numpy.clip(numpy.asarray(arrays.end, dtype=numpy.float64) - start, 0.0, None)
+    role = numpy.asarray(arrays.role, dtype=numpy.int64)
+    topic = numpy.asarray(arrays.topic, dtype=numpy.int64)
+    emotion = numpy.asarray(arrays.emotion, dtype=numpy.int64)
+
+    known_role = role >= 0
+    talk_time = numpy.bincount(role[known_role], weights=duration[known_role], minlength=len(ROLES))
+
+    patient = (role == PATIENT) & (emotion >= 0)
+    # Utterances starting before 0 count towards the first window.
+    window_start = numpy.maximum(start[patient], 0.0)
+    window_count = int(window_start.max() // window_seconds) + 1 if patient.any() else 0
+    edges = numpy.arange(window_count + 1) * window_seconds
+    window = numpy.searchsorted(edges, window_start, side="right") - 1
+    cells = window * len(EMOTIONS) + emotion[patient]
+    size = window_count * len(EMOTIONS)
+    weights = numpy.bincount(cells, weights=duration[patient], minlength=size).reshape(window_count, len(EMOTIONS))
+    spoken = numpy.bincount(window, minlength=window_count) > 0
+    # argmax takes the lowest emotion code on ties, like the Python path.
+    dominant = [int(code) if has_speech else None for code, has_speech in zip(weights.argmax(axis=1), spoken)]
+
+    valence = numpy.asarray(EMOTION_VALENCE, dtype=numpy.int64)[emotion[patient]]
+    tagged = (topic[patient] >= 0) & (valence != 0)
+    cells = topic[patient][tagged] * 2 + (valence[tagged] < 0)
+    topic_counts = numpy.bincount(cells, minlength=2 * len(arrays.topics)).reshape(len(arrays.topics), 2)
+    return talk_time.tolist(), dominant, topic_counts.tolist()
+
+
+def _aggregate_python(arrays: UtteranceArrays, window_seconds: float):
+    talk_time = [0.0] * len(ROLES)
+    window_weights: list[Optional[list[float]]] = []
+    topic_counts = [[0, 0] for _ in arrays.topics]
+    for start, end, role, topic, emotion in zip(arrays.start, arrays.end, arrays.role, arrays.topic, arrays.emotion):
+        duration = max(0.0, end - start)
+        if role >= 0:
+            talk_time[role] += duration
+        if role != PATIENT or emotion < 0:
+            continue
+        window = int(max(start, 0.0) // window_seconds)
+        if window >= len(window_weights):
+            window_weights.extend([None] * (window + 1 - len(window_weights)))
+        if window_weights[window] is None:
+            window_weights[window] = [0.0] * len(EMOTIONS)
+        window_weights[window][emotion] += duration
+        valence = EMOTION_VALENCE[emotion]
+        if topic >= 0 and valence != 0:
+            topic_counts[topic][valence < 0] += 1
+    dominant = [
+        None if weights is None else max(range(len(EMOTIONS)), key=lambda code: (weights[code], -code))
+        for weights in window_weights
+    ]
+    return talk_time, dominant, topic_counts
+
+
+def _format_seconds(seconds: float) -> str:
+    return str(int(seconds)) if float(seconds).is_integer() else f"{seconds:g}"
+
+
+def synthetic_utterances(
+    count: int,
+    topics: Sequence[str] = ("anxiety", "work", "sleep", "family", "progress", "coping_strategies"),
+    seed: int = 7,
+) -> UtteranceArrays:
+    """Alternating therapist/patient utterances with pseudo-random tags, for benchmarks."""
+    rng = random.Random(seed)
+    arrays = UtteranceArrays(topics=list(topics))
+    clock = 0.0
+    for index in range(count):
+        duration = rng.uniform(1.0, 15.0)
+        arrays.start.append(clock)
+        arrays.end.append(clock + duration)
+        clock += duration + rng.uniform(0.0, 1.0)
+        arrays.role.append(index % 2)
+        arrays.topic.append(rng.randrange(-1, len(topics)))
+        arrays.emotion.append(rng.randrange(len(EMOTIONS)))
+    return arrays
+
+
+def measure_metrics(arrays: UtteranceArrays, repeat: int = 5, use_numpy: bool = True) -> float:
+    """Best wall time of compute_metrics over repeat runs, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compute_metrics(arrays, use_numpy=use_numpy)
+        best = min(best, time.perf_counter() - started)
+    return best
@@ -18,17 +18,18 @@ class MongoAnalysisRepository:
         Args:
             event: The AnalysisCompletedEvent to save.
         """
-        self._collection.update_one(
-            {"video_id": event.video_id},
-            {
-                "$set": {
-                    "video_id": event.video_id,
-                    "word_count": event.word_count,
-                    "extra": event.extra,
-                }
-            },
-            upsert=True,
-        )
+        document = {
+            "video_id": event.video_id,
+            "word_count": event.word_count,
+            "extra": event.extra,
+            "timings": event.timings,
+        }
+        if event.utterances:
+            # Analyses made without a tagger keep the utterances and metrics saved earlier.
+            document["utterances"] = event.utterances
+        if event.metrics:
+            document["metrics"] = event.metrics
+        self._collection.update_one({"video_id": event.video_id}, {"$set": document}, upsert=True)
 
     def get_analysis(self, video_id: str) -> AnalysisCompletedEvent | None:
         """Retrieve an AnalysisCompletedEvent by video_id.
@@ -46,5 +47,8 @@ class MongoAnalysisRepository:
             video_id=doc["video_id"],
             word_count=doc["word_count"],
             extra=doc["extra"],
+            timings=doc.get("timings", {}),
+            utterances=doc.get("utterances", []),
+            metrics=doc.get("metrics", {}),
         )
 
@@ -0,0 +1,156 @@
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Protocol
+
+from src.shared.timings import timed
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
+from src.analysis_service.domain import AnalysisBackend, AnalysisResult, MergeableAnalysisBackend, StorageClient
+
+
+class PartialAnalysisStore(Protocol):
+    def save_chunk(self, video_id: str, segment_index: int, result: AnalysisResult) -> None:
+        """Store the analysis of one transcript segment."""
+        ...
+
+    def load_chunks(self, video_id: str) -> dict[int, AnalysisResult]:
+        """Return the stored segment analyses of a video, keyed by segment index."""
+        ...
+
+    def clear(self, video_id: str) -> None:
+        """Forget the stored segment analyses of a video."""
+        ...
+
+
+class InMemoryPartialAnalysisStore:
+    """Process-local PartialAnalysisStore; only merges if one worker sees every segment."""
+
+    def __init__(self) -> None:
+        self._chunks: dict[str, dict[int, AnalysisResult]] = {}
+        self._lock = threading.Lock()
+
+    def save_chunk(self, video_id: str, segment_index: int, result: AnalysisResult) -> None:
+        with self._lock:
+            self._chunks.setdefault(video_id, {})[segment_index] = result
+
+    def load_chunks(self, video_id: str) -> dict[int, AnalysisResult]:
+        with self._lock:
+            return dict(self._chunks.get(video_id, {}))
+
+    def clear(self, video_id: str) -> None:
+        with self._lock:
+            self._chunks.pop(video_id, None)
+
+
+class MongoPartialAnalysisStore:
+    """
+    PartialAnalysisStore keeping one document per analyzed segment in MongoDB.
+
+    Shared by every analysis worker, so the final transcript event can be
+    merged by whichever worker receives it, whoever analyzed the segments.
+    """
+
+    def __init__(self, client, db_name: str = "therapy_analysis") -> None:
+        """Initialize the store with a MongoDB client and database name.
+
+        Args:
+            client: MongoDB client instance.
+            db_name: Database name (default: "therapy_analysis").
+        """
+        self._collection = client[db_name]["analysis_partials"]
+        self._collection.create_index([("video_id", 1), ("segment_index", 1)], unique=True)
+
+    def save_chunk(self, video_id: str, segment_index: int, result: AnalysisResult) -> None:
+        self._collection.update_one(
+            {"video_id": video_id, "segment_index": segment_index},
+            {"$set": {"result": result.model_dump(), "saved_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    def load_chunks(self, video_id: str) -> dict[int, AnalysisResult]:
+        return {
+            document["segment_index"]: AnalysisResult(**document["result"])
+            for document in self._collection.find({"video_id": video_id})
+        }
+
+    def clear(self, video_id: str) -> None:
+        self._collection.delete_many({"video_id": video_id})
+
+
+def analyze_partial_transcript(
+    event: TranscriptPartialEvent,
+    backend: AnalysisBackend,
+    storage_client: StorageClient,
+    store: PartialAnalysisStore,
+) -> AnalysisResult:
+    """Analyze one transcript segment and keep the result for the final merge.
+
+    Args:
+        event: The TranscriptPartialEvent containing the segment bucket/key.
+        backend: The analysis backend to use.
+        storage_client: The storage client to download the segment text.
+        store: Where the segment analysis is kept until the transcript is complete.
+
+    Returns:
+        The AnalysisResult of the segment.
+    """
+    timings: dict[str, float] = {}
+
+    with timed(timings, "analysis_download"):
+        segment_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
+
+    with timed(timings, "analysis_analyze"):
+        result = backend.analyze(segment_bytes.decode("utf-8"))
+
+    chunk = AnalysisResult(
+        video_id=event.video_id,
+        word_count=result.word_count,
+        extra=result.extra,
+        timings=timings,
+    )
+    store.save_chunk(event.video_id, event.segment_index, chunk)
+    return chunk
+
+
+def merge_partial_results(
+    event: TranscriptCreatedEvent,
+    store: PartialAnalysisStore,
+    backend: AnalysisBackend,
+) -> Optional[AnalysisResult]:
+    """Merge stored segment analyses into the analysis of the whole transcript.
+
+    The segments are merged by the backend that analyzed them (see
+    MergeableAnalysisBackend), so the result has the same shape as an
+    analysis of the full transcript.
+
+    Args:
+        event: The final TranscriptCreatedEvent; its segment_count says how
+            many segments the transcript was published in.
+        store: The store holding the segment analyses.
+        backend: The analysis backend the segments were analyzed with.
+
+    Returns:
+        The merged AnalysisResult, or None if the transcript was not published
+        in segments, some segment has not been analyzed yet, or the backend
+        cannot merge its results.
+    """
+    if not event.segment_count or not isinstance(backend, MergeableAnalysisBackend):
+        return None
+    chunks = store.load_chunks(event.video_id)
+    if any(index not in chunks for index in range(event.segment_count)):
+        return None
+
+    timings = dict(event.timings)
+    with timed(timings, "analysis_merge"):
+        merged = backend.merge_results([chunks[index] for index in range(event.segment_count)])
+    if merged is None:
+        return None
+    # Segment analysis overlapped with transcription; report the time spent on it.
+    timings["analysis_partial_analyze"] = sum(
+        chunk.timings.get("analysis_analyze", 0.0) for chunk in chunks.values()
+    )
+    return AnalysisResult(
+        video_id=event.video_id,
+        word_count=merged.word_count,
+        extra=merged.extra,
+        timings=timings,
+    )
@@ -1,15 +1,33 @@
+import functools
 import json
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
 
 import pika
 from pydantic import BaseModel
+from pymongo.errors import ConnectionFailure
 
-from src.transcription_service.domain import TranscriptCreatedEvent
+from src.shared.redelivery import TRANSIENT_ERRORS, nack_failed_message
+from src.shared.timings import record_queue_wait
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
+from src.analysis_service.async_llm_client import TRANSIENT_LLM_ERRORS
 from src.analysis_service.domain import AnalysisBackend, StorageClient
+from src.analysis_service.partials import PartialAnalysisStore
+from src.analysis_service.utterance_tagging import UtteranceTagger
 from src.analysis_service.worker import (
     AnalysisEventPublisher,
     AnalysisRepository,
+    VideoTimingsRepository,
+    WriteBehindRepository,
     process_transcript_created_event,
+    process_transcript_partial_event,
+)
+
+
+# Failures worth redelivering the message for: storage, MongoDB or the LLM provider being unavailable.
+TRANSIENT_ANALYSIS_ERRORS: tuple[type[BaseException], ...] = (
+    TRANSIENT_ERRORS + TRANSIENT_LLM_ERRORS + (ConnectionFailure,)
 )
 
 
@@ -20,6 +38,27 @@ class RabbitMQConsumerConfig(BaseModel):
     username: str
     password: str
     queue_name: str = "transcript.created"
+    partial_queue_name: Optional[str] = None
+    prefetch_count: Optional[int] = None
+
+
+def _connect(config: RabbitMQConsumerConfig) -> pika.BlockingConnection:
+    credentials = pika.PlainCredentials(
+        config.username,
+        config.password,
+    )
+    parameters = pika.ConnectionParameters(
+        host=config.host,
+        port=config.port,
+        credentials=credentials,
+    )
+
+    while True:
+        try:
+            return pika.BlockingConnection(parameters)
+        except pika.exceptions.AMQPConnectionError:
+            print("RabbitMQ not ready yet, retrying in 5 seconds...")
+            time.sleep(5)
 
 
 class RabbitMQTranscriptCreatedConsumer:
@@ -31,6 +70,9 @@ class RabbitMQTranscriptCreatedConsumer:
         publisher: AnalysisEventPublisher,
         repository: AnalysisRepository,
         storage_client: StorageClient,
+        videos_repository: Optional[VideoTimingsRepository] = None,
+        partial_store: Optional[PartialAnalysisStore] = None,
+        tagger: Optional[UtteranceTagger] = None,
     ) -> None:
         """Initialize the consumer.
 
@@ -40,42 +82,51 @@ class RabbitMQTranscriptCreatedConsumer:
             publisher: Event publisher to use.
             repository: Repository to save analysis results.
             storage_client: Storage client to download transcripts.
+            videos_repository: Optional repository to record per-video timings.
+            partial_store: Optional store for segment analyses. Together with
+                config.partial_queue_name it enables analysis of
+                transcript.partial events while transcription is running.
+            tagger: Optional tagger for the utterances of structured transcripts.
         """
         self._config = config
         self._backend = backend
         self._publisher = publisher
         self._repository = repository
         self._storage_client = storage_client
+        self._videos_repository = videos_repository
+        self._partial_store = partial_store
+        self._tagger = tagger
 
     def run_forever(self) -> None:
         """Start consuming messages from the queue.
 
         Connects to RabbitMQ, declares the queue, and starts consuming messages.
         Each message is parsed as a TranscriptCreatedEvent and processed.
-        """
-        credentials = pika.PlainCredentials(
-            self._config.username,
-            self._config.password,
-        )
-        parameters = pika.ConnectionParameters(
-            host=self._config.host,
-            port=self._config.port,
-            credentials=credentials,
-        )
+        With a partial queue and store configured, TranscriptPartialEvents are
+        consumed on the same channel; if the final event arrives before all
+        segments were analyzed, the full transcript is analyzed instead.
 
-        while True:
-            try:
-                connection = pika.BlockingConnection(parameters)
-                break
-            except pika.exceptions.AMQPConnectionError:
-                print("RabbitMQ not ready yet, retrying in 5 seconds...")
-                time.sleep(5)
+        With a WriteBehindRepository, a message is acked only once the batch
+        holding its writes is stored and its analysis.completed event is
+        published (see process_transcript_created_event), and the buffered writes are flushed
+        when consuming stops. config.prefetch_count should then be at least
+        the repository's batch size, or batches only fill up by interval.
+        """
+        connection = _connect(self._config)
         channel = connection.channel()
         channel.queue_declare(queue=self._config.queue_name, durable=True)
+        if self._config.prefetch_count is not None:
+            channel.basic_qos(prefetch_count=self._config.prefetch_count)
+        write_behind = isinstance(self._repository, WriteBehindRepository)
 
         def _callback(ch, method, properties, body: bytes) -> None:
             data = json.loads(body.decode("utf-8"))
             event = TranscriptCreatedEvent(**data)
+            record_queue_wait(event.timings, "analysis_queue_wait", properties)
+            ack = functools.partial(ch.basic_ack, delivery_tag=method.delivery_tag)
+            if write_behind:
+                # The ack then runs on the flushing thread; pika channels are not thread-safe.
+                ack = functools.partial(connection.add_callback_threadsafe, ack)
 
             process_transcript_created_event(
                 event,
@@ -83,13 +134,156 @@ class RabbitMQTranscriptCreatedConsumer:
                 publisher=self._publisher,
                 repository=self._repository,
                 storage_client=self._storage_client,
+                videos_repository=self._videos_repository,
+                partial_store=self._partial_store,
+                tagger=self._tagger,
+                on_done=ack,
             )
 
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+        channel.basic_consume(
+            queue=self._config.queue_name,
+            on_message_callback=_callback,
+        )
+
+        if self._config.partial_queue_name and self._partial_store is not None:
+            channel.queue_declare(queue=self._config.partial_queue_name, durable=True)
+
+            def _partial_callback(ch, method, properties, body: bytes) -> None:
+                data = json.loads(body.decode("utf-8"))
+                event = TranscriptPartialEvent(**data)
+
+                process_transcript_partial_event(
+                    event,
+                    backend=self._backend,
+                    storage_client=self._storage_client,
+                    partial_store=self._partial_store,
+                )
+
+                ch.basic_ack(delivery_tag=method.delivery_tag)
+
+            channel.basic_consume(
+                queue=self._config.partial_queue_name,
+                on_message_callback=_partial_callback,
+            )
+
+        try:
+            channel.start_consuming()
+        finally:
+            if write_behind:
+                self._repository.close()
+                # Send the acks of the final flush.
+                connection.process_data_events(time_limit=0)
+
+
+class RabbitMQTranscriptBatchConsumer:
+    """
+    Consumes transcript.created events on a pool of threads, for draining backlogs.
+
+    Up to max_batch_size messages are processed at a time, each on its own
+    thread of a pool, so transcripts are downloaded and sessions analyzed
+    concurrently on the shared backend. A slot is refilled with the next
+    delivered message as soon as its session has been processed, so a slow
+    session never holds up the others. Each message is acked on its own as
+    soon as its result is saved and published (with a WriteBehindRepository,
+    once the result is stored), or nacked if processing it failed.
+
+    A failed message is logged and nacked. It is requeued only if it
+    failed with one of TRANSIENT_ANALYSIS_ERRORS; a malformed event, an
+    undecodable transcript or any other error would fail again, so it is
+    rejected without requeue (dead-lettered if the queue has a
+    dead-letter exchange).
+
+    Args:
+        config: RabbitMQ configuration. The prefetch count is raised to
+            max_batch_size if it is lower.
+        backend: Analysis backend to use; it is called from several threads.
+        publisher: Event publisher to use.
+        repository: Repository to save analysis results.
+        storage_client: Storage client to download transcripts.
+        videos_repository: Optional repository to record per-video timings.
+        max_batch_size: Most messages processed at a time.
+        tagger: Optional tagger for the utterances of structured transcripts.
+    """
+
+    def __init__(
+        self,
+        config: RabbitMQConsumerConfig,
+        backend: AnalysisBackend,
+        publisher: AnalysisEventPublisher,
+        repository: AnalysisRepository,
+        storage_client: StorageClient,
+        videos_repository: Optional[VideoTimingsRepository] = None,
+        max_batch_size: int = 16,
+        tagger: Optional[UtteranceTagger] = None,
+    ) -> None:
+        self._config = config
+        self._backend = backend
+        self._publisher = publisher
+        self._repository = repository
+        self._storage_client = storage_client
+        self._videos_repository = videos_repository
+        self._max_batch_size = max_batch_size
+        self._tagger = tagger
+
+    def run_forever(self) -> None:
+        """Start consuming messages from the queue on the thread pool."""
+        connection = _connect(self._config)
+        channel = connection.channel()
+        channel.queue_declare(queue=self._config.queue_name, durable=True)
+        channel.basic_qos(prefetch_count=max(self._config.prefetch_count or 0, self._max_batch_size))
+
+        pending: list[tuple[int, Any, bytes]] = []
+
+        def _callback(ch, method, properties, body: bytes) -> None:
+            pending.append((method.delivery_tag, properties, body))
 
         channel.basic_consume(
             queue=self._config.queue_name,
             on_message_callback=_callback,
         )
 
-        channel.start_consuming()
+        executor = ThreadPoolExecutor(max_workers=self._max_batch_size, thread_name_prefix="analysis-batch")
+        in_flight: set[Future] = set()
+        try:
+            while True:
+                in_flight = {future for future in in_flight if not future.done()}
+                while pending and len(in_flight) < self._max_batch_size:
+                    delivery_tag, properties, body = pending.pop(0)
+                    in_flight.add(
+                        executor.submit(self._process, connection, channel, delivery_tag, properties, body)
+                    )
+                # Keep the connection serviced; deliveries arrive and acks are sent from here.
+                connection.process_data_events(time_limit=0.05)
+        finally:
+            executor.shutdown(wait=True)
+            if isinstance(self._repository, WriteBehindRepository):
+                self._repository.close()
+            # Send the acks of the last messages.
+            connection.process_data_events(time_limit=0)
+
+    def _process(self, connection, channel, delivery_tag: int, properties, body: bytes) -> None:
+        try:
+            data = json.loads(body.decode("utf-8"))
+            event = TranscriptCreatedEvent(**data)
+        except Exception as exc:
+            # A malformed event fails the same way on every redelivery.
+            connection.add_callback_threadsafe(nack_failed_message(channel, delivery_tag, exc))
+            return
+        record_queue_wait(event.timings, "analysis_queue_wait", properties)
+        try:
+            process_transcript_created_event(
+                event,
+                backend=self._backend,
+                publisher=self._publisher,
+                repository=self._repository,
+                storage_client=self._storage_client,
+                videos_repository=self._videos_repository,
+                tagger=self._tagger,
+                on_done=lambda: connection.add_callback_threadsafe(
+                    functools.partial(channel.basic_ack, delivery_tag=delivery_tag)
+                ),
+            )
+        except Exception as exc:
+            connection.add_callback_threadsafe(
+                nack_failed_message(channel, delivery_tag, exc, TRANSIENT_ANALYSIS_ERRORS)
+            )
@@ -3,6 +3,7 @@ import json
 import pika
 from pydantic import BaseModel
 
+from src.shared.timings import enqueue_properties
 from src.analysis_service.worker import AnalysisCompletedEvent, AnalysisEventPublisher
 
 
@@ -37,12 +38,14 @@ class RabbitMQAnalysisEventPublisher(AnalysisEventPublisher):
 
             channel.queue_declare(queue=self._config.queue_name, durable=True)
 
-            body = json.dumps(event.model_dump()).encode("utf-8")
+            # Tagged utterances are stored with the analysis, not sent on the bus.
+            body = json.dumps(event.model_dump(exclude={"utterances"})).encode("utf-8")
 
             channel.basic_publish(
                 exchange="",
                 routing_key=self._config.queue_name,
                 body=body,
+                properties=enqueue_properties(),
             )
         finally:
             connection.close()
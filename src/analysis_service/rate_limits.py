@@ -0,0 +1,205 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Protocol
+
+from pydantic import BaseModel
+
+
+class BucketSpec(BaseModel):
+    """A token bucket refilling at rate tokens per second up to capacity."""
+
+    name: str
+    rate: float
+    capacity: float
+
+
+class RateLimitStore(Protocol):
+    def try_acquire(self, key: str, requests: list[tuple[BucketSpec, float]], now: float) -> float:
+        """Atomically take amount from every bucket of key, or take nothing.
+
+        Returns 0.0 if the tokens were taken, otherwise the seconds until
+        every bucket would hold enough.
+        """
+        ...
+
+    def adjust(self, key: str, spec: BucketSpec, amount: float, now: float) -> None:
+        """Take amount more (or give back -amount) from a bucket without waiting."""
+        ...
+
+
+def _refill(tokens: float, updated_at: float, spec: BucketSpec, now: float) -> float:
+    return min(spec.capacity, tokens + max(0.0, now - updated_at) * spec.rate)
+
+
+def _wait_seconds(levels: list[float], requests: list[tuple[BucketSpec, float]]) -> float:
+    return max(
+        (amount - tokens) / spec.rate
+        for tokens, (spec, amount) in zip(levels, requests)
+        if tokens < amount
+    )
+
+
+def _check(requests: list[tuple[BucketSpec, float]]) -> None:
+    for spec, amount in requests:
+        if amount > spec.capacity:
+            raise ValueError(f"Cannot take {amount} from bucket {spec.name} of capacity {spec.capacity}")
+
+
+class InMemoryRateLimitStore:
+    """RateLimitStore shared by the threads and event loops of one process."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[tuple[str, str], tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str, requests: list[tuple[BucketSpec, float]], now: float) -> float:
+        _check(requests)
+        with self._lock:
+            levels = [self._level(key, spec, now) for spec, _ in requests]
+            if any(tokens < amount for tokens, (_, amount) in zip(levels, requests)):
+                return _wait_seconds(levels, requests)
+            for tokens, (spec, amount) in zip(levels, requests):
+                self._buckets[(key, spec.name)] = (tokens - amount, now)
+            return 0.0
+
+    def adjust(self, key: str, spec: BucketSpec, amount: float, now: float) -> None:
+        with self._lock:
+            self._buckets[(key, spec.name)] = (self._level(key, spec, now) - amount, now)
+
+    def _level(self, key: str, spec: BucketSpec, now: float) -> float:
+        tokens, updated_at = self._buckets.get((key, spec.name), (spec.capacity, now))
+        return _refill(tokens, updated_at, spec, now)
+
+
+class SQLiteRateLimitStore:
+    """
+    RateLimitStore in a SQLite file, shared by every worker process on a host.
+
+    Each acquisition runs in a BEGIN IMMEDIATE transaction, so concurrent
+    workers serialize on the database lock and never both spend the same
+    tokens. Callers must pass wall-clock time (time.time) as now, since it
+    is compared across processes.
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0) -> None:
+        self._path = path
+        self._timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT NOT NULL, name TEXT NOT NULL, tokens REAL NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (key, name))"
+            )
+
+    def try_acquire(self, key: str, requests: list[tuple[BucketSpec, float]], now: float) -> float:
+        _check(requests)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            levels = [self._level(connection, key, spec, now) for spec, _ in requests]
+            if any(tokens < amount for tokens, (_, amount) in zip(levels, requests)):
+                connection.execute("ROLLBACK")
+                return _wait_seconds(levels, requests)
+            for tokens, (spec, amount) in zip(levels, requests):
+                self._store(connection, key, spec, tokens - amount, now)
+            connection.execute("COMMIT")
+            return 0.0
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def adjust(self, key: str, spec: BucketSpec, amount: float, now: float) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._store(connection, key, spec, self._level(connection, key, spec, now) - amount, now)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _level(connection: sqlite3.Connection, key: str, spec: BucketSpec, now: float) -> float:
+        row = connection.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ? AND name = ?", (key, spec.name)
+        ).fetchone()
+        if row is None:
+            return spec.capacity
+        return _refill(row[0], row[1], spec, now)
+
+    @staticmethod
+    def _store(connection: sqlite3.Connection, key: str, spec: BucketSpec, tokens: float, now: float) -> None:
+        connection.execute(
+            "INSERT INTO rate_limit_buckets (key, name, tokens, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key, name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+            (key, spec.name, tokens, now),
+        )
+
+
+class ProviderRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits of one LLM provider account.
+
+    Both buckets hold up to burst_seconds worth of allowance (a minute's,
+    like most providers, by default) and are kept in a RateLimitStore under
+    key, so every worker using the same store and key draws from the same
+    allowance.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        key: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        burst_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._store = store
+        self._key = key
+        self._requests = BucketSpec(
+            name="requests",
+            rate=requests_per_minute / 60,
+            capacity=max(1.0, requests_per_minute / 60 * burst_seconds),
+        )
+        self._tokens = BucketSpec(
+            name="tokens",
+            rate=tokens_per_minute / 60,
+            capacity=tokens_per_minute / 60 * burst_seconds,
+        )
+        self._clock = clock
+        self._sleep = sleep
+
+    async def acquire(self, tokens: float) -> None:
+        """Wait until one request and the given number of tokens are available.
+
+        Store calls run in a worker thread, since the SQLite store blocks on
+        a lock shared with other processes.
+        """
+        requests = [(self._requests, 1), (self._tokens, min(tokens, self._tokens.capacity))]
+        while True:
+            wait = await asyncio.to_thread(self._store.try_acquire, self._key, requests, self._clock())
+            if wait <= 0:
+                return
+            await self._sleep(wait)
+
+    async def settle(self, estimated_tokens: float, actual_tokens: float) -> None:
+        """Correct the token bucket once a response reports its real usage.
+
+        Both counts are capped at the bucket's capacity, as acquire() capped
+        the estimate, so a refund never gives back tokens that were not taken.
+        """
+        amount = min(actual_tokens, self._tokens.capacity) - min(estimated_tokens, self._tokens.capacity)
+        if amount:
+            await asyncio.to_thread(self._store.adjust, self._key, self._tokens, amount, self._clock())
@@ -0,0 +1,79 @@
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+
+from src.analysis_service.domain import AnalysisBackend, StorageClient, analyze_transcript
+from src.analysis_service.utterance_tagging import UtteranceTagger
+from src.analysis_service.worker import AnalysisRepository, build_completed_event
+from src.transcription_service.domain import (
+    TRANSCRIPT_BUCKET,
+    TranscriptCreatedEvent,
+    video_structured_transcript_key,
+    video_transcript_key,
+)
+
+
+class ReanalysisReport(BaseModel):
+    sessions: int = 0
+    failed: list[str] = []
+    computed_chunks: int = 0
+    reused_chunks: int = 0
+
+
+def transcript_event(video_id: str, bucket: str = TRANSCRIPT_BUCKET, structured: bool = False) -> TranscriptCreatedEvent:
+    """The TranscriptCreatedEvent of a video's stored transcript.
+
+    Keys follow the transcription service's layout. Pass structured=True
+    for videos transcribed by a structured backend, so the event also
+    points at the columnar transcript.
+    """
+    return TranscriptCreatedEvent(
+        video_id=video_id,
+        bucket=bucket,
+        key=video_transcript_key(video_id),
+        structured_key=video_structured_transcript_key(video_id) if structured else None,
+    )
+
+
+def reanalyze_transcripts(
+    events: Iterable[TranscriptCreatedEvent],
+    backend: AnalysisBackend,
+    repository: AnalysisRepository,
+    storage_client: StorageClient,
+    tagger: Optional[UtteranceTagger] = None,
+) -> ReanalysisReport:
+    """Re-run the analysis of already analyzed transcripts, e.g. after a prompt or model change.
+
+    With a ChunkedLLMAnalysisBackend that has a chunk store, only chunks
+    whose fingerprint changed are sent to the LLM; the stored results of
+    the others are merged with the new ones into fresh session results.
+    Results are saved, but no analysis.completed events are published, so
+    a backfill does not re-trigger downstream consumers. A session that
+    fails is reported and skipped.
+
+    Args:
+        events: TranscriptCreatedEvents of the transcripts to re-analyze.
+        backend: The analysis backend to use.
+        repository: The repository the new results are saved to.
+        storage_client: The storage client to download transcripts.
+        tagger: Optional utterance tagger for events with a structured
+            transcript, as in process_transcript_created_event.
+
+    Returns:
+        Counts of sessions and of recomputed and reused chunks.
+    """
+    report = ReanalysisReport()
+    for event in events:
+        try:
+            result = analyze_transcript(event, backend, storage_client)
+            completed_event = build_completed_event(event, result, storage_client, tagger=tagger)
+        except Exception:
+            report.failed.append(event.video_id)
+            continue
+        repository.save_analysis(completed_event)
+        report.sessions += 1
+        # A composite backend keeps each member's counts under the member's name.
+        for extra in [result.extra, *(value for value in result.extra.values() if isinstance(value, dict))]:
+            report.computed_chunks += extra.get("computed_chunks", 0)
+            report.reused_chunks += extra.get("reused_chunks", 0)
+    return report
@@ -1,44 +1,161 @@
 from pathlib import Path
+from typing import Optional
 
 from pymongo import MongoClient
 
-from src.analysis_service.config import load_config
-from src.analysis_service.domain import AnalysisBackend, AnalysisResult, analyze_transcript
+from src.analysis_service.async_llm_client import PROMPT_VERSION, AsyncHTTPLLMClient, BlockingLLMClient
+from src.shared.compressed_storage import CompressingStorageClient, StorageClient
+from src.analysis_service.chunk_results import ChunkResultStore, MongoChunkResultStore
+from src.analysis_service.composite import CompositeAnalysisBackend, CompositeMember
+from src.analysis_service.config import AnalysisServiceConfig, load_config
+from src.analysis_service.domain import AnalysisBackend, analyze_transcript
+from src.analysis_service.llm_backend import ChunkedLLMAnalysisBackend
+from src.analysis_service.llm_cache import CachingLLMClient
 from src.analysis_service.mongo_repository import MongoAnalysisRepository
-from src.analysis_service.rabbitmq_consumer import RabbitMQTranscriptCreatedConsumer
+from src.analysis_service.partials import MongoPartialAnalysisStore
+from src.analysis_service.rabbitmq_consumer import RabbitMQTranscriptBatchConsumer, RabbitMQTranscriptCreatedConsumer
 from src.analysis_service.rabbitmq_publisher import RabbitMQAnalysisEventPublisher
+from src.analysis_service.rate_limits import ProviderRateLimiter, SQLiteRateLimitStore
+from src.analysis_service.streaming import AnalyzerPipelineBackend, KeywordHitsAnalyzer, SpeakerStatsAnalyzer
+from src.analysis_service.utterance_tagging import UtteranceTagger
+from src.analysis_service.write_behind import WriteBehindAnalysisRepository
 from src.analysis_service.worker import (
     AnalysisEventPublisher,
     AnalysisRepository,
     AnalysisCompletedEvent,
 )
+from src.shared.videos_repository import MongoVideosRepository
 from src.transcription_service.domain import TranscriptCreatedEvent
 
 
-class SimpleWordCountBackend(AnalysisBackend):
-    def analyze(self, transcript_text: str) -> AnalysisResult:
-        words = transcript_text.split()
-        return AnalysisResult(
-            video_id="",
-            word_count=len(words),
-            extra={"backend": "simple-word-count"},
-        )
+class StubStorageClient:
+    """Stub storage client."""
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return b"stub transcript"
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        print(f"Uploaded {len(content)} bytes to {bucket}/{key}")
+
+
+def build_storage_client(inner: StorageClient) -> CompressingStorageClient:
+    """Read transcripts through a decompressing client.
+
+    The transcription worker may store transcripts, partials and columnar
+    transcripts compressed (ARTIFACT_COMPRESSION); uncompressed objects read
+    back unchanged. Nothing is compressed on upload.
+    """
+    return CompressingStorageClient(inner, codec="none")
+
+
+class SimpleWordCountBackend(AnalyzerPipelineBackend):
+    def __init__(self) -> None:
+        super().__init__(extra={"backend": "simple-word-count"})
+
+
+def build_stats_backend(config: AnalysisServiceConfig) -> AnalysisBackend:
+    """Cheap local statistics, computed in one streaming pass."""
+    keywords = list(config.keywords)
+    return AnalyzerPipelineBackend(
+        [SpeakerStatsAnalyzer, lambda: KeywordHitsAnalyzer(keywords)],
+        extra={"backend": "stats"},
+    )
+
+
+def build_llm_client(config: AnalysisServiceConfig) -> BlockingLLMClient:
+    """The provider client shared by the LLM analysis backend and the utterance tagger."""
+    llm = config.llm
+    # Every worker on the host draws from the same provider allowance.
+    limiter = ProviderRateLimiter(
+        SQLiteRateLimitStore(config.llm_rate_limit_db),
+        key=f"{llm.base_url}:{llm.model}",
+        requests_per_minute=llm.requests_per_minute,
+        tokens_per_minute=llm.tokens_per_minute,
+    )
+    return BlockingLLMClient(lambda: AsyncHTTPLLMClient(llm, limiter=limiter))
+
+
+def build_backend(
+    config: AnalysisServiceConfig,
+    chunk_store: Optional[ChunkResultStore] = None,
+    client: Optional[BlockingLLMClient] = None,
+) -> AnalysisBackend:
+    if config.llm is None:
+        return SimpleWordCountBackend()
+
+    llm = config.llm
+    if client is None:
+        client = build_llm_client(config)
+
+    shared_cache = None
+    if config.redis_url:
+        import redis  # optional dependency, only needed with REDIS_URL
+
+        shared_cache = redis.Redis.from_url(config.redis_url)
+    cached = CachingLLMClient(client, model=llm.model, prompt_version=PROMPT_VERSION, shared=shared_cache)
+    # In batch mode the chunks of every session in the batch share this pool.
+    llm_backend = ChunkedLLMAnalysisBackend(
+        cached,
+        max_concurrency=config.llm_max_concurrency,
+        chunk_store=chunk_store,
+        prompt_version=PROMPT_VERSION,
+        model=llm.model,
+    )
+    # Each member may analyze every session of a batch at the same time, on its own pool.
+    sessions = config.batch_size or 1
+    return CompositeAnalysisBackend([
+        CompositeMember("stats", build_stats_backend(config), max_concurrent=sessions),
+        CompositeMember("llm", llm_backend, timeout_seconds=config.llm_timeout_seconds, max_concurrent=sessions),
+    ])
+
 
 def main() -> None:
     config = load_config()
 
     client = MongoClient(config.mongo_uri)
-    repository = MongoAnalysisRepository(client, db_name=config.mongo_db_name)
+    if config.write_behind_batch_size:
+        repository = WriteBehindAnalysisRepository(
+            client,
+            db_name=config.mongo_db_name,
+            max_batch_size=config.write_behind_batch_size,
+            flush_interval_seconds=config.write_behind_flush_seconds,
+        ).start()
+        videos_repository = repository
+    else:
+        repository = MongoAnalysisRepository(client, db_name=config.mongo_db_name)
+        videos_repository = MongoVideosRepository(client, db_name=config.mongo_db_name)
 
-    backend = SimpleWordCountBackend()
+    llm_client = build_llm_client(config) if config.llm is not None else None
+    backend = build_backend(
+        config, chunk_store=MongoChunkResultStore(client, db_name=config.mongo_db_name), client=llm_client
+    )
+    tagger = None
+    if config.tag_utterances and llm_client is not None:
+        tagger = UtteranceTagger(llm_client, max_concurrency=config.llm_max_concurrency)
     publisher = RabbitMQAnalysisEventPublisher(config.publisher)
+    storage_client = build_storage_client(StubStorageClient())
 
-    consumer = RabbitMQTranscriptCreatedConsumer(
-        config=config.consumer,
-        backend=backend,
-        publisher=publisher,
-        repository=repository,
-    )
+    if config.batch_size:
+        consumer = RabbitMQTranscriptBatchConsumer(
+            config=config.consumer,
+            backend=backend,
+            publisher=publisher,
+            repository=repository,
+            storage_client=storage_client,
+            videos_repository=videos_repository,
+            max_batch_size=config.batch_size,
+            tagger=tagger,
+        )
+    else:
+        consumer = RabbitMQTranscriptCreatedConsumer(
+            config=config.consumer,
+            backend=backend,
+            publisher=publisher,
+            repository=repository,
+            storage_client=storage_client,
+            videos_repository=videos_repository,
+            partial_store=MongoPartialAnalysisStore(client, db_name=config.mongo_db_name),
+            tagger=tagger,
+        )
 
     consumer.run_forever()
 
@@ -0,0 +1,181 @@
+"""Single-pass analysis of transcript byte streams.
+
+Transcript bytes are decoded incrementally and split into words as they
+arrive; every StreamingAnalyzer of a pipeline sees each word once, in
+order, together with whether it starts a line. Nothing but the current
+chunk, one partial word and each analyzer's own state is held, so memory
+does not grow with the transcript.
+"""
+import codecs
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from src.analysis_service.domain import AnalysisResult, StreamingAnalysisBackend
+
+
+_TOKEN = re.compile(r"(\n)|(\S+)")
+_TRAILING_WORD = re.compile(r"\S+\Z")
+_KEYWORD_STRIP = ".,!?;:\"'()[]"
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode byte chunks incrementally; multi-byte characters may span chunks."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_words(text_chunks: Iterable[str]) -> Iterator[tuple[str, bool]]:
+    """Yield (word, starts_line) for the whitespace-separated words of a text stream.
+
+    Words are the items str.split() would return for the whole text, even
+    when a word is split across chunks.
+    """
+    carry = ""
+    line_start = True
+    for chunk in text_chunks:
+        data = carry + chunk
+        trailing = _TRAILING_WORD.search(data)
+        if trailing is not None:
+            carry, data = trailing.group(), data[:trailing.start()]
+        else:
+            carry = ""
+        for match in _TOKEN.finditer(data):
+            if match.group(1):
+                line_start = True
+            else:
+                yield match.group(2), line_start
+                line_start = False
+    if carry:
+        yield carry, line_start
+
+
+class StreamingAnalyzer(ABC):
+    """One analysis fed word by word; create a fresh instance per transcript."""
+
+    @abstractmethod
+    def feed(self, word: str, line_start: bool) -> None:
+        """Consume the next word of the transcript."""
+        ...
+
+    @abstractmethod
+    def finish(self) -> dict[str, Any]:
+        """Return this analyzer's entries for the result's extra."""
+        ...
+
+
+class WordCountAnalyzer(StreamingAnalyzer):
+    def __init__(self) -> None:
+        self.word_count = 0
+
+    def feed(self, word: str, line_start: bool) -> None:
+        self.word_count += 1
+
+    def finish(self) -> dict[str, Any]:
+        return {"word_count": self.word_count}
+
+
+class SpeakerStatsAnalyzer(StreamingAnalyzer):
+    """
+    Turns and words per speaker for transcripts with "<label>: text" lines.
+
+    A line whose first word ends with ':' starts a turn of that speaker;
+    the words that follow, up to the next turn, are counted for it. Words
+    before the first label are not attributed to anyone.
+    """
+
+    def __init__(self, max_label_length: int = 32) -> None:
+        self._max_label_length = max_label_length
+        self._current: Optional[str] = None
+        self._speakers: dict[str, dict[str, int]] = {}
+
+    def feed(self, word: str, line_start: bool) -> None:
+        if line_start and word.endswith(":") and 1 < len(word) <= self._max_label_length + 1:
+            self._current = word[:-1]
+            self._speakers.setdefault(self._current, {"turns": 0, "words": 0})["turns"] += 1
+        elif self._current is not None:
+            self._speakers[self._current]["words"] += 1
+
+    def finish(self) -> dict[str, Any]:
+        return {"speakers": self._speakers}
+
+
+class KeywordHitsAnalyzer(StreamingAnalyzer):
+    """Case-insensitive counts of single-word keywords, ignoring surrounding punctuation."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self._hits = {keyword.lower(): 0 for keyword in keywords}
+
+    def feed(self, word: str, line_start: bool) -> None:
+        word = word.strip(_KEYWORD_STRIP).lower()
+        if word in self._hits:
+            self._hits[word] += 1
+
+    def finish(self) -> dict[str, Any]:
+        return {"keyword_hits": {keyword: hits for keyword, hits in self._hits.items() if hits}}
+
+
+def run_analyzers(chunks: Iterable[bytes], analyzers: Sequence[StreamingAnalyzer]) -> dict[str, Any]:
+    """Feed one pass over the transcript bytes to every analyzer and collect their entries."""
+    feeds = [analyzer.feed for analyzer in analyzers]
+    for word, line_start in iter_words(iter_text(chunks)):
+        for feed in feeds:
+            feed(word, line_start)
+    extra: dict[str, Any] = {}
+    for analyzer in analyzers:
+        extra.update(analyzer.finish())
+    return extra
+
+
+class AnalyzerPipelineBackend(StreamingAnalysisBackend):
+    """
+    StreamingAnalysisBackend running a fresh set of analyzers over each transcript.
+
+    Args:
+        analyzer_factories: Callables returning new analyzers, one per
+            analysis; a WordCountAnalyzer is always added for word_count.
+        extra: Constant entries added to every result's extra.
+    """
+
+    def __init__(
+        self,
+        analyzer_factories: Sequence[Callable[[], StreamingAnalyzer]] = (),
+        extra: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self._analyzer_factories = list(analyzer_factories)
+        self._extra = dict(extra or {})
+
+    def analyze_stream(self, chunks: Iterable[bytes]) -> AnalysisResult:
+        word_count = WordCountAnalyzer()
+        analyzers = [word_count] + [factory() for factory in self._analyzer_factories]
+        extra = run_analyzers(chunks, analyzers)
+        extra.pop("word_count")
+        return AnalysisResult(video_id="", word_count=word_count.word_count, extra={**self._extra, **extra})
+
+    def merge_results(self, results: list[AnalysisResult]) -> AnalysisResult:
+        """Add up the analyzer entries of consecutive segments (they are all counts)."""
+        extra: dict[str, Any] = {}
+        for result in results:
+            for key, value in result.extra.items():
+                if key not in self._extra:
+                    extra[key] = _add_counts(extra.get(key), value)
+        return AnalysisResult(
+            video_id="",
+            word_count=sum(result.word_count for result in results),
+            extra={**self._extra, **extra},
+        )
+
+
+def _add_counts(total: Any, value: Any) -> Any:
+    if isinstance(value, dict):
+        merged = dict(total or {})
+        for key, item in value.items():
+            merged[key] = _add_counts(merged.get(key), item)
+        return merged
+    return (total or 0) + value
@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+
+from src.analysis_service.async_llm_client import LLM_CALL_ERRORS
+from src.analysis_service.llm_client import JSONCompletionClient
+from src.shared.transcript_format import StructuredTranscript
+
+
+TAGGING_PROMPT_VERSION = "utterance-tags-v1"
+EMOTIONS = ("neutral", "happy", "hopeful", "sad", "anxious", "angry", "frustrated", "ashamed")
+TAGGING_SYSTEM_PROMPT = (
+    "You tag utterances from a therapy session. Each input line is '[<index>] <utterance>'. "
+    'Reply with a JSON object {"items": [{"index": <index>, "topic": <short snake_case topic>, '
+    '"emotion": <one of ' + ", ".join(EMOTIONS) + ">}]} with exactly one item per input index."
+)
+
+
+class UtteranceTag(BaseModel):
+    index: int
+    topic: str
+    emotion: str
+
+
+class TaggingStats(BaseModel):
+    utterances: int
+    calls: int
+    failed_calls: int
+    reasked: int
+    untagged: int
+
+
+def build_batch_prompt(utterances: dict[int, str]) -> str:
+    """Number each utterance with its index, one per line."""
+    return "\n".join(f"[{index}] {' '.join(text.split())}" for index, text in utterances.items())
+
+
+def parse_batch_response(response: Any, expected: set[int]) -> dict[int, UtteranceTag]:
+    """
+    Return the valid tags of a batch response, keyed by utterance index.
+
+    An item is valid if its index is one of the expected indices and is
+    reported only once, its topic is a non-empty string and its emotion is
+    one of EMOTIONS. Anything else is dropped, so its index counts as
+    missing and can be asked for again.
+    """
+    items = response.get("items") if isinstance(response, dict) else response
+    if not isinstance(items, list):
+        return {}
+
+    tags: dict[int, UtteranceTag] = {}
+    seen: set[int] = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index, topic, emotion = item.get("index"), item.get("topic"), item.get("emotion")
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if not isinstance(index, int) or isinstance(index, bool) or index not in expected:
+            continue
+        if index in seen:
+            # Conflicting answers for one utterance: trust neither.
+            tags.pop(index, None)
+            continue
+        seen.add(index)
+        if not isinstance(topic, str) or not topic.strip():
+            continue
+        if not isinstance(emotion, str) or emotion.strip().lower() not in EMOTIONS:
+            continue
+        tags[index] = UtteranceTag(index=index, topic=topic.strip().lower(), emotion=emotion.strip().lower())
+    return tags
+
+
+class UtteranceTagger:
+    """
+    Tags utterances with a topic and an emotion, many utterances per LLM call.
+
+    Utterances are packed batch_size at a time into one indexed prompt and
+    the reply is checked against the indices that were sent. Indices that
+    are missing or invalid in a reply are collected and asked for again, in
+    batches of their own, for up to max_reasks further rounds; whatever is
+    still missing after that is left untagged (None). A call that fails
+    (an unparseable reply, a rejected or timed out request) leaves its whole
+    batch missing in the same way and is counted in failed_calls. Batches
+    of a round run concurrently, up to max_concurrency at a time.
+
+    Args:
+        client: Client that runs a prompt and returns its JSON reply.
+        batch_size: Utterances per call.
+        max_reasks: Extra rounds for missing or invalid items.
+        max_concurrency: Calls in flight at once.
+    """
+
+    def __init__(
+        self,
+        client: JSONCompletionClient,
+        batch_size: int = 40,
+        max_reasks: int = 2,
+        max_concurrency: int = 4,
+    ) -> None:
+        self._client = client
+        self._batch_size = batch_size
+        self._max_reasks = max_reasks
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="utterance-tagger")
+        self._stats = {name: 0 for name in TaggingStats.model_fields}
+        self._lock = threading.Lock()
+
+    def tag(self, utterances: Sequence[str]) -> list[Optional[UtteranceTag]]:
+        """Tag every utterance; the result is aligned with the input."""
+        tags: dict[int, UtteranceTag] = {}
+        pending = [index for index, text in enumerate(utterances) if text.strip()]
+        calls = 0
+        failed_calls = 0
+        reasked = 0
+        for round_number in range(self._max_reasks + 1):
+            if not pending:
+                break
+            if round_number > 0:
+                reasked += len(pending)
+            batches = [pending[start:start + self._batch_size] for start in range(0, len(pending), self._batch_size)]
+            replies = self._executor.map(
+                lambda batch: self._ask({index: utterances[index] for index in batch}),
+                batches,
+            )
+            for batch, reply in zip(batches, replies):
+                calls += 1
+                if reply is None:
+                    failed_calls += 1
+                    continue
+                tags.update(parse_batch_response(reply, set(batch)))
+            pending = [index for index in pending if index not in tags]
+
+        with self._lock:
+            self._stats["utterances"] += len(utterances)
+            self._stats["calls"] += calls
+            self._stats["failed_calls"] += failed_calls
+            self._stats["reasked"] += reasked
+            self._stats["untagged"] += len(utterances) - len(tags)
+        return [tags.get(index) for index in range(len(utterances))]
+
+    def stats(self) -> TaggingStats:
+        with self._lock:
+            return TaggingStats(**self._stats)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _ask(self, batch: dict[int, str]) -> Any:
+        try:
+            return self._client.complete_json(TAGGING_SYSTEM_PROMPT, build_batch_prompt(batch))
+        except LLM_CALL_ERRORS:
+            # A failed call leaves the whole batch missing for the next round.
+            return None
+
+
+def tag_transcript(transcript: StructuredTranscript, tagger: UtteranceTagger) -> list[dict]:
+    """Return the transcript's utterances as records with topic and emotion tags."""
+    tags = tagger.tag(transcript.text)
+    return [
+        {
+            "speaker_label": transcript.speaker[index] if index < len(transcript.speaker) else "",
+            "start_time": transcript.start[index] if index < len(transcript.start) else None,
+            "end_time": transcript.end[index] if index < len(transcript.end) else None,
+            "text": text,
+            "topic": tag.topic if tag is not None else None,
+            "emotion": tag.emotion if tag is not None else None,
+        }
+        for index, (text, tag) in enumerate(zip(transcript.text, tags))
+    ]
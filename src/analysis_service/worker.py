@@ -1,15 +1,33 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Optional, Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
-from src.transcription_service.domain import TranscriptCreatedEvent
-from src.analysis_service.domain import AnalysisBackend, analyze_transcript, StorageClient
+from src.shared.timings import timed
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
+from src.analysis_service.domain import (
+    AnalysisBackend,
+    AnalysisResult,
+    analyze_transcript,
+    load_structured_transcript,
+    StorageClient,
+)
+from src.analysis_service.metrics import assign_roles, compute_metrics, encode_utterances
+from src.analysis_service.partials import (
+    PartialAnalysisStore,
+    analyze_partial_transcript,
+    merge_partial_results,
+)
+from src.analysis_service.utterance_tagging import UtteranceTagger, tag_transcript
 
 
 class AnalysisCompletedEvent(BaseModel):
     video_id: str
     word_count: int
     extra: dict = {}
+    timings: dict[str, float] = {}
+    utterances: list[dict] = []
+    metrics: dict = {}
 
 
 class AnalysisEventPublisher(ABC):
@@ -26,12 +44,42 @@ class AnalysisRepository(ABC):
         ...
 
 
+class VideoTimingsRepository(Protocol):
+    def record_timings(self, video_id: str, timings: dict[str, float]) -> None:
+        """Merge step timings into the video's document."""
+        ...
+
+
+@runtime_checkable
+class AnalyzedVideosRepository(Protocol):
+    def mark_analyzed(self, video_id: str, word_count: Optional[int] = None) -> None:
+        """Set the video's status to analyzed (and its word count)."""
+        ...
+
+
+@runtime_checkable
+class WriteBehindRepository(Protocol):
+    """Repository that stores writes later, in batches (see WriteBehindAnalysisRepository)."""
+
+    def when_durable(self, callback: Callable[[], None]) -> None:
+        """Run callback once every write made so far is stored."""
+        ...
+
+    def close(self) -> bool:
+        """Store everything still buffered."""
+        ...
+
+
 def process_transcript_created_event(
     event: TranscriptCreatedEvent,
     backend: AnalysisBackend,
     publisher: AnalysisEventPublisher,
     repository: AnalysisRepository,
     storage_client: StorageClient,
+    videos_repository: Optional[VideoTimingsRepository] = None,
+    partial_store: Optional[PartialAnalysisStore] = None,
+    tagger: Optional[UtteranceTagger] = None,
+    on_done: Optional[Callable[[], None]] = None,
 ) -> AnalysisCompletedEvent:
     """Process a TranscriptCreatedEvent and publish an AnalysisCompletedEvent.
 
@@ -41,16 +89,98 @@ def process_transcript_created_event(
         publisher: The event publisher to use.
         repository: The repository to save the analysis to.
         storage_client: The storage client to download the transcript.
+        videos_repository: Optional repository to record the per-step timings
+            of the whole pipeline on the video's document; if it has
+            mark_analyzed, the video is also marked as analyzed.
+        partial_store: Optional store of segment analyses made from
+            transcript.partial events. When every segment has been analyzed
+            and the backend can merge them (MergeableAnalysisBackend), they
+            are merged instead of analyzing the full transcript again.
+        tagger: Optional utterance tagger (see build_completed_event).
+        on_done: Optional callback run once the analysis is stored and
+            published, e.g. to ack the message. Not run if publishing fails.
+
+    With a WriteBehindRepository, the event is published (and on_done run)
+    only once the writes are stored, on whichever thread flushes them, so
+    no consumer of analysis.completed reads a result that is not there yet.
 
     Returns:
         The AnalysisCompletedEvent that was published and saved.
     """
-    analysis_result = analyze_transcript(event, backend, storage_client)
-    completed_event = AnalysisCompletedEvent(
+    analysis_result = None
+    if partial_store is not None:
+        analysis_result = merge_partial_results(event, partial_store, backend)
+    if analysis_result is None:
+        analysis_result = analyze_transcript(event, backend, storage_client)
+    completed_event = build_completed_event(event, analysis_result, storage_client, tagger=tagger)
+    repository.save_analysis(completed_event)
+    if videos_repository is not None:
+        videos_repository.record_timings(completed_event.video_id, completed_event.timings)
+        if isinstance(videos_repository, AnalyzedVideosRepository):
+            videos_repository.mark_analyzed(completed_event.video_id, word_count=completed_event.word_count)
+
+    def publish() -> None:
+        publisher.publish_analysis_completed(completed_event)
+        if on_done is not None:
+            on_done()
+
+    if isinstance(repository, WriteBehindRepository):
+        repository.when_durable(publish)
+    else:
+        publish()
+    if partial_store is not None:
+        partial_store.clear(event.video_id)
+    return completed_event
+
+
+def build_completed_event(
+    event: TranscriptCreatedEvent,
+    analysis_result: AnalysisResult,
+    storage_client: StorageClient,
+    tagger: Optional[UtteranceTagger] = None,
+) -> AnalysisCompletedEvent:
+    """Build the AnalysisCompletedEvent of an analyzed transcript.
+
+    With a tagger and a structured transcript, its utterances are tagged
+    with a topic and an emotion, given a therapist or patient role
+    (assign_roles) and kept as the event's utterances; the session metrics
+    computed from them are kept as its metrics, with the emotion timeline
+    and topic histogram added to extra.
+    """
+    timings = dict(analysis_result.timings)
+    extra = analysis_result.extra
+    utterances: list[dict] = []
+    metrics: dict = {}
+    if tagger is not None and event.structured_key is not None:
+        with timed(timings, "analysis_tag"):
+            utterances = tag_transcript(load_structured_transcript(event, storage_client), tagger)
+        if utterances:
+            utterances = assign_roles(utterances)
+            document = compute_metrics(encode_utterances(utterances)).to_document()
+            metrics = document["metrics"]
+            extra = {**extra, **document["extra"]}
+    return AnalysisCompletedEvent(
         video_id=analysis_result.video_id,
         word_count=analysis_result.word_count,
-        extra=analysis_result.extra,
+        extra=extra,
+        timings=timings,
+        utterances=utterances,
+        metrics=metrics,
     )
-    repository.save_analysis(completed_event)
-    publisher.publish_analysis_completed(completed_event)
-    return completed_event
+
+
+def process_transcript_partial_event(
+    event: TranscriptPartialEvent,
+    backend: AnalysisBackend,
+    storage_client: StorageClient,
+    partial_store: PartialAnalysisStore,
+) -> None:
+    """Analyze one transcript segment ahead of the final TranscriptCreatedEvent.
+
+    Args:
+        event: The TranscriptPartialEvent to process.
+        backend: The analysis backend to use.
+        storage_client: The storage client to download the segment.
+        partial_store: Where the segment analysis is kept for the final merge.
+    """
+    analyze_partial_transcript(event, backend, storage_client, partial_store)
@@ -0,0 +1,242 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+from pymongo import UpdateOne
+
+from src.analysis_service.worker import AnalysisCompletedEvent, AnalysisRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindStats(BaseModel):
+    pending_writes: int
+    flushes: int
+    failed_flushes: int
+    failed_callbacks: int
+    flushed_analyses: int
+    flushed_video_updates: int
+    last_error: Optional[str]
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.analyses: dict[str, dict[str, Any]] = {}
+        self.videos: dict[str, dict[str, Any]] = {}
+        self.callbacks: list[Callable[[], None]] = []
+        self.started_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.analyses) + len(self.videos)
+
+    def absorb_older(self, older: "_Batch") -> None:
+        """Put the writes of an older batch underneath this one's."""
+        for video_id, document in older.analyses.items():
+            self.analyses.setdefault(video_id, document)
+        for video_id, fields in older.videos.items():
+            self.videos[video_id] = {**fields, **self.videos.get(video_id, {})}
+        self.callbacks[:0] = older.callbacks
+        if older.started_at is not None:
+            self.started_at = older.started_at if self.started_at is None else min(self.started_at, older.started_at)
+
+
+class WriteBehindAnalysisRepository(AnalysisRepository):
+    """
+    Buffers analysis results and video updates and writes them in bulk.
+
+    save_analysis, record_timings and mark_analyzed only update an in-memory
+    batch; writes to the same video are coalesced. The batch is written
+    with one unordered bulk_write per collection once it holds
+    max_batch_size writes (on the calling thread) or once its oldest write
+    is flush_interval_seconds old (on a background thread), and on close().
+
+    when_durable(callback) runs callback once every write buffered so far
+    has been written, which is when a worker may publish the results and
+    ack the messages that caused them; a callback that raises is logged
+    and counted without stopping the others. A failed flush keeps its writes and callbacks buffered and
+    retries them with the next flush, so nothing is acked before it is
+    stored; if the process dies instead, the unacked messages are
+    redelivered.
+
+    Args:
+        client: A MongoDB client (or mongomock client for testing).
+        db_name: The database name to use.
+        max_batch_size: Buffered writes that trigger a flush.
+        flush_interval_seconds: Longest time a write stays buffered.
+        write_concern: Optional pymongo WriteConcern for the bulk writes,
+            e.g. WriteConcern(w="majority", j=True).
+        clock: Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        client,
+        db_name: str = "therapy_analysis",
+        max_batch_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        write_concern=None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        database = client[db_name]
+        self._analysis_results = database["analysis_results"]
+        self._videos = database["videos"]
+        if write_concern is not None:
+            self._analysis_results = self._analysis_results.with_options(write_concern=write_concern)
+            self._videos = self._videos.with_options(write_concern=write_concern)
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval_seconds
+        self._clock = clock
+        self._batch = _Batch()
+        self._in_flight: Optional[_Batch] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {
+            "flushes": 0,
+            "failed_flushes": 0,
+            "failed_callbacks": 0,
+            "flushed_analyses": 0,
+            "flushed_video_updates": 0,
+        }
+        self._last_error: Optional[str] = None
+
+    def start(self) -> "WriteBehindAnalysisRepository":
+        """Start the background thread that flushes by interval."""
+        self._thread = threading.Thread(target=self._run, name="analysis-write-behind", daemon=True)
+        self._thread.start()
+        return self
+
+    def save_analysis(self, event: AnalysisCompletedEvent) -> None:
+        document = {
+            "video_id": event.video_id,
+            "word_count": event.word_count,
+            "extra": event.extra,
+            "timings": event.timings,
+        }
+        if event.utterances:
+            document["utterances"] = event.utterances
+        if event.metrics:
+            document["metrics"] = event.metrics
+        self._buffer(lambda batch: batch.analyses.__setitem__(event.video_id, document))
+
+    def record_timings(self, video_id: str, timings: dict[str, float]) -> None:
+        """Buffer a merge of per-step timings into the video's document."""
+        if not timings:
+            return
+        fields = {f"timings.{name}": seconds for name, seconds in timings.items()}
+        self._buffer(lambda batch: batch.videos.setdefault(video_id, {}).update(fields))
+
+    def mark_analyzed(self, video_id: str, word_count: Optional[int] = None) -> None:
+        """Buffer setting the video's status to analyzed (and its word count).
+
+        Unlike MongoVideosRepository.mark_analyzed, a missing video document
+        is created rather than reported, since the write happens later in bulk.
+        """
+        fields: dict[str, Any] = {"status": "analyzed"}
+        if word_count is not None:
+            fields["word_count"] = word_count
+        self._buffer(lambda batch: batch.videos.setdefault(video_id, {}).update(fields))
+
+    def when_durable(self, callback: Callable[[], None]) -> None:
+        """Run callback once every write buffered so far is stored (now, if none is pending)."""
+        with self._lock:
+            if len(self._batch):
+                self._batch.callbacks.append(callback)
+                return
+            if self._in_flight is not None:
+                self._in_flight.callbacks.append(callback)
+                return
+        callback()
+
+    def flush(self) -> bool:
+        """Write the buffered batch now; returns False if the write failed and was kept for a retry."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._batch = self._batch, _Batch()
+                self._in_flight = batch
+            try:
+                self._write(batch)
+            except Exception as exc:
+                with self._lock:
+                    self._in_flight = None
+                    self._batch.absorb_older(batch)
+                    self._counters["failed_flushes"] += 1
+                    self._last_error = f"{type(exc).__name__}: {exc}"
+                return False
+            with self._lock:
+                self._in_flight = None
+                if len(batch):
+                    self._counters["flushes"] += 1
+                    self._counters["flushed_analyses"] += len(batch.analyses)
+                    self._counters["flushed_video_updates"] += len(batch.videos)
+                callbacks = list(batch.callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                # E.g. a publish that failed; its message stays unacked and is redelivered.
+                logger.exception("Write-behind callback failed")
+                with self._lock:
+                    self._counters["failed_callbacks"] += 1
+                    self._last_error = f"{type(exc).__name__}: {exc}"
+        return True
+
+    def close(self) -> bool:
+        """Stop the background thread and flush what is left; returns whether that flush succeeded."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.flush()
+
+    def stats(self) -> WriteBehindStats:
+        with self._lock:
+            return WriteBehindStats(pending_writes=len(self._batch), last_error=self._last_error, **self._counters)
+
+    def _buffer(self, update: Callable[[_Batch], None]) -> None:
+        with self._lock:
+            update(self._batch)
+            if self._batch.started_at is None:
+                self._batch.started_at = self._clock()
+                self._wake.set()
+            full = len(self._batch) >= self._max_batch_size
+        if full:
+            self.flush()
+
+    def _write(self, batch: _Batch) -> None:
+        if batch.analyses:
+            self._analysis_results.bulk_write(
+                [
+                    UpdateOne({"video_id": video_id}, {"$set": document}, upsert=True)
+                    for video_id, document in batch.analyses.items()
+                ],
+                ordered=False,
+            )
+        if batch.videos:
+            self._videos.bulk_write(
+                [
+                    UpdateOne({"video_id": video_id}, {"$set": fields}, upsert=True)
+                    for video_id, fields in batch.videos.items()
+                ],
+                ordered=False,
+            )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                started_at = self._batch.started_at
+            if started_at is None:
+                timeout = self._flush_interval
+            else:
+                timeout = max(0.0, started_at + self._flush_interval - self._clock())
+            if self._wake.wait(timeout):
+                self._wake.clear()
+                continue
+            if started_at is not None and not self.flush():
+                # Back off before retrying a failed write.
+                self._stopped.wait(self._flush_interval)
@@ -1,13 +1,23 @@
+from typing import Optional
+
 from fastapi import FastAPI
 
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline
+
 
-def create_app() -> FastAPI:
+def create_app(pipeline: Optional[AudioExtractionPipeline] = None) -> FastAPI:
     app = FastAPI(title="Audio Extractor Service")
 
     @app.get("/health")
     def health_check():
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def metrics():
+        if pipeline is None:
+            return {"stages": {}}
+        return {"stages": {name: stats.model_dump() for name, stats in pipeline.stats().items()}}
+
     return app
 
 
@@ -1,16 +1,21 @@
 import os
 from pathlib import Path
+from typing import Optional
 
 from pydantic import BaseModel
 
 from src.audio_extractor_service.rabbitmq_consumer import RabbitMQConsumerConfig
 from src.audio_extractor_service.rabbitmq_publisher import RabbitMQConfig as RabbitMQPublisherConfig
+from src.audio_extractor_service.pipeline import PipelineConfig
+from src.audio_extractor_service.spill import SpillConfig
 
 
 class AudioExtractorConfig(BaseModel):
     consumer: RabbitMQConsumerConfig
     publisher: RabbitMQPublisherConfig
     base_output_dir: Path
+    spill: Optional[SpillConfig] = None
+    pipeline: Optional[PipelineConfig] = None
 
 
 def load_config() -> AudioExtractorConfig:
@@ -25,6 +30,15 @@ def load_config() -> AudioExtractorConfig:
     base_output_dir_str = os.getenv("AUDIO_OUTPUT_BASE_DIR", "/app/data/audio")
     base_output_dir = Path(base_output_dir_str)
 
+    spill_cfg = None
+    spill_threshold_str = os.getenv("AUDIO_SPILL_THRESHOLD_BYTES")
+    if spill_threshold_str:
+        spill_dir_str = os.getenv("AUDIO_SPILL_DIR")
+        spill_cfg = SpillConfig(
+            threshold_bytes=int(spill_threshold_str),
+            temp_dir=Path(spill_dir_str) if spill_dir_str else None,
+        )
+
     consumer_cfg = RabbitMQConsumerConfig(
         host=host,
         port=port,
@@ -41,8 +55,19 @@ def load_config() -> AudioExtractorConfig:
         queue_name=audio_extracted_queue,
     )
 
+    pipeline_cfg = None
+    if os.getenv("AUDIO_PIPELINE_ENABLED", "").lower() in ("1", "true", "yes"):
+        queue_size = int(os.getenv("AUDIO_PIPELINE_QUEUE_SIZE", "2"))
+        pipeline_cfg = PipelineConfig(
+            download_queue_size=queue_size,
+            convert_queue_size=queue_size,
+            upload_queue_size=queue_size,
+        )
+
     return AudioExtractorConfig(
         consumer=consumer_cfg,
         publisher=publisher_cfg,
         base_output_dir=base_output_dir,
+        spill=spill_cfg,
+        pipeline=pipeline_cfg,
     )
@@ -1,8 +1,19 @@
-from typing import Protocol
+from typing import Optional, Protocol
 
 from pydantic import BaseModel
 
+from src.shared.timings import timed
 from src.upload_service.domain import VideoUploadedEvent
+from src.audio_extractor_service.sniff import PROBE_BYTES, sniff_audio_format
+from src.audio_extractor_service.spill import SpillConfig, convert_via_disk, should_spill
+
+
+AUDIO_BUCKET = "therapy-audio"
+
+
+def build_audio_key(video_id: str, extension: str = "mp3") -> str:
+    """Return the storage key of the extracted audio for a video."""
+    return f"audio/{video_id}/audio.{extension}"
 
 
 class StorageClient(Protocol):
@@ -29,6 +40,7 @@ class AudioExtractedEvent(BaseModel):
     video_id: str
     bucket: str
     key: str
+    timings: dict[str, float] = {}
 
 
 class AudioEventPublisher(Protocol):
@@ -43,34 +55,70 @@ def extract_audio_from_video_event(
     event: VideoUploadedEvent,
     storage_client: StorageClient,
     audio_converter: AudioConverter,
+    spill_config: Optional[SpillConfig] = None,
 ) -> AudioExtractedEvent:
     """
     Extract audio from a video in MinIO storage.
     
+    Uploads that are already audio (see sniff_audio_format) are copied to
+    the audio bucket as-is instead of being converted.
+    
     Args:
         event: VideoUploadedEvent with bucket/key of the video file.
         storage_client: Client to download from/upload to storage.
         audio_converter: Converter to extract audio from video bytes.
+        spill_config: If set and the storage client supports streaming, videos
+            at or above the threshold are processed through temp files.
         
     Returns:
-        AudioExtractedEvent with bucket/key of the extracted MP3.
+        AudioExtractedEvent with bucket/key of the extracted audio.
         
     Raises:
         ValueError: If video bytes are empty.
     """
-    video_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
+    timings = dict(event.timings)
+
+    if should_spill(storage_client, event.bucket, event.key, spill_config):
+        audio_key = convert_via_disk(
+            storage_client=storage_client,
+            audio_converter=audio_converter,
+            source_bucket=event.bucket,
+            source_key=event.key,
+            target_bucket=AUDIO_BUCKET,
+            target_key_for=lambda extension: build_audio_key(event.video_id, extension),
+            config=spill_config,
+            timings=timings,
+        )
+        return AudioExtractedEvent(
+            video_id=event.video_id,
+            bucket=AUDIO_BUCKET,
+            key=audio_key,
+            timings=timings,
+        )
+
+    with timed(timings, "audio_extractor_download"):
+        video_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
     
     if len(video_bytes) == 0:
         raise ValueError("Downloaded video file is empty")
     
-    audio_bytes = audio_converter.convert(video_bytes)
-    audio_key = f"audio/{event.video_id}/audio.mp3"
-    storage_client.upload_file(bucket="therapy-audio", key=audio_key, content=audio_bytes)
+    audio_format = sniff_audio_format(video_bytes[:PROBE_BYTES])
+    if audio_format is not None:
+        audio_key = build_audio_key(event.video_id, audio_format)
+        audio_bytes = video_bytes
+    else:
+        audio_key = build_audio_key(event.video_id)
+        with timed(timings, "audio_extractor_convert"):
+            audio_bytes = audio_converter.convert(video_bytes)
+
+    with timed(timings, "audio_extractor_upload"):
+        storage_client.upload_file(bucket=AUDIO_BUCKET, key=audio_key, content=audio_bytes)
     
     return AudioExtractedEvent(
         video_id=event.video_id,
-        bucket="therapy-audio",
+        bucket=AUDIO_BUCKET,
         key=audio_key,
+        timings=timings,
     )
 
 
@@ -79,6 +127,7 @@ def handle_audio_extraction_event(
     storage_client: StorageClient,
     audio_converter: AudioConverter,
     publisher: AudioEventPublisher,
+    spill_config: Optional[SpillConfig] = None,
 ) -> None:
     """
     Handle video upload event: extract audio and publish result.
@@ -88,11 +137,13 @@ def handle_audio_extraction_event(
         storage_client: Client for storage operations.
         audio_converter: Converter for audio extraction.
         publisher: Publisher for AudioExtractedEvent.
+        spill_config: Optional disk-spill settings for large videos.
     """
     audio_event = extract_audio_from_video_event(
         event=event,
         storage_client=storage_client,
         audio_converter=audio_converter,
+        spill_config=spill_config,
     )
     publisher.publish_audio_extracted(audio_event)
 
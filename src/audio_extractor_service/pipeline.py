@@ -0,0 +1,212 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from src.upload_service.domain import VideoUploadedEvent
+from src.audio_extractor_service.domain import (
+    AUDIO_BUCKET,
+    AudioConverter,
+    AudioEventPublisher,
+    AudioExtractedEvent,
+    StorageClient,
+    build_audio_key,
+)
+from src.audio_extractor_service.sniff import PROBE_BYTES, sniff_audio_format
+
+
+DoneCallback = Callable[[Optional[Exception]], None]
+
+_STOP = object()
+
+
+class PipelineConfig(BaseModel):
+    """Bounds of the queues in front of each pipeline stage."""
+
+    download_queue_size: int = 2
+    convert_queue_size: int = 2
+    upload_queue_size: int = 2
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of events held by the pipeline, queued or in progress."""
+        return self.download_queue_size + self.convert_queue_size + self.upload_queue_size + 3
+
+
+class StageStats(BaseModel):
+    items: int
+    errors: int
+    busy_seconds: float
+    utilization: float
+    queue_depth: int
+
+
+class _Job:
+    def __init__(self, event: VideoUploadedEvent, on_done: Optional[DoneCallback]) -> None:
+        self.event = event
+        self.on_done = on_done
+        self.payload: Any = None
+        self.error: Optional[Exception] = None
+        self.timings = dict(event.timings)
+        self.extension = "mp3"
+
+
+class _Stage:
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+
+class AudioExtractionPipeline:
+    """
+    Overlapped download -> convert -> upload pipeline for audio extraction.
+
+    Each stage runs on its own thread and is fed by a bounded queue, so the
+    next video is downloaded while the current one is converted and the
+    previous result is uploaded. Events are published in submission order.
+    """
+
+    def __init__(
+        self,
+        storage_client: StorageClient,
+        audio_converter: AudioConverter,
+        publisher: AudioEventPublisher,
+        config: Optional[PipelineConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._storage_client = storage_client
+        self._audio_converter = audio_converter
+        self._publisher = publisher
+        self._config = config or PipelineConfig()
+        self._clock = clock
+        self._stages = [
+            _Stage("download", self._config.download_queue_size),
+            _Stage("convert", self._config.convert_queue_size),
+            _Stage("upload", self._config.upload_queue_size),
+        ]
+        self._handlers = [self._download, self._convert, self._upload]
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+
+    @property
+    def config(self) -> PipelineConfig:
+        return self._config
+
+    def start(self) -> None:
+        """Start the stage threads."""
+        self._started_at = self._clock()
+        for index in range(len(self._stages)):
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(index,),
+                name=f"audio-pipeline-{self._stages[index].name}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, event: VideoUploadedEvent, on_done: Optional[DoneCallback] = None) -> None:
+        """
+        Queue an event for processing, blocking while the download queue is full.
+
+        Args:
+            event: The VideoUploadedEvent to process.
+            on_done: Called from a pipeline thread once the event has been
+                published (with None) or has failed (with the exception).
+        """
+        self._stages[0].queue.put(_Job(event, on_done))
+
+    def close(self) -> None:
+        """Drain all queued events and stop the stage threads."""
+        self._stages[0].queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def stats(self) -> dict[str, StageStats]:
+        """Return per-stage counters and utilization since start()."""
+        elapsed = 0.0
+        if self._started_at is not None:
+            elapsed = self._clock() - self._started_at
+        with self._lock:
+            return {
+                stage.name: StageStats(
+                    items=stage.items,
+                    errors=stage.errors,
+                    busy_seconds=stage.busy_seconds,
+                    utilization=stage.busy_seconds / elapsed if elapsed > 0 else 0.0,
+                    queue_depth=stage.queue.qsize(),
+                )
+                for stage in self._stages
+            }
+
+    def _run_stage(self, index: int) -> None:
+        stage = self._stages[index]
+        handler = self._handlers[index]
+        next_queue = self._stages[index + 1].queue if index + 1 < len(self._stages) else None
+
+        while True:
+            job = stage.queue.get()
+            if job is _STOP:
+                if next_queue is not None:
+                    next_queue.put(_STOP)
+                return
+
+            if job.error is None:
+                started = self._clock()
+                try:
+                    handler(job)
+                except Exception as exc:
+                    job.error = exc
+                finished = self._clock()
+                job.timings[f"audio_extractor_{stage.name}"] = finished - started
+                if next_queue is None and job.error is None:
+                    # Published after the upload timing is recorded, so the event carries it.
+                    try:
+                        self._publish(job)
+                    except Exception as exc:
+                        job.error = exc
+                with self._lock:
+                    stage.items += 1
+                    stage.busy_seconds += finished - started
+                    if job.error is not None:
+                        stage.errors += 1
+
+            if next_queue is not None and job.error is None:
+                next_queue.put(job)
+            elif job.on_done is not None:
+                job.on_done(job.error)
+
+    def _download(self, job: _Job) -> None:
+        video_bytes = self._storage_client.download_file(bucket=job.event.bucket, key=job.event.key)
+        if len(video_bytes) == 0:
+            raise ValueError("Downloaded video file is empty")
+        job.payload = video_bytes
+
+    def _convert(self, job: _Job) -> None:
+        audio_format = sniff_audio_format(job.payload[:PROBE_BYTES])
+        if audio_format is not None:
+            job.extension = audio_format
+            return
+        job.payload = self._audio_converter.convert(job.payload)
+
+    def _upload(self, job: _Job) -> None:
+        audio_key = build_audio_key(job.event.video_id, job.extension)
+        self._storage_client.upload_file(bucket=AUDIO_BUCKET, key=audio_key, content=job.payload)
+        job.payload = audio_key
+
+    def _publish(self, job: _Job) -> None:
+        self._publisher.publish_audio_extracted(
+            AudioExtractedEvent(
+                video_id=job.event.video_id,
+                bucket=AUDIO_BUCKET,
+                key=job.payload,
+                timings=job.timings,
+            )
+        )
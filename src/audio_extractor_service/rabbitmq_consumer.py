@@ -1,14 +1,20 @@
+import functools
 import json
+from typing import Optional
 
 import pika
 from pydantic import BaseModel
 
+from src.shared.redelivery import nack_failed_message
+from src.shared.timings import record_queue_wait
 from src.upload_service.domain import VideoUploadedEvent
 from src.audio_extractor_service.domain import (
     AudioEventPublisher,
     StorageClient,
     AudioConverter,
 )
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline, PipelineConfig
+from src.audio_extractor_service.spill import SpillConfig
 from src.audio_extractor_service.worker import process_video_uploaded_event
 
 
@@ -27,11 +33,35 @@ class RabbitMQVideoUploadedConsumer:
         storage_client: StorageClient,
         audio_converter: AudioConverter,
         publisher: AudioEventPublisher,
+        spill_config: Optional[SpillConfig] = None,
+        pipeline_config: Optional[PipelineConfig] = None,
+        pipeline: Optional[AudioExtractionPipeline] = None,
     ) -> None:
+        """Initialize the consumer.
+
+        Args:
+            config: RabbitMQ configuration.
+            storage_client: Storage client for videos and audio.
+            audio_converter: Converts videos to audio.
+            publisher: Event publisher to use.
+            spill_config: Optional disk spilling of large videos (sequential mode).
+            pipeline_config: Consume through a pipeline built with this config.
+            pipeline: Consume through this pipeline instead, e.g. one whose
+                stats are also served by create_app.
+        """
+        if pipeline is None and pipeline_config is not None:
+            pipeline = AudioExtractionPipeline(
+                storage_client=storage_client,
+                audio_converter=audio_converter,
+                publisher=publisher,
+                config=pipeline_config,
+            )
         self._config = config
         self._storage_client = storage_client
         self._audio_converter = audio_converter
         self._publisher = publisher
+        self._spill_config = spill_config
+        self.pipeline = pipeline
 
     def run_forever(self) -> None:
         credentials = pika.PlainCredentials(
@@ -48,15 +78,21 @@ class RabbitMQVideoUploadedConsumer:
         channel = connection.channel()
         channel.queue_declare(queue=self._config.queue_name, durable=True)
 
+        if self.pipeline is not None:
+            self._consume_pipelined(connection, channel)
+            return
+
         def _callback(ch, method, properties, body: bytes) -> None:
             data = json.loads(body.decode("utf-8"))
             event = VideoUploadedEvent(**data)
+            record_queue_wait(event.timings, "audio_extractor_queue_wait", properties)
 
             process_video_uploaded_event(
                 event,
                 storage_client=self._storage_client,
                 audio_converter=self._audio_converter,
                 publisher=self._publisher,
+                spill_config=self._spill_config,
             )
 
             ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -66,4 +102,43 @@ class RabbitMQVideoUploadedConsumer:
             on_message_callback=_callback,
         )
 
-        channel.start_consuming()
\ No newline at end of file
+        channel.start_consuming()
+
+    def _consume_pipelined(self, connection, channel) -> None:
+        """Consume through an AudioExtractionPipeline, acking as each event completes.
+
+        Prefetch is capped at the pipeline capacity so submitting from the
+        pika callback never blocks. Acks are handed back to the connection
+        thread because pika channels are not thread-safe. Failed events are
+        logged; only transient errors are requeued, so an empty or corrupt
+        video is dead-lettered instead of redelivered forever.
+        """
+        channel.basic_qos(prefetch_count=self.pipeline.config.capacity)
+
+        def _on_done(delivery_tag: int, error: Optional[Exception]) -> None:
+            if error is None:
+                ack = functools.partial(channel.basic_ack, delivery_tag=delivery_tag)
+            else:
+                ack = nack_failed_message(channel, delivery_tag, error)
+            connection.add_callback_threadsafe(ack)
+
+        def _callback(ch, method, properties, body: bytes) -> None:
+            data = json.loads(body.decode("utf-8"))
+            event = VideoUploadedEvent(**data)
+            record_queue_wait(event.timings, "audio_extractor_queue_wait", properties)
+
+            self.pipeline.submit(
+                event,
+                on_done=functools.partial(_on_done, method.delivery_tag),
+            )
+
+        channel.basic_consume(
+            queue=self._config.queue_name,
+            on_message_callback=_callback,
+        )
+
+        self.pipeline.start()
+        try:
+            channel.start_consuming()
+        finally:
+            self.pipeline.close()
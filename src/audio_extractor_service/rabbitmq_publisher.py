@@ -3,6 +3,7 @@ import json
 import pika
 from pydantic import BaseModel
 
+from src.shared.timings import enqueue_properties
 from src.audio_extractor_service.domain import AudioExtractedEvent
 from src.audio_extractor_service.worker import AudioEventPublisher
 
@@ -43,6 +44,7 @@ class RabbitMQAudioEventPublisher(AudioEventPublisher):
                 exchange="",
                 routing_key=self._config.queue_name,
                 body=body,
+                properties=enqueue_properties(),
             )
         finally:
             connection.close()
@@ -1,43 +1,65 @@
 import os
+import threading
 import time
-from pathlib import Path
 
 import pika.exceptions
+import uvicorn
 
-from src.audio_extractor_service.config import RabbitMQConsumerConfig
+from src.audio_extractor_service.app import create_app
+from src.audio_extractor_service.config import load_config
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline
 from src.audio_extractor_service.rabbitmq_consumer import RabbitMQVideoUploadedConsumer
-from src.audio_extractor_service.rabbitmq_publisher import (
-    RabbitMQConfig as PublisherConfig,
-    RabbitMQAudioEventPublisher,
-)
+from src.audio_extractor_service.rabbitmq_publisher import RabbitMQAudioEventPublisher
+
+
+class StubStorageClient:
+    """Stub storage client."""
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return b"stub-video-content"
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        print(f"Uploaded {len(content)} bytes to {bucket}/{key}")
+
+
+class StubAudioConverter:
+    """Stub converter that passes the bytes through."""
+    def convert(self, video_bytes: bytes) -> bytes:
+        return video_bytes
 
 
 def main() -> None:
-    consumer_config = RabbitMQConsumerConfig(
-        host=os.environ["RABBITMQ_HOST"],
-        port=int(os.environ["RABBITMQ_PORT"]),
-        username=os.environ["RABBITMQ_USER"],
-        password=os.environ["RABBITMQ_PASS"],
-        queue_name=os.environ.get("RABBITMQ_QUEUE", "video.uploaded"),
-    )
+    config = load_config()
 
-    publisher_config = PublisherConfig(
-        host=os.environ["RABBITMQ_HOST"],
-        port=int(os.environ["RABBITMQ_PORT"]),
-        username=os.environ["RABBITMQ_USER"],
-        password=os.environ["RABBITMQ_PASS"],
-        queue_name=os.environ.get("AUDIO_EXTRACTED_QUEUE", "audio.extracted"),
-    )
+    storage_client = StubStorageClient()
+    audio_converter = StubAudioConverter()
+    publisher = RabbitMQAudioEventPublisher(config.publisher)
 
-    base_output_dir = Path(os.environ.get("AUDIO_OUTPUT_BASE_DIR", "/app/data/audio"))
-    publisher = RabbitMQAudioEventPublisher(publisher_config)
+    pipeline = None
+    if config.pipeline is not None:
+        # Shared by the consumer and the /metrics endpoint.
+        pipeline = AudioExtractionPipeline(
+            storage_client=storage_client,
+            audio_converter=audio_converter,
+            publisher=publisher,
+            config=config.pipeline,
+        )
 
     consumer = RabbitMQVideoUploadedConsumer(
-        config=consumer_config,
-        base_output_dir=base_output_dir,
+        config=config.consumer,
+        storage_client=storage_client,
+        audio_converter=audio_converter,
         publisher=publisher,
+        spill_config=config.spill,
+        pipeline=pipeline,
     )
 
+    health_port = os.environ.get("AUDIO_EXTRACTOR_HEALTH_PORT")
+    if health_port:
+        server = uvicorn.Server(
+            uvicorn.Config(create_app(pipeline), host="0.0.0.0", port=int(health_port), log_level="warning")
+        )
+        threading.Thread(target=server.run, name="audio-extractor-health", daemon=True).start()
+
     max_retries = 10
     retry_delay = 2
 
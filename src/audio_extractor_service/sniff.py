@@ -0,0 +1,83 @@
+from typing import Optional
+
+
+PROBE_BYTES = 64 * 1024
+
+_M4A_BRANDS = {b"M4A ", b"M4B ", b"M4P "}
+
+
+def sniff_audio_format(header: bytes) -> Optional[str]:
+    """
+    Detect audio-only uploads from the leading bytes of a file.
+
+    Recognises MP3 (ID3 tag or MPEG layer III frame sync), WAV, FLAC,
+    Ogg Vorbis/Opus and MP4/M4A. MP4 files are only treated as audio when the
+    brand is an audio brand or the header declares a sound track and no video
+    track, so videos fall through to normal extraction.
+
+    Args:
+        header: The first bytes of the file, ideally PROBE_BYTES long.
+
+    Returns:
+        The file extension to store the audio under ("mp3", "wav", "flac",
+        "ogg" or "m4a"), or None if the file is not recognised as audio.
+    """
+    if header.startswith(b"ID3"):
+        return _sniff_after_id3(header)
+    if _is_mp3_frame(header):
+        return "mp3"
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header.startswith(b"fLaC"):
+        return "flac"
+    if header.startswith(b"OggS"):
+        return _sniff_ogg(header)
+    if header[4:8] == b"ftyp":
+        return _sniff_mp4(header)
+    return None
+
+
+def _is_mp3_frame(header: bytes) -> bool:
+    # 11-bit frame sync followed by layer bits 01 (layer III).
+    return len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0 and (header[1] & 0x06) == 0x02
+
+
+def _sniff_after_id3(header: bytes) -> Optional[str]:
+    if len(header) < 10:
+        return "mp3"
+    # ID3v2 tag size is a 28-bit syncsafe integer.
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    body = header[10 + size:]
+    if not body:
+        # Frame lies beyond the probe window; ID3 tags are almost always MP3.
+        return "mp3"
+    if _is_mp3_frame(body):
+        return "mp3"
+    return None
+
+
+def _sniff_ogg(header: bytes) -> Optional[str]:
+    first_page = header[:128]
+    if b"theora" in first_page:
+        return None
+    if b"OpusHead" in first_page or b"\x01vorbis" in first_page:
+        return "ogg"
+    return None
+
+
+def _sniff_mp4(header: bytes) -> Optional[str]:
+    if header[8:12] in _M4A_BRANDS:
+        return "m4a"
+
+    handlers = set()
+    offset = header.find(b"hdlr")
+    while offset != -1:
+        # hdlr box: tag, version/flags (4), pre_defined (4), handler_type (4).
+        handler = header[offset + 12:offset + 16]
+        if len(handler) == 4:
+            handlers.add(handler)
+        offset = header.find(b"hdlr", offset + 4)
+
+    if b"soun" in handlers and b"vide" not in handlers:
+        return "m4a"
+    return None
@@ -0,0 +1,143 @@
+import mmap
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Protocol, runtime_checkable
+
+from pydantic import BaseModel
+
+from src.shared.timings import timed
+from src.audio_extractor_service.sniff import PROBE_BYTES, sniff_audio_format
+
+
+class SpillConfig(BaseModel):
+    """Settings for spilling large objects to disk instead of holding them in memory."""
+
+    threshold_bytes: int = 64 * 1024 * 1024
+    temp_dir: Optional[Path] = None
+
+
+@runtime_checkable
+class StreamingStorageClient(Protocol):
+    """Storage client that can move objects to/from local files without buffering them."""
+
+    def get_object_size(self, bucket: str, key: str) -> int:
+        """Return the size of an object in bytes."""
+        ...
+
+    def download_to_file(self, bucket: str, key: str, path: Path) -> None:
+        """Stream an object from storage into a local file."""
+        ...
+
+    def upload_from_file(self, bucket: str, key: str, path: Path) -> None:
+        """Stream a local file into storage."""
+        ...
+
+
+@runtime_checkable
+class FileAudioConverter(Protocol):
+    """Converter that reads its input from and writes its output to local files."""
+
+    def convert_file(self, input_path: Path, output_path: Path) -> None:
+        """Convert the video at input_path into audio written to output_path."""
+        ...
+
+
+def should_spill(
+    storage_client: object,
+    bucket: str,
+    key: str,
+    config: Optional[SpillConfig],
+) -> bool:
+    """
+    Decide whether an object should be processed through the disk path.
+
+    Args:
+        storage_client: Storage client for the object.
+        bucket: Bucket of the object.
+        key: Key of the object.
+        config: Spill settings, or None if spilling is disabled.
+
+    Returns:
+        True if spilling is enabled, the client supports streaming and the
+        object is at least config.threshold_bytes large.
+    """
+    if config is None or not isinstance(storage_client, StreamingStorageClient):
+        return False
+    return storage_client.get_object_size(bucket=bucket, key=key) >= config.threshold_bytes
+
+
+def convert_via_disk(
+    storage_client: StreamingStorageClient,
+    audio_converter: object,
+    source_bucket: str,
+    source_key: str,
+    target_bucket: str,
+    target_key_for: Callable[[str], str],
+    config: SpillConfig,
+    timings: Optional[dict[str, float]] = None,
+) -> str:
+    """
+    Download, convert and upload an object using temp files instead of memory.
+
+    The video is streamed into a temp file. Converters implementing
+    FileAudioConverter get file paths; other converters get a memoryview over
+    an mmap of the file, so the video is paged in by the OS rather than copied
+    onto the heap. The audio is written to a temp file and streamed to storage.
+    Files that are already audio are streamed back to storage unconverted.
+
+    Args:
+        storage_client: Streaming-capable storage client.
+        audio_converter: An AudioConverter or FileAudioConverter.
+        source_bucket: Bucket of the video.
+        source_key: Key of the video.
+        target_bucket: Bucket to upload the audio to.
+        target_key_for: Maps an audio file extension to the key to upload to.
+        config: Spill settings.
+        timings: Optional dict to record download/convert/upload durations in.
+
+    Returns:
+        The key the audio was uploaded to.
+
+    Raises:
+        ValueError: If the downloaded video file is empty.
+    """
+    if timings is None:
+        timings = {}
+
+    with tempfile.TemporaryDirectory(dir=config.temp_dir) as work_dir:
+        video_path = Path(work_dir) / "video"
+        audio_path = Path(work_dir) / "audio.mp3"
+
+        with timed(timings, "audio_extractor_download"):
+            storage_client.download_to_file(bucket=source_bucket, key=source_key, path=video_path)
+
+        if video_path.stat().st_size == 0:
+            raise ValueError("Downloaded video file is empty")
+
+        with open(video_path, "rb") as video_file:
+            audio_format = sniff_audio_format(video_file.read(PROBE_BYTES))
+        if audio_format is not None:
+            target_key = target_key_for(audio_format)
+            with timed(timings, "audio_extractor_upload"):
+                storage_client.upload_from_file(bucket=target_bucket, key=target_key, path=video_path)
+            return target_key
+
+        target_key = target_key_for("mp3")
+        with timed(timings, "audio_extractor_convert"):
+            if isinstance(audio_converter, FileAudioConverter):
+                audio_converter.convert_file(input_path=video_path, output_path=audio_path)
+            else:
+                with open(video_path, "rb") as video_file, mmap.mmap(
+                    video_file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        audio_bytes = audio_converter.convert(view)
+                    finally:
+                        view.release()
+                audio_path.write_bytes(audio_bytes)
+
+        with timed(timings, "audio_extractor_upload"):
+            storage_client.upload_from_file(bucket=target_bucket, key=target_key, path=audio_path)
+
+    return target_key
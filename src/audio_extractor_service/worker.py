@@ -1,3 +1,5 @@
+from typing import Optional
+
 from src.upload_service.domain import VideoUploadedEvent
 from src.audio_extractor_service.domain import (
     AudioExtractedEvent,
@@ -6,6 +8,7 @@ from src.audio_extractor_service.domain import (
     AudioConverter,
     handle_audio_extraction_event,
 )
+from src.audio_extractor_service.spill import SpillConfig
 
 
 def process_video_uploaded_event(
@@ -13,6 +16,7 @@ def process_video_uploaded_event(
     storage_client: StorageClient,
     audio_converter: AudioConverter,
     publisher: AudioEventPublisher,
+    spill_config: Optional[SpillConfig] = None,
 ) -> AudioExtractedEvent:
     """
     Process a video uploaded event: extract audio and publish result.
@@ -22,6 +26,7 @@ def process_video_uploaded_event(
         storage_client: Client for MinIO/storage operations.
         audio_converter: Converter for audio extraction.
         publisher: Publisher for audio extraction events.
+        spill_config: Optional disk-spill settings for large videos.
         
     Returns:
         AudioExtractedEvent with extraction result.
@@ -32,6 +37,7 @@ def process_video_uploaded_event(
         event=event,
         storage_client=storage_client,
         audio_converter=audio_converter,
+        spill_config=spill_config,
     )
     
     publisher.publish_audio_extracted(audio_event)
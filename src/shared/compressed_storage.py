@@ -0,0 +1,333 @@
+"""Transparent compression of text and JSON artifacts in object storage.
+
+CompressingStorageClient wraps any StorageClient. Uploads of compressible
+keys (.txt, .json, .jsonl by default) are compressed with gzip or, when the
+``zstandard`` package is installed, zstd. Downloads are decompressed based
+on the object's content-encoding metadata when the wrapped client exposes
+it, and on the codec's magic bytes otherwise, so objects written before
+compression was enabled still read back unchanged.
+"""
+import gzip
+import io
+import itertools
+import threading
+import time
+import zlib
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Protocol, runtime_checkable
+
+from pydantic import BaseModel
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+DEFAULT_SUFFIXES = (".txt", ".json", ".jsonl")
+CHUNK_SIZE = 64 * 1024
+
+
+class StorageClient(Protocol):
+    def download_file(self, bucket: str, key: str) -> bytes:
+        ...
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        ...
+
+
+@runtime_checkable
+class ContentEncodingStorageClient(Protocol):
+    """Storage client that can keep a Content-Encoding header with each object."""
+
+    def upload_file_with_encoding(self, bucket: str, key: str, content: bytes, content_encoding: str) -> None:
+        ...
+
+    def get_content_encoding(self, bucket: str, key: str) -> Optional[str]:
+        ...
+
+
+@runtime_checkable
+class ChunkedStorageClient(Protocol):
+    """Storage client that can stream an object's stored bytes in chunks."""
+
+    def iter_chunks(self, bucket: str, key: str) -> Iterator[bytes]:
+        ...
+
+
+class CompressionStats(BaseModel):
+    uploads: int
+    compressed_uploads: int
+    logical_bytes_up: int
+    stored_bytes_up: int
+    downloads: int
+    stored_bytes_down: int
+    logical_bytes_down: int
+    compress_seconds: float
+    decompress_seconds: float
+
+
+def available_codecs() -> list[str]:
+    """Codecs usable in this environment."""
+    return ["gzip", "zstd"] if zstandard is not None else ["gzip"]
+
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    """Compress data with the given codec ("gzip" or "zstd")."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if codec == "zstd":
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def detect_encoding(data: bytes) -> Optional[str]:
+    """Return the codec whose magic bytes start data, if any."""
+    if data.startswith(GZIP_MAGIC):
+        return "gzip"
+    if data.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def iter_decompressed(data: bytes, codec: Optional[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decompress data incrementally, yielding chunks of at most chunk_size bytes."""
+    view = memoryview(data)
+    slices = (bytes(view[offset:offset + chunk_size]) for offset in range(0, len(data), chunk_size))
+    if codec is None:
+        return slices
+    return iter_decompressed_stream(slices, codec, chunk_size)
+
+
+def iter_decompressed_stream(
+    chunks: Iterable[bytes],
+    codec: Optional[str],
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Decompress a stream of compressed chunks as they arrive.
+
+    Output chunks are at most chunk_size bytes, except without a codec,
+    where the input chunks are passed through.
+    """
+    if codec is None:
+        yield from chunks
+        return
+
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        for data in chunks:
+            chunk = decompressor.decompress(data, chunk_size)
+            while chunk:
+                yield chunk
+                chunk = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+        return
+
+    if codec == "zstd":
+        _require_zstd()
+        reader = zstandard.ZstdDecompressor().stream_reader(_ChunkReader(iter(chunks)))
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+class _ChunkReader(io.RawIOBase):
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class CompressingStorageClient:
+    """
+    StorageClient decorator that compresses text/JSON artifacts at rest.
+
+    Args:
+        inner: The storage client that actually stores the bytes.
+        codec: "gzip", "zstd" or "none". zstd needs the zstandard package.
+        level: Codec compression level; codec default if None.
+        suffixes: Key suffixes that are compressed on upload.
+        min_size: Payloads smaller than this are stored as is.
+    """
+
+    def __init__(
+        self,
+        inner: StorageClient,
+        codec: str = "gzip",
+        level: Optional[int] = None,
+        suffixes: tuple[str, ...] = DEFAULT_SUFFIXES,
+        min_size: int = 512,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if codec == "zstd":
+            _require_zstd()
+        elif codec not in ("gzip", "none"):
+            raise ValueError(f"Unknown compression codec: {codec}")
+        self._inner = inner
+        self._codec = codec
+        self._level = level
+        self._suffixes = suffixes
+        self._min_size = min_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(CompressionStats.model_fields, 0)
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        encoding = None
+        stored = content
+        if self._codec != "none" and key.endswith(self._suffixes) and len(content) >= self._min_size:
+            started = self._clock()
+            stored = compress(content, self._codec, self._level)
+            self._count(compress_seconds=self._clock() - started)
+            encoding = self._codec
+
+        if encoding is not None and isinstance(self._inner, ContentEncodingStorageClient):
+            self._inner.upload_file_with_encoding(bucket, key, stored, encoding)
+        else:
+            self._inner.upload_file(bucket=bucket, key=key, content=stored)
+        self._count(
+            uploads=1,
+            compressed_uploads=int(encoding is not None),
+            logical_bytes_up=len(content),
+            stored_bytes_up=len(stored),
+        )
+
+    def delete_file(self, bucket: str, key: str) -> None:
+        """Delete the object from the wrapped client, which must support deletes."""
+        self._inner.delete_file(bucket=bucket, key=key)
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return b"".join(self.iter_chunks(bucket, key))
+
+    def open(self, bucket: str, key: str) -> BinaryIO:
+        """Return a file object that decompresses the object as it is read."""
+        return io.BufferedReader(_ChunkReader(self.iter_chunks(bucket, key)), buffer_size=CHUNK_SIZE)
+
+    def iter_chunks(self, bucket: str, key: str) -> Iterator[bytes]:
+        """Yield the decompressed object in chunks.
+
+        When the wrapped client can stream (iter_chunks), the stored bytes
+        are decompressed as they arrive and neither the compressed nor the
+        decompressed object is ever held whole. Otherwise the compressed
+        object is downloaded in full (it is the smaller of the two) and only
+        its decompressed form is produced chunk by chunk.
+        """
+        self._count(downloads=1)
+        if isinstance(self._inner, ChunkedStorageClient):
+            stored_chunks = self._inner.iter_chunks(bucket, key)
+            # Enough leading bytes to recognize the codec's magic.
+            head = b""
+            for chunk in stored_chunks:
+                head += chunk
+                if len(head) >= len(ZSTD_MAGIC):
+                    break
+            encoding = self._encoding_of(bucket, key, head)
+            stored = itertools.chain([head], stored_chunks)
+        else:
+            data = self._inner.download_file(bucket=bucket, key=key)
+            encoding = self._encoding_of(bucket, key, data)
+            stored = iter([data]) if encoding else iter_decompressed(data, None)
+
+        chunks = iter_decompressed_stream(self._counted(stored), encoding)
+        while True:
+            started = self._clock()
+            chunk = next(chunks, None)
+            self._count(decompress_seconds=self._clock() - started if encoding else 0.0)
+            if chunk is None:
+                return
+            self._count(logical_bytes_down=len(chunk))
+            yield chunk
+
+    def _counted(self, stored: Iterator[bytes]) -> Iterator[bytes]:
+        for chunk in stored:
+            self._count(stored_bytes_down=len(chunk))
+            yield chunk
+
+    def stats(self) -> CompressionStats:
+        with self._lock:
+            return CompressionStats(**self._stats)
+
+    def _encoding_of(self, bucket: str, key: str, stored: bytes) -> Optional[str]:
+        if isinstance(self._inner, ContentEncodingStorageClient):
+            encoding = self._inner.get_content_encoding(bucket, key)
+            if encoding in ("gzip", "zstd"):
+                return encoding
+            if encoding is not None:
+                return None
+        if not key.endswith(self._suffixes):
+            return None
+        return detect_encoding(stored)
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+
+class CodecBenchmark(BaseModel):
+    codec: str
+    level: Optional[int]
+    original_bytes: int
+    stored_bytes: int
+    ratio: float
+    compress_seconds: float
+    decompress_seconds: float
+
+
+def measure_codec(
+    payload: bytes,
+    codec: str,
+    level: Optional[int] = None,
+    repeat: int = 5,
+    clock: Callable[[], float] = time.perf_counter,
+) -> CodecBenchmark:
+    """Measure compression ratio and best-of-repeat CPU time of a codec on payload."""
+    compress_times = []
+    decompress_times = []
+    stored = payload
+    for _ in range(repeat):
+        started = clock()
+        stored = compress(payload, codec, level)
+        compress_times.append(clock() - started)
+
+        started = clock()
+        restored = b"".join(iter_decompressed(stored, codec))
+        decompress_times.append(clock() - started)
+        if restored != payload:
+            raise AssertionError(f"{codec} round trip changed the payload")
+
+    return CodecBenchmark(
+        codec=codec,
+        level=level,
+        original_bytes=len(payload),
+        stored_bytes=len(stored),
+        ratio=len(payload) / len(stored) if stored else 0.0,
+        compress_seconds=min(compress_times),
+        decompress_seconds=min(decompress_times),
+    )
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise ValueError("zstd compression needs the 'zstandard' package")
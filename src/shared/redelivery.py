@@ -0,0 +1,53 @@
+"""Settling RabbitMQ messages whose processing failed."""
+
+import functools
+import logging
+from typing import Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+# Errors that may go away on their own, so the message is worth redelivering.
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError)
+
+
+def is_transient_error(
+    error: BaseException,
+    transient_errors: tuple[type[BaseException], ...] = TRANSIENT_ERRORS,
+) -> bool:
+    """Whether error is worth retrying by redelivering the message."""
+    return isinstance(error, transient_errors)
+
+
+def nack_failed_message(
+    channel,
+    delivery_tag: int,
+    error: BaseException,
+    transient_errors: tuple[type[BaseException], ...] = TRANSIENT_ERRORS,
+) -> Callable[[], None]:
+    """Log a failed message and return the basic_nack that settles it.
+
+    Transient errors are requeued. Anything else (malformed body, failed
+    validation, undecodable or empty input) would fail again on every
+    redelivery, so the message is rejected without requeue: the broker
+    dead-letters it if the queue has a dead-letter exchange, or drops it.
+    The nack is returned rather than sent so callers on worker threads can
+    hand it to connection.add_callback_threadsafe.
+
+    Args:
+        channel: The pika channel the message was delivered on.
+        delivery_tag: The message's delivery tag.
+        error: Why processing failed.
+        transient_errors: Error types that are requeued.
+    """
+    requeue = is_transient_error(error, transient_errors)
+    logger.error(
+        "Message %s failed with %s: %s; %s",
+        delivery_tag,
+        type(error).__name__,
+        error,
+        "requeueing" if requeue else "dead-lettering",
+        exc_info=error,
+    )
+    return functools.partial(channel.basic_nack, delivery_tag=delivery_tag, requeue=requeue)
@@ -0,0 +1,11 @@
+"""Retry settings shared by the services' HTTP clients."""
+
+from pydantic import BaseModel
+
+
+class RetryConfig(BaseModel):
+    """Exponential backoff with full jitter for transport errors, 429 and 5xx."""
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
@@ -0,0 +1,46 @@
+"""Step timing helpers shared by the pipeline services.
+
+Timings are plain ``{name: seconds}`` dicts carried on each event, so every
+stage appends its own entries to those of the stages before it. Names use
+underscores rather than dots so they can be stored as MongoDB field names.
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import pika
+
+
+ENQUEUED_AT_HEADER = "x-enqueued-at"
+
+
+@contextmanager
+def timed(timings: dict[str, float], name: str) -> Iterator[None]:
+    """Record the wall-clock duration of the enclosed block under timings[name].
+
+    The duration is recorded even if the block raises.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+
+
+def enqueue_properties() -> pika.BasicProperties:
+    """Build message properties stamped with the current enqueue time."""
+    return pika.BasicProperties(headers={ENQUEUED_AT_HEADER: time.time()})
+
+
+def record_queue_wait(timings: dict[str, float], name: str, properties: Any) -> None:
+    """Record how long a message waited in its queue, if it carries an enqueue stamp.
+
+    Args:
+        timings: Timings dict to update.
+        name: Timing name to record under.
+        properties: pika.BasicProperties of the delivered message (may be None).
+    """
+    headers: Optional[dict] = getattr(properties, "headers", None)
+    if not headers or ENQUEUED_AT_HEADER not in headers:
+        return
+    timings[name] = max(0.0, time.time() - float(headers[ENQUEUED_AT_HEADER]))
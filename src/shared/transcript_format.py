@@ -0,0 +1,93 @@
+"""Columnar encoding for structured transcripts.
+
+A structured transcript is stored as parallel arrays: one entry per utterance
+in the utterance columns and one entry per word in the word columns, with
+``word_utterance`` pointing each word at its utterance. The encoded object is
+a JSON header line followed by one JSON array per column; the header records
+the byte range of each column so readers can decode only what they need.
+"""
+import json
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+
+
+FORMAT_NAME = "columnar-transcript"
+FORMAT_VERSION = 1
+
+UTTERANCE_COLUMNS = ("speaker", "start", "end", "text")
+WORD_COLUMNS = ("word_text", "word_start", "word_end", "word_utterance")
+ALL_COLUMNS = UTTERANCE_COLUMNS + WORD_COLUMNS
+
+
+class StructuredTranscript(BaseModel):
+    speaker: list[str] = []
+    start: list[float] = []
+    end: list[float] = []
+    text: list[str] = []
+    word_text: list[str] = []
+    word_start: list[float] = []
+    word_end: list[float] = []
+    word_utterance: list[int] = []
+
+    def plain_text(self) -> str:
+        """Return the transcript as plain text, one utterance after another."""
+        return " ".join(self.text)
+
+
+def encode_transcript(transcript: StructuredTranscript) -> bytes:
+    """Encode a transcript into the columnar format."""
+    payloads = []
+    columns = {}
+    offset = 0
+    for name in ALL_COLUMNS:
+        payload = json.dumps(getattr(transcript, name), separators=(",", ":")).encode("utf-8") + b"\n"
+        columns[name] = [offset, len(payload)]
+        payloads.append(payload)
+        offset += len(payload)
+
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "utterances": len(transcript.text),
+        "words": len(transcript.word_text),
+        "columns": columns,
+    }
+    return json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n" + b"".join(payloads)
+
+
+def decode_transcript(data: bytes, columns: Optional[Iterable[str]] = None) -> StructuredTranscript:
+    """
+    Decode a columnar transcript.
+
+    Args:
+        data: Encoded transcript bytes.
+        columns: Column names to decode; all columns if None. Columns that are
+            not requested are left empty.
+
+    Returns:
+        The decoded StructuredTranscript.
+
+    Raises:
+        ValueError: If data is not a columnar transcript or a column is unknown.
+    """
+    header_end = data.find(b"\n")
+    if header_end == -1:
+        raise ValueError("Not a columnar transcript: missing header")
+    header = json.loads(data[:header_end])
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError("Not a columnar transcript: unexpected format")
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar transcript version: {header.get('version')}")
+
+    wanted = ALL_COLUMNS if columns is None else tuple(columns)
+    unknown = set(wanted) - set(ALL_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown transcript columns: {sorted(unknown)}")
+
+    body = memoryview(data)[header_end + 1:]
+    values = {}
+    for name in wanted:
+        offset, length = header["columns"][name]
+        values[name] = json.loads(bytes(body[offset:offset + length]))
+    return StructuredTranscript(**values)
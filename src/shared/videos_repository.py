@@ -71,3 +71,24 @@ class MongoVideosRepository:
         
         if result.matched_count == 0:
             raise VideoNotFoundError(f"Video with id {video_id} not found")
+    
+    def record_timings(self, video_id: str, timings: dict[str, float]) -> None:
+        """Merge per-step timings (in seconds) into a video document.
+        
+        Existing timings with other names are kept. The document is created
+        if it does not exist yet.
+        
+        Args:
+            video_id: Unique video identifier.
+            timings: Mapping of step name to duration in seconds.
+        """
+        if not timings:
+            return
+        
+        update_data = {f"timings.{name}": seconds for name, seconds in timings.items()}
+        
+        self._collection.update_one(
+            {"video_id": video_id},
+            {"$set": update_data},
+            upsert=True,
+        )
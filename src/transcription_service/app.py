@@ -1,14 +1,48 @@
+from typing import Optional
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from src.transcription_service.lifecycle import ReadinessGate
+from src.transcription_service.transcript_cache import InMemoryTranscriptCache
 
 
-def create_app() -> FastAPI:
-    """Create and configure the transcription service FastAPI application."""
+def create_app(
+    cache: Optional[InMemoryTranscriptCache] = None,
+    readiness: Optional[ReadinessGate] = None,
+) -> FastAPI:
+    """Create and configure the transcription service FastAPI application.
+
+    With a readiness gate, /health answers 503 until the backend is warmed up.
+    Both are kept on application.state, so the worker can attach its cache
+    and gate to the module-level app it serves.
+    """
     application = FastAPI(title="Transcription Service")
+    application.state.cache = cache
+    application.state.readiness = readiness
 
     @application.get("/health")
     def health():
+        readiness = application.state.readiness
+        if readiness is not None and not readiness.is_ready:
+            content = {"status": readiness.state}
+            if readiness.error is not None:
+                content["error"] = readiness.error
+            return JSONResponse(status_code=503, content=content)
         return {"status": "ok"}
 
+    @application.get("/metrics")
+    def metrics():
+        cache = application.state.cache
+        readiness = application.state.readiness
+        transcript_cache = None
+        if cache is not None:
+            transcript_cache = cache.stats().model_dump()
+        startup = None
+        if readiness is not None and readiness.report is not None:
+            startup = readiness.report.model_dump()
+        return {"transcript_cache": transcript_cache, "startup": startup}
+
     return application
 
 
@@ -0,0 +1,17 @@
+import io
+import wave
+
+
+def estimate_audio_seconds(audio_bytes: bytes, fallback_bitrate: int = 128_000) -> float:
+    """
+    Estimate the duration of an audio file in seconds.
+
+    WAV headers give the exact duration; for compressed formats the duration
+    is estimated from the size at fallback_bitrate (bits per second), which
+    is close enough for latency budgeting and routing.
+    """
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as reader:
+            return reader.getnframes() / reader.getframerate()
+    except (wave.Error, EOFError):
+        return len(audio_bytes) * 8 / fallback_bitrate
@@ -0,0 +1,178 @@
+import gc
+import io
+import json
+import math
+import time
+import tracemalloc
+import wave
+from typing import Callable, Optional, Sequence
+
+from pydantic import BaseModel
+
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptionBackend
+from src.transcription_service.worker import TranscriptEventPublisher, process_audio_extracted_event
+
+
+STEPS = ("decode", "download", "transcribe", "upload", "publish")
+
+
+def synthetic_wav(seconds: float, sample_rate: int = 16_000) -> bytes:
+    """Mono 16-bit PCM WAV of the given length with a quiet 440 Hz tone."""
+    period = [int(1000 * math.sin(2 * math.pi * 440 * i / sample_rate)) for i in range(sample_rate)]
+    one_second = b"".join(sample.to_bytes(2, "little", signed=True) for sample in period)
+    frames = one_second * int(seconds) + one_second[: int((seconds % 1) * sample_rate) * 2]
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(frames)
+    return buffer.getvalue()
+
+
+class InMemoryStorageClient:
+    """StorageClient keeping objects in a dict, so the benchmark measures no I/O."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return self.objects[(bucket, key)]
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        self.objects[(bucket, key)] = content
+
+    def delete_file(self, bucket: str, key: str) -> None:
+        self.objects.pop((bucket, key), None)
+
+
+class SerializingPublisher(TranscriptEventPublisher):
+    """Publisher that serializes events like the RabbitMQ publisher and drops them."""
+
+    def __init__(self) -> None:
+        self.published_bytes = 0
+        self.last_publish_seconds = 0.0
+
+    def publish_transcript_created(self, event: TranscriptCreatedEvent) -> None:
+        started = time.perf_counter()
+        body = json.dumps(event.model_dump()).encode("utf-8")
+        self.published_bytes += len(body)
+        self.last_publish_seconds = time.perf_counter() - started
+
+
+class StepSummary(BaseModel):
+    mean_seconds: float
+    p95_seconds: float
+    share: float
+
+
+class OverheadReport(BaseModel):
+    messages: int
+    audio_seconds: list[float]
+    wall_seconds: float
+    messages_per_second: float
+    steps: dict[str, StepSummary]
+    overhead_seconds_per_message: float
+    backend_share: float
+    peak_bytes_per_message: Optional[float] = None
+    retained_bytes_per_message: Optional[float] = None
+
+
+def benchmark_transcription_overhead(
+    backend: TranscriptionBackend,
+    audio_seconds: Sequence[float] = (10.0, 60.0, 300.0),
+    messages: int = 300,
+    trace_allocations: bool = True,
+    audio_factory: Callable[[float], bytes] = synthetic_wav,
+) -> OverheadReport:
+    """
+    Measure how much of a transcription worker's time is spent outside the backend.
+
+    Messages cycle through audio of the given lengths. Each one goes through
+    the same path as a delivery in RabbitMQAudioExtractedConsumer: JSON
+    decode of the body, process_audio_extracted_event (download, transcribe,
+    upload) and JSON serialization of the published event, with in-memory
+    storage and publisher so only the wrapper's own work is timed.
+
+    With trace_allocations, the messages are replayed a second time under
+    tracemalloc (which slows everything down, so it is kept out of the
+    timed pass) to report the peak memory allocated while handling a
+    message and the memory still held afterwards.
+
+    Returns:
+        An OverheadReport; backend_share close to 1.0 means the worker is
+        backend-bound.
+    """
+    storage = InMemoryStorageClient()
+    bodies = []
+    for index, seconds in enumerate(audio_seconds):
+        key = f"audio/bench-{index}/audio.wav"
+        storage.upload_file(bucket="therapy-audio", key=key, content=audio_factory(seconds))
+        event = AudioExtractedEvent(video_id=f"bench-{index}", bucket="therapy-audio", key=key)
+        bodies.append(json.dumps(event.model_dump()).encode("utf-8"))
+    publisher = SerializingPublisher()
+
+    def handle(body: bytes, timings: Optional[dict[str, list[float]]] = None) -> None:
+        started = time.perf_counter()
+        event = AudioExtractedEvent(**json.loads(body.decode("utf-8")))
+        decode_seconds = time.perf_counter() - started
+        created = process_audio_extracted_event(event, storage_client=storage, backend=backend, publisher=publisher)
+        if timings is not None:
+            timings["decode"].append(decode_seconds)
+            timings["download"].append(created.timings["transcription_download"])
+            timings["transcribe"].append(created.timings["transcription_transcribe"])
+            timings["upload"].append(created.timings["transcription_upload"])
+            timings["publish"].append(publisher.last_publish_seconds)
+
+    # One warm pass so imports, caches and pydantic validators are not counted.
+    for body in bodies:
+        handle(body)
+
+    timings: dict[str, list[float]] = {step: [] for step in STEPS}
+    started = time.perf_counter()
+    for index in range(messages):
+        handle(bodies[index % len(bodies)], timings)
+    wall_seconds = time.perf_counter() - started
+
+    step_totals = {step: sum(values) for step, values in timings.items()}
+    measured = sum(step_totals.values()) or 1.0
+    steps = {
+        step: StepSummary(
+            mean_seconds=step_totals[step] / messages,
+            p95_seconds=sorted(values)[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)],
+            share=step_totals[step] / measured,
+        )
+        for step, values in timings.items()
+    }
+
+    report = OverheadReport(
+        messages=messages,
+        audio_seconds=list(audio_seconds),
+        wall_seconds=wall_seconds,
+        messages_per_second=messages / wall_seconds if wall_seconds else 0.0,
+        steps=steps,
+        overhead_seconds_per_message=(wall_seconds - step_totals["transcribe"]) / messages,
+        backend_share=step_totals["transcribe"] / wall_seconds if wall_seconds else 0.0,
+    )
+
+    if trace_allocations:
+        traced = min(messages, 50)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            peaks = []
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            for index in range(traced):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                handle(bodies[index % len(bodies)])
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            retained = tracemalloc.get_traced_memory()[0] - start_bytes
+        finally:
+            tracemalloc.stop()
+        report.peak_bytes_per_message = sum(peaks) / len(peaks)
+        report.retained_bytes_per_message = retained / traced
+
+    return report
@@ -0,0 +1,81 @@
+import threading
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+
+class SegmentCheckpointStore(Protocol):
+    def load(self, job_key: str) -> dict[int, Any]:
+        """Return the saved segment results of a job, keyed by segment index."""
+        ...
+
+    def save(self, job_key: str, segment_index: int, result: Any) -> None:
+        """Save the JSON-serialisable result of one finished segment."""
+        ...
+
+    def clear(self, job_key: str) -> None:
+        """Drop the checkpoints of a job once its transcript is stored."""
+        ...
+
+
+class SegmentCheckpoint:
+    """Checkpoints of a single transcription job, bound to its job key."""
+
+    def __init__(self, store: SegmentCheckpointStore, job_key: str) -> None:
+        self.store = store
+        self.job_key = job_key
+
+    def load(self) -> dict[int, Any]:
+        return self.store.load(self.job_key)
+
+    def save(self, segment_index: int, result: Any) -> None:
+        self.store.save(self.job_key, segment_index, result)
+
+
+class InMemorySegmentCheckpointStore:
+    """Process-local SegmentCheckpointStore; survives retries but not restarts."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, dict[int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, job_key: str) -> dict[int, Any]:
+        with self._lock:
+            return dict(self._jobs.get(job_key, {}))
+
+    def save(self, job_key: str, segment_index: int, result: Any) -> None:
+        with self._lock:
+            self._jobs.setdefault(job_key, {})[segment_index] = result
+
+    def clear(self, job_key: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_key, None)
+
+
+class MongoSegmentCheckpointStore:
+    """SegmentCheckpointStore keeping one document per finished segment in MongoDB."""
+
+    def __init__(self, client, db_name: str = "therapy_analysis") -> None:
+        """Initialize the store with a MongoDB client and database name.
+
+        Args:
+            client: MongoDB client instance.
+            db_name: Database name (default: "therapy_analysis").
+        """
+        self._collection = client[db_name]["transcription_checkpoints"]
+        self._collection.create_index([("job_key", 1), ("segment_index", 1)], unique=True)
+
+    def load(self, job_key: str) -> dict[int, Any]:
+        return {
+            document["segment_index"]: document["result"]
+            for document in self._collection.find({"job_key": job_key})
+        }
+
+    def save(self, job_key: str, segment_index: int, result: Any) -> None:
+        self._collection.update_one(
+            {"job_key": job_key, "segment_index": segment_index},
+            {"$set": {"result": result, "saved_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    def clear(self, job_key: str) -> None:
+        self._collection.delete_many({"job_key": job_key})
@@ -1,15 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import Any, Callable, Iterable, Iterator, Optional, Protocol, Union
 
 from pydantic import BaseModel
 
 from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.shared.timings import timed
+from src.shared.transcript_format import StructuredTranscript, encode_transcript
+from src.transcription_service.checkpoints import SegmentCheckpoint, SegmentCheckpointStore
+from src.transcription_service.transcript_cache import (
+    BackendIdentity,
+    CachedTranscript,
+    TranscriptCache,
+    cached_transcript_key,
+    transcript_cache_key,
+)
+
+
+TRANSCRIPT_BUCKET = "therapy-transcripts"
+
+
+def video_transcript_key(video_id: str) -> str:
+    """Key of a video's plain text transcript in TRANSCRIPT_BUCKET."""
+    return f"transcripts/{video_id}/transcript.txt"
+
+
+def video_structured_transcript_key(video_id: str) -> str:
+    """Key of a video's columnar transcript, stored next to the plain text one by structured backends."""
+    return f"transcripts/{video_id}/transcript.columnar.jsonl"
 
 
 class TranscriptCreatedEvent(BaseModel):
     video_id: str
     bucket: str
     key: str
+    structured_key: Optional[str] = None
+    segment_count: Optional[int] = None
+    metadata: dict[str, Any] = {}
+    timings: dict[str, float] = {}
+
+
+class TranscriptPartialEvent(BaseModel):
+    video_id: str
+    segment_index: int
+    start: float
+    end: Optional[float] = None
+    bucket: str
+    key: str
+    timings: dict[str, float] = {}
 
 
 class StorageClient(Protocol):
@@ -21,16 +58,136 @@ class StorageClient(Protocol):
 
 
 class TranscriptionBackend(ABC):
+    version: str = "1"
+
+    @property
+    def name(self) -> str:
+        """Identifier of the backend, used in transcript cache keys."""
+        return type(self).__name__
+
+    @property
+    def options(self) -> dict:
+        """Settings that change the output (language, model, ...), used in cache keys."""
+        return {}
+
+    def warmup(self) -> None:
+        """Load models and other expensive state before the first transcription.
+
+        Called once per process before traffic is accepted, or once in the
+        parent before worker processes are forked so they share the loaded
+        model copy-on-write. The default does nothing.
+        """
+
+    def job_metadata(self) -> dict:
+        """Details of the calling thread's latest job, stored with its transcript.
+
+        Backends that make per-job choices (such as which service handled
+        the audio) report them here. The default reports nothing.
+        """
+        return {}
+
+    def cache_identity(self, audio_bytes: bytes) -> BackendIdentity:
+        """The backend expected to transcribe audio_bytes, whose identity keys the cache lookup.
+
+        Backends that delegate jobs to others (such as a router) answer
+        with the delegate, so a transcript cached from one delegate is not
+        served where another would have been used. The default is self.
+        """
+        return self
+
+    def job_cache_identity(self) -> BackendIdentity:
+        """The backend that transcribed the calling thread's latest job, whose identity keys the cache entry."""
+        return self
+
     @abstractmethod
     def transcribe(self, audio_bytes: bytes) -> str:
         """Transcribe audio bytes and return the transcript text."""
         ...
 
 
+class TranscriptWord(BaseModel):
+    text: str
+    start: float
+    end: float
+
+
+class TimedTranscriptionBackend(TranscriptionBackend):
+    """Backend that can also return word-level timestamps."""
+
+    @abstractmethod
+    def transcribe_words(self, audio_bytes: bytes) -> list[TranscriptWord]:
+        """Transcribe audio bytes and return words with start/end times in seconds."""
+        ...
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return " ".join(word.text for word in self.transcribe_words(audio_bytes))
+
+
+class StructuredTranscriptionBackend(TranscriptionBackend):
+    """Backend that returns speaker-labelled utterances with word timings."""
+
+    @abstractmethod
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        """Transcribe audio bytes into a StructuredTranscript."""
+        ...
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return self.transcribe_structured(audio_bytes).plain_text()
+
+
+class MixedOutputTranscriptionBackend(TranscriptionBackend):
+    """Backend whose jobs return structured or plain transcripts, depending on who handles them."""
+
+    @abstractmethod
+    def transcribe_output(self, audio_bytes: bytes) -> Union[StructuredTranscript, str]:
+        """Transcribe audio bytes, structured when the handling backend supports it."""
+        ...
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        output = self.transcribe_output(audio_bytes)
+        return output.plain_text() if isinstance(output, StructuredTranscript) else output
+
+
+class TranscriptSegment(BaseModel):
+    index: int
+    start: float
+    end: Optional[float] = None
+    text: str
+
+
+class IncrementalTranscriptionBackend(TranscriptionBackend):
+    """Backend that yields the transcript segment by segment as it is produced."""
+
+    @abstractmethod
+    def transcribe_segments(
+        self,
+        audio_bytes: bytes,
+        checkpoint: Optional[SegmentCheckpoint] = None,
+    ) -> Iterator[TranscriptSegment]:
+        """Yield non-overlapping transcript segments in order.
+
+        Each segment's end is None when it runs to the end of the audio.
+        With a checkpoint, segments saved by an earlier attempt are reused
+        and every newly transcribed segment is saved as soon as it finishes.
+        """
+        ...
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return join_segment_texts(segment.text for segment in self.transcribe_segments(audio_bytes))
+
+
+def join_segment_texts(texts: Iterable[str]) -> str:
+    """Join segment texts, skipping segments that contributed no words."""
+    return " ".join(text for text in texts if text)
+
+
 def generate_transcript(
     event: AudioExtractedEvent,
     backend: TranscriptionBackend,
     storage_client: StorageClient,
+    cache: Optional[TranscriptCache] = None,
+    on_partial: Optional[Callable[[TranscriptPartialEvent], None]] = None,
+    checkpoints: Optional[SegmentCheckpointStore] = None,
 ) -> TranscriptCreatedEvent:
     """
     Generate a transcript from an audio file.
@@ -39,28 +196,177 @@ def generate_transcript(
         event: The AudioExtractedEvent containing the audio bucket/key.
         backend: The transcription backend to use.
         storage_client: The storage client to download audio and upload transcript.
+        cache: Optional transcript cache. Cached transcripts are stored under
+            content-addressed keys (cached_transcript_key); on a hit they are
+            copied to the video's transcript keys and the backend is not called.
+        on_partial: Optional callback for incremental backends. Each segment
+            is stored under transcripts/<video_id>/partials/ and announced
+            with a TranscriptPartialEvent as soon as it is transcribed.
+        checkpoints: Optional segment checkpoint store for incremental
+            backends. If the job was interrupted, a redelivered event only
+            transcribes the segments that are missing before stitching.
+
+    Structured backends (and mixed-output backends whose job came back
+    structured) additionally get a columnar transcript stored next to the
+    plain text one; its key is set as structured_key on the event.
+
+    Whatever the backend reports from job_metadata() (for example the
+    routing decision of RoutingTranscriptionBackend) is set as metadata on
+    the event and kept with the cache entry.
 
     Returns:
         A TranscriptCreatedEvent with the bucket/key to the transcript file.
     """
-    audio_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
+    timings = dict(event.timings)
+
+    with timed(timings, "transcription_download"):
+        audio_bytes = storage_client.download_file(bucket=event.bucket, key=event.key)
     
     if not audio_bytes:
         raise ValueError("Downloaded audio is empty")
 
-    transcript_text = backend.transcribe(audio_bytes)
+    cache_key = None
+    identity = None
+    if cache is not None or checkpoints is not None:
+        identity = backend.cache_identity(audio_bytes)
+        cache_key = transcript_cache_key(audio_bytes, identity)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            copied = _copy_cached_transcript(event, cached, storage_client, timings)
+            if copied is not None:
+                return copied
+
+    transcript_bucket = TRANSCRIPT_BUCKET
+    structured = None
+    segment_count = None
+    with timed(timings, "transcription_transcribe"):
+        incremental = isinstance(backend, IncrementalTranscriptionBackend)
+        if incremental and (on_partial is not None or checkpoints is not None):
+            checkpoint = None
+            if checkpoints is not None:
+                checkpoint = SegmentCheckpoint(checkpoints, cache_key)
+            texts = []
+            for segment in backend.transcribe_segments(audio_bytes, checkpoint=checkpoint):
+                texts.append(segment.text)
+                if on_partial is None:
+                    continue
+                partial_key = f"transcripts/{event.video_id}/partials/{segment.index:05d}.txt"
+                storage_client.upload_file(
+                    bucket=transcript_bucket,
+                    key=partial_key,
+                    content=segment.text.encode("utf-8"),
+                )
+                on_partial(TranscriptPartialEvent(
+                    video_id=event.video_id,
+                    segment_index=segment.index,
+                    start=segment.start,
+                    end=segment.end,
+                    bucket=transcript_bucket,
+                    key=partial_key,
+                    timings=dict(event.timings),
+                ))
+            if on_partial is not None:
+                segment_count = len(texts)
+            transcript_text = join_segment_texts(texts)
+        elif isinstance(backend, StructuredTranscriptionBackend):
+            structured = backend.transcribe_structured(audio_bytes)
+            transcript_text = structured.plain_text()
+        elif isinstance(backend, MixedOutputTranscriptionBackend):
+            output = backend.transcribe_output(audio_bytes)
+            if isinstance(output, StructuredTranscript):
+                structured = output
+                transcript_text = structured.plain_text()
+            else:
+                transcript_text = output
+        else:
+            transcript_text = backend.transcribe(audio_bytes)
+    metadata = backend.job_metadata()
 
-    transcript_bucket = "therapy-transcripts"
-    transcript_key = f"transcripts/{event.video_id}/transcript.txt"
+    transcript_key = video_transcript_key(event.video_id)
+    structured_key = None
     
-    storage_client.upload_file(
+    with timed(timings, "transcription_upload"):
+        storage_client.upload_file(
+            bucket=transcript_bucket,
+            key=transcript_key,
+            content=transcript_text.encode("utf-8")
+        )
+        if structured is not None:
+            structured_key = video_structured_transcript_key(event.video_id)
+            storage_client.upload_file(
+                bucket=transcript_bucket,
+                key=structured_key,
+                content=encode_transcript(structured),
+            )
+
+    if cache is not None:
+        # Keyed by whoever actually transcribed the job, e.g. the route a router spilled over to.
+        job_identity = backend.job_cache_identity()
+        entry_key = cache_key if job_identity is identity else transcript_cache_key(audio_bytes, job_identity)
+        cached = CachedTranscript(
+            bucket=transcript_bucket,
+            key=cached_transcript_key(entry_key),
+            structured_key=cached_transcript_key(entry_key, "transcript.columnar.jsonl") if structured else None,
+            metadata=metadata,
+        )
+        storage_client.upload_file(
+            bucket=transcript_bucket,
+            key=cached.key,
+            content=transcript_text.encode("utf-8"),
+        )
+        if structured is not None:
+            storage_client.upload_file(
+                bucket=transcript_bucket,
+                key=cached.structured_key,
+                content=encode_transcript(structured),
+            )
+        cache.put(entry_key, cached)
+    if checkpoints is not None:
+        checkpoints.clear(cache_key)
+
+    return TranscriptCreatedEvent(
+        video_id=event.video_id,
         bucket=transcript_bucket,
         key=transcript_key,
-        content=transcript_text.encode("utf-8")
+        structured_key=structured_key,
+        segment_count=segment_count,
+        metadata=metadata,
+        timings=timings,
     )
 
+
+def _copy_cached_transcript(
+    event: AudioExtractedEvent,
+    cached: CachedTranscript,
+    storage_client: StorageClient,
+    timings: dict[str, float],
+) -> Optional[TranscriptCreatedEvent]:
+    """Copy a cached transcript to the video's own keys and announce it.
+
+    Returns None if the cached objects can no longer be read: each worker
+    process keeps its own cache index, so another one may have evicted the
+    entry and deleted them, and the audio is then transcribed again.
+    """
+    transcript_key = video_transcript_key(event.video_id)
+    structured_key = None
+    with timed(timings, "transcription_upload"):
+        try:
+            content = storage_client.download_file(bucket=cached.bucket, key=cached.key)
+            structured_content = None
+            if cached.structured_key is not None:
+                structured_content = storage_client.download_file(bucket=cached.bucket, key=cached.structured_key)
+        except Exception:
+            return None
+        storage_client.upload_file(bucket=cached.bucket, key=transcript_key, content=content)
+        if structured_content is not None:
+            structured_key = video_structured_transcript_key(event.video_id)
+            storage_client.upload_file(bucket=cached.bucket, key=structured_key, content=structured_content)
     return TranscriptCreatedEvent(
         video_id=event.video_id,
-        bucket=transcript_bucket,
+        bucket=cached.bucket,
         key=transcript_key,
+        structured_key=structured_key,
+        metadata=cached.metadata,
+        timings=timings,
     )
@@ -0,0 +1,209 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.audio_info import estimate_audio_seconds
+from src.transcription_service.domain import StructuredTranscriptionBackend, TranscriptionBackend
+
+
+class LatencyModel:
+    """
+    Expected job duration as a function of audio length.
+
+    Keeps a sliding window of recent (job seconds / audio seconds) ratios and
+    returns the given percentile scaled by the audio length. Until
+    min_samples jobs have completed, default_ratio is used instead.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        percentile: float = 0.95,
+        default_ratio: float = 0.5,
+        floor_seconds: float = 5.0,
+    ) -> None:
+        self._ratios: "deque[float]" = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._percentile = percentile
+        self._default_ratio = default_ratio
+        self._floor_seconds = floor_seconds
+        self._lock = threading.Lock()
+
+    def record(self, audio_seconds: float, job_seconds: float) -> None:
+        with self._lock:
+            self._ratios.append(job_seconds / max(audio_seconds, 1.0))
+
+    def expected_seconds(self, audio_seconds: float) -> float:
+        """Duration within which the given percentile of jobs of this length finish."""
+        with self._lock:
+            ratios = sorted(self._ratios)
+        ratio = self._default_ratio
+        if len(ratios) >= self._min_samples:
+            ratio = ratios[min(len(ratios) - 1, math.ceil(self._percentile * len(ratios)) - 1)]
+        return max(self._floor_seconds, ratio * max(audio_seconds, 1.0))
+
+
+class HedgeBudget:
+    """Caps hedged requests at max_fraction of all requests seen."""
+
+    def __init__(self, max_fraction: float = 0.05) -> None:
+        self._max_fraction = max_fraction
+        self.requests = 0
+        self.hedges = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self._max_fraction * self.requests:
+                self.denied += 1
+                return False
+            self.hedges += 1
+            return True
+
+
+class HedgeStats(BaseModel):
+    requests: int
+    hedges: int
+    hedge_wins: int
+    denied: int
+
+
+class HedgedTranscriptionBackend(TranscriptionBackend):
+    """
+    Sends a duplicate job to a secondary backend when the primary runs long.
+
+    The primary gets until the latency model's p95 for the audio length.
+    If it has not finished by then and the hedge budget allows it, the same
+    audio goes to the secondary (for example another region), the first
+    result wins and the other job is cancelled. Backends with
+    submit_structured() (such as RemoteASRTranscriptionBackend, which then
+    deletes the provider's job) are really cancelled; for other backends
+    the losing result is discarded.
+
+    The latency model only learns the primary's latency: how long it took,
+    or, when the secondary won, how long it had run by then (a lower bound).
+
+    Use hedged_backend() to get the structured variant when both backends
+    return structured transcripts.
+    """
+
+    def __init__(
+        self,
+        primary: TranscriptionBackend,
+        secondary: TranscriptionBackend,
+        budget: Optional[HedgeBudget] = None,
+        latency: Optional[LatencyModel] = None,
+        max_workers: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._primary = primary
+        self._secondary = secondary
+        self._budget = budget or HedgeBudget()
+        self._latency = latency or LatencyModel()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-transcription")
+        self._clock = clock
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._primary.name
+
+    @property
+    def version(self) -> str:
+        return self._primary.version
+
+    @property
+    def options(self) -> dict:
+        return self._primary.options
+
+    def warmup(self) -> None:
+        self._primary.warmup()
+        self._secondary.warmup()
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return self._hedge(audio_bytes, "transcribe")
+
+    def stats(self) -> HedgeStats:
+        with self._lock:
+            hedge_wins = self._hedge_wins
+        return HedgeStats(
+            requests=self._budget.requests,
+            hedges=self._budget.hedges,
+            hedge_wins=hedge_wins,
+            denied=self._budget.denied,
+        )
+
+    def _hedge(self, audio_bytes: bytes, method: str) -> Any:
+        audio_seconds = estimate_audio_seconds(audio_bytes)
+        self._budget.record_request()
+
+        started = self._clock()
+        primary = self._start(self._primary, method, audio_bytes)
+        done, _ = wait([primary], timeout=self._latency.expected_seconds(audio_seconds))
+        if done or not self._budget.try_acquire():
+            result = primary.result()
+            self._latency.record(audio_seconds, self._clock() - started)
+            return _as_output(result, method)
+
+        secondary = self._start(self._secondary, method, audio_bytes)
+        pending = {primary, secondary}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is None and pending:
+                # One job failed; wait for the other instead of failing fast.
+                continue
+            winner = winner or next(iter(done))
+            for loser in pending:
+                loser.cancel()
+            if winner is secondary:
+                with self._lock:
+                    self._hedge_wins += 1
+            self._latency.record(audio_seconds, self._clock() - started)
+            return _as_output(winner.result(), method)
+
+    def _start(self, backend: TranscriptionBackend, method: str, audio_bytes: bytes) -> Future:
+        # Jobs started with submit_structured() can be cancelled; plain text is taken from them at the end.
+        if hasattr(backend, "submit_structured"):
+            return backend.submit_structured(audio_bytes)
+        return self._executor.submit(getattr(backend, method), audio_bytes)
+
+
+def _as_output(result: Any, method: str) -> Any:
+    if method == "transcribe" and isinstance(result, StructuredTranscript):
+        return result.plain_text()
+    return result
+
+
+class HedgedStructuredTranscriptionBackend(HedgedTranscriptionBackend, StructuredTranscriptionBackend):
+    """HedgedTranscriptionBackend over two structured backends."""
+
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return self._hedge(audio_bytes, "transcribe_structured")
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return self.transcribe_structured(audio_bytes).plain_text()
+
+
+def hedged_backend(
+    primary: TranscriptionBackend,
+    secondary: TranscriptionBackend,
+    **kwargs: Any,
+) -> HedgedTranscriptionBackend:
+    """Wrap two backends in a hedging backend, keeping structured output if both provide it."""
+    if isinstance(primary, StructuredTranscriptionBackend) and isinstance(secondary, StructuredTranscriptionBackend):
+        return HedgedStructuredTranscriptionBackend(primary, secondary, **kwargs)
+    return HedgedTranscriptionBackend(primary, secondary, **kwargs)
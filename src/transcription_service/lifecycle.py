@@ -0,0 +1,205 @@
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from src.transcription_service.domain import TranscriptionBackend
+
+
+class StartupReport(BaseModel):
+    backend: str
+    construct_seconds: float = 0.0
+    warmup_seconds: float
+    first_transcribe_seconds: Optional[float] = None
+    max_rss_bytes: int
+
+
+class ReadinessGate:
+    """
+    Tracks whether the worker's backend is warmed up and able to take traffic.
+
+    The state moves from "starting" to "ready", or to "failed" if warmup
+    raised or (for the parent of forked workers) a worker exited. The
+    /health endpoint reports it so orchestrators only route work to
+    warmed-up, running workers.
+    """
+
+    def __init__(self) -> None:
+        self._ready = threading.Event()
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.report: Optional[StartupReport] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self, report: Optional[StartupReport] = None) -> None:
+        self.report = report
+        self.state = "ready"
+        self._ready.set()
+
+    def mark_failed(self, error: BaseException) -> None:
+        """Close the gate, whether the worker never got ready or stopped working later."""
+        self._ready.clear()
+        self.state = "failed"
+        self.error = str(error)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until ready; returns False on timeout."""
+        return self._ready.wait(timeout)
+
+
+def warm_up_backend(
+    backend: TranscriptionBackend,
+    gate: Optional[ReadinessGate] = None,
+    sample_audio: Optional[bytes] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> StartupReport:
+    """
+    Warm up a backend and open the readiness gate.
+
+    Args:
+        backend: The backend to warm up.
+        gate: Optional gate marked ready on success and failed on error.
+        sample_audio: Optional audio transcribed once after warmup, so lazy
+            initialisation on the first call is paid before traffic arrives
+            and measured in the report.
+        clock: Clock used for the timings.
+
+    Returns:
+        A StartupReport with the warmup timings.
+    """
+    try:
+        started = clock()
+        backend.warmup()
+        warmup_seconds = clock() - started
+
+        first_transcribe_seconds = None
+        if sample_audio is not None:
+            started = clock()
+            backend.transcribe(sample_audio)
+            first_transcribe_seconds = clock() - started
+    except Exception as exc:
+        if gate is not None:
+            gate.mark_failed(exc)
+        raise
+
+    report = StartupReport(
+        backend=backend.name,
+        warmup_seconds=warmup_seconds,
+        first_transcribe_seconds=first_transcribe_seconds,
+        max_rss_bytes=max_rss_bytes(),
+    )
+    if gate is not None:
+        gate.mark_ready(report)
+    return report
+
+
+def benchmark_startup(
+    backend_factory: Callable[[], TranscriptionBackend],
+    sample_audio: Optional[bytes] = None,
+    runs: int = 3,
+    clock: Callable[[], float] = time.perf_counter,
+) -> list[StartupReport]:
+    """
+    Measure cold-start cost: construction, warmup and first transcription.
+
+    Each run builds a fresh backend from backend_factory, so the numbers
+    reflect what every new worker process pays without preloading.
+    """
+    reports = []
+    for _ in range(runs):
+        started = clock()
+        backend = backend_factory()
+        construct_seconds = clock() - started
+        report = warm_up_backend(backend, sample_audio=sample_audio, clock=clock)
+        report.construct_seconds = construct_seconds
+        reports.append(report)
+    return reports
+
+
+def fork_workers(
+    backend: TranscriptionBackend,
+    processes: int,
+    target: Callable[[TranscriptionBackend, int], None],
+) -> list[int]:
+    """
+    Fork worker processes that share an already warmed-up backend.
+
+    The backend's model is loaded once in the parent; children inherit its
+    memory copy-on-write instead of each loading their own copy. gc.freeze()
+    moves the preloaded objects out of the collector's reach so garbage
+    collection in the children does not touch (and copy) those pages.
+
+    Args:
+        backend: A backend on which warmup() has already been called.
+        processes: Number of worker processes to fork.
+        target: Run in each child with the shared backend and the child's
+            index (0 to processes - 1); the child exits with status 0 when
+            it returns and 1 if it raises.
+
+    Returns:
+        The child process ids.
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Preforked workers need os.fork()")
+
+    gc.collect()
+    gc.freeze()
+    pids = []
+    for index in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                target(backend, index)
+            except BaseException:
+                status = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+        pids.append(pid)
+    return pids
+
+
+def wait_workers(
+    pids: list[int],
+    on_exit: Optional[Callable[[int, int], None]] = None,
+    poll_seconds: float = 0.5,
+) -> list[int]:
+    """
+    Wait for forked workers and return their exit codes, in pid order.
+
+    Args:
+        pids: The worker process ids.
+        on_exit: Called with (pid, exit code) as soon as each worker exits,
+            e.g. to fail the parent's readiness gate.
+        poll_seconds: How often the workers are checked.
+    """
+    exit_codes: dict[int, int] = {}
+    while len(exit_codes) < len(pids):
+        for pid in pids:
+            if pid in exit_codes:
+                continue
+            exited, status = os.waitpid(pid, os.WNOHANG)
+            if exited:
+                exit_codes[pid] = os.waitstatus_to_exitcode(status)
+                if on_exit is not None:
+                    on_exit(pid, exit_codes[pid])
+        if len(exit_codes) < len(pids):
+            time.sleep(poll_seconds)
+    return [exit_codes[pid] for pid in pids]
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return usage if sys.platform == "darwin" else usage * 1024
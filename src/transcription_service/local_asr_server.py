@@ -0,0 +1,182 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Hundreds of clients connect at once; the default backlog of 5 drops SYNs.
+    request_queue_size = 1024
+
+
+class LocalASRServer:
+    """
+    Local stand-in for the remote diarizing ASR API, for offline throughput tests.
+
+    Implements the subset of the AssemblyAI v2 API used by
+    AsyncRemoteASRClient: POST /v2/upload, POST /v2/transcript,
+    GET /v2/transcript/<id> and DELETE /v2/transcript/<id>. Jobs report "queued", then "processing", and
+    complete processing_seconds after submission with a two-speaker
+    transcript derived from the audio size. Every throttle_every-th request
+    is answered with 429 to exercise client retries, and audio starting
+    with b"error" produces a failed job.
+    """
+
+    def __init__(
+        self,
+        processing_seconds: float = 0.05,
+        throttle_every: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.processing_seconds = processing_seconds
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.throttled = 0
+        self.deleted: list[str] = []
+        self._uploads: dict[str, bytes] = {}
+        self._jobs: dict[str, tuple[float, str]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalASRServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-asr-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalASRServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                if server._throttle(self):
+                    return
+                length = int(self.headers.get("content-length", "0"))
+                body = self.rfile.read(length)
+                if self.path == "/v2/upload":
+                    upload_id = server._new_id("upload")
+                    with server._lock:
+                        server._uploads[upload_id] = body
+                    self._reply(200, {"upload_url": f"{server.base_url}/uploads/{upload_id}"})
+                elif self.path == "/v2/transcript":
+                    audio_url = json.loads(body)["audio_url"]
+                    job_id = server._new_id("job")
+                    with server._lock:
+                        server._jobs[job_id] = (time.monotonic(), audio_url.rsplit("/", 1)[-1])
+                    self._reply(200, {"id": job_id, "status": "queued"})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_GET(self) -> None:
+                if server._throttle(self):
+                    return
+                prefix = "/v2/transcript/"
+                job = None
+                if self.path.startswith(prefix):
+                    with server._lock:
+                        job = server._jobs.get(self.path[len(prefix):])
+                if job is None:
+                    self._reply(404, {"error": "not found"})
+                    return
+                self._reply(200, server._job_status(self.path[len(prefix):], *job))
+
+            def do_DELETE(self) -> None:
+                if server._throttle(self):
+                    return
+                job_id = self.path[len("/v2/transcript/"):] if self.path.startswith("/v2/transcript/") else ""
+                with server._lock:
+                    job = server._jobs.pop(job_id, None)
+                    if job is not None:
+                        server.deleted.append(job_id)
+                if job is None:
+                    self._reply(404, {"error": "not found"})
+                    return
+                self._reply(200, {"id": job_id, "status": "deleted"})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}-{next(self._ids)}"
+
+    def _throttle(self, handler: BaseHTTPRequestHandler) -> bool:
+        with self._lock:
+            self.requests += 1
+            throttle = self.throttle_every is not None and self.requests % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+        if throttle:
+            handler._reply(429, {"error": "rate limited"})
+        return throttle
+
+    def _job_status(self, job_id: str, submitted_at: float, upload_id: str) -> dict:
+        elapsed = time.monotonic() - submitted_at
+        if elapsed < self.processing_seconds / 2:
+            return {"id": job_id, "status": "queued"}
+        if elapsed < self.processing_seconds:
+            return {"id": job_id, "status": "processing"}
+
+        with self._lock:
+            audio = self._uploads.get(upload_id, b"")
+        if audio.startswith(b"error"):
+            return {"id": job_id, "status": "error", "error": "could not decode audio"}
+
+        utterances = [
+            _utterance("A", 0, ["hello", "how", "are", "you"]),
+            _utterance("B", 2000, ["fine", "thanks", f"{len(audio)}", "bytes"]),
+        ]
+        return {
+            "id": job_id,
+            "status": "completed",
+            "text": " ".join(utterance["text"] for utterance in utterances),
+            "utterances": utterances,
+        }
+
+
+def _utterance(speaker: str, start_ms: int, words: list[str]) -> dict:
+    timed_words = [
+        {"text": word, "start": start_ms + 400 * index, "end": start_ms + 400 * index + 300, "speaker": speaker}
+        for index, word in enumerate(words)
+    ]
+    return {
+        "speaker": speaker,
+        "start": timed_words[0]["start"],
+        "end": timed_words[-1]["end"],
+        "text": " ".join(words),
+        "words": timed_words,
+    }
@@ -1,10 +1,19 @@
+import functools
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import pika
 from pydantic import BaseModel
 
+from src.shared.redelivery import TRANSIENT_ERRORS, nack_failed_message
+from src.shared.timings import record_queue_wait
 from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.transcription_service.checkpoints import SegmentCheckpointStore
 from src.transcription_service.domain import TranscriptionBackend, StorageClient
+from src.transcription_service.remote_asr import TRANSIENT_REMOTE_ASR_ERRORS
+from src.transcription_service.routing import RoutingBudgetExceededError
+from src.transcription_service.transcript_cache import TranscriptCache
 from src.transcription_service.worker import TranscriptEventPublisher, process_audio_extracted_event
 
 
@@ -23,11 +32,19 @@ class RabbitMQAudioExtractedConsumer:
         storage_client: StorageClient,
         backend: TranscriptionBackend,
         publisher: TranscriptEventPublisher,
+        cache: Optional[TranscriptCache] = None,
+        max_in_flight: int = 1,
+        publish_partials: bool = False,
+        checkpoints: Optional[SegmentCheckpointStore] = None,
     ) -> None:
         self._config = config
         self._storage_client = storage_client
         self._backend = backend
         self._publisher = publisher
+        self._cache = cache
+        self._max_in_flight = max_in_flight
+        self._publish_partials = publish_partials
+        self._checkpoints = checkpoints
 
     def run_forever(self) -> None:
         credentials = pika.PlainCredentials(
@@ -44,15 +61,23 @@ class RabbitMQAudioExtractedConsumer:
         channel = connection.channel()
         channel.queue_declare(queue=self._config.queue_name, durable=True)
 
+        if self._max_in_flight > 1:
+            self._consume_concurrently(connection, channel)
+            return
+
         def _callback(ch, method, properties, body: bytes) -> None:
             data = json.loads(body.decode("utf-8"))
             event = AudioExtractedEvent(**data)
+            record_queue_wait(event.timings, "transcription_queue_wait", properties)
 
             process_audio_extracted_event(
                 event,
                 storage_client=self._storage_client,
                 backend=self._backend,
                 publisher=self._publisher,
+                cache=self._cache,
+                publish_partials=self._publish_partials,
+                checkpoints=self._checkpoints,
             )
 
             ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -63,3 +88,60 @@ class RabbitMQAudioExtractedConsumer:
         )
 
         channel.start_consuming()
+
+    def _consume_concurrently(self, connection, channel) -> None:
+        """Process up to max_in_flight messages at once, acking each as it completes.
+
+        Used with backends that wait on a remote service, such as
+        RemoteASRTranscriptionBackend, so one worker keeps many jobs running.
+        Acks are handed back to the connection thread because pika channels
+        are not thread-safe. A failed message is logged; it is requeued only
+        for transient errors (connection problems, an overloaded provider, a
+        job that did not finish in time, routes out of budget) and
+        dead-lettered otherwise, so a
+        malformed event or undecodable audio is not redelivered forever.
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_in_flight,
+            thread_name_prefix="transcription-worker",
+        )
+        channel.basic_qos(prefetch_count=self._max_in_flight)
+        transient_errors = TRANSIENT_ERRORS + TRANSIENT_REMOTE_ASR_ERRORS + (RoutingBudgetExceededError,)
+
+        def _process(delivery_tag: int, event: AudioExtractedEvent) -> None:
+            try:
+                process_audio_extracted_event(
+                    event,
+                    storage_client=self._storage_client,
+                    backend=self._backend,
+                    publisher=self._publisher,
+                    cache=self._cache,
+                    publish_partials=self._publish_partials,
+                    checkpoints=self._checkpoints,
+                )
+            except Exception as exc:
+                ack = nack_failed_message(channel, delivery_tag, exc, transient_errors)
+            else:
+                ack = functools.partial(channel.basic_ack, delivery_tag=delivery_tag)
+            connection.add_callback_threadsafe(ack)
+
+        def _callback(ch, method, properties, body: bytes) -> None:
+            try:
+                data = json.loads(body.decode("utf-8"))
+                event = AudioExtractedEvent(**data)
+            except Exception as exc:
+                nack_failed_message(ch, method.delivery_tag, exc)()
+                return
+            record_queue_wait(event.timings, "transcription_queue_wait", properties)
+
+            executor.submit(_process, method.delivery_tag, event)
+
+        channel.basic_consume(
+            queue=self._config.queue_name,
+            on_message_callback=_callback,
+        )
+
+        try:
+            channel.start_consuming()
+        finally:
+            executor.shutdown(wait=True)
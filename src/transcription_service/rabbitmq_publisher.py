@@ -3,7 +3,8 @@ import json
 import pika
 from pydantic import BaseModel
 
-from src.transcription_service.domain import TranscriptCreatedEvent
+from src.shared.timings import enqueue_properties
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
 from src.transcription_service.worker import TranscriptEventPublisher
 
 
@@ -13,6 +14,7 @@ class RabbitMQConfig(BaseModel):
     username: str
     password: str
     queue_name: str = "transcript.created"
+    partial_queue_name: str = "transcript.partial"
 
 
 class RabbitMQTranscriptEventPublisher(TranscriptEventPublisher):
@@ -21,6 +23,12 @@ class RabbitMQTranscriptEventPublisher(TranscriptEventPublisher):
         self._config = config
 
     def publish_transcript_created(self, event: TranscriptCreatedEvent) -> None:
+        self._publish(self._config.queue_name, event)
+
+    def publish_transcript_partial(self, event: TranscriptPartialEvent) -> None:
+        self._publish(self._config.partial_queue_name, event)
+
+    def _publish(self, queue_name: str, event: BaseModel) -> None:
         credentials = pika.PlainCredentials(
             self._config.username,
             self._config.password,
@@ -35,14 +43,15 @@ class RabbitMQTranscriptEventPublisher(TranscriptEventPublisher):
         try:
             channel = connection.channel()
 
-            channel.queue_declare(queue=self._config.queue_name, durable=True)
+            channel.queue_declare(queue=queue_name, durable=True)
 
             body = json.dumps(event.model_dump()).encode("utf-8")
 
             channel.basic_publish(
                 exchange="",
-                routing_key=self._config.queue_name,
+                routing_key=queue_name,
                 body=body,
+                properties=enqueue_properties(),
             )
         finally:
             connection.close()
@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from src.shared.retry import RetryConfig
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.domain import StructuredTranscriptionBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteASRError(Exception):
+    """Raised when the remote ASR service rejects or fails a job."""
+
+
+class RemoteASRUnavailableError(RemoteASRError):
+    """Raised when the service stayed overloaded or a job did not finish in time; worth retrying later."""
+
+
+# Errors after which resubmitting the same audio later may succeed.
+TRANSIENT_REMOTE_ASR_ERRORS: tuple[type[BaseException], ...] = (httpx.TransportError, RemoteASRUnavailableError)
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to capacity; acquire()
+    waits until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self._sleep((1 - self._tokens) / self._rate)
+
+
+class PollingConfig(BaseModel):
+    """Poll interval grows by multiplier from initial to max while a job runs."""
+
+    initial_interval: float = 1.0
+    max_interval: float = 15.0
+    multiplier: float = 1.5
+    timeout: float = 4 * 3600
+
+
+class RemoteASRConfig(BaseModel):
+    base_url: str
+    api_key: str
+    speaker_labels: bool = True
+    language_code: Optional[str] = None
+    max_in_flight: int = 200
+    requests_per_second: float = 20.0
+    burst: int = 40
+    request_timeout: float = 60.0
+    polling: PollingConfig = PollingConfig()
+    retry: RetryConfig = RetryConfig()
+
+
+_PENDING_STATUSES = {"queued", "processing"}
+
+
+class AsyncRemoteASRClient:
+    """
+    Asyncio client for a submit-then-poll diarizing ASR API (AssemblyAI v2).
+
+    Audio is uploaded, a transcript job is submitted and then polled until
+    it completes. Up to max_in_flight jobs run concurrently; every HTTP
+    request first takes a token from a shared bucket, so polling hundreds of
+    jobs stays under the provider's request rate.
+    """
+
+    def __init__(
+        self,
+        config: RemoteASRConfig,
+        http_client: Optional[httpx.AsyncClient] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._config = config
+        self._http = http_client or httpx.AsyncClient(
+            base_url=config.base_url,
+            headers={"authorization": config.api_key},
+            timeout=config.request_timeout,
+        )
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._bucket = TokenBucket(config.requests_per_second, config.burst, sleep=sleep)
+        self._slots = asyncio.Semaphore(config.max_in_flight)
+        self.in_flight = 0
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        """Upload, submit and poll one job, returning its structured transcript.
+
+        If the call is cancelled while the job runs (e.g. a hedged request
+        that lost), the job is deleted so the provider stops working on it.
+        """
+        async with self._slots:
+            self.in_flight += 1
+            submission = asyncio.ensure_future(self.submit(audio_bytes))
+            try:
+                # Shielded, so a job created just as the call is cancelled still gets its id and is deleted.
+                job_id = await asyncio.shield(submission)
+                result = await self.wait(job_id)
+            except asyncio.CancelledError:
+                await self._delete_submitted(submission)
+                raise
+            finally:
+                self.in_flight -= 1
+        return to_structured_transcript(result)
+
+    async def _delete_submitted(self, submission: "asyncio.Future[str]") -> None:
+        try:
+            job_id = await submission
+        except Exception:
+            return
+        await self.delete(job_id)
+
+    async def delete(self, job_id: str) -> None:
+        """Delete a transcript job, cancelling it if it is still running; failures are only logged."""
+        try:
+            await self._request("DELETE", f"/v2/transcript/{job_id}")
+        except (RemoteASRError, httpx.TransportError):
+            logger.warning("Could not delete transcript job %s", job_id, exc_info=True)
+
+    async def submit(self, audio_bytes: bytes) -> str:
+        """Upload audio and submit a transcript job, returning the job id."""
+        upload = await self._request("POST", "/v2/upload", content=audio_bytes)
+        body: dict[str, Any] = {
+            "audio_url": upload["upload_url"],
+            "speaker_labels": self._config.speaker_labels,
+        }
+        if self._config.language_code:
+            body["language_code"] = self._config.language_code
+        job = await self._request("POST", "/v2/transcript", json=body)
+        return job["id"]
+
+    async def wait(self, job_id: str) -> dict:
+        """Poll a job until it completes and return the provider's result."""
+        polling = self._config.polling
+        interval = polling.initial_interval
+        waited = 0.0
+        last_status = None
+        while True:
+            job = await self._request("GET", f"/v2/transcript/{job_id}")
+            status = job.get("status")
+            if status == "completed":
+                return job
+            if status not in _PENDING_STATUSES:
+                raise RemoteASRError(f"Transcript job {job_id} failed: {job.get('error') or status}")
+            if waited >= polling.timeout:
+                raise RemoteASRUnavailableError(f"Transcript job {job_id} timed out after {waited:.0f}s")
+
+            # Queued jobs back off quickly; once the provider starts processing,
+            # restart from the short interval since completion is now closer.
+            if last_status == "queued" and status == "processing":
+                interval = polling.initial_interval
+            last_status = status
+            await self._sleep(interval)
+            waited += interval
+            interval = min(polling.max_interval, interval * polling.multiplier)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> dict:
+        retry = self._config.retry
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            retry_after = None
+            try:
+                response = await self._http.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                error: Exception = exc
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code != 429 and response.status_code < 500:
+                    raise RemoteASRError(f"{method} {url} failed with {response.status_code}: {response.text}")
+                error = RemoteASRUnavailableError(f"{method} {url} failed with {response.status_code}")
+                retry_after = _parse_retry_after(response)
+
+            attempt += 1
+            if attempt >= retry.max_attempts:
+                raise error
+            delay = self._rng.uniform(0, min(retry.max_delay, retry.base_delay * 2 ** (attempt - 1)))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            await self._sleep(delay)
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def to_structured_transcript(result: dict) -> StructuredTranscript:
+    """
+    Convert a completed AssemblyAI transcript into a StructuredTranscript.
+
+    Times are converted from milliseconds to seconds. Without diarization
+    the whole transcript becomes a single utterance with an empty speaker.
+    """
+    utterances = result.get("utterances")
+    if not utterances:
+        words = result.get("words") or []
+        utterances = [{
+            "speaker": "",
+            "start": words[0]["start"] if words else 0,
+            "end": words[-1]["end"] if words else 0,
+            "text": result.get("text") or "",
+            "words": words,
+        }]
+
+    transcript = StructuredTranscript()
+    for index, utterance in enumerate(utterances):
+        transcript.speaker.append(str(utterance.get("speaker") or ""))
+        transcript.start.append(utterance["start"] / 1000)
+        transcript.end.append(utterance["end"] / 1000)
+        transcript.text.append(utterance["text"])
+        for word in utterance.get("words") or []:
+            transcript.word_text.append(word["text"])
+            transcript.word_start.append(word["start"] / 1000)
+            transcript.word_end.append(word["end"] / 1000)
+            transcript.word_utterance.append(index)
+    return transcript
+
+
+class RemoteASRTranscriptionBackend(StructuredTranscriptionBackend):
+    """
+    Synchronous TranscriptionBackend over AsyncRemoteASRClient.
+
+    The client runs on a private event loop thread, so any number of worker
+    threads can call transcribe_structured() (or submit_structured()) at
+    once while all their jobs share one loop, one connection pool and one
+    rate limiter.
+    """
+
+    version = "v2"
+
+    def __init__(
+        self,
+        config: RemoteASRConfig,
+        client_factory: Optional[Callable[[RemoteASRConfig], AsyncRemoteASRClient]] = None,
+    ) -> None:
+        self._config = config
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="remote-asr-loop", daemon=True)
+        self._thread.start()
+        factory = client_factory or AsyncRemoteASRClient
+
+        async def _create() -> AsyncRemoteASRClient:
+            return factory(config)
+
+        self._client = asyncio.run_coroutine_threadsafe(_create(), self._loop).result()
+
+    @property
+    def name(self) -> str:
+        return "remote-asr"
+
+    @property
+    def options(self) -> dict:
+        return {
+            "speaker_labels": self._config.speaker_labels,
+            "language_code": self._config.language_code,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return self._client.in_flight
+
+    def submit_structured(self, audio_bytes: bytes) -> "Future[StructuredTranscript]":
+        """Start a job on the client loop and return a future for its transcript."""
+        return asyncio.run_coroutine_threadsafe(self._client.transcribe_structured(audio_bytes), self._loop)
+
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return self.submit_structured(audio_bytes).result()
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the loop thread."""
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,309 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Union
+
+from pydantic import BaseModel
+
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.audio_info import estimate_audio_seconds
+from src.transcription_service.domain import (
+    MixedOutputTranscriptionBackend,
+    StructuredTranscriptionBackend,
+    TranscriptionBackend,
+)
+from src.transcription_service.hedging import LatencyModel
+from src.transcription_service.transcript_cache import BackendIdentity
+
+
+class RoutingBudgetExceededError(RuntimeError):
+    """Raised when every route is out of budget and none frees up in time; worth retrying later."""
+
+
+class CostBudget:
+    """Spending limit over a sliding time window, e.g. 20.0 per hour."""
+
+    def __init__(
+        self,
+        limit: float,
+        window_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._limit = limit
+        self._window_seconds = window_seconds
+        self._clock = clock
+        self._charges: "deque[tuple[float, float]]" = deque()
+        self._lock = threading.Lock()
+
+    def spent(self) -> float:
+        with self._lock:
+            return self._spent_locked()
+
+    def allows(self, cost: float) -> bool:
+        with self._lock:
+            return self._spent_locked() + cost <= self._limit
+
+    def charge(self, cost: float) -> None:
+        with self._lock:
+            self._charges.append((self._clock(), cost))
+
+    def refund(self, cost: float) -> None:
+        """Take back the latest charge of cost, e.g. for a job that failed; no-op once it left the window."""
+        with self._lock:
+            for index in range(len(self._charges) - 1, -1, -1):
+                if self._charges[index][1] == cost:
+                    del self._charges[index]
+                    return
+
+    def seconds_until_allows(self, cost: float) -> Optional[float]:
+        """Seconds until enough charges leave the window to allow cost, or None if it never fits."""
+        with self._lock:
+            if cost > self._limit:
+                return None
+            spent = self._spent_locked()
+            now = self._clock()
+            wait = 0.0
+            for charged_at, charged in self._charges:
+                if spent + cost <= self._limit:
+                    break
+                spent -= charged
+                wait = charged_at + self._window_seconds - now
+            return max(wait, 0.0)
+
+    def _spent_locked(self) -> float:
+        cutoff = self._clock() - self._window_seconds
+        while self._charges and self._charges[0][0] <= cutoff:
+            self._charges.popleft()
+        return sum(cost for _, cost in self._charges)
+
+
+class TranscriptionRoute:
+    """
+    A backend the router may send jobs to.
+
+    Args:
+        name: Route name recorded in routing decisions.
+        backend: The transcription backend.
+        max_in_flight: Jobs this backend may run at once before it counts
+            as saturated and jobs spill over to other routes; at least 1.
+        min_audio_seconds: Shortest audio this route is preferred for.
+        max_audio_seconds: Longest audio this route is preferred for (None
+            for no limit).
+        cost_per_audio_minute: Price of one minute of audio on this route.
+        budget: Optional spending limit; the route is skipped while a job
+            would exceed it.
+        latency: Model of recent job durations on this route.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: TranscriptionBackend,
+        max_in_flight: int = 1,
+        min_audio_seconds: float = 0.0,
+        max_audio_seconds: Optional[float] = None,
+        cost_per_audio_minute: float = 0.0,
+        budget: Optional[CostBudget] = None,
+        latency: Optional[LatencyModel] = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"Route {name} needs max_in_flight of at least 1, got {max_in_flight}")
+        self.name = name
+        self.backend = backend
+        self.max_in_flight = max_in_flight
+        self.min_audio_seconds = min_audio_seconds
+        self.max_audio_seconds = max_audio_seconds
+        self.cost_per_audio_minute = cost_per_audio_minute
+        self.budget = budget
+        self.latency = latency or LatencyModel()
+        self.in_flight = 0
+
+    def prefers(self, audio_seconds: float) -> bool:
+        if audio_seconds < self.min_audio_seconds:
+            return False
+        return self.max_audio_seconds is None or audio_seconds <= self.max_audio_seconds
+
+    def cost(self, audio_seconds: float) -> float:
+        return self.cost_per_audio_minute * audio_seconds / 60.0
+
+
+class RoutingDecision(BaseModel):
+    route: str
+    reason: str
+    audio_seconds: float
+    in_flight: dict[str, int]
+    expected_seconds: float
+    cost: float
+
+
+class RoutingTranscriptionBackend(MixedOutputTranscriptionBackend):
+    """
+    Picks a transcription backend per job.
+
+    Each job goes to the route preferred for its audio duration (say a
+    cheap local model for short sessions and a remote high-accuracy
+    service for long ones). When every preferred route is saturated or out
+    of budget the job spills over to any other route that has capacity and
+    budget left, fastest expected finish first, then cheapest. If no route
+    has room, the job queues on the in-budget route with the fewest jobs in
+    flight. A route is never charged past its budget: when every route is
+    out of budget the job waits up to max_budget_wait_seconds for spending
+    to leave a budget window and then fails with RoutingBudgetExceededError.
+
+    Jobs on structured routes come back as StructuredTranscript from
+    transcribe_output(), so generate_transcript keeps their columnar
+    transcript even when other routes only return text. The decision for
+    the latest job of the calling thread is returned by job_metadata() and
+    stored with the transcript, and transcripts are cached under the
+    identity of the route's backend rather than the router's.
+    """
+
+    def __init__(
+        self,
+        routes: list[TranscriptionRoute],
+        clock: Callable[[], float] = time.monotonic,
+        max_budget_wait_seconds: float = 300.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if not routes:
+            raise ValueError("RoutingTranscriptionBackend needs at least one route")
+        self._routes = routes
+        self._clock = clock
+        self._max_budget_wait_seconds = max_budget_wait_seconds
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def name(self) -> str:
+        return "routed"
+
+    @property
+    def options(self) -> dict:
+        return {
+            "routes": [
+                {"name": route.name, "backend": route.backend.name, "version": route.backend.version}
+                for route in self._routes
+            ]
+        }
+
+    def warmup(self) -> None:
+        for route in self._routes:
+            route.backend.warmup()
+
+    def transcribe_output(self, audio_bytes: bytes) -> Union[StructuredTranscript, str]:
+        return self._route(audio_bytes)
+
+    def job_metadata(self) -> dict:
+        decision = getattr(self._local, "decision", None)
+        return {"routing": decision.model_dump()} if decision is not None else {}
+
+    def cache_identity(self, audio_bytes: bytes) -> BackendIdentity:
+        # The route choose() would pick right now, without reserving a slot on it.
+        audio_seconds = estimate_audio_seconds(audio_bytes)
+        with self._lock:
+            picked = self._pick(audio_seconds)
+        route = picked[0] if picked is not None else min(self._routes, key=lambda route: route.cost(audio_seconds))
+        return route.backend.cache_identity(audio_bytes)
+
+    def job_cache_identity(self) -> BackendIdentity:
+        route = getattr(self._local, "route", None)
+        return route.backend.job_cache_identity() if route is not None else self
+
+    def choose(self, audio_seconds: float) -> tuple[TranscriptionRoute, RoutingDecision]:
+        """Pick a route for audio of the given length and reserve a slot on it.
+
+        Raises:
+            RoutingBudgetExceededError: If every route stays out of budget
+                for longer than max_budget_wait_seconds.
+        """
+        deadline = self._clock() + self._max_budget_wait_seconds
+        while True:
+            with self._lock:
+                picked = self._pick(audio_seconds)
+                if picked is not None:
+                    route, reason = picked
+                    decision = RoutingDecision(
+                        route=route.name,
+                        reason=reason,
+                        audio_seconds=audio_seconds,
+                        in_flight={candidate.name: candidate.in_flight for candidate in self._routes},
+                        expected_seconds=route.latency.expected_seconds(audio_seconds),
+                        cost=route.cost(audio_seconds),
+                    )
+                    route.in_flight += 1
+                    if route.budget is not None:
+                        route.budget.charge(decision.cost)
+                    return route, decision
+                waits = [route.budget.seconds_until_allows(route.cost(audio_seconds)) for route in self._routes]
+            waits = [wait for wait in waits if wait is not None]
+            if not waits or self._clock() + min(waits) > deadline:
+                raise RoutingBudgetExceededError(
+                    f"Every route is out of budget for {audio_seconds:.0f}s of audio"
+                )
+            self._sleep(min(waits))
+
+    def _pick(self, audio_seconds: float) -> Optional[tuple[TranscriptionRoute, str]]:
+        def within_budget(route: TranscriptionRoute) -> bool:
+            return route.budget is None or route.budget.allows(route.cost(audio_seconds))
+
+        def fastest(routes: list[TranscriptionRoute]) -> TranscriptionRoute:
+            return min(
+                routes,
+                key=lambda route: (route.latency.expected_seconds(audio_seconds), route.cost(audio_seconds)),
+            )
+
+        affordable = [route for route in self._routes if within_budget(route)]
+        available = [route for route in affordable if route.in_flight < route.max_in_flight]
+
+        preferred = [route for route in available if route.prefers(audio_seconds)]
+        if preferred:
+            return fastest(preferred), "preferred"
+        if available:
+            return fastest(available), "spillover"
+        if affordable:
+            return min(affordable, key=lambda route: route.in_flight / route.max_in_flight), "saturated"
+        return None
+
+    def _route(self, audio_bytes: bytes):
+        audio_seconds = estimate_audio_seconds(audio_bytes)
+        route, decision = self.choose(audio_seconds)
+        self._local.decision = decision
+        self._local.route = route
+        started = self._clock()
+        try:
+            if isinstance(route.backend, StructuredTranscriptionBackend):
+                result = route.backend.transcribe_structured(audio_bytes)
+            else:
+                result = route.backend.transcribe(audio_bytes)
+        except Exception:
+            # choose() charged the budget up front; a job that failed is not paid for.
+            if route.budget is not None:
+                route.budget.refund(decision.cost)
+            raise
+        finally:
+            with self._lock:
+                route.in_flight -= 1
+        route.latency.record(audio_seconds, self._clock() - started)
+        return result
+
+
+class RoutingStructuredTranscriptionBackend(RoutingTranscriptionBackend, StructuredTranscriptionBackend):
+    """RoutingTranscriptionBackend over structured backends only."""
+
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return self._route(audio_bytes)
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return self.transcribe_structured(audio_bytes).plain_text()
+
+
+def routing_backend(routes: list[TranscriptionRoute], **kwargs) -> RoutingTranscriptionBackend:
+    """Build a router, always structured if every route provides it.
+
+    Otherwise the router is a MixedOutputTranscriptionBackend that returns
+    structured transcripts from the routes able to produce them.
+    """
+    if all(isinstance(route.backend, StructuredTranscriptionBackend) for route in routes):
+        return RoutingStructuredTranscriptionBackend(routes, **kwargs)
+    return RoutingTranscriptionBackend(routes, **kwargs)
@@ -1,8 +1,12 @@
+import functools
 import os
+import threading
 import time
 from pathlib import Path
 
 import pika.exceptions
+import uvicorn
+from pymongo import MongoClient
 
 from src.transcription_service.rabbitmq_consumer import (
     RabbitMQConsumerConfig,
@@ -12,7 +16,16 @@ from src.transcription_service.rabbitmq_publisher import (
     RabbitMQConfig as PublisherConfig,
     RabbitMQTranscriptEventPublisher,
 )
+from src.shared.compressed_storage import CompressingStorageClient
+from src.transcription_service.app import app, create_app
+from src.transcription_service.checkpoints import MongoSegmentCheckpointStore
 from src.transcription_service.domain import TranscriptionBackend, StorageClient
+from src.transcription_service.hedging import HedgeBudget, hedged_backend
+from src.transcription_service.lifecycle import ReadinessGate, fork_workers, wait_workers, warm_up_backend
+from src.transcription_service.remote_asr import RemoteASRConfig, RemoteASRTranscriptionBackend
+from src.transcription_service.routing import CostBudget, TranscriptionRoute, routing_backend
+from src.transcription_service.segmented import FfmpegWavDecoder, SegmentedTranscriptionBackend, WavSegmenter
+from src.transcription_service.transcript_cache import InMemoryTranscriptCache, delete_cached_transcript
 
 
 class StubTranscriptionBackend(TranscriptionBackend):
@@ -30,6 +43,9 @@ class StubStorageClient:
     def upload_file(self, bucket: str, key: str, content: bytes) -> None:
         print(f"Uploaded {len(content)} bytes to {bucket}/{key}")
 
+    def delete_file(self, bucket: str, key: str) -> None:
+        print(f"Deleted {bucket}/{key}")
+
 
 def main() -> None:
     consumer_config = RabbitMQConsumerConfig(
@@ -46,19 +62,136 @@ def main() -> None:
         username=os.environ["RABBITMQ_USER"],
         password=os.environ["RABBITMQ_PASS"],
         queue_name=os.environ.get("TRANSCRIPT_CREATED_QUEUE", "transcript.created"),
+        partial_queue_name=os.environ.get("TRANSCRIPT_PARTIAL_QUEUE", "transcript.partial"),
     )
 
     publisher = RabbitMQTranscriptEventPublisher(publisher_config)
     backend = StubTranscriptionBackend()
+    parallel_workers = int(os.environ.get("TRANSCRIPTION_PARALLEL_WORKERS", "1"))
+    if parallel_workers > 1 and not FfmpegWavDecoder.available():
+        # The extractor stores mp3, which can only be split once decoded.
+        print("TRANSCRIPTION_PARALLEL_WORKERS ignored: ffmpeg is needed to split mp3 audio into segments")
+        parallel_workers = 1
+    if parallel_workers > 1:
+        backend = SegmentedTranscriptionBackend(
+            backends=[StubTranscriptionBackend() for _ in range(parallel_workers)],
+            segmenter=WavSegmenter(decoder=FfmpegWavDecoder()),
+            segment_seconds=float(os.environ.get("TRANSCRIPTION_SEGMENT_SECONDS", "300")),
+            overlap_seconds=float(os.environ.get("TRANSCRIPTION_OVERLAP_SECONDS", "5")),
+        )
+    max_in_flight = 1
+    if os.environ.get("REMOTE_ASR_URL"):
+        local_backend = backend
+        remote_config = RemoteASRConfig(
+            base_url=os.environ["REMOTE_ASR_URL"],
+            api_key=os.environ["REMOTE_ASR_API_KEY"],
+            max_in_flight=int(os.environ.get("REMOTE_ASR_MAX_IN_FLIGHT", "200")),
+            requests_per_second=float(os.environ.get("REMOTE_ASR_REQUESTS_PER_SECOND", "20")),
+        )
+        backend = RemoteASRTranscriptionBackend(remote_config)
+        max_in_flight = remote_config.max_in_flight
+        if os.environ.get("REMOTE_ASR_HEDGE_URL"):
+            hedge_config = remote_config.model_copy(update={
+                "base_url": os.environ["REMOTE_ASR_HEDGE_URL"],
+                "api_key": os.environ.get("REMOTE_ASR_HEDGE_API_KEY", remote_config.api_key),
+            })
+            backend = hedged_backend(
+                backend,
+                RemoteASRTranscriptionBackend(hedge_config),
+                budget=HedgeBudget(float(os.environ.get("TRANSCRIPTION_HEDGE_BUDGET", "0.05"))),
+            )
+        if os.environ.get("TRANSCRIPTION_ROUTE_REMOTE_MIN_SECONDS"):
+            # Short sessions stay on the local backend, long ones go remote. Jobs
+            # routed remote keep their structured transcript; the local route has none.
+            remote_min_seconds = float(os.environ["TRANSCRIPTION_ROUTE_REMOTE_MIN_SECONDS"])
+            remote_budget = os.environ.get("REMOTE_ASR_HOURLY_BUDGET")
+            backend = routing_backend([
+                TranscriptionRoute(
+                    "local",
+                    local_backend,
+                    max_in_flight=int(os.environ.get("TRANSCRIPTION_ROUTE_LOCAL_MAX_IN_FLIGHT", "1")),
+                    max_audio_seconds=remote_min_seconds,
+                ),
+                TranscriptionRoute(
+                    "remote",
+                    backend,
+                    max_in_flight=remote_config.max_in_flight,
+                    min_audio_seconds=remote_min_seconds,
+                    cost_per_audio_minute=float(os.environ.get("REMOTE_ASR_COST_PER_MINUTE", "0")),
+                    budget=CostBudget(float(remote_budget)) if remote_budget else None,
+                ),
+            ], max_budget_wait_seconds=float(os.environ.get("TRANSCRIPTION_ROUTE_BUDGET_WAIT_SECONDS", "300")))
     storage_client = StubStorageClient()
+    # The analysis worker reads through a decompressing client (see its build_storage_client).
+    compression = os.environ.get("ARTIFACT_COMPRESSION", "gzip")
+    if compression != "none":
+        storage_client = CompressingStorageClient(storage_client, codec=compression)
+    cache = InMemoryTranscriptCache(
+        max_entries=int(os.environ.get("TRANSCRIPT_CACHE_MAX_ENTRIES", "10000")),
+        ttl_seconds=float(os.environ.get("TRANSCRIPT_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+        # Evicted transcripts are deleted from transcripts/by-hash/ so storage stays bounded too.
+        on_evict=functools.partial(delete_cached_transcript, storage_client),
+    )
+
+    checkpoints = None
+    if os.environ.get("TRANSCRIPTION_CHECKPOINT_MONGO_URI"):
+        checkpoints = MongoSegmentCheckpointStore(
+            MongoClient(os.environ["TRANSCRIPTION_CHECKPOINT_MONGO_URI"], connect=False),
+            db_name=os.environ.get("MONGO_DB_NAME", "therapy_analysis"),
+        )
 
     consumer = RabbitMQAudioExtractedConsumer(
         config=consumer_config,
         storage_client=storage_client,
         backend=backend,
         publisher=publisher,
+        cache=cache,
+        max_in_flight=max_in_flight,
+        publish_partials=os.environ.get("TRANSCRIPT_PARTIAL_EVENTS", "").lower() in ("1", "true", "yes"),
+        checkpoints=checkpoints,
     )
 
+    processes = int(os.environ.get("TRANSCRIPTION_WORKER_PROCESSES", "1"))
+    forked = processes > 1 and max_in_flight == 1
+
+    readiness = ReadinessGate()
+    # The module-level app reports this process's readiness (port 0 disables it).
+    # Forked workers each have their own cache, which they report on their own ports.
+    app.state.cache = None if forked else cache
+    app.state.readiness = readiness
+    health_port = int(os.environ.get("TRANSCRIPTION_HEALTH_PORT", "8000"))
+    if health_port:
+        _serve_health(app, health_port)
+
+    report = warm_up_backend(backend, readiness)
+    print(f"Backend {report.backend} warmed up in {report.warmup_seconds:.2f}s")
+
+    if forked:
+        def run_worker_process(_, index: int) -> None:
+            if health_port:
+                worker_readiness = ReadinessGate()
+                worker_readiness.mark_ready(report)
+                _serve_health(create_app(cache=cache, readiness=worker_readiness), health_port + 1 + index)
+            _run_consumer(consumer)
+
+        def worker_exited(pid: int, exit_code: int) -> None:
+            readiness.mark_failed(RuntimeError(f"Worker {pid} exited with status {exit_code}"))
+
+        # The model is loaded once here and shared copy-on-write by the workers.
+        pids = fork_workers(backend, processes, run_worker_process)
+        exit_codes = wait_workers(pids, on_exit=worker_exited)
+        if any(exit_codes):
+            raise SystemExit(f"Transcription workers exited with {exit_codes}")
+    else:
+        _run_consumer(consumer)
+
+
+def _serve_health(application, port: int) -> None:
+    server = uvicorn.Server(uvicorn.Config(application, host="0.0.0.0", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="transcription-health", daemon=True).start()
+
+
+def _run_consumer(consumer: RabbitMQAudioExtractedConsumer) -> None:
     max_retries = 10
     retry_delay = 2
 
@@ -0,0 +1,376 @@
+import io
+import logging
+import queue
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional, Protocol, Sequence
+
+from pydantic import BaseModel
+
+from src.transcription_service.checkpoints import SegmentCheckpoint
+from src.transcription_service.domain import (
+    IncrementalTranscriptionBackend,
+    TimedTranscriptionBackend,
+    TranscriptionBackend,
+    TranscriptSegment,
+    TranscriptWord,
+    join_segment_texts,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AudioSegment(BaseModel):
+    start: float
+    audio_bytes: bytes
+
+
+class AudioSegmenter(Protocol):
+    def split(
+        self,
+        audio_bytes: bytes,
+        segment_seconds: float,
+        overlap_seconds: float,
+    ) -> list[AudioSegment]:
+        """Split audio into segments that overlap by overlap_seconds."""
+        ...
+
+
+class AudioDecoder(Protocol):
+    def to_wav(self, audio_bytes: bytes) -> bytes:
+        """Decode compressed audio (mp3, flac, ...) into PCM WAV."""
+        ...
+
+
+class FfmpegWavDecoder:
+    """Decodes any audio ffmpeg can read into mono 16-bit PCM WAV.
+
+    ffmpeg writes raw PCM to stdout, which is wrapped in a WAV header here:
+    a WAV written to a pipe has no valid length, so it could not be split.
+
+    Args:
+        ffmpeg_path: The ffmpeg executable.
+        sample_rate: Sample rate of the decoded audio, in Hz.
+    """
+
+    def __init__(self, ffmpeg_path: str = "ffmpeg", sample_rate: int = 16000) -> None:
+        self._ffmpeg_path = ffmpeg_path
+        self._sample_rate = sample_rate
+
+    @staticmethod
+    def available(ffmpeg_path: str = "ffmpeg") -> bool:
+        """Whether the ffmpeg executable can be found."""
+        return shutil.which(ffmpeg_path) is not None
+
+    def to_wav(self, audio_bytes: bytes) -> bytes:
+        completed = subprocess.run(
+            [
+                self._ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(self._sample_rate),
+                "pipe:1",
+            ],
+            input=audio_bytes,
+            capture_output=True,
+            check=True,
+        )
+        return _to_wav(1, 2, self._sample_rate, completed.stdout)
+
+
+class WavSegmenter:
+    """Splits PCM WAV audio into overlapping WAV segments.
+
+    With a decoder, other formats (such as the extractor's mp3) are decoded
+    to WAV first. Without one, audio that is not WAV is returned as a single
+    segment with a warning, so the backend still works but without
+    parallelism.
+
+    Args:
+        decoder: Optional decoder for audio that is not WAV.
+    """
+
+    def __init__(self, decoder: Optional[AudioDecoder] = None) -> None:
+        self._decoder = decoder
+
+    def split(
+        self,
+        audio_bytes: bytes,
+        segment_seconds: float,
+        overlap_seconds: float,
+    ) -> list[AudioSegment]:
+        if not _is_wav(audio_bytes):
+            if self._decoder is None:
+                logger.warning("Audio is not WAV and no decoder is configured; transcribing it as one segment")
+                return [AudioSegment(start=0.0, audio_bytes=audio_bytes)]
+            audio_bytes = self._decoder.to_wav(audio_bytes)
+
+        with wave.open(io.BytesIO(audio_bytes), "rb") as reader:
+            params = reader.getparams()
+            rate = params.framerate
+            total_frames = params.nframes
+            segment_frames = max(1, int(segment_seconds * rate))
+            step_frames = max(1, segment_frames - int(overlap_seconds * rate))
+
+            segments = []
+            start_frame = 0
+            while True:
+                reader.setpos(start_frame)
+                frames = reader.readframes(segment_frames)
+                segments.append(
+                    AudioSegment(
+                        start=start_frame / rate,
+                        audio_bytes=_to_wav(params.nchannels, params.sampwidth, rate, frames),
+                    )
+                )
+                if start_frame + segment_frames >= total_frames:
+                    return segments
+                start_frame += step_frames
+
+
+def _is_wav(audio_bytes: bytes) -> bool:
+    try:
+        wave.open(io.BytesIO(audio_bytes), "rb").close()
+    except (wave.Error, EOFError):
+        return False
+    return True
+
+
+def _to_wav(nchannels: int, sampwidth: int, framerate: int, frames: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(nchannels)
+        writer.setsampwidth(sampwidth)
+        writer.setframerate(framerate)
+        writer.writeframes(frames)
+    return buffer.getvalue()
+
+
+class SegmentedTranscriptionBackend(TimedTranscriptionBackend, IncrementalTranscriptionBackend):
+    """
+    Transcribes long audio by fanning overlapping segments out to a pool of backends.
+
+    Each backend in the pool handles one segment at a time, so wall-clock
+    time scales with the pool size. When every backend returns word timings,
+    words are shifted by their segment's start and the overlap is cut at its
+    midpoint. Otherwise the segment texts are joined and the longest run of
+    words repeated across a segment boundary is dropped.
+
+    transcribe_segments() yields each stitched segment as soon as it and all
+    earlier segments are done, so callers can publish partial transcripts.
+    Given a checkpoint, raw per-segment results are saved as they finish
+    and reused on the next attempt, so a restarted job only transcribes the
+    segments it had not finished.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[TranscriptionBackend],
+        segmenter: AudioSegmenter,
+        segment_seconds: float = 300.0,
+        overlap_seconds: float = 5.0,
+        max_overlap_words: int = 50,
+    ) -> None:
+        if not backends:
+            raise ValueError("At least one transcription backend is required")
+        if overlap_seconds >= segment_seconds:
+            raise ValueError("overlap_seconds must be smaller than segment_seconds")
+        self._backends = list(backends)
+        self._segmenter = segmenter
+        self._segment_seconds = segment_seconds
+        self._overlap_seconds = overlap_seconds
+        self._max_overlap_words = max_overlap_words
+        self._pool: "queue.Queue[TranscriptionBackend]" = queue.Queue()
+        for backend in self._backends:
+            self._pool.put(backend)
+
+    @property
+    def name(self) -> str:
+        return f"segmented:{self._backends[0].name}"
+
+    @property
+    def version(self) -> str:
+        return self._backends[0].version
+
+    @property
+    def options(self) -> dict:
+        return {
+            **self._backends[0].options,
+            "segment_seconds": self._segment_seconds,
+            "overlap_seconds": self._overlap_seconds,
+        }
+
+    def warmup(self) -> None:
+        for backend in self._backends:
+            backend.warmup()
+
+    @property
+    def timed(self) -> bool:
+        """Whether every pooled backend returns word timings."""
+        return all(isinstance(backend, TimedTranscriptionBackend) for backend in self._backends)
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        return join_segment_texts(segment.text for segment in self.transcribe_segments(audio_bytes))
+
+    def transcribe_words(self, audio_bytes: bytes) -> list[TranscriptWord]:
+        if not self.timed:
+            raise TypeError("All pooled backends must be TimedTranscriptionBackend instances")
+        segments = self._split(audio_bytes)
+        results = self._map_segments(segments, lambda backend, audio: backend.transcribe_words(audio))
+        return stitch_words(list(results), self._overlap_seconds)
+
+    def transcribe_segments(
+        self,
+        audio_bytes: bytes,
+        checkpoint: Optional[SegmentCheckpoint] = None,
+    ) -> Iterator[TranscriptSegment]:
+        segments = self._split(audio_bytes)
+        starts = [segment.start for segment in segments]
+        if self.timed:
+            results = self._map_segments(
+                segments,
+                lambda backend, audio: backend.transcribe_words(audio),
+                checkpoint,
+                dump=lambda words: {"words": [word.model_dump() for word in words]},
+                load=lambda saved: [TranscriptWord(**word) for word in saved["words"]],
+            )
+        else:
+            results = self._map_segments(
+                segments,
+                lambda backend, audio: backend.transcribe(audio),
+                checkpoint,
+                dump=lambda text: {"text": text},
+                load=lambda saved: saved["text"],
+            )
+
+        tail: list[str] = []
+        for index, (offset, result) in enumerate(results):
+            lower, upper = _segment_bounds(starts, index, self._overlap_seconds)
+            if self.timed:
+                text = " ".join(word.text for word in _keep_words(offset, result, lower, upper))
+            else:
+                words = result.split()
+                new_words = words[_repeated_prefix(tail, words, self._max_overlap_words):]
+                tail = (tail + new_words)[-self._max_overlap_words:]
+                text = " ".join(new_words)
+            yield TranscriptSegment(
+                index=index,
+                start=offset if lower is None else lower,
+                end=upper,
+                text=text,
+            )
+
+    def _split(self, audio_bytes: bytes) -> list[AudioSegment]:
+        return self._segmenter.split(audio_bytes, self._segment_seconds, self._overlap_seconds)
+
+    def _map_segments(
+        self,
+        segments: list[AudioSegment],
+        call: Callable[[TranscriptionBackend, bytes], Any],
+        checkpoint: Optional[SegmentCheckpoint] = None,
+        dump: Callable[[Any], Any] = lambda result: result,
+        load: Callable[[Any], Any] = lambda saved: saved,
+    ) -> Iterator[tuple[float, Any]]:
+        saved = checkpoint.load() if checkpoint is not None else {}
+
+        def _run(index: int):
+            segment = segments[index]
+            if index in saved:
+                return segment.start, load(saved[index])
+            backend = self._pool.get()
+            try:
+                result = call(backend, segment.audio_bytes)
+            finally:
+                self._pool.put(backend)
+            if checkpoint is not None:
+                checkpoint.save(index, dump(result))
+            return segment.start, result
+
+        pending = [index for index in range(len(segments)) if index not in saved]
+        if len(pending) <= 1:
+            yield from map(_run, range(len(segments)))
+            return
+        with ThreadPoolExecutor(max_workers=min(len(self._backends), len(pending))) as executor:
+            yield from executor.map(_run, range(len(segments)))
+
+
+def _segment_bounds(
+    starts: Sequence[float],
+    index: int,
+    overlap_seconds: float,
+) -> tuple[Optional[float], Optional[float]]:
+    lower = None
+    if index > 0:
+        lower = starts[index] + overlap_seconds / 2
+    upper = None
+    if index + 1 < len(starts):
+        upper = starts[index + 1] + overlap_seconds / 2
+    return lower, upper
+
+
+def _keep_words(
+    offset: float,
+    words: Sequence[TranscriptWord],
+    lower: Optional[float],
+    upper: Optional[float],
+) -> list[TranscriptWord]:
+    kept = []
+    for word in words:
+        start = word.start + offset
+        if lower is not None and start < lower:
+            continue
+        if upper is not None and start >= upper:
+            continue
+        kept.append(TranscriptWord(text=word.text, start=start, end=word.end + offset))
+    return kept
+
+
+def _repeated_prefix(merged: Sequence[str], words: Sequence[str], max_overlap_words: int) -> int:
+    longest = min(len(merged), len(words), max_overlap_words)
+    for size in range(longest, 0, -1):
+        if list(merged[-size:]) == list(words[:size]):
+            return size
+    return 0
+
+
+def stitch_words(
+    segments: Sequence[tuple[float, Sequence[TranscriptWord]]],
+    overlap_seconds: float,
+) -> list[TranscriptWord]:
+    """
+    Stitch per-segment words into one timeline.
+
+    Args:
+        segments: (segment start, words relative to the segment) in order.
+        overlap_seconds: Overlap between consecutive segments.
+
+    Returns:
+        Words with absolute times. In each overlap, words starting before the
+        midpoint come from the earlier segment and the rest from the later one.
+    """
+    starts = [offset for offset, _ in segments]
+    stitched: list[TranscriptWord] = []
+    for index, (offset, words) in enumerate(segments):
+        lower, upper = _segment_bounds(starts, index, overlap_seconds)
+        stitched.extend(_keep_words(offset, words, lower, upper))
+    return stitched
+
+
+def stitch_texts(texts: Sequence[str], max_overlap_words: int = 50) -> str:
+    """
+    Join segment texts, dropping words repeated across each boundary.
+
+    Args:
+        texts: Transcript text of each segment, in order.
+        max_overlap_words: Longest repeated run to look for at a boundary.
+
+    Returns:
+        The stitched transcript text.
+    """
+    merged: list[str] = []
+    for text in texts:
+        words = text.split()
+        merged.extend(words[_repeated_prefix(merged, words, max_overlap_words):])
+    return " ".join(merged)
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol, runtime_checkable
+
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+
+class BackendIdentity(Protocol):
+    name: str
+    version: str
+    options: dict
+
+
+class CachedTranscript(BaseModel):
+    bucket: str
+    key: str
+    structured_key: Optional[str] = None
+    metadata: dict = {}
+
+
+class TranscriptCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    hit_rate: float
+
+
+class TranscriptCache(Protocol):
+    def get(self, cache_key: str) -> Optional[CachedTranscript]:
+        """Return the stored transcript location for cache_key, if any."""
+        ...
+
+    def put(self, cache_key: str, transcript: CachedTranscript) -> None:
+        """Remember where the transcript for cache_key is stored."""
+        ...
+
+
+@runtime_checkable
+class DeletableStorageClient(Protocol):
+    def delete_file(self, bucket: str, key: str) -> None:
+        ...
+
+
+def transcript_cache_key(audio_bytes: bytes, backend: BackendIdentity) -> str:
+    """
+    Build the cache key for transcribing audio_bytes with backend.
+
+    The key covers the audio content, the backend name and version, and the
+    backend options, so a new model or language setting never reuses an old
+    transcript.
+    """
+    audio_digest = hashlib.sha256(audio_bytes).hexdigest()
+    options = json.dumps(backend.options, sort_keys=True, separators=(",", ":"))
+    return f"{audio_digest}:{backend.name}:{backend.version}:{options}"
+
+
+def cached_transcript_key(cache_key: str, suffix: str = "transcript.txt") -> str:
+    """
+    Content-addressed storage key of the transcript cached under cache_key.
+
+    Only the cache writes there, and the digest covers the audio and the
+    backend identity, so unlike transcripts/<video_id>/ the object cannot be
+    overwritten by a later run of the same video with another backend.
+    """
+    digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+    return f"transcripts/by-hash/{digest}.{suffix}"
+
+
+def delete_cached_transcript(storage_client: DeletableStorageClient, cached: CachedTranscript) -> None:
+    """Delete the objects of a cache entry from storage (use as on_evict)."""
+    storage_client.delete_file(bucket=cached.bucket, key=cached.key)
+    if cached.structured_key is not None:
+        storage_client.delete_file(bucket=cached.bucket, key=cached.structured_key)
+
+
+class InMemoryTranscriptCache:
+    """
+    Transcript cache index with LRU eviction and a per-entry TTL.
+
+    Only transcript locations are held here; the transcripts themselves stay
+    in object storage, under cached_transcript_key. Pass on_evict (e.g.
+    delete_cached_transcript bound to the storage client) to remove them
+    when their entry is evicted or expires; otherwise they stay in storage
+    until something else cleans up transcripts/by-hash/.
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted.
+        ttl_seconds: Age at which an entry expires (None to never expire).
+        clock: Monotonic clock used for the TTL.
+        on_evict: Called with each evicted or expired entry, outside the
+            lock; errors are logged and do not fail the cache call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[CachedTranscript], None]] = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[str, tuple[float, CachedTranscript]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, cache_key: str) -> Optional[CachedTranscript]:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            stored_at, transcript = entry
+            expired = self._ttl_seconds is not None and self._clock() - stored_at >= self._ttl_seconds
+            if not expired:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+                return transcript
+
+            del self._entries[cache_key]
+            self._expirations += 1
+            self._misses += 1
+        self._evicted([transcript])
+        return None
+
+    def put(self, cache_key: str, transcript: CachedTranscript) -> None:
+        evicted = []
+        with self._lock:
+            self._entries[cache_key] = (self._clock(), transcript)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_entries:
+                evicted.append(self._entries.popitem(last=False)[1][1])
+                self._evictions += 1
+        self._evicted(evicted)
+
+    def stats(self) -> TranscriptCacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return TranscriptCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries),
+                hit_rate=self._hits / lookups if lookups else 0.0,
+            )
+
+    def _evicted(self, transcripts: list[CachedTranscript]) -> None:
+        if self._on_evict is None:
+            return
+        for transcript in transcripts:
+            try:
+                self._on_evict(transcript)
+            except Exception:
+                logger.exception("Failed to clean up evicted transcript %s/%s", transcript.bucket, transcript.key)
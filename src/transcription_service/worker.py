@@ -1,22 +1,33 @@
+from typing import Optional
+
 from src.audio_extractor_service.domain import AudioExtractedEvent
 from src.transcription_service.domain import (
     TranscriptCreatedEvent,
+    TranscriptPartialEvent,
     TranscriptionBackend,
     generate_transcript,
     StorageClient,
 )
+from src.transcription_service.checkpoints import SegmentCheckpointStore
+from src.transcription_service.transcript_cache import TranscriptCache
 
 
 class TranscriptEventPublisher:
     def publish_transcript_created(self, event: TranscriptCreatedEvent) -> None:
         raise NotImplementedError
 
+    def publish_transcript_partial(self, event: TranscriptPartialEvent) -> None:
+        raise NotImplementedError
+
 
 def process_audio_extracted_event(
     event: AudioExtractedEvent,
     storage_client: StorageClient,
     backend: TranscriptionBackend,
     publisher: TranscriptEventPublisher,
+    cache: Optional[TranscriptCache] = None,
+    publish_partials: bool = False,
+    checkpoints: Optional[SegmentCheckpointStore] = None,
 ) -> TranscriptCreatedEvent:
     """
     Process an AudioExtractedEvent by generating a transcript and publishing the result.
@@ -26,11 +37,24 @@ def process_audio_extracted_event(
         storage_client: The storage client to use.
         backend: The transcription backend to use.
         publisher: The publisher to send the TranscriptCreatedEvent.
+        cache: Optional transcript cache consulted before transcribing.
+        publish_partials: Publish a TranscriptPartialEvent per finished segment
+            (incremental backends only) before the final TranscriptCreatedEvent.
+        checkpoints: Optional segment checkpoint store so a redelivered event
+            resumes an interrupted transcription.
 
     Returns:
         The TranscriptCreatedEvent produced.
     """
-    transcript_event = generate_transcript(event, backend, storage_client)
+    on_partial = publisher.publish_transcript_partial if publish_partials else None
+    transcript_event = generate_transcript(
+        event,
+        backend,
+        storage_client,
+        cache=cache,
+        on_partial=on_partial,
+        checkpoints=checkpoints,
+    )
     publisher.publish_transcript_created(transcript_event)
 
     return transcript_event
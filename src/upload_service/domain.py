@@ -5,6 +5,8 @@ import re
 
 from pydantic import BaseModel
 
+from src.shared.timings import timed
+
 
 class VideoUploadedEvent(BaseModel):
     video_id: str
@@ -12,6 +14,7 @@ class VideoUploadedEvent(BaseModel):
     bucket: str
     key: str
     uploaded_at: datetime
+    timings: dict[str, float] = {}
 
 
 class VideoEventPublisher(Protocol):
@@ -55,7 +58,9 @@ def handle_video_upload(
     bucket = "therapy-videos"
     key = f"videos/{video_id}/{safe_filename}"
     
-    storage_client.upload_file(bucket=bucket, key=key, content=content)
+    timings: dict[str, float] = {}
+    with timed(timings, "upload_store"):
+        storage_client.upload_file(bucket=bucket, key=key, content=content)
     
     event = VideoUploadedEvent(
         video_id=video_id,
@@ -63,6 +68,7 @@ def handle_video_upload(
         bucket=bucket,
         key=key,
         uploaded_at=datetime.now(),
+        timings=timings,
     )
     publisher.publish_video_uploaded(event)
     
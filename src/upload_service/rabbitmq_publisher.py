@@ -3,6 +3,7 @@ import json
 import pika
 from pydantic import BaseModel
 
+from src.shared.timings import enqueue_properties
 from src.upload_service.domain import VideoUploadedEvent, VideoEventPublisher
 
 
@@ -41,6 +42,7 @@ class RabbitMQVideoEventPublisher(VideoEventPublisher):
                 exchange="",
                 routing_key=self._config.queue_name,
                 body=body,
+                properties=enqueue_properties(),
             )
         finally:
             connection.close()
\ No newline at end of file
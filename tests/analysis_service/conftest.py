@@ -1,6 +1,6 @@
 import pytest
 from pathlib import Path
-from typing import Dict, Any, Protocol
+from typing import Dict, Any, Optional, Protocol
 from src.transcription_service.domain import TranscriptCreatedEvent
 from src.analysis_service.domain import AnalysisBackend, AnalysisResult
 from src.analysis_service.llm_client import LLMClient
@@ -69,6 +69,14 @@ class FakeAnalysisRepository(AnalysisRepository):
         self.saved_events.append(event)
 
 
+class FakeVideoTimingsRepository:
+    def __init__(self) -> None:
+        self.recorded: list[tuple[str, dict[str, float]]] = []
+
+    def record_timings(self, video_id: str, timings: dict[str, float]) -> None:
+        self.recorded.append((video_id, timings))
+
+
 class FakeLLMClient(LLMClient):
     """Fake LLM client for testing."""
     def __init__(self, return_value: Dict[str, Any]) -> None:
@@ -78,6 +86,31 @@ class FakeLLMClient(LLMClient):
         return self.return_value
 
 
+class FakeRedis:
+    """In-memory stand-in for redis.Redis get/set with expiry."""
+    def __init__(self, clock=lambda: 0.0) -> None:
+        self.clock = clock
+        self.values: dict[str, tuple[bytes, Optional[float]]] = {}
+        self.set_calls: list[tuple[str, Optional[int]]] = []
+        self.down = False
+
+    def get(self, name: str) -> Optional[bytes]:
+        if self.down:
+            raise ConnectionError("redis is down")
+        value, expires_at = self.values.get(name, (None, None))
+        if expires_at is not None and self.clock() >= expires_at:
+            del self.values[name]
+            return None
+        return value
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        if self.down:
+            raise ConnectionError("redis is down")
+        self.set_calls.append((name, ex))
+        self.values[name] = (value, self.clock() + ex if ex is not None else None)
+        return True
+
+
 @pytest.fixture
 def video_id() -> str:
     return "video-123"
@@ -1,7 +1,8 @@
 import pytest
 
 from src.transcription_service.domain import TranscriptCreatedEvent
-from src.analysis_service.domain import analyze_transcript
+from src.shared.transcript_format import StructuredTranscript, encode_transcript
+from src.analysis_service.domain import analyze_transcript, load_structured_transcript
 from tests.analysis_service.conftest import FakeAnalysisBackend, FakeStorageClient
 
 
@@ -54,4 +55,49 @@ def test_should_return_analysis_result_with_correct_extra_data(
 
     expected_extra = {"backend": "fake"}
     actual_extra = result.extra
-    assert actual_extra == expected_extra
\ No newline at end of file
+    assert actual_extra == expected_extra
+
+
+def test_should_carry_upstream_timings_and_add_own_steps(
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    event.timings = {"transcription_transcribe": 4.0}
+
+    result = analyze_transcript(event, fake_backend, fake_storage_client)
+
+    assert result.timings["transcription_transcribe"] == 4.0
+    assert set(result.timings) == {
+        "transcription_transcribe",
+        "analysis_download",
+        "analysis_analyze",
+    }
+
+
+def test_should_load_only_requested_structured_columns(
+    event: TranscriptCreatedEvent,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    event.structured_key = f"transcripts/{event.video_id}/transcript.columnar.jsonl"
+    fake_storage_client.add_file(
+        event.bucket,
+        event.structured_key,
+        encode_transcript(
+            StructuredTranscript(speaker=["client"], start=[0.0], end=[3.0], text=["hello world hello"])
+        ),
+    )
+
+    structured = load_structured_transcript(event, fake_storage_client, columns=["speaker", "end"])
+
+    assert structured is not None
+    assert structured.speaker == ["client"]
+    assert structured.end == [3.0]
+    assert structured.text == []
+
+
+def test_should_return_none_without_structured_transcript(
+    event: TranscriptCreatedEvent,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    assert load_structured_transcript(event, fake_storage_client) is None
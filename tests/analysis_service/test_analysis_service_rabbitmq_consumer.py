@@ -1,4 +1,5 @@
 import json
+import time
 from pathlib import Path
 from typing import Callable, Any
 
@@ -9,6 +10,8 @@ from src.analysis_service.rabbitmq_consumer import (
     RabbitMQConsumerConfig,
     RabbitMQTranscriptCreatedConsumer,
 )
+from src.analysis_service.partials import InMemoryPartialAnalysisStore
+from src.shared.timings import ENQUEUED_AT_HEADER
 from tests.analysis_service.conftest import (
     FakeAnalysisBackend,
     FakeAnalysisEventPublisher,
@@ -247,6 +250,26 @@ def test_should_acknowledge_message_after_processing(
     mock_channel.basic_ack.assert_called_once_with(delivery_tag=42)
 
 
+@pytest.mark.unit
+def test_should_record_queue_wait_from_message_headers(
+    started_consumer: tuple,
+    fake_repository: FakeAnalysisRepository,
+    message_body: bytes,
+    mocker,
+):
+    consumer, mock_channel, callback = started_consumer
+    assert callback is not None
+
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+    properties = pika.BasicProperties(headers={ENQUEUED_AT_HEADER: time.time() - 2})
+
+    callback(mock_channel, fake_method, properties, message_body)
+
+    saved = fake_repository.saved_events[0]
+    assert saved.timings["analysis_queue_wait"] >= 2
+
+
 
 @pytest.mark.unit
 @pytest.mark.parametrize("invalid_body,description", [
@@ -294,3 +317,59 @@ def test_should_handle_malformed_message_gracefully(
         pass
     
     assert len(fake_publisher.published_events) == 0
+
+
+@pytest.mark.unit
+def test_should_consume_partial_queue_when_store_is_configured(
+    config: RabbitMQConsumerConfig,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+    mock_channel,
+    mock_pika,
+    video_id: str,
+    mocker,
+) -> None:
+    callbacks = {}
+
+    def capture_basic_consume(queue, on_message_callback, auto_ack=False):
+        callbacks[queue] = on_message_callback
+        return "consumer-tag"
+
+    mock_channel.basic_consume.side_effect = capture_basic_consume
+    mock_channel.start_consuming.side_effect = KeyboardInterrupt
+    config.partial_queue_name = "transcript.partial"
+    store = InMemoryPartialAnalysisStore()
+    consumer = RabbitMQTranscriptCreatedConsumer(
+        config=config,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=fake_storage_client,
+        partial_store=store,
+    )
+
+    try:
+        consumer.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+    partial_key = f"transcripts/{video_id}/partials/00000.txt"
+    fake_storage_client.add_file("therapy-transcripts", partial_key, b"hello there")
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 7
+    body = json.dumps({
+        "video_id": video_id,
+        "segment_index": 0,
+        "start": 0.0,
+        "bucket": "therapy-transcripts",
+        "key": partial_key,
+    }).encode("utf-8")
+
+    callbacks["transcript.partial"](mock_channel, fake_method, None, body)
+
+    mock_channel.queue_declare.assert_any_call(queue="transcript.partial", durable=True)
+    assert store.load_chunks(video_id)[0].word_count == 2
+    mock_channel.basic_ack.assert_called_once_with(delivery_tag=7)
+    assert fake_publisher.published_events == []
@@ -99,6 +99,7 @@ def test_should_publish_event_as_json_to_correct_queue(
     assert body_dict["video_id"] == event.video_id
     assert body_dict["word_count"] == event.word_count
     assert body_dict["extra"] == event.extra
+    assert "utterances" not in body_dict
 
 
 @pytest.mark.unit
@@ -1,10 +1,13 @@
+from src.shared.transcript_format import StructuredTranscript, encode_transcript
 from src.transcription_service.domain import TranscriptCreatedEvent
+from src.analysis_service.utterance_tagging import UtteranceTagger
 from src.analysis_service.worker import process_transcript_created_event
 from tests.analysis_service.conftest import (
     FakeAnalysisBackend,
     FakeAnalysisEventPublisher,
     FakeAnalysisRepository,
     FakeStorageClient,
+    FakeVideoTimingsRepository,
 )
 
 
@@ -102,3 +105,84 @@ def test_should_save_exactly_one_event_equal_to_returned_event(
     expected_event = result
     actual_event = fake_repository.saved_events[0]
     assert actual_event == expected_event
+
+
+def test_should_record_pipeline_timings_on_video_document(
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    videos_repository = FakeVideoTimingsRepository()
+    event.timings = {"upload_store": 0.1}
+
+    result = process_transcript_created_event(
+        event,
+        fake_backend,
+        fake_publisher,
+        fake_repository,
+        fake_storage_client,
+        videos_repository=videos_repository,
+    )
+
+    expected_recorded = [(event.video_id, result.timings)]
+    actual_recorded = videos_repository.recorded
+    assert actual_recorded == expected_recorded
+    assert {"upload_store", "analysis_download", "analysis_analyze"} <= set(result.timings)
+
+
+def test_should_save_tagged_utterances_of_structured_transcript(
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    class TagEverything:
+        def complete_json(self, system_prompt: str, user_content: str) -> dict:
+            count = len(user_content.splitlines())
+            return {"items": [{"index": index, "topic": "sleep", "emotion": "sad"} for index in range(count)]}
+
+    event.structured_key = f"transcripts/{event.video_id}/transcript.columnar.jsonl"
+    fake_storage_client.add_file(event.bucket, event.structured_key, encode_transcript(StructuredTranscript(
+        speaker=["A", "B"], start=[0.0, 2.0], end=[2.0, 3.0], text=["how are you?", "tired"],
+    )))
+    tagger = UtteranceTagger(TagEverything())
+
+    result = process_transcript_created_event(
+        event, fake_backend, fake_publisher, fake_repository, fake_storage_client, tagger=tagger
+    )
+    tagger.close()
+
+    assert [(record["speaker_label"], record["topic"], record["emotion"]) for record in result.utterances] == [
+        ("A", "sleep", "sad"),
+        ("B", "sleep", "sad"),
+    ]
+    assert fake_repository.saved_events[0].utterances == result.utterances
+    assert [record["role"] for record in result.utterances] == ["therapist", "patient"]
+    assert result.metrics["talk_time_patient"] == 1.0
+    assert result.metrics["patient_negative_topics"] == ["sleep"]
+    assert result.extra["emotion_timeline"] == [{"time_window": "0-60", "dominant_emotion": "sad"}]
+    assert "analysis_tag" in result.timings
+
+
+def test_should_not_tag_plain_text_transcripts(
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    class NoCalls:
+        def complete_json(self, system_prompt: str, user_content: str) -> dict:
+            raise AssertionError("no structured transcript to tag")
+
+    tagger = UtteranceTagger(NoCalls())
+
+    result = process_transcript_created_event(
+        event, fake_backend, fake_publisher, fake_repository, fake_storage_client, tagger=tagger
+    )
+    tagger.close()
+
+    assert result.utterances == []
@@ -0,0 +1,319 @@
+import asyncio
+import random
+import threading
+
+import pytest
+
+from src.analysis_service.async_llm_client import (
+    AIMDConcurrency,
+    AIMDConfig,
+    AsyncHTTPLLMClient,
+    BlockingLLMClient,
+    LLMProviderConfig,
+    LLMProviderError,
+    LLMUnavailableError,
+)
+from src.analysis_service.local_llm_server import LocalLLMServer
+from src.analysis_service.rate_limits import (
+    BucketSpec,
+    InMemoryRateLimitStore,
+    ProviderRateLimiter,
+    SQLiteRateLimitStore,
+)
+from src.shared.retry import RetryConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_config(base_url: str, **overrides) -> LLMProviderConfig:
+    values = dict(
+        base_url=base_url,
+        api_key="test-key",
+        model="fake-model",
+        max_output_tokens=64,
+        retry=RetryConfig(max_attempts=8, base_delay=0.001, max_delay=0.01),
+    )
+    values.update(overrides)
+    return LLMProviderConfig(**values)
+
+
+REQUESTS = BucketSpec(name="requests", rate=1.0, capacity=2)
+TOKENS = BucketSpec(name="tokens", rate=10.0, capacity=100)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("store_kind", ["memory", "sqlite"])
+def test_store_should_take_from_all_buckets_or_none(store_kind: str, tmp_path) -> None:
+    store = InMemoryRateLimitStore() if store_kind == "memory" else SQLiteRateLimitStore(str(tmp_path / "limits.db"))
+
+    assert store.try_acquire("acct", [(REQUESTS, 1), (TOKENS, 80)], now=0.0) == 0.0
+    wait = store.try_acquire("acct", [(REQUESTS, 1), (TOKENS, 80)], now=0.0)
+
+    assert wait == pytest.approx(6.0)
+    assert store.try_acquire("acct", [(REQUESTS, 1), (TOKENS, 20)], now=0.0) == 0.0
+    assert store.try_acquire("acct", [(REQUESTS, 1), (TOKENS, 1)], now=0.0) == pytest.approx(1.0)
+    assert store.try_acquire("other", [(REQUESTS, 1), (TOKENS, 100)], now=0.0) == 0.0
+
+
+@pytest.mark.unit
+def test_sqlite_store_should_be_shared_between_workers(tmp_path) -> None:
+    path = str(tmp_path / "limits.db")
+    worker_a = SQLiteRateLimitStore(path)
+    worker_b = SQLiteRateLimitStore(path)
+
+    assert worker_a.try_acquire("acct", [(REQUESTS, 2)], now=100.0) == 0.0
+
+    assert worker_b.try_acquire("acct", [(REQUESTS, 1)], now=100.0) == pytest.approx(1.0)
+    assert worker_b.try_acquire("acct", [(REQUESTS, 1)], now=101.0) == 0.0
+
+
+@pytest.mark.unit
+def test_store_should_reject_amount_over_capacity() -> None:
+    with pytest.raises(ValueError):
+        InMemoryRateLimitStore().try_acquire("acct", [(TOKENS, 101)], now=0.0)
+
+
+@pytest.mark.unit
+def test_limiter_should_wait_for_tokens_and_settle_actual_usage() -> None:
+    clock = FakeClock()
+    store = InMemoryRateLimitStore()
+    limiter = ProviderRateLimiter(store, "acct", 600, 600, burst_seconds=60, clock=clock, sleep=clock.sleep)
+
+    async def run() -> None:
+        await limiter.acquire(500)
+        await limiter.settle(estimated_tokens=500, actual_tokens=200)
+        await limiter.acquire(400)
+        await limiter.acquire(100)
+
+    asyncio.run(run())
+
+    # 500 estimated, 200 used: 300 refunded, so 400 fits and 100 waits 10 s at 10 tokens/s.
+    assert clock.sleeps == [pytest.approx(10.0)]
+
+
+@pytest.mark.unit
+def test_limiter_should_cap_settled_usage_at_capacity_like_acquire() -> None:
+    clock = FakeClock()
+    limiter = ProviderRateLimiter(InMemoryRateLimitStore(), "acct", 600, 600, burst_seconds=60, clock=clock, sleep=clock.sleep)
+
+    async def run() -> None:
+        # Only the 600-token capacity was taken for the 1000-token estimate, so only 300 come back.
+        await limiter.acquire(1000)
+        await limiter.settle(estimated_tokens=1000, actual_tokens=300)
+        await limiter.acquire(600)
+
+    asyncio.run(run())
+
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+@pytest.mark.unit
+def test_limiter_should_call_the_store_off_the_event_loop() -> None:
+    class RecordingStore(InMemoryRateLimitStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.threads: list[int] = []
+
+        def try_acquire(self, key, requests, now):
+            self.threads.append(threading.get_ident())
+            return super().try_acquire(key, requests, now)
+
+        def adjust(self, key, spec, amount, now):
+            self.threads.append(threading.get_ident())
+            super().adjust(key, spec, amount, now)
+
+    store = RecordingStore()
+    limiter = ProviderRateLimiter(store, "acct", 600, 600)
+
+    async def run() -> int:
+        await limiter.acquire(10)
+        await limiter.settle(estimated_tokens=10, actual_tokens=20)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(store.threads) == 2
+    assert loop_thread not in store.threads
+
+
+@pytest.mark.unit
+def test_aimd_should_grow_additively_and_shrink_once_per_overload_burst() -> None:
+    clock = FakeClock()
+    aimd = AIMDConcurrency(AIMDConfig(initial=4, minimum=1, maximum=8), clock=clock)
+
+    async def run() -> list[float]:
+        limits = []
+        started = [await aimd.acquire() for _ in range(4)]
+        clock.now += 1
+        for started_at in started:
+            await aimd.release(started_at)
+        limits.append(aimd.limit)
+
+        started = [await aimd.acquire() for _ in range(4)]
+        clock.now += 1
+        for started_at in started:
+            await aimd.release(started_at, overloaded=True)
+        limits.append(aimd.limit)
+        return limits
+
+    after_successes, after_overload = asyncio.run(run())
+
+    assert 4.8 < after_successes < 5.0
+    assert after_overload == pytest.approx(after_successes / 2)
+
+
+@pytest.mark.unit
+def test_aimd_should_treat_slow_responses_as_overload() -> None:
+    clock = FakeClock()
+    aimd = AIMDConcurrency(AIMDConfig(initial=4, latency_target_seconds=2.0), clock=clock)
+
+    async def run() -> None:
+        started_at = await aimd.acquire()
+        clock.now += 3
+        await aimd.release(started_at)
+
+    asyncio.run(run())
+
+    assert aimd.limit == 2.0
+
+
+@pytest.mark.unit
+def test_aimd_should_cap_requests_in_flight() -> None:
+    aimd = AIMDConcurrency(AIMDConfig(initial=2))
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal peak
+        started_at = await aimd.acquire()
+        peak = max(peak, aimd.in_flight)
+        await asyncio.sleep(0.001)
+        await aimd.release(started_at, overloaded=True)
+
+    async def run() -> None:
+        await asyncio.gather(*(worker() for _ in range(10)))
+
+    asyncio.run(run())
+
+    assert peak <= 2
+    assert aimd.limit == 1.0
+
+
+@pytest.mark.integration
+def test_client_should_return_parsed_analysis() -> None:
+    async def run(base_url: str) -> dict:
+        client = AsyncHTTPLLMClient(make_config(base_url))
+        try:
+            return await client.analyze_transcript("Hello there, how was your week?")
+        finally:
+            await client.aclose()
+
+    with LocalLLMServer() as server:
+        result = asyncio.run(run(server.base_url))
+
+    assert result["summary"] == "Hello there, how was your week?"
+    assert result["word_count"] == 6
+
+
+@pytest.mark.integration
+def test_client_should_not_retry_client_errors() -> None:
+    async def run(base_url: str) -> None:
+        client = AsyncHTTPLLMClient(make_config(base_url))
+        try:
+            await client.analyze_transcript("invalid request")
+        finally:
+            await client.aclose()
+
+    with LocalLLMServer() as server:
+        with pytest.raises(LLMProviderError, match="400"):
+            asyncio.run(run(server.base_url))
+        assert server.requests == 1
+
+
+@pytest.mark.integration
+def test_client_should_report_provider_still_throttling_after_retries_as_unavailable() -> None:
+    async def run(base_url: str) -> None:
+        retry = RetryConfig(max_attempts=2, base_delay=0.001, max_delay=0.01)
+        client = AsyncHTTPLLMClient(make_config(base_url, retry=retry))
+        try:
+            await client.analyze_transcript("Hello there")
+        finally:
+            await client.aclose()
+
+    with LocalLLMServer(max_concurrency=0) as server:
+        with pytest.raises(LLMUnavailableError, match="429"):
+            asyncio.run(run(server.base_url))
+        assert server.requests == 2
+
+
+@pytest.mark.integration
+def test_client_should_adapt_concurrency_to_provider_limit() -> None:
+    async def run(base_url: str) -> tuple[list[dict], AsyncHTTPLLMClient]:
+        client = AsyncHTTPLLMClient(
+            make_config(base_url, aimd=AIMDConfig(initial=16, maximum=32)),
+            rng=random.Random(1),
+        )
+        try:
+            results = await asyncio.gather(*(client.analyze_transcript(f"chunk {index}") for index in range(60)))
+        finally:
+            await client.aclose()
+        return results, client
+
+    with LocalLLMServer(latency_seconds=0.01, max_concurrency=4) as server:
+        results, client = asyncio.run(run(server.base_url))
+
+    assert len(results) == 60
+    assert server.completed == 60
+    assert server.throttled > 0
+    assert server.max_concurrent <= 4
+    assert client.concurrency.limit < 16
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("shared_limiter", [True, False])
+def test_shared_limiter_should_keep_workers_under_provider_rate(shared_limiter: bool, tmp_path) -> None:
+    path = str(tmp_path / "limits.db")
+
+    async def worker(base_url: str) -> list[dict]:
+        limiter = None
+        if shared_limiter:
+            limiter = ProviderRateLimiter(
+                SQLiteRateLimitStore(path), "acct", requests_per_minute=1200, tokens_per_minute=10**6, burst_seconds=0.25
+            )
+        client = AsyncHTTPLLMClient(make_config(base_url), limiter=limiter)
+        try:
+            return await asyncio.gather(*(client.analyze_transcript(f"chunk {index}") for index in range(10)))
+        finally:
+            await client.aclose()
+
+    async def run(base_url: str) -> None:
+        await asyncio.gather(worker(base_url), worker(base_url))
+
+    # The provider allows a little more than the workers' shared budget.
+    with LocalLLMServer(latency_seconds=0.0, requests_per_minute=1500, burst_seconds=0.25) as server:
+        asyncio.run(run(server.base_url))
+
+    assert server.completed == 20
+    assert (server.throttled == 0) is shared_limiter
+
+
+@pytest.mark.integration
+def test_blocking_client_should_serve_sync_callers() -> None:
+    with LocalLLMServer() as server:
+        client = BlockingLLMClient(lambda: AsyncHTTPLLMClient(make_config(server.base_url)))
+        try:
+            result = client.analyze_transcript("We talked about sleep.")
+        finally:
+            client.close()
+
+    assert result["word_count"] == 4
@@ -0,0 +1,253 @@
+import json
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from src.analysis_service.llm_backend import ChunkedLLMAnalysisBackend
+from src.analysis_service.rabbitmq_consumer import RabbitMQConsumerConfig, RabbitMQTranscriptBatchConsumer
+from src.analysis_service.write_behind import WriteBehindAnalysisRepository
+from tests.analysis_service.conftest import (
+    FakeAnalysisBackend,
+    FakeAnalysisEventPublisher,
+    FakeAnalysisRepository,
+    FakeStorageClient,
+)
+
+
+class SlowLLMClient:
+    """Records how many calls were in flight at once."""
+
+    def __init__(self, delay: float = 0.1) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return {"topics": [transcript_text.split()[0]]}
+
+
+class FailingStorageClient(FakeStorageClient):
+    def download_file(self, bucket: str, key: str) -> bytes:
+        if "broken" in key:
+            raise ConnectionError("storage unavailable")
+        return super().download_file(bucket, key)
+
+
+@pytest.fixture
+def config() -> RabbitMQConsumerConfig:
+    return RabbitMQConsumerConfig(host="rabbitmq", port=5672, username="guest", password="guest")
+
+
+def message(video_id: str) -> bytes:
+    return json.dumps({
+        "video_id": video_id,
+        "bucket": "therapy-transcripts",
+        "key": f"transcripts/{video_id}/transcript.txt",
+    }).encode("utf-8")
+
+
+def run_consumer(mocker, consumer: RabbitMQTranscriptBatchConsumer, bodies: list[bytes]):
+    """Run the consumer until every message has been acked or nacked; returns the channel mock."""
+    channel = mocker.MagicMock()
+    connection = mocker.MagicMock()
+    connection.channel.return_value = channel
+    connection.add_callback_threadsafe.side_effect = lambda callback: callback()
+    mocker.patch("pika.BlockingConnection", return_value=connection)
+    queue = list(enumerate(bodies, start=1))
+
+    def process_data_events(time_limit=None) -> None:
+        if queue:
+            delivery_tag, body = queue.pop(0)
+            callback = channel.basic_consume.call_args.kwargs["on_message_callback"]
+            callback(channel, mocker.MagicMock(delivery_tag=delivery_tag), mocker.MagicMock(headers={}), body)
+        elif channel.basic_ack.call_count + channel.basic_nack.call_count == len(bodies):
+            raise KeyboardInterrupt
+        else:
+            time.sleep(0.01)
+
+    connection.process_data_events.side_effect = process_data_events
+    with pytest.raises(KeyboardInterrupt):
+        consumer.run_forever()
+    return channel
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_analyze_sessions_of_a_batch_concurrently(
+    mocker,
+    config: RabbitMQConsumerConfig,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    for video_id in ["a", "b", "c"]:
+        fake_storage_client.add_file("therapy-transcripts", f"transcripts/{video_id}/transcript.txt", b"sleep well")
+    llm_client = SlowLLMClient()
+    backend = ChunkedLLMAnalysisBackend(llm_client, max_concurrency=4)
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=backend,
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=fake_storage_client,
+        max_batch_size=3,
+    )
+
+    channel = run_consumer(mocker, consumer, [message("a"), message("b"), message("c")])
+    backend.close()
+
+    assert llm_client.max_in_flight == 3
+    assert sorted(event.video_id for event in fake_repository.saved_events) == ["a", "b", "c"]
+    assert sorted(call.kwargs["delivery_tag"] for call in channel.basic_ack.call_args_list) == [1, 2, 3]
+    channel.basic_qos.assert_called_once_with(prefetch_count=3)
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_not_wait_for_a_full_pool(
+    mocker,
+    config: RabbitMQConsumerConfig,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=fake_storage_client,
+        max_batch_size=10,
+    )
+
+    channel = run_consumer(mocker, consumer, [message("a")])
+
+    channel.basic_ack.assert_called_once_with(delivery_tag=1)
+    assert len(fake_publisher.published_events) == 1
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_refill_slots_while_a_slow_session_runs(
+    mocker,
+    config: RabbitMQConsumerConfig,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    others_done = threading.Event()
+    released = []
+
+    class SlowSessionBackend(FakeAnalysisBackend):
+        def analyze(self, transcript_text: str):
+            if transcript_text == "slow":
+                released.append(others_done.wait(timeout=5))
+                return super().analyze(transcript_text)
+            result = super().analyze(transcript_text)
+            if len(self.calls) == 3:
+                others_done.set()
+            return result
+
+    for video_id in ["slow", "a", "b", "c"]:
+        fake_storage_client.add_file("therapy-transcripts", f"transcripts/{video_id}/transcript.txt", video_id.encode())
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=SlowSessionBackend(),
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=fake_storage_client,
+        max_batch_size=2,
+    )
+
+    channel = run_consumer(mocker, consumer, [message("slow"), message("a"), message("b"), message("c")])
+
+    assert released == [True]
+    assert sorted(call.kwargs["delivery_tag"] for call in channel.basic_ack.call_args_list) == [1, 2, 3, 4]
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_nack_only_the_failed_message(
+    mocker,
+    config: RabbitMQConsumerConfig,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+) -> None:
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=FailingStorageClient(),
+        max_batch_size=2,
+    )
+
+    channel = run_consumer(mocker, consumer, [message("a"), message("broken")])
+
+    channel.basic_ack.assert_called_once_with(delivery_tag=1)
+    channel.basic_nack.assert_called_once_with(delivery_tag=2, requeue=True)
+    assert [event.video_id for event in fake_repository.saved_events] == ["a"]
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_reject_messages_that_would_fail_again(
+    mocker,
+    config: RabbitMQConsumerConfig,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+) -> None:
+    storage = FakeStorageClient()
+    storage.add_file("therapy-transcripts", "transcripts/a/transcript.txt", b"hello")
+    storage.add_file("therapy-transcripts", "transcripts/latin1/transcript.txt", "caf\xe9".encode("latin-1"))
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=fake_repository,
+        storage_client=storage,
+        max_batch_size=4,
+    )
+    log = mocker.patch("src.shared.redelivery.logger")
+
+    channel = run_consumer(
+        mocker, consumer, [message("a"), b"not json", json.dumps({"video_id": "b"}).encode(), message("latin1")]
+    )
+
+    channel.basic_ack.assert_called_once_with(delivery_tag=1)
+    assert sorted(
+        (call.kwargs["delivery_tag"], call.kwargs["requeue"]) for call in channel.basic_nack.call_args_list
+    ) == [(2, False), (3, False), (4, False)]
+    assert log.error.call_count == 3
+
+
+@pytest.mark.unit
+def test_batch_consumer_should_ack_write_behind_results_once_stored(
+    mocker,
+    mongo_client,
+    config: RabbitMQConsumerConfig,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client, max_batch_size=2, flush_interval_seconds=60)
+    consumer = RabbitMQTranscriptBatchConsumer(
+        config=config,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=repository,
+        storage_client=fake_storage_client,
+        max_batch_size=2,
+    )
+
+    channel = run_consumer(mocker, consumer, [message("a"), message("b")])
+
+    assert sorted(call.kwargs["delivery_tag"] for call in channel.basic_ack.call_args_list) == [1, 2]
+    assert mongo_client["therapy_analysis"]["analysis_results"].count_documents({}) == 2
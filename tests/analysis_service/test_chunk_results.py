@@ -0,0 +1,183 @@
+import threading
+from typing import Any, Dict
+
+import mongomock
+import pytest
+
+from src.analysis_service.chunk_results import InMemoryChunkResultStore, MongoChunkResultStore
+from src.analysis_service.llm_backend import ChunkedLLMAnalysisBackend
+from src.analysis_service.llm_client import LLMClient
+from src.analysis_service.reanalysis import reanalyze_transcripts, transcript_event
+from src.analysis_service.utterance_tagging import UtteranceTagger
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.domain import StructuredTranscriptionBackend, generate_transcript
+from tests.analysis_service.conftest import FakeAnalysisBackend, FakeAnalysisRepository, FakeStorageClient
+
+
+class RecordingLLMClient(LLMClient):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(transcript_text)
+        first_word = transcript_text.split()[0]
+        return {"topics": [first_word], "sentiment": 0.5}
+
+
+def session_text(changed_sentence: int = -1) -> str:
+    return " ".join(
+        f"s{index} {'revised' if index == changed_sentence else 'sentence'} number {index}." for index in range(12)
+    )
+
+
+def chunked_backend(client: LLMClient, store, prompt_version: str = "v1", model: str = "model-a"):
+    return ChunkedLLMAnalysisBackend(
+        client,
+        max_tokens=8,
+        overlap_tokens=0,
+        count_tokens=lambda text: len(text.split()),
+        chunk_store=store,
+        prompt_version=prompt_version,
+        model=model,
+    )
+
+
+@pytest.mark.unit
+def test_backend_should_only_recompute_chunks_whose_text_changed() -> None:
+    store = InMemoryChunkResultStore()
+    client = RecordingLLMClient()
+    backend = chunked_backend(client, store)
+
+    first = backend.analyze(session_text())
+    client.calls.clear()
+    second = backend.analyze(session_text(changed_sentence=5))
+    backend.close()
+
+    assert (first.extra["computed_chunks"], first.extra["reused_chunks"]) == (6, 0)
+    assert client.calls == ["s4 sentence number 4.\ns5 revised number 5."]
+    assert (second.extra["computed_chunks"], second.extra["reused_chunks"]) == (1, 5)
+    assert second.extra["llm_result"]["topics"] == ["s0", "s2", "s4", "s6", "s8", "s10"]
+    assert first.extra["chunks"][0]["fingerprint"] == second.extra["chunks"][0]["fingerprint"]
+    assert first.extra["chunks"][2]["fingerprint"] != second.extra["chunks"][2]["fingerprint"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("changes", [{"prompt_version": "v2"}, {"model": "model-b"}])
+def test_backend_should_recompute_every_chunk_after_prompt_or_model_change(changes: dict) -> None:
+    store = InMemoryChunkResultStore()
+    client = RecordingLLMClient()
+    chunked_backend(client, store).analyze(session_text())
+    client.calls.clear()
+
+    result = chunked_backend(client, store, **changes).analyze(session_text())
+
+    assert len(client.calls) == 6
+    assert result.extra["reused_chunks"] == 0
+
+
+@pytest.mark.unit
+def test_backend_should_store_completed_chunks_before_raising() -> None:
+    class FailingOnChunk(RecordingLLMClient):
+        def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+            if transcript_text.startswith("s4"):
+                raise TimeoutError("provider timed out")
+            return super().analyze_transcript(transcript_text)
+
+    store = InMemoryChunkResultStore()
+    with pytest.raises(TimeoutError):
+        chunked_backend(FailingOnChunk(), store).analyze(session_text())
+    client = RecordingLLMClient()
+
+    result = chunked_backend(client, store).analyze(session_text())
+
+    assert client.calls == ["s4 sentence number 4.\ns5 sentence number 5."]
+    assert (result.extra["computed_chunks"], result.extra["reused_chunks"]) == (1, 5)
+
+
+@pytest.mark.unit
+def test_backend_should_require_prompt_version_and_model_with_store() -> None:
+    with pytest.raises(ValueError):
+        ChunkedLLMAnalysisBackend(RecordingLLMClient(), chunk_store=InMemoryChunkResultStore())
+
+
+@pytest.mark.integration
+def test_mongo_store_should_round_trip_and_overwrite(mongo_client: mongomock.MongoClient) -> None:
+    store = MongoChunkResultStore(mongo_client)
+
+    store.put_many({"a": {"topics": ["x"]}, "b": {"topics": ["y"]}}, prompt_version="v1", model="model-a")
+    store.put_many({"a": {"topics": ["z"]}}, prompt_version="v1", model="model-a")
+
+    assert store.get_many(["a", "b", "missing"]) == {"a": {"topics": ["z"]}, "b": {"topics": ["y"]}}
+    assert mongo_client["therapy_analysis"]["analysis_chunks"].count_documents({}) == 2
+
+
+@pytest.mark.unit
+def test_reanalysis_should_save_results_and_count_reused_chunks(fake_storage_client: FakeStorageClient) -> None:
+    store = InMemoryChunkResultStore()
+    client = RecordingLLMClient()
+    repository = FakeAnalysisRepository()
+    for video_id, text in (("video-1", session_text()), ("video-2", session_text(changed_sentence=0))):
+        event = transcript_event(video_id)
+        fake_storage_client.add_file(event.bucket, event.key, text.encode("utf-8"))
+    chunked_backend(client, store).analyze(session_text())
+
+    report = reanalyze_transcripts(
+        [transcript_event("video-1"), transcript_event("video-2")],
+        chunked_backend(client, store),
+        repository,
+        fake_storage_client,
+    )
+
+    assert report.sessions == 2 and report.failed == []
+    assert (report.computed_chunks, report.reused_chunks) == (1, 11)
+    assert [event.video_id for event in repository.saved_events] == ["video-1", "video-2"]
+
+
+@pytest.mark.unit
+def test_reanalysis_should_report_failed_sessions(fake_storage_client: FakeStorageClient) -> None:
+    class FailingStorageClient(FakeStorageClient):
+        def download_file(self, bucket: str, key: str) -> bytes:
+            raise ConnectionError("storage is down")
+
+    repository = FakeAnalysisRepository()
+
+    report = reanalyze_transcripts(
+        [transcript_event("video-1")],
+        chunked_backend(RecordingLLMClient(), InMemoryChunkResultStore()),
+        repository,
+        FailingStorageClient(),
+    )
+
+    assert report.failed == ["video-1"] and report.sessions == 0
+    assert repository.saved_events == []
+
+
+@pytest.mark.unit
+def test_reanalysis_should_read_transcripts_where_transcription_stores_them(
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    class StructuredBackend(StructuredTranscriptionBackend):
+        def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+            return StructuredTranscript(speaker=["A", "B"], start=[0.0, 1.0], end=[1.0, 3.0], text=["why?", "tired"])
+
+    class TagEverything:
+        def complete_json(self, system_prompt: str, user_content: str) -> dict:
+            count = len(user_content.splitlines())
+            return {"items": [{"index": index, "topic": "sleep", "emotion": "sad"} for index in range(count)]}
+
+    audio = AudioExtractedEvent(video_id="video-1", bucket="therapy-audio", key="audio/video-1/audio.mp3")
+    fake_storage_client.add_file(audio.bucket, audio.key, b"audio")
+    created = generate_transcript(audio, StructuredBackend(), fake_storage_client)
+    repository = FakeAnalysisRepository()
+    tagger = UtteranceTagger(TagEverything())
+
+    event = transcript_event("video-1", structured=True)
+    report = reanalyze_transcripts([event], FakeAnalysisBackend("video-1"), repository, fake_storage_client, tagger=tagger)
+    tagger.close()
+
+    assert (event.bucket, event.key, event.structured_key) == (created.bucket, created.key, created.structured_key)
+    assert report.sessions == 1
+    assert [record["role"] for record in repository.saved_events[0].utterances] == ["therapist", "patient"]
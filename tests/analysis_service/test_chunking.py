@@ -0,0 +1,79 @@
+import pytest
+
+from src.analysis_service.chunking import chunk_utterances, iter_utterances, split_utterances
+
+
+def word_tokens(text: str) -> int:
+    return len(text.split())
+
+
+@pytest.mark.unit
+def test_split_utterances_should_split_every_line_into_sentences() -> None:
+    assert split_utterances("A: hello.\n\nB: hi there") == ["A: hello.", "B: hi there"]
+    assert split_utterances("How are you? Fine, thanks. Good!") == ["How are you?", "Fine, thanks.", "Good!"]
+    assert split_utterances("\n\nHi. Bye.\nB: ok. Sure") == ["Hi.", "Bye.", "B: ok.", "Sure"]
+    assert split_utterances("A: ok. Sure\nB: fine") == ["A: ok.", "Sure", "B: fine"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("size", [1, 2, 5, 13])
+@pytest.mark.parametrize("text", [
+    "A: hello. Two!\r\n\nB: hi there\nC: x? y\n",
+    "  \n\nHow are you?  Fine, thanks. Good!  ",
+    "a. \nb",
+])
+def test_iter_utterances_should_not_depend_on_chunking(text: str, size: int) -> None:
+    chunks = [text[offset:offset + size] for offset in range(0, len(text), size)]
+
+    assert list(iter_utterances(chunks)) == split_utterances(text)
+
+
+@pytest.mark.unit
+def test_should_keep_short_transcript_in_one_chunk() -> None:
+    chunks = chunk_utterances(["one two", "three"], max_tokens=10, overlap_tokens=2, count_tokens=word_tokens)
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "one two\nthree"
+    assert (chunks[0].first_utterance, chunks[0].last_utterance, chunks[0].token_count) == (0, 1, 3)
+
+
+@pytest.mark.unit
+def test_should_respect_budget_and_utterance_boundaries() -> None:
+    utterances = [f"u{index} a b" for index in range(10)]
+
+    chunks = chunk_utterances(utterances, max_tokens=7, overlap_tokens=3, count_tokens=word_tokens)
+
+    assert all(chunk.token_count <= 7 for chunk in chunks)
+    for chunk in chunks:
+        assert all(line in utterances for line in chunk.text.split("\n"))
+    assert chunks[0].last_utterance == 1
+    assert chunks[-1].last_utterance == 9
+
+
+@pytest.mark.unit
+def test_should_repeat_trailing_utterances_as_overlap() -> None:
+    utterances = ["a b", "c d", "e f", "g h"]
+
+    chunks = chunk_utterances(utterances, max_tokens=4, overlap_tokens=2, count_tokens=word_tokens)
+
+    assert [chunk.text for chunk in chunks] == ["a b\nc d", "c d\ne f", "e f\ng h"]
+    assert [(chunk.first_utterance, chunk.last_utterance) for chunk in chunks] == [(0, 1), (1, 2), (2, 3)]
+
+
+@pytest.mark.unit
+def test_should_split_utterance_longer_than_budget() -> None:
+    chunks = chunk_utterances(["w " * 25], max_tokens=10, overlap_tokens=0, count_tokens=word_tokens)
+
+    assert [chunk.token_count for chunk in chunks] == [10, 10, 5]
+    assert {chunk.first_utterance for chunk in chunks} == {0}
+
+
+@pytest.mark.unit
+def test_should_reject_overlap_not_smaller_than_budget() -> None:
+    with pytest.raises(ValueError):
+        chunk_utterances(["a"], max_tokens=5, overlap_tokens=5)
+
+
+@pytest.mark.unit
+def test_should_return_no_chunks_for_empty_transcript() -> None:
+    assert chunk_utterances(split_utterances("  ")) == []
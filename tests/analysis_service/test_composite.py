@@ -0,0 +1,256 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.analysis_service.async_llm_client import LLMProviderConfig
+from src.analysis_service.composite import CompositeAnalysisBackend, CompositeMember
+from src.analysis_service.config import AnalysisServiceConfig
+from src.analysis_service.domain import (
+    AnalysisBackend,
+    AnalysisResult,
+    StreamingAnalysisBackend,
+    analyze_transcript,
+)
+from src.analysis_service.run_worker import build_backend
+from src.analysis_service.streaming import AnalyzerPipelineBackend, KeywordHitsAnalyzer
+from src.transcription_service.domain import TranscriptCreatedEvent
+from tests.analysis_service.conftest import FakeStorageClient
+
+
+class StaticBackend(AnalysisBackend):
+    def __init__(self, extra: dict, delay: float = 0.0, release: threading.Event = None) -> None:
+        self.extra = extra
+        self.delay = delay
+        self.release = release
+        self.closed = False
+
+    def analyze(self, transcript_text: str) -> AnalysisResult:
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        time.sleep(self.delay)
+        return AnalysisResult(video_id="", word_count=-1, extra=self.extra)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FailingBackend(AnalysisBackend):
+    def analyze(self, transcript_text: str) -> AnalysisResult:
+        raise RuntimeError("provider unavailable")
+
+
+class RecordingStreamBackend(StreamingAnalysisBackend):
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def analyze_stream(self, chunks) -> AnalysisResult:
+        self.chunks.extend(chunks)
+        return AnalysisResult(video_id="", word_count=0, extra={"chunks": len(self.chunks)})
+
+
+class ProcessIdBackend(AnalysisBackend):
+    def analyze(self, transcript_text: str) -> AnalysisResult:
+        return AnalysisResult(video_id="", word_count=0, extra={"pid": os.getpid()})
+
+
+@pytest.mark.unit
+def test_composite_should_namespace_member_extras() -> None:
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", AnalyzerPipelineBackend([lambda: KeywordHitsAnalyzer(["sleep"])])),
+        CompositeMember("llm", StaticBackend({"backend": "llm", "llm_result": {"topics": ["sleep"]}})),
+    ])
+
+    result = backend.analyze("I could not sleep. Sleep is hard.")
+    backend.close()
+
+    assert result.word_count == 7
+    assert result.extra["backend"] == "composite"
+    assert result.extra["stats"] == {"keyword_hits": {"sleep": 2}}
+    assert result.extra["llm"] == {"backend": "llm", "llm_result": {"topics": ["sleep"]}}
+    assert {name: status["status"] for name, status in result.extra["components"].items()} == {
+        "stats": "ok",
+        "llm": "ok",
+    }
+
+
+@pytest.mark.unit
+def test_composite_should_run_members_concurrently() -> None:
+    backend = CompositeAnalysisBackend([
+        CompositeMember(f"slow{index}", StaticBackend({"index": index}, delay=0.2)) for index in range(4)
+    ])
+
+    started = time.monotonic()
+    backend.analyze("text")
+    elapsed = time.monotonic() - started
+    backend.close()
+
+    assert elapsed < 0.6
+
+
+@pytest.mark.unit
+def test_composite_should_not_wait_past_a_member_timeout() -> None:
+    release = threading.Event()
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", StaticBackend({"words": 2})),
+        CompositeMember("llm", StaticBackend({"never": True}, release=release), timeout_seconds=0.1),
+    ])
+
+    started = time.monotonic()
+    result = backend.analyze("two words")
+    elapsed = time.monotonic() - started
+    release.set()
+    backend.close()
+
+    assert elapsed < 1.0
+    assert result.extra["stats"] == {"words": 2}
+    assert "llm" not in result.extra
+    assert result.extra["components"]["llm"]["status"] == "timeout"
+
+
+@pytest.mark.unit
+def test_composite_should_not_let_a_hung_member_hold_up_the_others() -> None:
+    release = threading.Event()
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", StaticBackend({"words": 2}), max_concurrent=1),
+        CompositeMember("llm", StaticBackend({}, release=release), timeout_seconds=0.1, max_concurrent=1),
+    ])
+
+    results = [backend.analyze("two words") for _ in range(3)]
+    release.set()
+    backend.close()
+
+    assert [result.extra["stats"] for result in results] == [{"words": 2}] * 3
+    assert [result.extra["components"]["llm"]["status"] for result in results] == ["timeout"] * 3
+
+
+@pytest.mark.unit
+def test_composite_timeout_should_start_when_the_member_starts_running() -> None:
+    backend = CompositeAnalysisBackend([
+        CompositeMember("llm", StaticBackend({"done": True}, delay=0.2), timeout_seconds=0.3, max_concurrent=1),
+    ])
+
+    with ThreadPoolExecutor(max_workers=2) as sessions:
+        results = list(sessions.map(backend.analyze, ["first", "second"]))
+    backend.close()
+
+    assert [result.extra["components"]["llm"]["status"] for result in results] == ["ok", "ok"]
+
+
+@pytest.mark.unit
+def test_composite_should_stream_chunks_to_streaming_members() -> None:
+    streaming = RecordingStreamBackend()
+    plain = StaticBackend({"summary": "greeting"})
+    backend = CompositeAnalysisBackend([CompositeMember("stream", streaming), CompositeMember("plain", plain)])
+
+    result = backend.analyze_stream([b"hello ", b"there ", b"world"])
+    backend.close()
+
+    assert streaming.chunks == [b"hello ", b"there ", b"world"]
+    assert result.word_count == 3
+    assert result.extra["stream"] == {"chunks": 3}
+    assert result.extra["plain"] == {"summary": "greeting"}
+
+
+@pytest.mark.unit
+def test_composite_should_fail_streaming_members_when_the_stream_fails() -> None:
+    backend = CompositeAnalysisBackend([CompositeMember("stream", RecordingStreamBackend(), timeout_seconds=1.0)])
+
+    def broken():
+        yield b"hello "
+        raise ConnectionError("download interrupted")
+
+    with pytest.raises(ConnectionError):
+        backend.analyze_stream(broken())
+    backend.close()
+
+
+@pytest.mark.unit
+def test_composite_should_report_member_errors() -> None:
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", StaticBackend({"words": 2})),
+        CompositeMember("llm", FailingBackend()),
+    ])
+
+    result = backend.analyze("two words")
+    backend.close()
+
+    assert result.extra["stats"] == {"words": 2}
+    status = result.extra["components"]["llm"]
+    assert (status["status"], status["error"]) == ("error", "RuntimeError: provider unavailable")
+
+
+@pytest.mark.unit
+def test_composite_should_fail_when_every_member_fails() -> None:
+    backend = CompositeAnalysisBackend([CompositeMember("a", FailingBackend()), CompositeMember("b", FailingBackend())])
+
+    with pytest.raises(RuntimeError, match="provider unavailable"):
+        backend.analyze("text")
+    backend.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("names", [[], ["a", "a"], ["components"], ["backend"]])
+def test_composite_should_reject_invalid_member_names(names: list[str]) -> None:
+    with pytest.raises(ValueError):
+        CompositeAnalysisBackend([CompositeMember(name, FailingBackend()) for name in names])
+
+
+@pytest.mark.unit
+def test_composite_should_run_process_members_in_another_process() -> None:
+    backend = CompositeAnalysisBackend([CompositeMember("cpu", ProcessIdBackend(), use_process=True)])
+
+    result = backend.analyze("text")
+    backend.close()
+
+    assert result.extra["cpu"]["pid"] != os.getpid()
+
+
+@pytest.mark.unit
+def test_composite_should_close_its_members() -> None:
+    member = StaticBackend({})
+    backend = CompositeAnalysisBackend([CompositeMember("a", member)])
+
+    backend.close()
+
+    assert member.closed
+
+
+@pytest.mark.unit
+def test_composite_should_plug_into_analyze_transcript(
+    event: TranscriptCreatedEvent,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    fake_storage_client.add_file(event.bucket, event.key, b"hello there world")
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", AnalyzerPipelineBackend()),
+        CompositeMember("llm", StaticBackend({"summary": "greeting"})),
+    ])
+
+    result = analyze_transcript(event, backend, fake_storage_client)
+    backend.close()
+
+    assert result.video_id == event.video_id
+    assert result.word_count == 3
+    assert result.extra["llm"] == {"summary": "greeting"}
+
+
+@pytest.mark.unit
+def test_worker_should_combine_stats_and_llm_backends_when_llm_is_configured() -> None:
+    config = AnalysisServiceConfig.model_construct(
+        llm=LLMProviderConfig(base_url="http://127.0.0.1:9", api_key="", model="model-a"),
+        llm_rate_limit_db=":memory:",
+        redis_url=None,
+        llm_timeout_seconds=30.0,
+        keywords=["sleep"],
+    )
+
+    backend = build_backend(config)
+    backend.close()
+
+    assert isinstance(backend, CompositeAnalysisBackend)
+    assert [(member.name, member.timeout_seconds) for member in backend.members] == [("stats", None), ("llm", 30.0)]
+    assert isinstance(backend, StreamingAnalysisBackend)
+    assert all(member.streams for member in backend.members)
@@ -0,0 +1,53 @@
+"""Transcripts written compressed by the transcription worker read back in the analysis worker."""
+import pytest
+
+from src.analysis_service.domain import analyze_transcript, load_structured_transcript
+from src.analysis_service.run_worker import SimpleWordCountBackend, build_storage_client
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.shared.compressed_storage import CompressingStorageClient, detect_encoding
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.benchmark import InMemoryStorageClient
+from src.transcription_service.domain import StructuredTranscriptionBackend, generate_transcript
+from tests.analysis_service.conftest import FakeAnalysisBackend
+
+
+UTTERANCES = ["how have you been sleeping this week", "better, mostly"] * 100
+
+
+class StructuredBackend(StructuredTranscriptionBackend):
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return StructuredTranscript(
+            speaker=["therapist", "client"] * 100,
+            start=[float(index) for index in range(200)],
+            end=[index + 0.5 for index in range(200)],
+            text=UTTERANCES,
+        )
+
+
+@pytest.fixture
+def stored_event():
+    inner = InMemoryStorageClient()
+    inner.objects[("therapy-audio", "audio/video-1/audio.wav")] = b"audio"
+    writer = CompressingStorageClient(inner, codec="gzip")
+    event = generate_transcript(
+        AudioExtractedEvent(video_id="video-1", bucket="therapy-audio", key="audio/video-1/audio.wav"),
+        StructuredBackend(),
+        writer,
+    )
+    return inner, event
+
+
+@pytest.mark.unit
+def test_analysis_should_read_gzipped_transcripts(stored_event) -> None:
+    inner, event = stored_event
+    assert detect_encoding(inner.objects[(event.bucket, event.key)]) == "gzip"
+    storage_client = build_storage_client(inner)
+    expected_words = len(" ".join(UTTERANCES).split())
+
+    streamed = analyze_transcript(event, SimpleWordCountBackend(), storage_client)
+    downloaded = analyze_transcript(event, FakeAnalysisBackend(), storage_client)
+    structured = load_structured_transcript(event, storage_client, columns=["text"])
+
+    assert streamed.word_count == expected_words
+    assert downloaded.word_count == expected_words
+    assert structured.text == UTTERANCES
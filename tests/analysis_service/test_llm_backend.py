@@ -1,6 +1,9 @@
+import threading
+import time
+
 import pytest
 from typing import Dict, Any
-from src.analysis_service.llm_backend import LLMAnalysisBackend
+from src.analysis_service.llm_backend import ChunkedLLMAnalysisBackend, LLMAnalysisBackend, merge_llm_results
 from src.analysis_service.llm_client import LLMClient
 from src.analysis_service.domain import AnalysisResult
 from tests.analysis_service.conftest import FakeLLMClient
@@ -44,3 +47,86 @@ def test_should_propagate_exception_when_llm_client_fails() -> None:
     
     with pytest.raises(RuntimeError, match="LLM API is down"):
         backend.analyze("some text")
+
+
+class ChunkEchoLLMClient(LLMClient):
+    """Fake LLM client whose result depends on the chunk and that finishes out of order."""
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(transcript_text)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02 if transcript_text.startswith("s0") else 0.001)
+        with self._lock:
+            self.in_flight -= 1
+        first_line = transcript_text.split("\n")[0]
+        return {"summary": first_line, "topics": [first_line.split()[0], "therapy"], "sentiment": 0.5}
+
+
+@pytest.mark.unit
+def test_chunked_backend_should_analyze_chunks_concurrently_and_merge_in_order() -> None:
+    client = ChunkEchoLLMClient()
+    backend = ChunkedLLMAnalysisBackend(
+        client, max_tokens=8, overlap_tokens=0, max_concurrency=3, count_tokens=lambda text: len(text.split())
+    )
+    transcript = " ".join(f"s{index} sentence number {index}." for index in range(12))
+
+    result = backend.analyze(transcript)
+    backend.close()
+
+    assert result.word_count == 48
+    assert len(client.calls) == 6
+    assert 1 < client.max_in_flight <= 3
+    llm_result = result.extra["llm_result"]
+    assert llm_result["topics"] == ["s0", "therapy", "s2", "s4", "s6", "s8", "s10"]
+    assert llm_result["summary"][0] == "s0 sentence number 0."
+    assert llm_result["sentiment"] == 0.5
+    assert [chunk["index"] for chunk in result.extra["chunks"]] == list(range(6))
+
+
+@pytest.mark.unit
+def test_chunked_backend_should_send_chunks_while_transcript_streams() -> None:
+    client = ChunkEchoLLMClient()
+    backend = ChunkedLLMAnalysisBackend(
+        client, max_tokens=8, overlap_tokens=0, max_concurrency=2, count_tokens=lambda text: len(text.split())
+    )
+    transcript = " ".join(f"s{index} sentence number {index}." for index in range(12))
+    data = transcript.encode("utf-8")
+    sent_before_end = []
+
+    def stream():
+        for offset in range(0, len(data), 7):
+            yield data[offset:offset + 7]
+        sent_before_end.append(len(client.calls))
+
+    streamed = backend.analyze_stream(stream())
+    expected_calls = list(client.calls)
+    client.calls.clear()
+    whole = backend.analyze(transcript)
+    backend.close()
+
+    assert sent_before_end[0] > 0
+    assert sorted(client.calls) == sorted(expected_calls)
+    assert streamed.extra == whole.extra
+    assert streamed.word_count == whole.word_count == 48
+
+
+@pytest.mark.unit
+def test_merge_llm_results_should_be_deterministic() -> None:
+    results = [
+        {"summary": "a", "topics": ["x", "y"], "scores": {"risk": 1}, "flagged": False},
+        {"summary": "a", "topics": ["y", "z"], "scores": {"risk": 3, "mood": 2}, "flagged": True},
+    ]
+
+    assert merge_llm_results(results) == {
+        "summary": "a",
+        "topics": ["x", "y", "z"],
+        "scores": {"risk": 2.0, "mood": 2.0},
+        "flagged": False,
+    }
@@ -0,0 +1,163 @@
+import threading
+from typing import Any, Dict
+
+import pytest
+
+from src.analysis_service.llm_cache import (
+    CachingLLMClient,
+    LRUResponseCache,
+    llm_cache_key,
+    normalize_transcript_text,
+)
+from src.analysis_service.llm_client import LLMClient
+from tests.analysis_service.conftest import FakeRedis
+
+
+class CountingLLMClient(LLMClient):
+    def __init__(self, release: threading.Event | None = None) -> None:
+        self.calls: list[str] = []
+        self.release = release
+        self._lock = threading.Lock()
+
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(transcript_text)
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        return {"summary": transcript_text[:10], "topics": ["sleep"]}
+
+
+def caching_client(inner: LLMClient, **kwargs) -> CachingLLMClient:
+    return CachingLLMClient(inner, model="model-a", prompt_version="v1", **kwargs)
+
+
+@pytest.mark.unit
+def test_key_should_ignore_whitespace_but_not_prompt_or_model() -> None:
+    key = llm_cache_key("hello  world\n", "v1", "model-a")
+
+    assert key == llm_cache_key(" hello world", "v1", "model-a")
+    assert key != llm_cache_key("hello world", "v2", "model-a")
+    assert key != llm_cache_key("hello world", "v1", "model-b")
+    assert normalize_transcript_text("café\tbar") == "café bar"
+
+
+@pytest.mark.unit
+def test_should_call_llm_once_for_repeated_text() -> None:
+    inner = CountingLLMClient()
+    client = caching_client(inner)
+
+    first = client.analyze_transcript("hello world")
+    second = client.analyze_transcript("hello   world")
+
+    assert first == second
+    assert len(inner.calls) == 1
+    stats = client.stats()
+    assert (stats.misses, stats.local_hits) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+
+@pytest.mark.unit
+def test_should_return_independent_copies() -> None:
+    client = caching_client(CountingLLMClient())
+    client.analyze_transcript("hello world")["topics"].append("mutated")
+
+    assert client.analyze_transcript("hello world")["topics"] == ["sleep"]
+
+
+@pytest.mark.unit
+def test_should_share_responses_between_processes_through_shared_tier() -> None:
+    redis = FakeRedis()
+    inner = CountingLLMClient()
+    caching_client(inner, shared=redis, ttl_seconds=600).analyze_transcript("hello world")
+
+    other_worker = caching_client(inner, shared=redis)
+    result = other_worker.analyze_transcript("hello world")
+
+    assert result["topics"] == ["sleep"]
+    assert len(inner.calls) == 1
+    assert redis.set_calls[0][1] == 600
+    assert other_worker.stats().shared_hits == 1
+
+
+@pytest.mark.unit
+def test_should_call_llm_again_after_shared_entry_expires() -> None:
+    now = [0.0]
+    redis = FakeRedis(clock=lambda: now[0])
+    inner = CountingLLMClient()
+    caching_client(inner, shared=redis, ttl_seconds=60).analyze_transcript("hello world")
+    now[0] = 61.0
+
+    caching_client(inner, shared=redis, ttl_seconds=60).analyze_transcript("hello world")
+
+    assert len(inner.calls) == 2
+
+
+@pytest.mark.unit
+def test_should_fall_back_to_llm_when_shared_tier_is_down() -> None:
+    redis = FakeRedis()
+    redis.down = True
+    inner = CountingLLMClient()
+    client = caching_client(inner, shared=redis)
+
+    assert client.analyze_transcript("hello world")["summary"] == "hello worl"
+    assert client.stats().shared_errors == 2
+
+
+@pytest.mark.unit
+def test_should_coalesce_concurrent_identical_requests() -> None:
+    release = threading.Event()
+    inner = CountingLLMClient(release=release)
+    client = caching_client(inner)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(client.analyze_transcript("same chunk"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while not inner.calls:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(inner.calls) == 1
+    assert len(results) == 8
+    assert client.stats().misses + client.stats().coalesced + client.stats().local_hits == 8
+
+
+@pytest.mark.unit
+def test_should_propagate_llm_failure_and_not_cache_it() -> None:
+    class FailingOnce(CountingLLMClient):
+        def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+            if not self.calls:
+                self.calls.append(transcript_text)
+                raise RuntimeError("rate limited")
+            return super().analyze_transcript(transcript_text)
+
+    client = caching_client(FailingOnce())
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        client.analyze_transcript("hello world")
+    assert client.analyze_transcript("hello world")["topics"] == ["sleep"]
+
+
+@pytest.mark.unit
+def test_lru_should_evict_least_recently_used_by_size() -> None:
+    cache = LRUResponseCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.size() == (2, 8)
+    assert cache.evictions == 1
+
+
+@pytest.mark.unit
+def test_lru_should_skip_values_larger_than_capacity() -> None:
+    cache = LRUResponseCache(max_bytes=4)
+    cache.put("big", b"12345")
+
+    assert cache.size() == (0, 0)
@@ -0,0 +1,136 @@
+import pytest
+
+from src.analysis_service.metrics import (
+    UNKNOWN,
+    assign_roles,
+    compute_metrics,
+    encode_utterances,
+    measure_metrics,
+    synthetic_utterances,
+)
+
+IMPLEMENTATIONS = [pytest.param(False, id="python"), pytest.param(True, id="numpy")]
+
+
+def utterance(role: str, start: float, end: float, topic: str = None, emotion: str = None) -> dict:
+    return {"role": role, "start_time": start, "end_time": end, "text": "...", "topic": topic, "emotion": emotion}
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    return [
+        utterance("therapist", 0.0, 5.0, "greeting", "neutral"),
+        utterance("patient", 5.5, 12.5, "anxiety", "anxious"),
+        utterance("patient", 13.0, 15.0, "work", "happy"),
+        utterance("therapist", 61.0, 70.0, "anxiety", "neutral"),
+        utterance("patient", 70.0, 80.0, "anxiety", "hopeful"),
+        utterance("patient", 80.0, 82.0, "work", "frustrated"),
+        utterance("patient", 85.0, 87.0, "work", "sad"),
+        utterance("patient", 90.0, 92.0, "anxiety", "hopeful"),
+        utterance("patient", 185.0, 190.0, "sleep", "sad"),
+        utterance("speaker_2", 190.0, 200.0, "sleep", "sad"),
+    ]
+
+
+@pytest.mark.unit
+def test_encode_should_number_topics_and_mark_unknown_codes() -> None:
+    arrays = encode_utterances([
+        utterance("patient", 0.0, 1.0, "sleep", "sad"),
+        utterance("observer", 1.0, 2.0, None, "bored"),
+        utterance("therapist", 2.0, 3.0, "sleep", "neutral"),
+    ])
+
+    assert arrays.topics == ["sleep"]
+    assert arrays.role == [1, UNKNOWN, 0]
+    assert arrays.topic == [0, UNKNOWN, 0]
+    assert arrays.emotion[1] == UNKNOWN
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_numpy", IMPLEMENTATIONS)
+def test_metrics_should_match_analysis_results_schema(records: list[dict], use_numpy: bool) -> None:
+    document = compute_metrics(encode_utterances(records), use_numpy=use_numpy).to_document()
+
+    assert document["metrics"] == {
+        "talk_time_therapist": 14.0,
+        "talk_time_patient": 30.0,
+        "patient_positive_topics": ["anxiety"],
+        "patient_negative_topics": ["work", "sleep"],
+    }
+    assert document["extra"]["emotion_timeline"] == [
+        {"time_window": "0-60", "dominant_emotion": "anxious"},
+        {"time_window": "60-120", "dominant_emotion": "hopeful"},
+        {"time_window": "180-240", "dominant_emotion": "sad"},
+    ]
+    assert document["extra"]["topic_histogram"] == {
+        "anxiety": {"positive": 2, "negative": 1},
+        "work": {"positive": 1, "negative": 2},
+        "sleep": {"positive": 0, "negative": 1},
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_numpy", IMPLEMENTATIONS)
+def test_metrics_should_handle_sessions_without_patient_speech(use_numpy: bool) -> None:
+    arrays = encode_utterances([utterance("therapist", 0.0, 4.0, "greeting", "neutral")])
+
+    result = compute_metrics(arrays, use_numpy=use_numpy)
+
+    assert result.talk_time_therapist == 4.0
+    assert result.emotion_timeline == [] and result.topic_histogram == {}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_numpy", IMPLEMENTATIONS)
+def test_metrics_should_count_utterances_starting_before_zero_in_first_window(use_numpy: bool) -> None:
+    arrays = encode_utterances([
+        utterance("patient", -2.0, 3.0, "sleep", "sad"),
+        utterance("patient", 3.0, 4.0, "sleep", "happy"),
+    ])
+
+    result = compute_metrics(arrays, use_numpy=use_numpy)
+
+    assert result.emotion_timeline == [{"time_window": "0-60", "dominant_emotion": "sad"}]
+    assert result.talk_time_patient == 6.0
+
+
+@pytest.mark.unit
+def test_assign_roles_should_pick_the_questioner_as_therapist() -> None:
+    records = [
+        {"speaker_label": "A", "start_time": 0.0, "end_time": 20.0, "text": "Work was hard."},
+        {"speaker_label": "B", "start_time": 20.0, "end_time": 22.0, "text": "What happened?"},
+        {"speaker_label": "A", "start_time": 22.0, "end_time": 40.0, "text": "My boss shouted."},
+        {"speaker_label": "C", "start_time": 40.0, "end_time": 41.0, "text": "Sorry."},
+        {"speaker_label": "B", "start_time": 41.0, "end_time": 42.0, "text": "Hm.", "role": "patient"},
+    ]
+
+    roles = [record["role"] for record in assign_roles(records)]
+
+    assert roles == ["patient", "therapist", "patient", None, "patient"]
+    assert "role" not in records[0]
+
+
+@pytest.mark.unit
+def test_metrics_should_reject_ragged_columns() -> None:
+    arrays = synthetic_utterances(10)
+    arrays.end.pop()
+
+    with pytest.raises(ValueError):
+        compute_metrics(arrays, use_numpy=False)
+
+
+@pytest.mark.unit
+def test_numpy_and_python_implementations_should_agree() -> None:
+    arrays = synthetic_utterances(10_000)
+
+    assert compute_metrics(arrays, use_numpy=True) == compute_metrics(arrays, use_numpy=False)
+
+
+@pytest.mark.unit
+def test_metrics_should_scale_to_long_sessions() -> None:
+    arrays = synthetic_utterances(20_000)
+
+    result = compute_metrics(arrays)
+
+    assert len(result.emotion_timeline) > 100
+    assert measure_metrics(arrays, repeat=1) < 2.0
@@ -72,3 +72,37 @@ class TestMongoAnalysisRepository:
         assert result is not None
         assert result.word_count == 99
         assert result.extra == {"version": 2}
+
+    def test_should_save_and_retrieve_timings(
+        self,
+        repository: MongoAnalysisRepository,
+    ) -> None:
+        event = AnalysisCompletedEvent(
+            video_id="video-123",
+            word_count=1,
+            timings={"analysis_analyze": 0.5},
+        )
+
+        repository.save_analysis(event)
+        result = repository.get_analysis("video-123")
+
+        assert result is not None
+        assert result.timings == {"analysis_analyze": 0.5}
+
+    def test_should_keep_tagged_utterances_when_saved_without_them(
+        self,
+        repository: MongoAnalysisRepository,
+    ) -> None:
+        utterances = [{"speaker_label": "A", "text": "hi", "topic": "greeting", "emotion": "neutral"}]
+        metrics = {"talk_time_therapist": 1.0, "talk_time_patient": 0.0}
+        repository.save_analysis(
+            AnalysisCompletedEvent(video_id="video-123", word_count=1, utterances=utterances, metrics=metrics)
+        )
+
+        repository.save_analysis(AnalysisCompletedEvent(video_id="video-123", word_count=2))
+        result = repository.get_analysis("video-123")
+
+        assert result is not None
+        assert result.word_count == 2
+        assert result.utterances == utterances
+        assert result.metrics == metrics
@@ -0,0 +1,160 @@
+from typing import Any, Dict
+
+import mongomock
+
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
+from src.analysis_service.composite import CompositeAnalysisBackend, CompositeMember
+from src.analysis_service.domain import AnalysisBackend, AnalysisResult
+from src.analysis_service.llm_backend import ChunkedLLMAnalysisBackend
+from src.analysis_service.llm_client import LLMClient
+from src.analysis_service.partials import (
+    InMemoryPartialAnalysisStore,
+    MongoPartialAnalysisStore,
+    merge_partial_results,
+)
+from src.analysis_service.streaming import AnalyzerPipelineBackend, KeywordHitsAnalyzer, SpeakerStatsAnalyzer
+from src.analysis_service.worker import (
+    process_transcript_created_event,
+    process_transcript_partial_event,
+)
+from tests.analysis_service.conftest import (
+    FakeAnalysisBackend,
+    FakeAnalysisEventPublisher,
+    FakeAnalysisRepository,
+    FakeStorageClient,
+)
+
+
+class MergingFakeBackend(FakeAnalysisBackend):
+    def merge_results(self, results: list[AnalysisResult]) -> AnalysisResult:
+        return AnalysisResult(
+            video_id="",
+            word_count=sum(result.word_count for result in results),
+            extra={"backend": "fake"},
+        )
+
+
+class FirstWordLLMClient(LLMClient):
+    def analyze_transcript(self, transcript_text: str) -> Dict[str, Any]:
+        return {"topics": [transcript_text.split()[0]], "sentiment": 0.5}
+
+
+def _partial(video_id: str, index: int) -> TranscriptPartialEvent:
+    return TranscriptPartialEvent(
+        video_id=video_id,
+        segment_index=index,
+        start=float(index),
+        bucket="therapy-transcripts",
+        key=f"transcripts/{video_id}/partials/{index:05d}.txt",
+    )
+
+
+def _analyze_partials(
+    video_id: str,
+    texts: list[bytes],
+    backend: AnalysisBackend,
+    storage_client: FakeStorageClient,
+    store: InMemoryPartialAnalysisStore,
+) -> None:
+    for index, text in enumerate(texts):
+        partial = _partial(video_id, index)
+        storage_client.add_file(partial.bucket, partial.key, text)
+        process_transcript_partial_event(partial, backend, storage_client, store)
+
+
+def test_should_merge_analyzed_segments_instead_of_reanalyzing(
+    event: TranscriptCreatedEvent,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    backend = MergingFakeBackend()
+    store = InMemoryPartialAnalysisStore()
+    _analyze_partials(event.video_id, [b"hello world", b"hello"], backend, fake_storage_client, store)
+    event.segment_count = 2
+
+    result = process_transcript_created_event(
+        event, backend, fake_publisher, fake_repository, fake_storage_client, partial_store=store
+    )
+
+    assert backend.calls == ["hello world", "hello"]
+    assert result.word_count == 3
+    assert result.extra["backend"] == "fake"
+    assert "analysis_merge" in result.timings
+    assert store.load_chunks(event.video_id) == {}
+
+
+def test_should_analyze_full_transcript_when_segments_are_missing(
+    event: TranscriptCreatedEvent,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_repository: FakeAnalysisRepository,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    backend = MergingFakeBackend()
+    store = InMemoryPartialAnalysisStore()
+    _analyze_partials(event.video_id, [b"hello world"], backend, fake_storage_client, store)
+    event.segment_count = 2
+
+    result = process_transcript_created_event(
+        event, backend, fake_publisher, fake_repository, fake_storage_client, partial_store=store
+    )
+
+    assert backend.calls[-1] == "hello world hello"
+    assert result.word_count == 3
+    assert "analysis_merge" not in result.timings
+
+
+def test_should_ignore_partials_for_unsegmented_transcripts(
+    event: TranscriptCreatedEvent,
+) -> None:
+    store = InMemoryPartialAnalysisStore()
+    store.save_chunk(event.video_id, 0, AnalysisResult(video_id=event.video_id, word_count=1))
+
+    assert merge_partial_results(event, store, MergingFakeBackend()) is None
+
+
+def test_should_not_merge_with_a_backend_that_cannot_merge(
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+) -> None:
+    store = InMemoryPartialAnalysisStore()
+    store.save_chunk(event.video_id, 0, AnalysisResult(video_id=event.video_id, word_count=1))
+    event.segment_count = 1
+
+    assert merge_partial_results(event, store, fake_backend) is None
+
+
+def test_merged_result_should_have_the_shape_of_a_full_analysis() -> None:
+    backend = CompositeAnalysisBackend([
+        CompositeMember("stats", AnalyzerPipelineBackend(
+            [SpeakerStatsAnalyzer, lambda: KeywordHitsAnalyzer(["anxious"])], extra={"backend": "stats"},
+        )),
+        CompositeMember("llm", ChunkedLLMAnalysisBackend(
+            FirstWordLLMClient(), max_tokens=4, overlap_tokens=0, count_tokens=lambda text: len(text.split()),
+        )),
+    ])
+    segments = ["A: I feel anxious today.\nB: Tell me more.", "A: Anxious at work.\nB: I see."]
+
+    merged = backend.merge_results([backend.analyze(text) for text in segments])
+    full = backend.analyze("\n".join(segments))
+
+    assert merged.word_count == full.word_count
+    assert set(merged.extra) == set(full.extra)
+    assert merged.extra["stats"] == full.extra["stats"]
+    chunks = merged.extra["llm"]["chunks"]
+    assert [chunk["index"] for chunk in chunks] == list(range(len(chunks)))
+    assert merged.extra["llm"]["llm_result"] == full.extra["llm"]["llm_result"]
+    assert {status["status"] for status in merged.extra["components"].values()} == {"ok"}
+
+
+def test_mongo_store_should_share_segments_between_workers(mongo_client: mongomock.MongoClient) -> None:
+    first_worker = MongoPartialAnalysisStore(mongo_client)
+    second_worker = MongoPartialAnalysisStore(mongo_client)
+    result = AnalysisResult(video_id="video-1", word_count=2, extra={"backend": "fake"}, timings={"analysis_analyze": 0.5})
+
+    first_worker.save_chunk("video-1", 0, result)
+    first_worker.save_chunk("video-1", 0, result)
+
+    assert second_worker.load_chunks("video-1") == {0: result}
+    second_worker.clear("video-1")
+    assert first_worker.load_chunks("video-1") == {}
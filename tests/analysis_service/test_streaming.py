@@ -0,0 +1,124 @@
+import tracemalloc
+from typing import Iterator
+
+import pytest
+
+from src.analysis_service.domain import analyze_transcript
+from src.analysis_service.streaming import (
+    AnalyzerPipelineBackend,
+    KeywordHitsAnalyzer,
+    SpeakerStatsAnalyzer,
+    WordCountAnalyzer,
+    iter_text,
+    iter_words,
+    run_analyzers,
+)
+from src.transcription_service.domain import TranscriptCreatedEvent
+from tests.analysis_service.conftest import FakeStorageClient
+
+
+TRANSCRIPT = (
+    "Therapist: How did you sleep this week?\n"
+    "Patient: Badly. I felt anxious, really ANXIOUS about work.\n"
+    "Therapist: Tell me more about work.\n"
+    "Patient: My manager… again.\n"
+)
+
+
+def split_bytes(data: bytes, size: int) -> list[bytes]:
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+class ChunkedFakeStorageClient(FakeStorageClient):
+    def __init__(self, chunk_size: int) -> None:
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.iterated = False
+
+    def iter_chunks(self, bucket: str, key: str) -> Iterator[bytes]:
+        self.iterated = True
+        yield from split_bytes(self.download_file(bucket, key), self.chunk_size)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_words_should_match_split_for_any_chunking(chunk_size: int) -> None:
+    data = TRANSCRIPT.encode("utf-8")
+
+    words = list(iter_words(iter_text(split_bytes(data, chunk_size))))
+
+    assert [word for word, _ in words] == TRANSCRIPT.split()
+    assert [word for word, line_start in words if line_start] == ["Therapist:", "Patient:", "Therapist:", "Patient:"]
+
+
+@pytest.mark.unit
+def test_text_should_reject_invalid_utf8() -> None:
+    with pytest.raises(UnicodeDecodeError):
+        list(iter_text([b"ok \xff"]))
+
+
+@pytest.mark.unit
+def test_analyzers_should_share_one_pass() -> None:
+    extra = run_analyzers(
+        split_bytes(TRANSCRIPT.encode("utf-8"), 5),
+        [WordCountAnalyzer(), SpeakerStatsAnalyzer(), KeywordHitsAnalyzer(["anxious", "work", "panic"])],
+    )
+
+    assert extra == {
+        "word_count": len(TRANSCRIPT.split()),
+        "speakers": {
+            "Therapist": {"turns": 2, "words": 11},
+            "Patient": {"turns": 2, "words": 11},
+        },
+        "keyword_hits": {"anxious": 2, "work": 2},
+    }
+
+
+@pytest.mark.unit
+def test_pipeline_backend_should_stream_from_chunked_storage(event: TranscriptCreatedEvent) -> None:
+    storage = ChunkedFakeStorageClient(chunk_size=16)
+    storage.add_file(event.bucket, event.key, TRANSCRIPT.encode("utf-8"))
+    backend = AnalyzerPipelineBackend([SpeakerStatsAnalyzer], extra={"backend": "pipeline"})
+
+    result = analyze_transcript(event, backend, storage)
+
+    assert storage.iterated
+    assert result.video_id == event.video_id
+    assert result.word_count == len(TRANSCRIPT.split())
+    assert result.extra["backend"] == "pipeline"
+    assert result.extra["speakers"]["Patient"]["turns"] == 2
+    assert {"analysis_download", "analysis_analyze"} <= set(result.timings)
+
+
+@pytest.mark.unit
+def test_pipeline_backend_should_also_analyze_plain_strings() -> None:
+    backend = AnalyzerPipelineBackend([lambda: KeywordHitsAnalyzer(["work"])])
+
+    result = backend.analyze(TRANSCRIPT)
+
+    assert result.word_count == len(TRANSCRIPT.split())
+    assert result.extra == {"keyword_hits": {"work": 2}}
+
+
+@pytest.mark.unit
+def test_pipeline_memory_should_not_grow_with_transcript_size() -> None:
+    line = "Patient: I keep thinking about work and how anxious it makes me feel.\n".encode("utf-8")
+
+    def stream(lines: int) -> Iterator[bytes]:
+        for _ in range(lines // 100):
+            yield line * 100
+
+    def peak_bytes(lines: int) -> int:
+        backend = AnalyzerPipelineBackend([SpeakerStatsAnalyzer, lambda: KeywordHitsAnalyzer(["anxious"])])
+        tracemalloc.start()
+        try:
+            result = backend.analyze_stream(stream(lines))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert result.word_count == lines * 13
+        return peak
+
+    small, large = peak_bytes(1_000), peak_bytes(20_000)
+
+    assert large < small * 2
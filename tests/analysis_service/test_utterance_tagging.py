@@ -0,0 +1,205 @@
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+import pytest
+
+from src.analysis_service.async_llm_client import InvalidCompletionError, LLMProviderError
+from src.analysis_service.utterance_tagging import (
+    TAGGING_SYSTEM_PROMPT,
+    UtteranceTagger,
+    build_batch_prompt,
+    parse_batch_response,
+    tag_transcript,
+)
+from src.shared.transcript_format import StructuredTranscript
+
+
+_LINE = re.compile(r"^\[(\d+)\] (.*)$")
+
+
+def tag_everything(indices: list[int]) -> Dict[str, Any]:
+    return {"items": [{"index": index, "topic": "sleep", "emotion": "anxious"} for index in indices]}
+
+
+class ScriptedJSONClient:
+    """Answers each batch prompt with respond(indices) for the indices it lists."""
+
+    def __init__(self, respond: Callable[[list[int]], Any] = tag_everything) -> None:
+        self.respond = respond
+        self.prompts: list[list[int]] = []
+        self._lock = threading.Lock()
+
+    def complete_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        assert system_prompt == TAGGING_SYSTEM_PROMPT
+        indices = [int(_LINE.match(line).group(1)) for line in user_content.splitlines()]
+        with self._lock:
+            self.prompts.append(indices)
+        reply = self.respond(indices)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def utterances() -> list[str]:
+    return [f"I could not sleep on night {index}." for index in range(200)]
+
+
+@pytest.mark.unit
+def test_prompt_should_number_each_utterance_on_its_own_line() -> None:
+    prompt = build_batch_prompt({3: "Hello\nthere", 7: "  How are   you? "})
+
+    assert prompt == "[3] Hello there\n[7] How are you?"
+
+
+@pytest.mark.unit
+def test_parse_should_keep_only_valid_items_for_expected_indices() -> None:
+    response = {"items": [
+        {"index": 0, "topic": "Sleep", "emotion": "Anxious"},
+        {"index": "1", "topic": "work", "emotion": "sad"},
+        {"index": 2, "topic": "", "emotion": "sad"},
+        {"index": 3, "topic": "work", "emotion": "bored"},
+        {"index": 9, "topic": "work", "emotion": "sad"},
+        {"index": 4, "topic": "family", "emotion": "happy"},
+        {"index": 4, "topic": "work", "emotion": "sad"},
+        "not an item",
+    ]}
+
+    tags = parse_batch_response(response, expected={0, 1, 2, 3, 4})
+
+    assert sorted(tags) == [0, 1]
+    assert (tags[0].topic, tags[0].emotion) == ("sleep", "anxious")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("response", [None, {}, {"items": "nope"}, "text"])
+def test_parse_should_return_nothing_for_malformed_responses(response: Any) -> None:
+    assert parse_batch_response(response, expected={0}) == {}
+
+
+@pytest.mark.unit
+def test_tagger_should_pack_utterances_into_few_calls(utterances: list[str]) -> None:
+    client = ScriptedJSONClient()
+    tagger = UtteranceTagger(client, batch_size=40)
+
+    tags = tagger.tag(utterances)
+    tagger.close()
+
+    assert len(client.prompts) == 5
+    assert sorted(index for prompt in client.prompts for index in prompt) == list(range(200))
+    assert [tag.index for tag in tags] == list(range(200))
+    assert tagger.stats().model_dump() == {
+        "utterances": 200, "calls": 5, "failed_calls": 0, "reasked": 0, "untagged": 0,
+    }
+
+
+@pytest.mark.unit
+def test_tagger_should_reask_only_missing_and_invalid_items(utterances: list[str]) -> None:
+    def respond(indices: list[int]) -> Dict[str, Any]:
+        if len(indices) == 40:
+            items = tag_everything(indices)["items"]
+            items[10]["emotion"] = "bored"
+            del items[5]
+            return {"items": items}
+        return tag_everything(indices)
+
+    client = ScriptedJSONClient(respond)
+    tagger = UtteranceTagger(client, batch_size=40, max_concurrency=1)
+
+    tags = tagger.tag(utterances)
+    tagger.close()
+
+    first_round, reasks = client.prompts[:5], client.prompts[5:]
+    assert all(len(prompt) == 40 for prompt in first_round)
+    assert sorted(index for prompt in reasks for index in prompt) == sorted(
+        index for prompt in first_round for index in (prompt[5], prompt[10])
+    )
+    assert all(tag is not None for tag in tags)
+    stats = tagger.stats()
+    assert (stats.calls, stats.reasked, stats.untagged) == (6, 10, 0)
+
+
+@pytest.mark.unit
+def test_tagger_should_leave_items_untagged_after_max_reasks() -> None:
+    def respond(indices: list[int]) -> Dict[str, Any]:
+        return tag_everything([index for index in indices if index != 1])
+
+    client = ScriptedJSONClient(respond)
+    tagger = UtteranceTagger(client, batch_size=10, max_reasks=2)
+
+    tags = tagger.tag(["one", "two", "three"])
+    tagger.close()
+
+    assert tags[1] is None and tags[0] is not None and tags[2] is not None
+    assert client.prompts[1:] == [[1], [1]]
+    assert tagger.stats().untagged == 1
+
+
+@pytest.mark.unit
+def test_tagger_should_reask_batches_whose_reply_is_not_json() -> None:
+    replies: list[Optional[Exception]] = [InvalidCompletionError("not json")]
+
+    def respond(indices: list[int]) -> Any:
+        return replies.pop() if replies else tag_everything(indices)
+
+    client = ScriptedJSONClient(respond)
+    tagger = UtteranceTagger(client, batch_size=10)
+
+    tags = tagger.tag(["one", "two"])
+    tagger.close()
+
+    assert client.prompts == [[0, 1], [0, 1]]
+    assert all(tag is not None for tag in tags)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("error", [LLMProviderError("Completion failed with 400"), httpx.ConnectError("refused")])
+def test_tagger_should_treat_failed_batch_as_missing(error: Exception) -> None:
+    def respond(indices: list[int]) -> Any:
+        return error if 0 in indices else tag_everything(indices)
+
+    client = ScriptedJSONClient(respond)
+    tagger = UtteranceTagger(client, batch_size=2, max_reasks=1)
+
+    tags = tagger.tag(["one", "two", "three", "four"])
+    tagger.close()
+
+    assert tags[0] is None and tags[1] is None
+    assert tags[2] is not None and tags[3] is not None
+    stats = tagger.stats()
+    assert (stats.calls, stats.failed_calls, stats.untagged) == (3, 2, 2)
+
+
+@pytest.mark.unit
+def test_tagger_should_skip_blank_utterances() -> None:
+    client = ScriptedJSONClient()
+    tagger = UtteranceTagger(client)
+
+    tags = tagger.tag(["hello", "  ", "bye"])
+    tagger.close()
+
+    assert client.prompts == [[0, 2]]
+    assert tags[1] is None
+
+
+@pytest.mark.unit
+def test_tag_transcript_should_return_utterance_records() -> None:
+    transcript = StructuredTranscript(
+        speaker=["SPEAKER_00", "SPEAKER_01"],
+        start=[0.0, 2.5],
+        end=[2.5, 4.0],
+        text=["How did you sleep?", "Badly."],
+    )
+    tagger = UtteranceTagger(ScriptedJSONClient())
+
+    records = tag_transcript(transcript, tagger)
+    tagger.close()
+
+    assert records == [
+        {"speaker_label": "SPEAKER_00", "start_time": 0.0, "end_time": 2.5,
+         "text": "How did you sleep?", "topic": "sleep", "emotion": "anxious"},
+        {"speaker_label": "SPEAKER_01", "start_time": 2.5, "end_time": 4.0,
+         "text": "Badly.", "topic": "sleep", "emotion": "anxious"},
+    ]
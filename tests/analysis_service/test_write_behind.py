@@ -0,0 +1,223 @@
+import json
+import time
+
+import pytest
+
+from src.analysis_service.rabbitmq_consumer import RabbitMQConsumerConfig, RabbitMQTranscriptCreatedConsumer
+from src.analysis_service.worker import AnalysisCompletedEvent, process_transcript_created_event
+from src.analysis_service.write_behind import WriteBehindAnalysisRepository
+from src.transcription_service.domain import TranscriptCreatedEvent
+from tests.analysis_service.conftest import (
+    FakeAnalysisBackend,
+    FakeAnalysisEventPublisher,
+    FakeStorageClient,
+)
+
+
+def completed(video_id: str, word_count: int = 3) -> AnalysisCompletedEvent:
+    return AnalysisCompletedEvent(video_id=video_id, word_count=word_count, timings={"analysis_analyze": 0.5})
+
+
+class FlakyCollection:
+    """Wraps a collection so that its next bulk_write fails."""
+
+    def __init__(self, collection) -> None:
+        self.collection = collection
+        self.fail_next = True
+
+    def bulk_write(self, requests, ordered=True):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("primary stepped down")
+        return self.collection.bulk_write(requests, ordered=ordered)
+
+
+@pytest.mark.unit
+def test_write_behind_should_buffer_until_the_batch_is_full(mongo_client) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client, max_batch_size=3)
+    results = mongo_client["therapy_analysis"]["analysis_results"]
+
+    repository.save_analysis(completed("a"))
+    repository.save_analysis(completed("b"))
+    assert results.count_documents({}) == 0
+
+    repository.save_analysis(completed("c"))
+
+    assert sorted(document["video_id"] for document in results.find()) == ["a", "b", "c"]
+    stats = repository.stats()
+    assert (stats.flushes, stats.flushed_analyses, stats.pending_writes) == (1, 3, 0)
+
+
+@pytest.mark.unit
+def test_write_behind_should_coalesce_writes_to_the_same_video(mongo_client) -> None:
+    mongo_client["therapy_analysis"]["videos"].insert_one({"video_id": "a", "status": "transcribed"})
+    repository = WriteBehindAnalysisRepository(mongo_client)
+
+    repository.save_analysis(completed("a", word_count=1))
+    repository.save_analysis(completed("a", word_count=2))
+    repository.record_timings("a", {"analysis_analyze": 0.5})
+    repository.mark_analyzed("a", word_count=2)
+    assert repository.stats().pending_writes == 2
+    assert repository.flush()
+
+    result = mongo_client["therapy_analysis"]["analysis_results"].find_one({"video_id": "a"})
+    video = mongo_client["therapy_analysis"]["videos"].find_one({"video_id": "a"})
+    assert result["word_count"] == 2
+    assert (video["status"], video["word_count"], video["timings"]) == ("analyzed", 2, {"analysis_analyze": 0.5})
+
+
+@pytest.mark.unit
+def test_write_behind_should_flush_by_interval(mongo_client) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client, flush_interval_seconds=0.05).start()
+    flushed = []
+
+    repository.save_analysis(completed("a"))
+    repository.when_durable(lambda: flushed.append(time.monotonic()))
+    deadline = time.monotonic() + 2
+    while not flushed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    repository.close()
+
+    assert flushed
+    assert mongo_client["therapy_analysis"]["analysis_results"].count_documents({"video_id": "a"}) == 1
+
+
+@pytest.mark.unit
+def test_write_behind_should_run_callbacks_only_after_the_write(mongo_client) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client)
+    acked = []
+
+    repository.when_durable(lambda: acked.append("nothing pending"))
+    repository.save_analysis(completed("a"))
+    repository.when_durable(lambda: acked.append("a"))
+
+    assert acked == ["nothing pending"]
+    repository.flush()
+    assert acked == ["nothing pending", "a"]
+
+
+@pytest.mark.unit
+def test_write_behind_should_keep_writes_and_callbacks_when_a_flush_fails(mongo_client) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client)
+    flaky = FlakyCollection(repository._analysis_results)
+    repository._analysis_results = flaky
+    acked = []
+
+    repository.save_analysis(completed("a"))
+    repository.when_durable(lambda: acked.append("a"))
+
+    assert not repository.flush()
+    assert acked == []
+    stats = repository.stats()
+    assert (stats.failed_flushes, stats.pending_writes) == (1, 1)
+    assert stats.last_error == "ConnectionError: primary stepped down"
+
+    repository.save_analysis(completed("b"))
+    repository.when_durable(lambda: acked.append("b"))
+    assert repository.flush()
+
+    assert acked == ["a", "b"]
+    assert flaky.collection.count_documents({}) == 2
+
+
+@pytest.mark.unit
+def test_write_behind_should_run_remaining_callbacks_when_one_fails(mongo_client, caplog) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client)
+    acked = []
+
+    def failing_publish() -> None:
+        raise ConnectionError("broker unavailable")
+
+    repository.save_analysis(completed("a"))
+    repository.when_durable(failing_publish)
+    repository.when_durable(lambda: acked.append("b"))
+
+    with caplog.at_level("ERROR", logger="src.analysis_service.write_behind"):
+        assert repository.flush()
+    assert acked == ["b"]
+    assert repository.stats().failed_callbacks == 1
+    assert "broker unavailable" in caplog.text
+
+
+@pytest.mark.unit
+def test_worker_should_publish_only_once_the_write_is_flushed(
+    mongo_client,
+    event: TranscriptCreatedEvent,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client)
+    done = []
+
+    process_transcript_created_event(
+        event,
+        fake_backend,
+        fake_publisher,
+        repository,
+        fake_storage_client,
+        videos_repository=repository,
+        on_done=lambda: done.append(len(fake_publisher.published_events)),
+    )
+
+    assert fake_publisher.published_events == []
+    assert done == []
+    assert repository.flush()
+    assert len(fake_publisher.published_events) == 1
+    assert done == [1]
+    video = mongo_client["therapy_analysis"]["videos"].find_one({"video_id": event.video_id})
+    assert (video["status"], video["word_count"]) == ("analyzed", fake_publisher.published_events[0].word_count)
+    assert repository.stats().flushed_video_updates == 1
+
+
+@pytest.mark.unit
+def test_write_behind_should_flush_on_close(mongo_client) -> None:
+    repository = WriteBehindAnalysisRepository(mongo_client, flush_interval_seconds=60).start()
+
+    repository.save_analysis(completed("a"))
+
+    assert repository.close()
+    assert mongo_client["therapy_analysis"]["analysis_results"].count_documents({"video_id": "a"}) == 1
+
+
+@pytest.mark.unit
+def test_consumer_should_ack_only_once_the_write_is_flushed(
+    mocker,
+    mongo_client,
+    fake_backend: FakeAnalysisBackend,
+    fake_publisher: FakeAnalysisEventPublisher,
+    fake_storage_client: FakeStorageClient,
+) -> None:
+    fake_storage_client.add_file("therapy-transcripts", "transcripts/a/transcript.txt", b"hello world")
+    repository = WriteBehindAnalysisRepository(mongo_client, max_batch_size=10)
+    channel = mocker.MagicMock()
+    connection = mocker.MagicMock()
+    connection.channel.return_value = channel
+    connection.add_callback_threadsafe.side_effect = lambda callback: callback()
+    mocker.patch("pika.BlockingConnection", return_value=connection)
+    acks_before_shutdown = []
+
+    def consume_one_message() -> None:
+        callback = channel.basic_consume.call_args.kwargs["on_message_callback"]
+        body = json.dumps({"video_id": "a", "bucket": "therapy-transcripts", "key": "transcripts/a/transcript.txt"})
+        callback(channel, mocker.MagicMock(delivery_tag=7), mocker.MagicMock(headers={}), body.encode("utf-8"))
+        acks_before_shutdown.extend(channel.basic_ack.call_args_list)
+        raise KeyboardInterrupt
+
+    channel.start_consuming.side_effect = consume_one_message
+    consumer = RabbitMQTranscriptCreatedConsumer(
+        config=RabbitMQConsumerConfig(host="rabbitmq", port=5672, username="guest", password="guest", prefetch_count=10),
+        backend=fake_backend,
+        publisher=fake_publisher,
+        repository=repository,
+        storage_client=fake_storage_client,
+        videos_repository=repository,
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        consumer.run_forever()
+
+    channel.basic_qos.assert_called_once_with(prefetch_count=10)
+    assert acks_before_shutdown == []
+    channel.basic_ack.assert_called_once_with(delivery_tag=7)
+    assert mongo_client["therapy_analysis"]["analysis_results"].count_documents({"video_id": "a"}) == 1
@@ -27,6 +27,31 @@ class FakeStorageClient:
         self.upload_called_with = {"bucket": bucket, "key": key, "content": content}
 
 
+class FakeStreamingStorageClient(FakeStorageClient):
+    """Fake StorageClient that also supports streaming to/from local files."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.download_to_file_called_with: Optional[dict] = None
+        self.upload_from_file_called_with: Optional[dict] = None
+    
+    def get_object_size(self, bucket: str, key: str) -> int:
+        """Return the size of the configured download response."""
+        return len(self.download_response or b"")
+    
+    def download_to_file(self, bucket: str, key: str, path: Path) -> None:
+        """Record the call and write the set response to path."""
+        self.download_to_file_called_with = {"bucket": bucket, "key": key}
+        path.write_bytes(self.download_response or b"")
+    
+    def upload_from_file(self, bucket: str, key: str, path: Path) -> None:
+        """Record the call along with the file content at upload time."""
+        self.upload_from_file_called_with = {
+            "bucket": bucket,
+            "key": key,
+            "content": path.read_bytes(),
+        }
+
+
 class FakeAudioConverter:
     """Fake AudioConverter that records convert calls."""
     def __init__(self) -> None:
@@ -43,6 +68,18 @@ class FakeAudioConverter:
         return self.convert_response or b"fake-audio-bytes"
 
 
+class FakeFileAudioConverter:
+    """Fake converter that works on file paths."""
+    def __init__(self, output: bytes = b"fake-audio-bytes") -> None:
+        self.output = output
+        self.convert_file_called_with: Optional[bytes] = None
+    
+    def convert_file(self, input_path: Path, output_path: Path) -> None:
+        """Record the input content and write the set output."""
+        self.convert_file_called_with = input_path.read_bytes()
+        output_path.write_bytes(self.output)
+
+
 class FakeAudioEventPublisher:
     def __init__(self) -> None:
         self.published_events: list[AudioExtractedEvent] = []
@@ -59,6 +96,12 @@ def fake_storage_client() -> FakeStorageClient:
     return FakeStorageClient()
 
 
+@pytest.fixture
+def fake_streaming_storage_client() -> FakeStreamingStorageClient:
+    """Fixture for FakeStreamingStorageClient."""
+    return FakeStreamingStorageClient()
+
+
 @pytest.fixture
 def fake_audio_converter() -> FakeAudioConverter:
     """Fixture for FakeAudioConverter."""
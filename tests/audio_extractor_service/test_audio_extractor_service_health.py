@@ -1,7 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
 
-from src.audio_extractor_service.app import app
+from src.audio_extractor_service.app import app, create_app
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline
 
 
 @pytest.mark.unit
@@ -11,4 +12,26 @@ def test_should_return_ok_status_when_health_endpoint_called():
     response = client.get("/health")
 
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
\ No newline at end of file
+    assert response.json() == {"status": "ok"}
+
+@pytest.mark.unit
+def test_should_return_empty_metrics_without_pipeline():
+    client = TestClient(app)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.json() == {"stages": {}}
+
+
+@pytest.mark.unit
+def test_should_return_stage_metrics_of_the_given_pipeline(
+    fake_storage_client, fake_audio_converter, fake_audio_publisher
+):
+    pipeline = AudioExtractionPipeline(fake_storage_client, fake_audio_converter, fake_audio_publisher)
+    client = TestClient(create_app(pipeline))
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert set(response.json()["stages"]) == {"download", "convert", "upload"}
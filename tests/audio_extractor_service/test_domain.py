@@ -314,3 +314,68 @@ def test_should_preserve_video_id_in_output_key(
     assert fake_storage_client.upload_called_with["key"] == expected_key
 
 
+@pytest.mark.unit
+def test_should_carry_upstream_timings_and_add_own_steps(
+    fake_storage_client,
+    fake_audio_converter,
+    video_id: str,
+    video_bytes: bytes,
+    audio_bytes: bytes,
+):
+    """Domain should keep timings from the event and add download/convert/upload."""
+    event = _create_video_uploaded_event(video_id)
+    event.timings = {"upload_store": 0.25}
+    fake_storage_client.set_download_response(video_bytes)
+    fake_audio_converter.set_convert_response(audio_bytes)
+    
+    result = extract_audio_from_video_event(
+        event=event,
+        storage_client=fake_storage_client,
+        audio_converter=fake_audio_converter,
+    )
+    
+    assert result.timings["upload_store"] == 0.25
+    assert set(result.timings) == {
+        "upload_store",
+        "audio_extractor_download",
+        "audio_extractor_convert",
+        "audio_extractor_upload",
+    }
+
+
+# --- Unit Tests: Audio Passthrough ---
+
+MP3_UPLOAD = b"ID3\x04\x00\x00\x00\x00\x00\x00" + b"\xff\xfb\x90\x64" + b"\x00" * 64
+WAV_UPLOAD = b"RIFF\x24\x08\x00\x00WAVEfmt " + b"\x00" * 64
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("upload_bytes,extension", [
+    (MP3_UPLOAD, "mp3"),
+    (WAV_UPLOAD, "wav"),
+])
+def test_should_copy_audio_uploads_without_converting(
+    fake_storage_client,
+    fake_audio_converter,
+    video_id: str,
+    upload_bytes: bytes,
+    extension: str,
+):
+    """Domain should store audio-only uploads as-is under their own extension."""
+    event = _create_video_uploaded_event(video_id, key=f"videos/{video_id}/session.{extension}")
+    fake_storage_client.set_download_response(upload_bytes)
+    
+    result = extract_audio_from_video_event(
+        event=event,
+        storage_client=fake_storage_client,
+        audio_converter=fake_audio_converter,
+    )
+    
+    assert fake_audio_converter.convert_called_with is None
+    assert fake_storage_client.upload_called_with == {
+        "bucket": "therapy-audio",
+        "key": f"audio/{video_id}/audio.{extension}",
+        "content": upload_bytes,
+    }
+    assert result.key == f"audio/{video_id}/audio.{extension}"
+    assert "audio_extractor_convert" not in result.timings
@@ -0,0 +1,216 @@
+"""Tests for the overlapped download/convert/upload AudioExtractionPipeline."""
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.upload_service.domain import VideoUploadedEvent
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline, PipelineConfig
+from tests.audio_extractor_service.conftest import (
+    FakeAudioConverter,
+    FakeAudioEventPublisher,
+    FakeStorageClient,
+)
+
+
+# --- Helpers ---
+
+def _create_video_uploaded_event(video_id: str) -> VideoUploadedEvent:
+    """Helper to create a VideoUploadedEvent."""
+    return VideoUploadedEvent(
+        video_id=video_id,
+        filename="test.mp4",
+        bucket="therapy-videos",
+        key=f"videos/{video_id}/test.mp4",
+        uploaded_at=datetime.now(),
+    )
+
+
+def _run(pipeline: AudioExtractionPipeline, video_ids: list[str]) -> list:
+    """Submit events for video_ids, drain the pipeline and return the on_done results."""
+    results = []
+    pipeline.start()
+    for video_id in video_ids:
+        pipeline.submit(
+            _create_video_uploaded_event(video_id),
+            on_done=lambda error, video_id=video_id: results.append((video_id, error)),
+        )
+    pipeline.close()
+    return results
+
+
+# --- Unit Tests: Happy Path ---
+
+@pytest.mark.unit
+def test_should_publish_all_events_in_submission_order(
+    configured_storage_and_converter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    storage_client, converter = configured_storage_and_converter
+    pipeline = AudioExtractionPipeline(storage_client, converter, fake_audio_publisher)
+    
+    results = _run(pipeline, ["v1", "v2", "v3"])
+    
+    assert [e.video_id for e in fake_audio_publisher.published_events] == ["v1", "v2", "v3"]
+    assert [e.key for e in fake_audio_publisher.published_events] == [
+        "audio/v1/audio.mp3",
+        "audio/v2/audio.mp3",
+        "audio/v3/audio.mp3",
+    ]
+    assert results == [("v1", None), ("v2", None), ("v3", None)]
+
+
+@pytest.mark.unit
+def test_should_download_next_video_while_converting_current_one(
+    fake_storage_client: FakeStorageClient,
+    fake_audio_publisher: FakeAudioEventPublisher,
+    video_bytes: bytes,
+):
+    """The download stage should not wait for the convert stage to finish."""
+    second_download_started = threading.Event()
+    overlapped = []
+    downloads = []
+    fake_storage_client.set_download_response(video_bytes)
+    original_download = fake_storage_client.download_file
+
+    def download_file(bucket: str, key: str) -> bytes:
+        downloads.append(key)
+        if len(downloads) == 2:
+            second_download_started.set()
+        return original_download(bucket=bucket, key=key)
+
+    class BlockingConverter:
+        def convert(self, video_bytes: bytes) -> bytes:
+            if not overlapped:
+                overlapped.append(second_download_started.wait(timeout=5))
+            return b"audio"
+
+    fake_storage_client.download_file = download_file
+    pipeline = AudioExtractionPipeline(fake_storage_client, BlockingConverter(), fake_audio_publisher)
+    
+    _run(pipeline, ["v1", "v2"])
+    
+    assert overlapped == [True]
+    assert len(fake_audio_publisher.published_events) == 2
+
+
+@pytest.mark.unit
+def test_should_report_per_stage_stats(
+    configured_storage_and_converter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    storage_client, converter = configured_storage_and_converter
+    ticks = iter(range(1000))
+    pipeline = AudioExtractionPipeline(
+        storage_client,
+        converter,
+        fake_audio_publisher,
+        clock=lambda: float(next(ticks)),
+    )
+    
+    _run(pipeline, ["v1", "v2"])
+    stats = pipeline.stats()
+    
+    assert set(stats) == {"download", "convert", "upload"}
+    for stage in stats.values():
+        assert stage.items == 2
+        assert stage.errors == 0
+        assert stage.busy_seconds >= 2.0
+        assert 0.0 < stage.utilization <= 1.0
+        assert stage.queue_depth == 0
+
+
+@pytest.mark.unit
+def test_published_event_should_carry_every_stage_timing(
+    configured_storage_and_converter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    storage_client, converter = configured_storage_and_converter
+    ticks = iter(range(1000))
+    pipeline = AudioExtractionPipeline(
+        storage_client,
+        converter,
+        fake_audio_publisher,
+        clock=lambda: float(next(ticks)),
+    )
+
+    _run(pipeline, ["v1"])
+
+    timings = fake_audio_publisher.published_events[0].timings
+    assert {"audio_extractor_download", "audio_extractor_convert", "audio_extractor_upload"} <= set(timings)
+    assert timings["audio_extractor_upload"] == 1.0
+
+
+@pytest.mark.unit
+def test_should_bound_stage_queues_by_config(
+    fake_storage_client: FakeStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    config = PipelineConfig(download_queue_size=1, convert_queue_size=3, upload_queue_size=4)
+    pipeline = AudioExtractionPipeline(
+        fake_storage_client, fake_audio_converter, fake_audio_publisher, config=config
+    )
+    
+    assert [stage.queue.maxsize for stage in pipeline._stages] == [1, 3, 4]
+    assert config.capacity == 11
+
+
+# --- Unit Tests: Error Cases ---
+
+@pytest.mark.unit
+def test_should_report_failure_without_publishing_and_keep_processing(
+    fake_storage_client: FakeStorageClient,
+    fake_audio_publisher: FakeAudioEventPublisher,
+    video_bytes: bytes,
+):
+    class FailingOnceConverter:
+        def convert(self, video_bytes: bytes) -> bytes:
+            if not hasattr(self, "failed"):
+                self.failed = True
+                raise RuntimeError("Conversion failed")
+            return b"audio"
+
+    fake_storage_client.set_download_response(video_bytes)
+    pipeline = AudioExtractionPipeline(fake_storage_client, FailingOnceConverter(), fake_audio_publisher)
+    
+    results = dict(_run(pipeline, ["v1", "v2"]))
+    
+    assert isinstance(results["v1"], RuntimeError)
+    assert results["v2"] is None
+    assert [e.video_id for e in fake_audio_publisher.published_events] == ["v2"]
+    assert pipeline.stats()["convert"].errors == 1
+    assert pipeline.stats()["upload"].items == 1
+
+
+@pytest.mark.unit
+def test_should_fail_empty_download_before_conversion(
+    fake_storage_client: FakeStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    fake_storage_client.set_download_response(b"")
+    pipeline = AudioExtractionPipeline(fake_storage_client, fake_audio_converter, fake_audio_publisher)
+    
+    results = _run(pipeline, ["v1"])
+    
+    assert isinstance(results[0][1], ValueError)
+    assert fake_audio_converter.convert_called_with is None
+    assert fake_audio_publisher.published_events == []
+
+
+@pytest.mark.unit
+def test_should_pass_audio_uploads_through_without_converting(
+    fake_storage_client: FakeStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    fake_audio_publisher: FakeAudioEventPublisher,
+):
+    flac_bytes = b"fLaC\x00\x00\x00\x22" + b"\x00" * 64
+    fake_storage_client.set_download_response(flac_bytes)
+    pipeline = AudioExtractionPipeline(fake_storage_client, fake_audio_converter, fake_audio_publisher)
+    
+    _run(pipeline, ["v1"])
+    
+    assert fake_audio_converter.convert_called_with is None
+    assert fake_storage_client.upload_called_with["content"] == flac_bytes
+    assert fake_audio_publisher.published_events[0].key == "audio/v1/audio.flac"
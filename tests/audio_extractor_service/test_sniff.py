@@ -0,0 +1,81 @@
+"""Tests for sniff_audio_format magic-byte and header probing."""
+import struct
+
+import pytest
+
+from src.audio_extractor_service.sniff import sniff_audio_format
+
+
+# --- Helpers ---
+
+def _box(box_type: bytes, payload: bytes = b"") -> bytes:
+    """Build a single MP4 box."""
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def _hdlr(handler_type: bytes) -> bytes:
+    """Build an MP4 hdlr box for the given handler type."""
+    return _box(b"hdlr", b"\x00" * 4 + b"\x00" * 4 + handler_type + b"\x00" * 12)
+
+
+def _mp4(brand: bytes, *handlers: bytes) -> bytes:
+    """Build a minimal MP4 header with an ftyp box and one trak per handler."""
+    traks = b"".join(_box(b"trak", _box(b"mdia", _hdlr(h))) for h in handlers)
+    return _box(b"ftyp", brand + b"\x00\x00\x02\x00" + b"isom") + _box(b"moov", traks)
+
+
+MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 32
+
+
+# --- Unit Tests ---
+
+@pytest.mark.unit
+@pytest.mark.parametrize("header,expected", [
+    (MP3_FRAME, "mp3"),
+    (b"ID3\x04\x00\x00\x00\x00\x00\x02" + b"\x00\x00" + MP3_FRAME, "mp3"),
+    (b"ID3\x04\x00\x00\x00\x00\x7f\x7f", "mp3"),
+    (b"RIFF\x24\x08\x00\x00WAVEfmt ", "wav"),
+    (b"fLaC\x00\x00\x00\x22", "flac"),
+    (b"OggS\x00\x02" + b"\x00" * 22 + b"OpusHead", "ogg"),
+    (b"OggS\x00\x02" + b"\x00" * 22 + b"\x01vorbis", "ogg"),
+    (_mp4(b"M4A "), "m4a"),
+    (_mp4(b"isom", b"soun"), "m4a"),
+    (_mp4(b"isom", b"soun", b"mdir"), "m4a"),
+], ids=[
+    "mp3-frame",
+    "mp3-id3-then-frame",
+    "mp3-id3-beyond-window",
+    "wav",
+    "flac",
+    "ogg-opus",
+    "ogg-vorbis",
+    "m4a-brand",
+    "mp4-sound-only",
+    "mp4-sound-with-metadata",
+])
+def test_should_detect_audio_formats(header: bytes, expected: str):
+    assert sniff_audio_format(header) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("header", [
+    b"fake-video-content",
+    b"",
+    _mp4(b"isom", b"vide", b"soun"),
+    _mp4(b"mp42"),
+    b"OggS\x00\x02" + b"\x00" * 22 + b"\x80theora",
+    b"\xff\xf1\x50\x80",
+    b"RIFF\x24\x08\x00\x00AVI LIST",
+    b"ID3\x04\x00\x00\x00\x00\x00\x02" + b"\x00\x00" + b"\x1a\x45\xdf\xa3",
+], ids=[
+    "garbage",
+    "empty",
+    "mp4-with-video",
+    "mp4-moov-beyond-window",
+    "ogg-theora",
+    "aac-adts",
+    "avi",
+    "id3-then-not-mp3",
+])
+def test_should_not_detect_video_or_unknown_formats_as_audio(header: bytes):
+    assert sniff_audio_format(header) is None
@@ -0,0 +1,223 @@
+"""Tests for disk-spill handling of large videos in extract_audio_from_video_event."""
+import pytest
+
+from src.upload_service.domain import VideoUploadedEvent
+from src.audio_extractor_service.domain import extract_audio_from_video_event
+from src.audio_extractor_service.spill import SpillConfig
+from tests.audio_extractor_service.conftest import (
+    FakeAudioConverter,
+    FakeFileAudioConverter,
+    FakeStreamingStorageClient,
+)
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def spill_config(tmp_path) -> SpillConfig:
+    return SpillConfig(threshold_bytes=8, temp_dir=tmp_path)
+
+
+# --- Unit Tests: Happy Path ---
+
+@pytest.mark.unit
+def test_should_stream_to_and_from_disk_when_video_exceeds_threshold(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_bytes: bytes,
+    audio_bytes: bytes,
+):
+    """Large videos should bypass download_file/upload_file and use the file methods."""
+    fake_streaming_storage_client.set_download_response(video_bytes)
+    fake_audio_converter.set_convert_response(audio_bytes)
+    
+    result = extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=fake_audio_converter,
+        spill_config=spill_config,
+    )
+    
+    assert fake_streaming_storage_client.download_called_with is None
+    assert fake_streaming_storage_client.upload_called_with is None
+    assert fake_streaming_storage_client.upload_from_file_called_with == {
+        "bucket": "therapy-audio",
+        "key": result.key,
+        "content": audio_bytes,
+    }
+
+
+@pytest.mark.unit
+def test_should_pass_mmap_memoryview_to_bytes_converter(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_bytes: bytes,
+):
+    """Converters without convert_file should receive a memoryview over the spilled file."""
+    seen = {}
+
+    class RecordingConverter:
+        def convert(self, video_bytes) -> bytes:
+            seen["type"] = type(video_bytes)
+            seen["content"] = bytes(video_bytes)
+            return b"audio"
+
+    fake_streaming_storage_client.set_download_response(video_bytes)
+    
+    extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=RecordingConverter(),
+        spill_config=spill_config,
+    )
+    
+    assert seen["type"] is memoryview
+    assert seen["content"] == video_bytes
+
+
+@pytest.mark.unit
+def test_should_pass_paths_to_file_converter(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_bytes: bytes,
+):
+    """Converters implementing convert_file should read and write files directly."""
+    converter = FakeFileAudioConverter(output=b"file-audio")
+    fake_streaming_storage_client.set_download_response(video_bytes)
+    
+    extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=converter,
+        spill_config=spill_config,
+    )
+    
+    assert converter.convert_file_called_with == video_bytes
+    assert fake_streaming_storage_client.upload_from_file_called_with["content"] == b"file-audio"
+
+
+@pytest.mark.unit
+def test_should_clean_up_temp_files_after_conversion(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_bytes: bytes,
+):
+    """Spilled files should not outlive the extraction."""
+    fake_streaming_storage_client.set_download_response(video_bytes)
+    
+    extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=fake_audio_converter,
+        spill_config=spill_config,
+    )
+    
+    assert list(spill_config.temp_dir.iterdir()) == []
+
+
+# --- Unit Tests: In-Memory Fallback ---
+
+@pytest.mark.unit
+@pytest.mark.parametrize("threshold_bytes", [1024, None])
+def test_should_stay_in_memory_below_threshold_or_when_disabled(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    video_bytes: bytes,
+    tmp_path,
+    threshold_bytes,
+):
+    """Small videos and disabled spilling should use the in-memory path."""
+    spill_config = None
+    if threshold_bytes is not None:
+        spill_config = SpillConfig(threshold_bytes=threshold_bytes, temp_dir=tmp_path)
+    fake_streaming_storage_client.set_download_response(video_bytes)
+    
+    extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=fake_audio_converter,
+        spill_config=spill_config,
+    )
+    
+    assert fake_streaming_storage_client.download_to_file_called_with is None
+    assert fake_audio_converter.convert_called_with == video_bytes
+
+
+@pytest.mark.unit
+def test_should_stay_in_memory_when_storage_client_cannot_stream(
+    fake_storage_client,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_bytes: bytes,
+):
+    """Plain storage clients should keep working with spilling enabled."""
+    fake_storage_client.set_download_response(video_bytes)
+    
+    extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_storage_client,
+        audio_converter=fake_audio_converter,
+        spill_config=spill_config,
+    )
+    
+    assert fake_audio_converter.convert_called_with == video_bytes
+
+
+# --- Unit Tests: Error Cases ---
+
+@pytest.mark.unit
+def test_should_raise_value_error_when_spilled_file_is_empty(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    tmp_path,
+):
+    """Empty videos should be rejected before conversion on the disk path too."""
+    fake_streaming_storage_client.set_download_response(b"")
+    
+    with pytest.raises(ValueError, match="empty"):
+        extract_audio_from_video_event(
+            event=video_uploaded_event,
+            storage_client=fake_streaming_storage_client,
+            audio_converter=fake_audio_converter,
+            spill_config=SpillConfig(threshold_bytes=0, temp_dir=tmp_path),
+        )
+    
+    assert fake_audio_converter.convert_called_with is None
+    assert fake_streaming_storage_client.upload_from_file_called_with is None
+
+
+@pytest.mark.unit
+def test_should_stream_audio_uploads_back_without_converting(
+    fake_streaming_storage_client: FakeStreamingStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    video_uploaded_event: VideoUploadedEvent,
+    spill_config: SpillConfig,
+    video_id: str,
+):
+    """Audio-only uploads on the disk path should be uploaded from the spilled file as-is."""
+    wav_bytes = b"RIFF\x24\x08\x00\x00WAVEfmt " + b"\x00" * 64
+    fake_streaming_storage_client.set_download_response(wav_bytes)
+    
+    result = extract_audio_from_video_event(
+        event=video_uploaded_event,
+        storage_client=fake_streaming_storage_client,
+        audio_converter=fake_audio_converter,
+        spill_config=spill_config,
+    )
+    
+    assert fake_audio_converter.convert_called_with is None
+    assert result.key == f"audio/{video_id}/audio.wav"
+    assert fake_streaming_storage_client.upload_from_file_called_with == {
+        "bucket": "therapy-audio",
+        "key": f"audio/{video_id}/audio.wav",
+        "content": wav_bytes,
+    }
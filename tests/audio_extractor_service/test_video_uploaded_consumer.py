@@ -5,6 +5,7 @@ from typing import Callable, Any
 import pytest
 import pika
 
+from src.audio_extractor_service.pipeline import AudioExtractionPipeline, PipelineConfig
 from src.audio_extractor_service.rabbitmq_consumer import (
     RabbitMQConsumerConfig,
     RabbitMQVideoUploadedConsumer,
@@ -265,4 +266,127 @@ def test_should_handle_malformed_message_gracefully(
     except Exception:
         pass
 
-    assert len(fake_publisher.published_events) == 0
\ No newline at end of file
+    assert len(fake_publisher.published_events) == 0
+
+@pytest.mark.unit
+def test_should_ack_through_connection_thread_in_pipelined_mode(
+    config: RabbitMQConsumerConfig,
+    fake_storage_client: FakeStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    fake_publisher: FakeAudioEventPublisher,
+    video_bytes: bytes,
+    message_body: bytes,
+    video_id: str,
+    mock_channel_with_callback,
+    mock_connection_with_callback,
+    mocker,
+):
+    mocker.patch("pika.BlockingConnection", return_value=mock_connection_with_callback)
+    mock_connection_with_callback.add_callback_threadsafe.side_effect = lambda fn: fn()
+    fake_storage_client.set_download_response(video_bytes)
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+
+    def deliver_one_message():
+        mock_channel_with_callback._consume_callback(
+            mock_channel_with_callback, fake_method, None, message_body
+        )
+
+    mock_channel_with_callback.start_consuming.side_effect = deliver_one_message
+    pipeline_config = PipelineConfig(download_queue_size=1, convert_queue_size=1, upload_queue_size=1)
+
+    consumer = RabbitMQVideoUploadedConsumer(
+        config=config,
+        storage_client=fake_storage_client,
+        audio_converter=fake_audio_converter,
+        publisher=fake_publisher,
+        pipeline_config=pipeline_config,
+    )
+    consumer.run_forever()
+
+    mock_channel_with_callback.basic_qos.assert_called_once_with(prefetch_count=pipeline_config.capacity)
+    mock_connection_with_callback.add_callback_threadsafe.assert_called_once()
+    mock_channel_with_callback.basic_ack.assert_called_once_with(delivery_tag=42)
+    assert [e.video_id for e in fake_publisher.published_events] == [video_id]
+
+
+class UnreachableStorageClient(FakeStorageClient):
+    def download_file(self, bucket: str, key: str) -> bytes:
+        raise ConnectionError("storage unreachable")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "storage_client_factory, requeue",
+    [(FakeStorageClient, False), (UnreachableStorageClient, True)],
+    ids=["empty-video-dead-lettered", "unreachable-storage-requeued"],
+)
+def test_should_requeue_only_transient_failures_in_pipelined_mode(
+    config: RabbitMQConsumerConfig,
+    fake_audio_converter: FakeAudioConverter,
+    fake_publisher: FakeAudioEventPublisher,
+    message_body: bytes,
+    mock_channel_with_callback,
+    mock_connection_with_callback,
+    mocker,
+    storage_client_factory,
+    requeue: bool,
+):
+    mocker.patch("pika.BlockingConnection", return_value=mock_connection_with_callback)
+    mock_connection_with_callback.add_callback_threadsafe.side_effect = lambda fn: fn()
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+    mock_channel_with_callback.start_consuming.side_effect = lambda: mock_channel_with_callback._consume_callback(
+        mock_channel_with_callback, fake_method, None, message_body
+    )
+
+    consumer = RabbitMQVideoUploadedConsumer(
+        config=config,
+        storage_client=storage_client_factory(),
+        audio_converter=fake_audio_converter,
+        publisher=fake_publisher,
+        pipeline_config=PipelineConfig(),
+    )
+    consumer.run_forever()
+
+    mock_channel_with_callback.basic_nack.assert_called_once_with(delivery_tag=42, requeue=requeue)
+    mock_channel_with_callback.basic_ack.assert_not_called()
+    assert fake_publisher.published_events == []
+
+
+@pytest.mark.unit
+def test_should_consume_through_the_given_pipeline(
+    config: RabbitMQConsumerConfig,
+    fake_storage_client: FakeStorageClient,
+    fake_audio_converter: FakeAudioConverter,
+    fake_publisher: FakeAudioEventPublisher,
+    video_bytes: bytes,
+    message_body: bytes,
+    mock_channel_with_callback,
+    mock_connection_with_callback,
+    mocker,
+):
+    mocker.patch("pika.BlockingConnection", return_value=mock_connection_with_callback)
+    mock_connection_with_callback.add_callback_threadsafe.side_effect = lambda fn: fn()
+    fake_storage_client.set_download_response(video_bytes)
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+    mock_channel_with_callback.start_consuming.side_effect = lambda: mock_channel_with_callback._consume_callback(
+        mock_channel_with_callback, fake_method, None, message_body
+    )
+    pipeline = AudioExtractionPipeline(
+        fake_storage_client, fake_audio_converter, fake_publisher, config=PipelineConfig(download_queue_size=1)
+    )
+
+    consumer = RabbitMQVideoUploadedConsumer(
+        config=config,
+        storage_client=fake_storage_client,
+        audio_converter=fake_audio_converter,
+        publisher=fake_publisher,
+        pipeline=pipeline,
+    )
+    consumer.run_forever()
+
+    assert consumer.pipeline is pipeline
+    mock_channel_with_callback.basic_qos.assert_called_once_with(prefetch_count=pipeline.config.capacity)
+    assert pipeline.stats()["upload"].items == 1
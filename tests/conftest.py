@@ -1,5 +1,6 @@
 import pytest
 import mongomock
+from pymongo import UpdateOne
 
 from src.upload_service.domain import VideoEventPublisher, VideoUploadedEvent
 
@@ -19,9 +20,22 @@ def fake_video_publisher() -> FakeVideoEventPublisher:
     return FakeVideoEventPublisher()
 
 
+_mongomock_bulk_write = mongomock.collection.Collection.bulk_write
+
+
+def _bulk_write(self, requests, ordered=True, *args, **kwargs):
+    """mongomock's bulk_write rejects UpdateOne, so apply those one by one."""
+    requests = list(requests)
+    if not all(isinstance(request, UpdateOne) for request in requests):
+        return _mongomock_bulk_write(self, requests, ordered, *args, **kwargs)
+    for request in requests:
+        self.update_one(request._filter, request._doc, upsert=request._upsert)
+
+
 @pytest.fixture
-def mongo_client():
+def mongo_client(monkeypatch):
     """Global fixture for mocking MongoDB."""
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _bulk_write)
     return mongomock.MongoClient()
 
 
@@ -0,0 +1,191 @@
+import gzip
+from typing import Optional
+
+import pytest
+
+from src.shared.compressed_storage import (
+    CompressingStorageClient,
+    available_codecs,
+    detect_encoding,
+    iter_decompressed,
+    measure_codec,
+)
+
+
+class InMemoryStorageClient:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return self.objects[(bucket, key)]
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        self.objects[(bucket, key)] = content
+
+
+class EncodingAwareStorageClient(InMemoryStorageClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.encodings: dict[tuple[str, str], str] = {}
+
+    def upload_file_with_encoding(self, bucket: str, key: str, content: bytes, content_encoding: str) -> None:
+        self.upload_file(bucket, key, content)
+        self.encodings[(bucket, key)] = content_encoding
+
+    def get_content_encoding(self, bucket: str, key: str) -> Optional[str]:
+        return self.encodings.get((bucket, key))
+
+
+TRANSCRIPT = ("Therapist: how have you been sleeping this week?\nClient: better, mostly.\n" * 500).encode("utf-8")
+
+
+@pytest.mark.unit
+def test_should_store_transcripts_compressed_and_read_them_back() -> None:
+    inner = InMemoryStorageClient()
+    storage = CompressingStorageClient(inner)
+
+    storage.upload_file("transcripts", "transcripts/v1/transcript.txt", TRANSCRIPT)
+
+    stored = inner.objects[("transcripts", "transcripts/v1/transcript.txt")]
+    assert detect_encoding(stored) == "gzip"
+    assert len(stored) * 5 < len(TRANSCRIPT)
+    assert storage.download_file("transcripts", "transcripts/v1/transcript.txt") == TRANSCRIPT
+
+
+@pytest.mark.unit
+def test_should_leave_audio_and_small_payloads_uncompressed() -> None:
+    inner = InMemoryStorageClient()
+    storage = CompressingStorageClient(inner, min_size=512)
+
+    storage.upload_file("audio", "audio/v1/audio.mp3", TRANSCRIPT)
+    storage.upload_file("transcripts", "transcripts/v1/partials/00000.txt", b"hello")
+
+    assert inner.objects[("audio", "audio/v1/audio.mp3")] == TRANSCRIPT
+    assert inner.objects[("transcripts", "transcripts/v1/partials/00000.txt")] == b"hello"
+    assert storage.stats().compressed_uploads == 0
+
+
+@pytest.mark.unit
+def test_should_read_objects_written_before_compression_was_enabled() -> None:
+    inner = InMemoryStorageClient()
+    inner.upload_file("transcripts", "transcripts/v1/transcript.txt", TRANSCRIPT)
+
+    storage = CompressingStorageClient(inner)
+
+    assert storage.download_file("transcripts", "transcripts/v1/transcript.txt") == TRANSCRIPT
+
+
+@pytest.mark.unit
+def test_should_record_content_encoding_metadata_when_supported() -> None:
+    inner = EncodingAwareStorageClient()
+    storage = CompressingStorageClient(inner)
+
+    storage.upload_file("transcripts", "transcripts/v1/result.json", TRANSCRIPT)
+
+    assert inner.encodings[("transcripts", "transcripts/v1/result.json")] == "gzip"
+    assert storage.download_file("transcripts", "transcripts/v1/result.json") == TRANSCRIPT
+
+
+@pytest.mark.unit
+def test_should_trust_identity_metadata_over_magic_bytes() -> None:
+    inner = EncodingAwareStorageClient()
+    payload = gzip.compress(b"already a gzip file")
+    inner.upload_file_with_encoding("exports", "exports/archive.json", payload, "identity")
+
+    storage = CompressingStorageClient(inner)
+
+    assert storage.download_file("exports", "exports/archive.json") == payload
+
+
+@pytest.mark.unit
+def test_open_should_decompress_while_reading() -> None:
+    inner = InMemoryStorageClient()
+    storage = CompressingStorageClient(inner)
+    storage.upload_file("transcripts", "transcripts/v1/transcript.txt", TRANSCRIPT)
+
+    with storage.open("transcripts", "transcripts/v1/transcript.txt") as stream:
+        first_line = stream.readline()
+        rest = stream.read()
+
+    assert first_line == b"Therapist: how have you been sleeping this week?\n"
+    assert first_line + rest == TRANSCRIPT
+
+
+@pytest.mark.unit
+def test_iter_decompressed_should_bound_chunk_size() -> None:
+    chunks = list(iter_decompressed(gzip.compress(TRANSCRIPT), "gzip", chunk_size=1024))
+
+    assert b"".join(chunks) == TRANSCRIPT
+    assert max(len(chunk) for chunk in chunks) <= 1024
+
+
+@pytest.mark.unit
+def test_stats_should_report_bytes_moved() -> None:
+    storage = CompressingStorageClient(InMemoryStorageClient())
+    storage.upload_file("transcripts", "transcripts/v1/transcript.txt", TRANSCRIPT)
+    storage.download_file("transcripts", "transcripts/v1/transcript.txt")
+
+    stats = storage.stats()
+    assert stats.logical_bytes_up == stats.logical_bytes_down == len(TRANSCRIPT)
+    assert stats.stored_bytes_up == stats.stored_bytes_down < len(TRANSCRIPT)
+
+
+@pytest.mark.unit
+def test_should_reject_unavailable_codec() -> None:
+    if "zstd" in available_codecs():
+        pytest.skip("zstandard is installed")
+    with pytest.raises(ValueError, match="zstandard"):
+        CompressingStorageClient(InMemoryStorageClient(), codec="zstd")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("codec", available_codecs())
+def test_measure_codec_should_report_ratio_and_cpu_time(codec: str) -> None:
+    result = measure_codec(TRANSCRIPT, codec, repeat=2)
+
+    assert result.original_bytes == len(TRANSCRIPT)
+    assert result.ratio > 5
+    assert result.compress_seconds >= 0 and result.decompress_seconds >= 0
+
+
+class StreamingStorageClient(InMemoryStorageClient):
+    """Hands out stored objects in small chunks and records how far they were read."""
+
+    def __init__(self, chunk_size: int = 100) -> None:
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.chunks_read = 0
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        raise AssertionError("a streaming client should not be downloaded in full")
+
+    def iter_chunks(self, bucket: str, key: str):
+        data = self.objects[(bucket, key)]
+        for offset in range(0, len(data), self.chunk_size):
+            self.chunks_read += 1
+            yield data[offset:offset + self.chunk_size]
+
+
+@pytest.mark.unit
+def test_iter_chunks_should_stream_from_a_chunked_client() -> None:
+    inner = StreamingStorageClient()
+    inner.objects[("therapy-transcripts", "t.txt")] = gzip.compress(TRANSCRIPT)
+    client = CompressingStorageClient(inner)
+
+    chunks = client.iter_chunks("therapy-transcripts", "t.txt")
+    first = next(chunks)
+    read_after_first = inner.chunks_read
+    rest = b"".join(chunks)
+
+    assert first + rest == TRANSCRIPT
+    total_chunks = -(-len(inner.objects[("therapy-transcripts", "t.txt")]) // inner.chunk_size)
+    assert read_after_first < total_chunks
+    assert client.stats().stored_bytes_down == len(inner.objects[("therapy-transcripts", "t.txt")])
+
+
+@pytest.mark.unit
+def test_iter_chunks_should_pass_uncompressed_chunks_through() -> None:
+    inner = StreamingStorageClient()
+    inner.objects[("therapy-transcripts", "t.txt")] = TRANSCRIPT
+
+    assert b"".join(CompressingStorageClient(inner).iter_chunks("therapy-transcripts", "t.txt")) == TRANSCRIPT
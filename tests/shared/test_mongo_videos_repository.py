@@ -124,3 +124,23 @@ def test_should_raise_error_when_marking_nonexistent_video_as_analyzed(
 ) -> None:
     with pytest.raises(VideoNotFoundError):
         repository.mark_analyzed(video_id="missing-video", word_count=999)
+
+
+@pytest.mark.unit
+def test_should_merge_timings_into_existing_document(repository, mongo_client, uploaded_video) -> None:
+    repository.record_timings("video-1", {"upload_store": 0.5})
+    repository.record_timings("video-1", {"analysis_analyze": 1.5})
+    
+    doc = mongo_client["therapy_analysis"]["videos"].find_one({"video_id": "video-1"})
+    assert doc["status"] == "uploaded"
+    assert doc["timings"] == {"upload_store": 0.5, "analysis_analyze": 1.5}
+
+
+@pytest.mark.unit
+def test_should_create_document_when_recording_timings_for_unknown_video(
+    repository, mongo_client
+) -> None:
+    repository.record_timings("video-new", {"transcription_transcribe": 2.0})
+    
+    doc = mongo_client["therapy_analysis"]["videos"].find_one({"video_id": "video-new"})
+    assert doc["timings"] == {"transcription_transcribe": 2.0}
@@ -0,0 +1,66 @@
+import time
+
+import pika
+import pytest
+
+from src.shared.timings import (
+    ENQUEUED_AT_HEADER,
+    enqueue_properties,
+    record_queue_wait,
+    timed,
+)
+
+
+@pytest.mark.unit
+def test_should_record_duration_of_block() -> None:
+    timings: dict[str, float] = {}
+
+    with timed(timings, "step"):
+        time.sleep(0.01)
+
+    assert timings["step"] >= 0.01
+
+
+@pytest.mark.unit
+def test_should_record_duration_even_when_block_raises() -> None:
+    timings: dict[str, float] = {}
+
+    with pytest.raises(RuntimeError):
+        with timed(timings, "step"):
+            raise RuntimeError("boom")
+
+    assert "step" in timings
+
+
+@pytest.mark.unit
+def test_should_stamp_enqueue_time_in_headers() -> None:
+    before = time.time()
+
+    properties = enqueue_properties()
+
+    assert isinstance(properties, pika.BasicProperties)
+    assert before <= properties.headers[ENQUEUED_AT_HEADER] <= time.time()
+
+
+@pytest.mark.unit
+def test_should_record_queue_wait_from_enqueue_header() -> None:
+    timings: dict[str, float] = {}
+    properties = pika.BasicProperties(headers={ENQUEUED_AT_HEADER: time.time() - 5})
+
+    record_queue_wait(timings, "queue_wait", properties)
+
+    assert 5 <= timings["queue_wait"] < 6
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("properties", [
+    None,
+    pika.BasicProperties(),
+    pika.BasicProperties(headers={"other": 1}),
+])
+def test_should_skip_queue_wait_without_enqueue_header(properties) -> None:
+    timings: dict[str, float] = {}
+
+    record_queue_wait(timings, "queue_wait", properties)
+
+    assert timings == {}
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from src.shared.transcript_format import (
+    StructuredTranscript,
+    decode_transcript,
+    encode_transcript,
+)
+
+
+@pytest.fixture
+def transcript() -> StructuredTranscript:
+    return StructuredTranscript(
+        speaker=["therapist", "client"],
+        start=[0.0, 2.5],
+        end=[2.0, 4.0],
+        text=["how are you", "fine thanks"],
+        word_text=["how", "are", "you", "fine", "thanks"],
+        word_start=[0.0, 0.5, 1.0, 2.5, 3.0],
+        word_end=[0.4, 0.9, 2.0, 2.9, 4.0],
+        word_utterance=[0, 0, 0, 1, 1],
+    )
+
+
+@pytest.mark.unit
+def test_should_round_trip_all_columns(transcript: StructuredTranscript) -> None:
+    assert decode_transcript(encode_transcript(transcript)) == transcript
+
+
+@pytest.mark.unit
+def test_should_decode_only_requested_columns(transcript: StructuredTranscript) -> None:
+    decoded = decode_transcript(encode_transcript(transcript), columns=["speaker", "start", "end"])
+
+    assert decoded.speaker == transcript.speaker
+    assert decoded.end == transcript.end
+    assert decoded.text == []
+    assert decoded.word_text == []
+
+
+@pytest.mark.unit
+def test_should_record_counts_in_header(transcript: StructuredTranscript) -> None:
+    header = json.loads(encode_transcript(transcript).split(b"\n", 1)[0])
+
+    assert header["utterances"] == 2
+    assert header["words"] == 5
+
+
+@pytest.mark.unit
+def test_should_join_utterances_as_plain_text(transcript: StructuredTranscript) -> None:
+    assert transcript.plain_text() == "how are you fine thanks"
+
+
+@pytest.mark.unit
+def test_should_reject_plain_text_transcript() -> None:
+    with pytest.raises(ValueError):
+        decode_transcript(b"hello world\n")
+
+
+@pytest.mark.unit
+def test_should_reject_unknown_column(transcript: StructuredTranscript) -> None:
+    with pytest.raises(ValueError, match="Unknown transcript columns"):
+        decode_transcript(encode_transcript(transcript), columns=["emotion"])
@@ -4,6 +4,7 @@ from typing import Optional
 from src.audio_extractor_service.domain import AudioExtractedEvent
 from src.transcription_service.domain import (
     TranscriptCreatedEvent,
+    TranscriptPartialEvent,
     TranscriptionBackend,
     StorageClient,
 )
@@ -23,10 +24,14 @@ class FakeTranscriptionBackend(TranscriptionBackend):
 class FakeTranscriptEventPublisher(TranscriptEventPublisher):
     def __init__(self) -> None:
         self.published_events: list[TranscriptCreatedEvent] = []
+        self.partial_events: list[TranscriptPartialEvent] = []
 
     def publish_transcript_created(self, event: TranscriptCreatedEvent) -> None:
         self.published_events.append(event)
 
+    def publish_transcript_partial(self, event: TranscriptPartialEvent) -> None:
+        self.partial_events.append(event)
+
 
 class FakeStorageClient:
     """Fake StorageClient that records download/upload calls."""
@@ -0,0 +1,44 @@
+import io
+import time
+import wave
+
+import pytest
+
+from src.transcription_service.benchmark import STEPS, benchmark_transcription_overhead, synthetic_wav
+from tests.transcription_service.conftest import FakeTranscriptionBackend
+
+
+class SleepingBackend(FakeTranscriptionBackend):
+    def transcribe(self, audio_bytes: bytes) -> str:
+        time.sleep(0.005)
+        return super().transcribe(audio_bytes)
+
+
+@pytest.mark.unit
+def test_synthetic_wav_should_have_requested_length() -> None:
+    with wave.open(io.BytesIO(synthetic_wav(2.5, sample_rate=8000)), "rb") as reader:
+        assert reader.getnframes() / reader.getframerate() == 2.5
+
+
+@pytest.mark.unit
+def test_should_report_throughput_steps_and_allocations() -> None:
+    backend = FakeTranscriptionBackend("hello")
+
+    report = benchmark_transcription_overhead(backend, audio_seconds=(0.5, 1.0), messages=20)
+
+    assert report.messages == 20
+    assert report.messages_per_second > 0
+    assert set(report.steps) == set(STEPS)
+    assert sum(step.share for step in report.steps.values()) == pytest.approx(1.0)
+    assert report.peak_bytes_per_message > 0
+    assert len(backend.calls) == 2 + 20 + 20
+
+
+@pytest.mark.unit
+def test_slow_backend_should_dominate_wall_time() -> None:
+    report = benchmark_transcription_overhead(
+        SleepingBackend("hello"), audio_seconds=(0.5,), messages=10, trace_allocations=False
+    )
+
+    assert report.backend_share > 0.8
+    assert report.peak_bytes_per_message is None
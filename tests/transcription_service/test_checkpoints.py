@@ -0,0 +1,57 @@
+import mongomock
+import pytest
+
+from src.transcription_service.checkpoints import (
+    InMemorySegmentCheckpointStore,
+    MongoSegmentCheckpointStore,
+    SegmentCheckpoint,
+)
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def store(request):
+    if request.param == "memory":
+        return InMemorySegmentCheckpointStore()
+    return MongoSegmentCheckpointStore(mongomock.MongoClient(), db_name="test_db")
+
+
+@pytest.mark.unit
+def test_should_round_trip_segment_results(store) -> None:
+    store.save("job-1", 0, {"text": "hello"})
+    store.save("job-1", 2, {"words": [{"text": "hi", "start": 0.0, "end": 0.5}]})
+    store.save("job-2", 0, {"text": "other job"})
+
+    assert store.load("job-1") == {
+        0: {"text": "hello"},
+        2: {"words": [{"text": "hi", "start": 0.0, "end": 0.5}]},
+    }
+
+
+@pytest.mark.unit
+def test_should_overwrite_segment_saved_twice(store) -> None:
+    store.save("job-1", 0, {"text": "first"})
+    store.save("job-1", 0, {"text": "second"})
+
+    assert store.load("job-1") == {0: {"text": "second"}}
+
+
+@pytest.mark.unit
+def test_should_clear_only_the_given_job(store) -> None:
+    store.save("job-1", 0, {"text": "hello"})
+    store.save("job-2", 0, {"text": "other job"})
+
+    store.clear("job-1")
+
+    assert store.load("job-1") == {}
+    assert store.load("job-2") == {0: {"text": "other job"}}
+
+
+@pytest.mark.unit
+def test_bound_checkpoint_should_use_its_job_key() -> None:
+    store = InMemorySegmentCheckpointStore()
+    checkpoint = SegmentCheckpoint(store, "job-1")
+
+    checkpoint.save(1, {"text": "hello"})
+
+    assert checkpoint.load() == {1: {"text": "hello"}}
+    assert store.load("job-1") == {1: {"text": "hello"}}
@@ -0,0 +1,215 @@
+import io
+import threading
+import wave
+from concurrent.futures import Future
+
+import pytest
+
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.audio_info import estimate_audio_seconds
+from src.transcription_service.domain import StructuredTranscriptionBackend, TranscriptionBackend
+from src.transcription_service.hedging import (
+    HedgeBudget,
+    HedgedStructuredTranscriptionBackend,
+    HedgedTranscriptionBackend,
+    LatencyModel,
+    hedged_backend,
+)
+
+
+class ControlledBackend(TranscriptionBackend):
+    """Fake backend that blocks until released, then returns or raises."""
+
+    def __init__(self, text: str, release: threading.Event | None = None, error: Exception | None = None) -> None:
+        self.text = text
+        self.release = release
+        self.error = error
+        self.calls = 0
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+
+class SubmittingStructuredBackend(StructuredTranscriptionBackend):
+    """Fake remote backend whose jobs are futures the test completes by hand."""
+
+    def __init__(self) -> None:
+        self.futures: list[Future] = []
+
+    def submit_structured(self, audio_bytes: bytes) -> Future:
+        future: Future = Future()
+        self.futures.append(future)
+        return future
+
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return self.submit_structured(audio_bytes).result()
+
+
+def fast_hedging_latency() -> LatencyModel:
+    return LatencyModel(min_samples=1000, default_ratio=0.0, floor_seconds=0.05)
+
+
+@pytest.fixture
+def released():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.mark.unit
+def test_should_not_hedge_when_primary_is_fast() -> None:
+    secondary = ControlledBackend("secondary")
+    backend = HedgedTranscriptionBackend(
+        ControlledBackend("primary"), secondary, budget=HedgeBudget(1.0), latency=fast_hedging_latency()
+    )
+
+    assert backend.transcribe(b"audio") == "primary"
+    assert secondary.calls == 0
+    assert backend.stats().hedges == 0
+
+
+@pytest.mark.unit
+def test_should_return_secondary_result_when_primary_hangs(released: threading.Event) -> None:
+    backend = HedgedTranscriptionBackend(
+        ControlledBackend("primary", release=released),
+        ControlledBackend("secondary"),
+        budget=HedgeBudget(1.0),
+        latency=fast_hedging_latency(),
+    )
+
+    assert backend.transcribe(b"audio") == "secondary"
+    stats = backend.stats()
+    assert (stats.requests, stats.hedges, stats.hedge_wins) == (1, 1, 1)
+
+
+@pytest.mark.unit
+def test_should_wait_for_primary_when_budget_is_spent() -> None:
+    release = threading.Event()
+    secondary = ControlledBackend("secondary")
+    backend = HedgedTranscriptionBackend(
+        ControlledBackend("primary", release=release),
+        secondary,
+        budget=HedgeBudget(0.0),
+        latency=fast_hedging_latency(),
+    )
+    threading.Timer(0.2, release.set).start()
+
+    assert backend.transcribe(b"audio") == "primary"
+    assert secondary.calls == 0
+    assert backend.stats().denied == 1
+
+
+@pytest.mark.unit
+def test_should_fall_back_to_other_job_when_one_fails() -> None:
+    release = threading.Event()
+    backend = HedgedTranscriptionBackend(
+        ControlledBackend("primary", release=release, error=RuntimeError("job lost")),
+        ControlledBackend("secondary", release=release),
+        budget=HedgeBudget(1.0),
+        latency=fast_hedging_latency(),
+    )
+    threading.Timer(0.2, release.set).start()
+
+    assert backend.transcribe(b"audio") == "secondary"
+
+
+@pytest.mark.unit
+def test_should_cancel_losing_remote_job() -> None:
+    primary = SubmittingStructuredBackend()
+    secondary = SubmittingStructuredBackend()
+    backend = hedged_backend(primary, secondary, budget=HedgeBudget(1.0), latency=fast_hedging_latency())
+    transcript = StructuredTranscript(speaker=["A"], start=[0.0], end=[1.0], text=["hello"])
+
+    def finish_secondary() -> None:
+        while not secondary.futures:
+            threading.Event().wait(0.01)
+        secondary.futures[0].set_result(transcript)
+
+    threading.Thread(target=finish_secondary).start()
+    result = backend.transcribe_structured(b"audio")
+
+    assert isinstance(backend, HedgedStructuredTranscriptionBackend)
+    assert result == transcript
+    assert primary.futures[0].cancelled()
+
+
+@pytest.mark.unit
+def test_should_cancel_losing_remote_job_of_plain_transcription() -> None:
+    primary = SubmittingStructuredBackend()
+    backend = HedgedTranscriptionBackend(
+        primary, ControlledBackend("secondary"), budget=HedgeBudget(1.0), latency=fast_hedging_latency()
+    )
+
+    assert backend.transcribe(b"audio") == "secondary"
+    assert primary.futures[0].cancelled()
+
+
+@pytest.mark.unit
+def test_should_record_primary_latency_when_secondary_wins(released: threading.Event) -> None:
+    class RecordingLatencyModel(LatencyModel):
+        def __init__(self) -> None:
+            super().__init__(min_samples=1000, default_ratio=0.0, floor_seconds=0.05)
+            self.recorded: list[float] = []
+
+        def record(self, audio_seconds: float, job_seconds: float) -> None:
+            self.recorded.append(job_seconds)
+
+    latency = RecordingLatencyModel()
+    backend = HedgedTranscriptionBackend(
+        ControlledBackend("primary", release=released),
+        ControlledBackend("secondary"),
+        budget=HedgeBudget(1.0),
+        latency=latency,
+    )
+
+    assert backend.transcribe(b"audio") == "secondary"
+    # The primary had run at least until the hedge was sent; the secondary's own time is not recorded.
+    assert len(latency.recorded) == 1
+    assert latency.recorded[0] >= 0.05
+
+
+@pytest.mark.unit
+def test_budget_should_cap_hedges_at_fraction_of_traffic() -> None:
+    budget = HedgeBudget(max_fraction=0.1)
+    granted = 0
+    for _ in range(40):
+        budget.record_request()
+        granted += budget.try_acquire()
+
+    assert granted == 4
+
+
+@pytest.mark.unit
+def test_latency_model_should_scale_p95_by_audio_length() -> None:
+    model = LatencyModel(min_samples=20, floor_seconds=0.0)
+    for ratio in range(1, 101):
+        model.record(audio_seconds=100.0, job_seconds=ratio / 100 * 100.0)
+
+    assert model.expected_seconds(600.0) == pytest.approx(0.95 * 600.0)
+
+
+@pytest.mark.unit
+def test_latency_model_should_use_default_until_enough_samples() -> None:
+    model = LatencyModel(min_samples=20, default_ratio=0.5, floor_seconds=10.0)
+    model.record(audio_seconds=100.0, job_seconds=1000.0)
+
+    assert model.expected_seconds(600.0) == 300.0
+    assert model.expected_seconds(4.0) == 10.0
+
+
+@pytest.mark.unit
+def test_should_estimate_audio_seconds() -> None:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b"\x00\x00" * 8000 * 3)
+
+    assert estimate_audio_seconds(buffer.getvalue()) == 3.0
+    assert estimate_audio_seconds(b"\xff" * 16_000, fallback_bitrate=128_000) == 1.0
@@ -0,0 +1,150 @@
+import gc
+import os
+import sys
+
+import pytest
+
+from src.transcription_service.domain import TranscriptionBackend
+from src.transcription_service.lifecycle import (
+    ReadinessGate,
+    benchmark_startup,
+    fork_workers,
+    wait_workers,
+    warm_up_backend,
+)
+from src.transcription_service.segmented import SegmentedTranscriptionBackend, WavSegmenter
+
+
+class FakeLocalModelBackend(TranscriptionBackend):
+    """Fake CPU backend whose 'model' is loaded by warmup()."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.model: dict | None = None
+        self.warmups = 0
+
+    def warmup(self) -> None:
+        self.warmups += 1
+        if self.fail:
+            raise RuntimeError("model file missing")
+        self.model = {"weights": list(range(1000))}
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        assert self.model is not None, "transcribe called before warmup"
+        return f"{len(self.model['weights'])} weights"
+
+
+@pytest.mark.unit
+def test_should_warm_up_and_open_gate() -> None:
+    backend = FakeLocalModelBackend()
+    gate = ReadinessGate()
+
+    report = warm_up_backend(backend, gate, sample_audio=b"audio")
+
+    assert backend.warmups == 1
+    assert gate.is_ready and gate.state == "ready"
+    assert gate.report == report
+    assert report.backend == "FakeLocalModelBackend"
+    assert report.first_transcribe_seconds is not None
+    assert report.max_rss_bytes > 0
+
+
+@pytest.mark.unit
+def test_should_mark_gate_failed_when_warmup_raises() -> None:
+    gate = ReadinessGate()
+
+    with pytest.raises(RuntimeError):
+        warm_up_backend(FakeLocalModelBackend(fail=True), gate)
+
+    assert not gate.is_ready
+    assert gate.state == "failed"
+    assert gate.error == "model file missing"
+
+
+@pytest.mark.unit
+def test_should_close_gate_that_fails_after_being_ready() -> None:
+    gate = ReadinessGate()
+    warm_up_backend(FakeLocalModelBackend(), gate)
+
+    gate.mark_failed(RuntimeError("worker 42 exited with status 1"))
+
+    assert not gate.is_ready
+    assert gate.state == "failed"
+
+
+@pytest.mark.unit
+def test_should_benchmark_cold_start_per_run() -> None:
+    built = []
+
+    def factory() -> FakeLocalModelBackend:
+        backend = FakeLocalModelBackend()
+        built.append(backend)
+        return backend
+
+    reports = benchmark_startup(factory, sample_audio=b"audio", runs=3)
+
+    assert len(reports) == 3
+    assert all(backend.warmups == 1 for backend in built)
+    assert all(report.construct_seconds >= 0 for report in reports)
+
+
+@pytest.mark.unit
+def test_should_warm_up_every_pooled_backend() -> None:
+    pool = [FakeLocalModelBackend(), FakeLocalModelBackend()]
+    backend = SegmentedTranscriptionBackend(backends=pool, segmenter=WavSegmenter())
+
+    backend.warmup()
+
+    assert [b.warmups for b in pool] == [1, 1]
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(sys.platform == "win32", reason="needs os.fork")
+def test_should_share_preloaded_backend_with_forked_workers(tmp_path) -> None:
+    backend = FakeLocalModelBackend()
+    backend.warmup()
+
+    def target(shared: TranscriptionBackend, index: int) -> None:
+        path = tmp_path / f"worker-{index}"
+        path.write_text(f"{shared.warmups} {shared.transcribe(b'audio')}")
+
+    try:
+        pids = fork_workers(backend, 2, target)
+        exit_codes = wait_workers(pids, poll_seconds=0.01)
+    finally:
+        gc.unfreeze()
+
+    assert exit_codes == [0, 0]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["worker-0", "worker-1"]
+    outputs = [path.read_text() for path in tmp_path.iterdir()]
+    # Workers never warmed up themselves; they used the parent's model.
+    assert outputs == ["1 1000 weights", "1 1000 weights"]
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(sys.platform == "win32", reason="needs os.fork")
+def test_should_fail_parent_readiness_when_a_worker_exits() -> None:
+    backend = FakeLocalModelBackend()
+    gate = ReadinessGate()
+    warm_up_backend(backend, gate)
+    exited = []
+
+    def target(shared: TranscriptionBackend, index: int) -> None:
+        if index == 1:
+            raise RuntimeError("consumer crashed")
+
+    def on_exit(pid: int, exit_code: int) -> None:
+        exited.append(exit_code)
+        if exit_code:
+            gate.mark_failed(RuntimeError(f"Worker {pid} exited with status {exit_code}"))
+
+    try:
+        pids = fork_workers(backend, 2, target)
+        exit_codes = wait_workers(pids, on_exit=on_exit, poll_seconds=0.01)
+    finally:
+        gc.unfreeze()
+
+    assert exit_codes == [0, 1]
+    assert sorted(exited) == [0, 1]
+    assert not gate.is_ready
+    assert gate.state == "failed"
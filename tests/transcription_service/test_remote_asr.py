@@ -0,0 +1,211 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from src.shared.retry import RetryConfig
+from src.transcription_service.local_asr_server import LocalASRServer
+from src.transcription_service.remote_asr import (
+    AsyncRemoteASRClient,
+    PollingConfig,
+    RemoteASRConfig,
+    RemoteASRError,
+    RemoteASRTranscriptionBackend,
+    TokenBucket,
+    to_structured_transcript,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def server():
+    with LocalASRServer(processing_seconds=0.05) as server:
+        yield server
+
+
+def make_config(base_url: str, **overrides) -> RemoteASRConfig:
+    values = dict(
+        base_url=base_url,
+        api_key="test-key",
+        requests_per_second=10_000,
+        burst=1_000,
+        polling=PollingConfig(initial_interval=0.01, max_interval=0.05),
+        retry=RetryConfig(max_attempts=5, base_delay=0.001, max_delay=0.01),
+    )
+    values.update(overrides)
+    return RemoteASRConfig(**values)
+
+
+@pytest.mark.unit
+def test_token_bucket_should_allow_burst_then_wait_for_refill() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    async def take(count: int) -> None:
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(4))
+
+    assert clock.now == pytest.approx(1.0)
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+@pytest.mark.unit
+def test_should_convert_utterances_from_milliseconds() -> None:
+    transcript = to_structured_transcript({
+        "utterances": [
+            {"speaker": "A", "start": 0, "end": 900, "text": "hi there",
+             "words": [{"text": "hi", "start": 0, "end": 400}, {"text": "there", "start": 500, "end": 900}]},
+            {"speaker": "B", "start": 1000, "end": 1500, "text": "hello",
+             "words": [{"text": "hello", "start": 1000, "end": 1500}]},
+        ]
+    })
+
+    assert transcript.speaker == ["A", "B"]
+    assert transcript.end == [0.9, 1.5]
+    assert transcript.word_start == [0.0, 0.5, 1.0]
+    assert transcript.word_utterance == [0, 0, 1]
+
+
+@pytest.mark.unit
+def test_should_fall_back_to_single_utterance_without_diarization() -> None:
+    transcript = to_structured_transcript({
+        "text": "hi there",
+        "utterances": None,
+        "words": [{"text": "hi", "start": 0, "end": 400}, {"text": "there", "start": 500, "end": 900}],
+    })
+
+    assert transcript.speaker == [""]
+    assert transcript.text == ["hi there"]
+    assert transcript.word_utterance == [0, 0]
+
+
+@pytest.mark.unit
+def test_should_back_off_polling_and_reset_when_processing_starts() -> None:
+    clock = FakeClock()
+    statuses = iter(["queued", "queued", "processing", "processing", "completed"])
+    client = AsyncRemoteASRClient(
+        make_config("http://asr.invalid", polling=PollingConfig(initial_interval=1.0, max_interval=3.0, multiplier=2.0)),
+        sleep=clock.sleep,
+    )
+
+    async def fake_request(method, url, **kwargs):
+        return {"id": "job-1", "status": next(statuses)}
+
+    client._request = fake_request
+    result = asyncio.run(client.wait("job-1"))
+
+    assert result["status"] == "completed"
+    assert clock.sleeps == [1.0, 2.0, 1.0, 2.0]
+
+
+@pytest.mark.integration
+def test_should_transcribe_against_local_server(server: LocalASRServer) -> None:
+    async def run():
+        client = AsyncRemoteASRClient(make_config(server.base_url))
+        try:
+            return await client.transcribe_structured(b"audio")
+        finally:
+            await client.aclose()
+
+    transcript = asyncio.run(run())
+
+    assert transcript.speaker == ["A", "B"]
+    assert transcript.text[1] == "fine thanks 5 bytes"
+
+
+@pytest.mark.integration
+def test_should_keep_many_jobs_in_flight(server: LocalASRServer) -> None:
+    server.processing_seconds = 0.2
+    jobs = 100
+
+    async def run():
+        client = AsyncRemoteASRClient(make_config(server.base_url, max_in_flight=jobs))
+        try:
+            started = time.monotonic()
+            transcripts = await asyncio.gather(*(client.transcribe_structured(b"x" * n) for n in range(jobs)))
+            return transcripts, time.monotonic() - started
+        finally:
+            await client.aclose()
+
+    transcripts, elapsed = asyncio.run(run())
+
+    assert len(transcripts) == jobs
+    # Sequential processing would take jobs * processing_seconds (20s).
+    assert elapsed < 5.0
+
+
+@pytest.mark.integration
+def test_should_retry_throttled_requests() -> None:
+    with LocalASRServer(processing_seconds=0.02, throttle_every=3) as server:
+        async def run():
+            client = AsyncRemoteASRClient(make_config(server.base_url), rng=random.Random(0))
+            try:
+                return await client.transcribe_structured(b"audio")
+            finally:
+                await client.aclose()
+
+        transcript = asyncio.run(run())
+
+    assert server.throttled > 0
+    assert transcript.speaker == ["A", "B"]
+
+
+@pytest.mark.integration
+def test_should_raise_when_job_fails(server: LocalASRServer) -> None:
+    async def run():
+        client = AsyncRemoteASRClient(make_config(server.base_url))
+        try:
+            await client.transcribe_structured(b"error audio")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(RemoteASRError, match="could not decode audio"):
+        asyncio.run(run())
+
+
+@pytest.mark.integration
+def test_backend_should_serve_blocking_callers(server: LocalASRServer) -> None:
+    backend = RemoteASRTranscriptionBackend(make_config(server.base_url))
+    try:
+        futures = [backend.submit_structured(b"audio") for _ in range(10)]
+        results = [future.result(timeout=5) for future in futures]
+        text = backend.transcribe(b"audio")
+    finally:
+        backend.close()
+
+    assert all(result.speaker == ["A", "B"] for result in results)
+    assert text == "hello how are you fine thanks 5 bytes"
+
+
+@pytest.mark.integration
+def test_backend_should_delete_cancelled_job(server: LocalASRServer) -> None:
+    server.processing_seconds = 30
+    backend = RemoteASRTranscriptionBackend(make_config(server.base_url))
+    try:
+        future = backend.submit_structured(b"audio")
+        deadline = time.monotonic() + 5
+        while not server._jobs and time.monotonic() < deadline:
+            time.sleep(0.01)
+        future.cancel()
+        while (not server.deleted or backend.in_flight) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        backend.close()
+
+    assert server.deleted == ["job-2"]
+    assert server._jobs == {}
@@ -0,0 +1,289 @@
+import io
+import threading
+import wave
+
+import pytest
+
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.shared.transcript_format import StructuredTranscript
+from src.transcription_service.benchmark import InMemoryStorageClient
+from src.transcription_service.domain import StructuredTranscriptionBackend, generate_transcript
+from src.transcription_service.hedging import LatencyModel
+from src.transcription_service.routing import (
+    CostBudget,
+    RoutingBudgetExceededError,
+    RoutingStructuredTranscriptionBackend,
+    RoutingTranscriptionBackend,
+    TranscriptionRoute,
+    routing_backend,
+)
+from src.transcription_service.transcript_cache import InMemoryTranscriptCache, transcript_cache_key
+from tests.transcription_service.conftest import FakeTranscriptionBackend
+
+
+def wav_of(seconds: float) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(1)
+        writer.setframerate(100)
+        writer.writeframes(b"\x80" * int(seconds * 100))
+    return buffer.getvalue()
+
+
+class StructuredFake(StructuredTranscriptionBackend):
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return StructuredTranscript(speaker=["A"], start=[0.0], end=[1.0], text=["remote"])
+
+
+class ModelFake(FakeTranscriptionBackend):
+    @property
+    def options(self) -> dict:
+        return {"model": self.transcript_text}
+
+
+def local_and_remote(**remote_kwargs) -> tuple[RoutingTranscriptionBackend, FakeTranscriptionBackend, FakeTranscriptionBackend]:
+    local = ModelFake("local")
+    remote = ModelFake("remote")
+    router = RoutingTranscriptionBackend([
+        TranscriptionRoute("local", local, max_in_flight=1, max_audio_seconds=600),
+        TranscriptionRoute(
+            "remote", remote, max_in_flight=10, min_audio_seconds=600, cost_per_audio_minute=0.01, **remote_kwargs
+        ),
+    ])
+    return router, local, remote
+
+
+@pytest.mark.unit
+def test_should_route_by_audio_duration() -> None:
+    router, _, _ = local_and_remote()
+
+    assert router.transcribe(wav_of(60)) == "local"
+    assert router.job_metadata()["routing"]["reason"] == "preferred"
+    assert router.transcribe(wav_of(1200)) == "remote"
+    assert router.job_metadata()["routing"]["route"] == "remote"
+    assert router.job_metadata()["routing"]["cost"] == pytest.approx(0.2)
+
+
+@pytest.mark.unit
+def test_should_spill_over_when_preferred_route_is_saturated() -> None:
+    router, _, _ = local_and_remote()
+    reserved, _ = router.choose(60)
+
+    _, decision = router.choose(60)
+
+    assert reserved.name == "local"
+    assert (decision.route, decision.reason) == ("remote", "spillover")
+    assert decision.in_flight == {"local": 1, "remote": 0}
+
+
+@pytest.mark.unit
+def test_should_skip_route_over_cost_budget() -> None:
+    router, _, _ = local_and_remote(budget=CostBudget(limit=0.3))
+
+    assert router.choose(1200)[1].route == "remote"
+    _, decision = router.choose(1200)
+
+    assert (decision.route, decision.reason) == ("local", "spillover")
+
+
+@pytest.mark.unit
+def test_should_wait_for_budget_instead_of_overspending() -> None:
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds: float) -> None:
+        slept.append(seconds)
+        now[0] += seconds
+
+    budget = CostBudget(limit=0.3, window_seconds=3600, clock=lambda: now[0])
+    router = RoutingTranscriptionBackend(
+        [TranscriptionRoute("remote", FakeTranscriptionBackend("remote"), cost_per_audio_minute=0.01, budget=budget)],
+        clock=lambda: now[0],
+        max_budget_wait_seconds=3600,
+        sleep=sleep,
+    )
+    router.choose(1200)
+
+    _, decision = router.choose(1200)
+
+    assert slept == [3600]
+    assert decision.route == "remote"
+    assert budget.spent() == pytest.approx(0.2)
+
+
+@pytest.mark.unit
+def test_should_reject_job_when_budget_does_not_free_up_in_time() -> None:
+    budget = CostBudget(limit=0.3, window_seconds=3600, clock=lambda: 0.0)
+    router = RoutingTranscriptionBackend(
+        [TranscriptionRoute("remote", FakeTranscriptionBackend("remote"), cost_per_audio_minute=0.01, budget=budget)],
+        clock=lambda: 0.0,
+        max_budget_wait_seconds=60,
+        sleep=lambda seconds: pytest.fail("should not wait past the deadline"),
+    )
+    router.choose(1200)
+
+    with pytest.raises(RoutingBudgetExceededError):
+        router.choose(1200)
+    with pytest.raises(RoutingBudgetExceededError):
+        router.choose(6000)
+    assert budget.spent() == pytest.approx(0.2)
+
+
+@pytest.mark.unit
+def test_cost_budget_should_forget_charges_outside_window() -> None:
+    now = [0.0]
+    budget = CostBudget(limit=1.0, window_seconds=60, clock=lambda: now[0])
+    budget.charge(0.8)
+    assert not budget.allows(0.5)
+
+    now[0] = 61.0
+
+    assert budget.allows(0.5)
+    assert budget.spent() == 0.0
+
+
+@pytest.mark.unit
+def test_should_prefer_route_with_lower_recent_latency() -> None:
+    slow = LatencyModel(min_samples=1, floor_seconds=0.0)
+    slow.record(audio_seconds=60, job_seconds=60)
+    fast = LatencyModel(min_samples=1, floor_seconds=0.0)
+    fast.record(audio_seconds=60, job_seconds=6)
+    router = RoutingTranscriptionBackend([
+        TranscriptionRoute("a", FakeTranscriptionBackend("a"), latency=slow),
+        TranscriptionRoute("b", FakeTranscriptionBackend("b"), latency=fast),
+    ])
+
+    assert router.transcribe(wav_of(30)) == "b"
+    assert router.job_metadata()["routing"]["expected_seconds"] == pytest.approx(3.0)
+
+
+@pytest.mark.unit
+def test_should_release_slot_when_backend_fails() -> None:
+    class FailingBackend(FakeTranscriptionBackend):
+        def transcribe(self, audio_bytes: bytes) -> str:
+            raise RuntimeError("model crashed")
+
+    route = TranscriptionRoute("local", FailingBackend(""))
+    router = RoutingTranscriptionBackend([route])
+
+    with pytest.raises(RuntimeError):
+        router.transcribe(wav_of(1))
+    assert route.in_flight == 0
+
+
+@pytest.mark.unit
+def test_should_refund_budget_when_backend_fails() -> None:
+    class FailingBackend(FakeTranscriptionBackend):
+        def transcribe(self, audio_bytes: bytes) -> str:
+            raise RuntimeError("remote job failed")
+
+    budget = CostBudget(limit=1.0)
+    budget.charge(0.1)
+    router = RoutingTranscriptionBackend([
+        TranscriptionRoute("remote", FailingBackend(""), cost_per_audio_minute=0.01, budget=budget),
+    ])
+
+    with pytest.raises(RuntimeError):
+        router.transcribe(wav_of(1200))
+    assert budget.spent() == pytest.approx(0.1)
+
+
+@pytest.mark.unit
+def test_should_reject_route_without_slots() -> None:
+    with pytest.raises(ValueError):
+        TranscriptionRoute("local", FakeTranscriptionBackend(""), max_in_flight=0)
+
+
+@pytest.mark.unit
+def test_cache_identity_should_follow_the_route_that_would_be_picked() -> None:
+    slow = LatencyModel(min_samples=1, floor_seconds=0.0)
+    slow.record(audio_seconds=60, job_seconds=60)
+    fast = LatencyModel(min_samples=1, floor_seconds=0.0)
+    fast.record(audio_seconds=60, job_seconds=6)
+    first, second = ModelFake("first"), ModelFake("second")
+    router = RoutingTranscriptionBackend([
+        TranscriptionRoute("first", first, latency=slow),
+        TranscriptionRoute("second", second, latency=fast),
+    ])
+    audio = wav_of(30)
+
+    identity = router.cache_identity(audio)
+    router.transcribe(audio)
+
+    assert identity is second
+    assert router.job_cache_identity() is second
+    assert [route.in_flight for route in router._routes] == [0, 0]
+
+
+@pytest.mark.unit
+def test_job_metadata_should_be_per_thread() -> None:
+    router, _, _ = local_and_remote()
+    router.transcribe(wav_of(1200))
+    seen = []
+
+    thread = threading.Thread(target=lambda: seen.append(router.job_metadata()))
+    thread.start()
+    thread.join()
+
+    assert seen == [{}]
+    assert router.job_metadata()["routing"]["route"] == "remote"
+
+
+@pytest.mark.unit
+def test_routing_backend_should_keep_structured_output() -> None:
+    router = routing_backend([TranscriptionRoute("remote", StructuredFake())])
+
+    assert isinstance(router, RoutingStructuredTranscriptionBackend)
+    assert router.transcribe_structured(wav_of(1)).text == ["remote"]
+
+
+@pytest.mark.unit
+def test_generate_transcript_should_record_routing_decision(
+    event: AudioExtractedEvent, fake_storage
+) -> None:
+    router, _, _ = local_and_remote()
+    fake_storage.set_download_response(wav_of(1200))
+    cache = InMemoryTranscriptCache()
+
+    created = generate_transcript(event, router, fake_storage, cache=cache)
+    cached = generate_transcript(event, router, fake_storage, cache=cache)
+
+    assert created.metadata["routing"]["route"] == "remote"
+    assert cached.metadata == created.metadata
+
+
+@pytest.mark.unit
+def test_generate_transcript_should_keep_structured_output_of_structured_route(event: AudioExtractedEvent) -> None:
+    router = routing_backend([
+        TranscriptionRoute("local", FakeTranscriptionBackend("local"), max_audio_seconds=600),
+        TranscriptionRoute("remote", StructuredFake(), min_audio_seconds=600),
+    ])
+    storage = InMemoryStorageClient()
+    storage.upload_file(event.bucket, event.key, wav_of(1200))
+
+    created = generate_transcript(event, router, storage)
+
+    assert created.structured_key == f"transcripts/{event.video_id}/transcript.columnar.jsonl"
+    assert storage.download_file(created.bucket, created.key) == b"remote"
+
+    storage.upload_file(event.bucket, event.key, wav_of(60))
+    created = generate_transcript(event, router, storage)
+
+    assert created.structured_key is None
+    assert storage.download_file(created.bucket, created.key) == b"local"
+
+
+@pytest.mark.unit
+def test_generate_transcript_should_cache_under_route_that_transcribed(event: AudioExtractedEvent) -> None:
+    router, local, remote = local_and_remote()
+    storage = InMemoryStorageClient()
+    audio = wav_of(60)
+    storage.upload_file(event.bucket, event.key, audio)
+    cache = InMemoryTranscriptCache()
+    router.choose(60)  # the local route is busy, so the job spills over
+
+    generate_transcript(event, router, storage, cache=cache)
+
+    assert cache.get(transcript_cache_key(audio, remote)) is not None
+    assert cache.get(transcript_cache_key(audio, local)) is None
@@ -0,0 +1,322 @@
+"""Tests for parallel segment transcription and stitching."""
+import io
+import struct
+import threading
+import wave
+
+import pytest
+
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.transcription_service.checkpoints import InMemorySegmentCheckpointStore, SegmentCheckpoint
+from src.transcription_service.domain import (
+    TimedTranscriptionBackend,
+    TranscriptionBackend,
+    TranscriptWord,
+    generate_transcript,
+)
+from src.transcription_service.segmented import (
+    FfmpegWavDecoder,
+    SegmentedTranscriptionBackend,
+    WavSegmenter,
+    stitch_texts,
+    stitch_words,
+)
+
+
+RATE = 100
+
+
+# --- Helpers ---
+
+def _wav(seconds: int) -> bytes:
+    """Build a mono 16-bit WAV where each sample holds the second it belongs to."""
+    frames = b"".join(struct.pack("<h", second) for second in range(seconds) for _ in range(RATE))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(RATE)
+        writer.writeframes(frames)
+    return buffer.getvalue()
+
+
+def _seconds_in(audio_bytes: bytes) -> list[int]:
+    """Return the distinct second markers in a WAV built by _wav, in order."""
+    with wave.open(io.BytesIO(audio_bytes), "rb") as reader:
+        frames = reader.readframes(reader.getnframes())
+    values = [value for (value,) in struct.iter_unpack("<h", frames)]
+    return sorted(set(values))
+
+
+class SecondsTextBackend(TranscriptionBackend):
+    """Fake backend that 'hears' one word per second of audio."""
+
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        self.barrier = barrier
+        self.calls = 0
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        self.calls += 1
+        if self.barrier is not None:
+            self.barrier.wait()
+        return " ".join(f"w{second}" for second in _seconds_in(audio_bytes))
+
+
+class SecondsTimedBackend(TimedTranscriptionBackend):
+    """Fake timed backend that returns one word per second with segment-relative times."""
+
+    def transcribe_words(self, audio_bytes: bytes) -> list[TranscriptWord]:
+        seconds = _seconds_in(audio_bytes)
+        first = seconds[0]
+        return [
+            TranscriptWord(text=f"w{second}", start=second - first, end=second - first + 0.5)
+            for second in seconds
+        ]
+
+
+class CrashingBackend(SecondsTextBackend):
+    """Fake backend that dies on audio containing crash_at_second, while it is set."""
+
+    def __init__(self, crash_at_second: int | None) -> None:
+        super().__init__()
+        self.crash_at_second = crash_at_second
+        self.transcribed: list[list[int]] = []
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        seconds = _seconds_in(audio_bytes)
+        if self.crash_at_second in seconds:
+            raise RuntimeError("worker died")
+        self.transcribed.append(seconds)
+        return super().transcribe(audio_bytes)
+
+
+class WavStorageClient:
+    def __init__(self, audio_bytes: bytes) -> None:
+        self.audio_bytes = audio_bytes
+        self.uploads: dict[str, bytes] = {}
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return self.audio_bytes
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        self.uploads[key] = content
+
+
+# --- Unit Tests: Segmenter ---
+
+@pytest.mark.unit
+def test_should_split_wav_into_overlapping_segments() -> None:
+    segments = WavSegmenter().split(_wav(10), segment_seconds=4, overlap_seconds=1)
+
+    assert [segment.start for segment in segments] == [0.0, 3.0, 6.0]
+    assert [_seconds_in(segment.audio_bytes) for segment in segments] == [
+        [0, 1, 2, 3],
+        [3, 4, 5, 6],
+        [6, 7, 8, 9],
+    ]
+
+
+@pytest.mark.unit
+def test_should_return_single_segment_and_warn_for_non_wav_audio_without_decoder(caplog) -> None:
+    with caplog.at_level("WARNING", logger="src.transcription_service.segmented"):
+        segments = WavSegmenter().split(b"ID3-mp3-bytes", segment_seconds=4, overlap_seconds=1)
+
+    assert len(segments) == 1
+    assert segments[0].start == 0.0
+    assert segments[0].audio_bytes == b"ID3-mp3-bytes"
+    assert "not WAV" in caplog.text
+
+
+@pytest.mark.unit
+def test_should_decode_non_wav_audio_before_splitting() -> None:
+    class FakeMp3Decoder:
+        def __init__(self) -> None:
+            self.decoded: list[bytes] = []
+
+        def to_wav(self, audio_bytes: bytes) -> bytes:
+            self.decoded.append(audio_bytes)
+            return _wav(10)
+
+    decoder = FakeMp3Decoder()
+
+    segments = WavSegmenter(decoder=decoder).split(b"ID3-mp3-bytes", segment_seconds=4, overlap_seconds=1)
+
+    assert decoder.decoded == [b"ID3-mp3-bytes"]
+    assert [segment.start for segment in segments] == [0.0, 3.0, 6.0]
+    assert _seconds_in(segments[1].audio_bytes) == [3, 4, 5, 6]
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not FfmpegWavDecoder.available(), reason="needs ffmpeg")
+def test_ffmpeg_decoder_should_produce_splittable_wav() -> None:
+    wav = FfmpegWavDecoder(sample_rate=RATE * 80).to_wav(_wav(3))
+
+    segments = WavSegmenter().split(wav, segment_seconds=2, overlap_seconds=0)
+
+    assert [segment.start for segment in segments] == [0.0, 2.0]
+
+
+# --- Unit Tests: Stitching ---
+
+@pytest.mark.unit
+def test_should_offset_timestamps_and_cut_overlap_at_midpoint() -> None:
+    segments = [
+        (0.0, [TranscriptWord(text="a", start=0.0, end=1.0), TranscriptWord(text="b", start=3.2, end=3.8)]),
+        (3.0, [TranscriptWord(text="b", start=0.2, end=0.8), TranscriptWord(text="c", start=0.9, end=1.5)]),
+    ]
+
+    words = stitch_words(segments, overlap_seconds=1.0)
+
+    assert [(w.text, w.start, w.end) for w in words] == [
+        ("a", 0.0, 1.0),
+        ("b", 3.2, 3.8),
+        ("c", 3.9, 4.5),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("texts,expected", [
+    (["hello there how", "there how are you"], "hello there how are you"),
+    (["one two", "three four"], "one two three four"),
+    (["", "only second"], "only second"),
+])
+def test_should_drop_words_repeated_across_boundaries(texts: list[str], expected: str) -> None:
+    assert stitch_texts(texts) == expected
+
+
+# --- Unit Tests: Backend ---
+
+@pytest.mark.unit
+def test_should_stitch_text_from_plain_backends() -> None:
+    backend = SegmentedTranscriptionBackend(
+        backends=[SecondsTextBackend(), SecondsTextBackend()],
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    transcript = backend.transcribe(_wav(10))
+
+    assert transcript == " ".join(f"w{second}" for second in range(10))
+
+
+@pytest.mark.unit
+def test_should_stitch_words_with_absolute_times_from_timed_backends() -> None:
+    backend = SegmentedTranscriptionBackend(
+        backends=[SecondsTimedBackend(), SecondsTimedBackend()],
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    words = backend.transcribe_words(_wav(10))
+
+    assert [w.text for w in words] == [f"w{second}" for second in range(10)]
+    assert [w.start for w in words] == [float(second) for second in range(10)]
+    assert backend.transcribe(_wav(10)) == " ".join(f"w{second}" for second in range(10))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend_class", [SecondsTextBackend, SecondsTimedBackend])
+def test_should_yield_stitched_segments_in_order(backend_class) -> None:
+    backend = SegmentedTranscriptionBackend(
+        backends=[backend_class(), backend_class()],
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    segments = list(backend.transcribe_segments(_wav(10)))
+
+    assert [segment.index for segment in segments] == [0, 1, 2]
+    assert [(segment.start, segment.end) for segment in segments] == [(0.0, 3.5), (3.5, 6.5), (6.5, None)]
+    assert " ".join(segment.text for segment in segments) == " ".join(f"w{second}" for second in range(10))
+
+
+@pytest.mark.unit
+def test_should_transcribe_segments_concurrently_across_pool() -> None:
+    barrier = threading.Barrier(3, timeout=5)
+    pool = [SecondsTextBackend(barrier) for _ in range(3)]
+    backend = SegmentedTranscriptionBackend(
+        backends=pool,
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    backend.transcribe(_wav(10))
+
+    assert [b.calls for b in pool] == [1, 1, 1]
+
+
+@pytest.mark.unit
+def test_should_reject_word_timings_when_pool_is_not_timed() -> None:
+    backend = SegmentedTranscriptionBackend(
+        backends=[SecondsTextBackend()],
+        segmenter=WavSegmenter(),
+    )
+
+    with pytest.raises(TypeError):
+        backend.transcribe_words(_wav(1))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backends,segment_seconds,overlap_seconds", [
+    ([], 10, 1),
+    ([SecondsTextBackend()], 5, 5),
+])
+def test_should_validate_configuration(backends, segment_seconds, overlap_seconds) -> None:
+    with pytest.raises(ValueError):
+        SegmentedTranscriptionBackend(
+            backends=backends,
+            segmenter=WavSegmenter(),
+            segment_seconds=segment_seconds,
+            overlap_seconds=overlap_seconds,
+        )
+
+
+@pytest.mark.unit
+def test_should_resume_from_checkpoints_and_only_transcribe_missing_segments() -> None:
+    storage = WavStorageClient(_wav(10))
+    event = AudioExtractedEvent(video_id="video-123", bucket="therapy-audio", key="audio/video-123/audio.wav")
+    checkpoints = InMemorySegmentCheckpointStore()
+    inner = CrashingBackend(crash_at_second=9)
+    backend = SegmentedTranscriptionBackend(
+        backends=[inner],
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    with pytest.raises(RuntimeError):
+        generate_transcript(event, backend, storage, checkpoints=checkpoints)
+
+    inner.crash_at_second = None
+    inner.transcribed.clear()
+    result = generate_transcript(event, backend, storage, checkpoints=checkpoints)
+
+    assert inner.transcribed == [[6, 7, 8, 9]]
+    assert storage.uploads[result.key].decode() == " ".join(f"w{second}" for second in range(10))
+    assert checkpoints._jobs == {}
+
+
+@pytest.mark.unit
+def test_should_save_and_reuse_word_timings_in_checkpoints() -> None:
+    checkpoints = InMemorySegmentCheckpointStore()
+    checkpoint = SegmentCheckpoint(checkpoints, "job-1")
+    inner = SecondsTimedBackend()
+    backend = SegmentedTranscriptionBackend(
+        backends=[inner],
+        segmenter=WavSegmenter(),
+        segment_seconds=4,
+        overlap_seconds=1,
+    )
+
+    first = list(backend.transcribe_segments(_wav(10), checkpoint=checkpoint))
+    saved = checkpoint.load()
+    inner.transcribe_words = lambda audio_bytes: pytest.fail("segment transcribed again")
+    resumed = list(backend.transcribe_segments(_wav(10), checkpoint=checkpoint))
+
+    assert sorted(saved) == [0, 1, 2]
+    assert saved[1]["words"][0] == {"text": "w3", "start": 0.0, "end": 0.5}
+    assert resumed == first
@@ -0,0 +1,230 @@
+"""Tests for the transcript cache index and its use in generate_transcript."""
+import pytest
+
+from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.transcription_service.benchmark import InMemoryStorageClient
+from src.transcription_service.domain import generate_transcript
+from src.transcription_service.transcript_cache import (
+    CachedTranscript,
+    InMemoryTranscriptCache,
+    cached_transcript_key,
+    delete_cached_transcript,
+    transcript_cache_key,
+)
+from tests.transcription_service.conftest import FakeStorageClient, FakeTranscriptionBackend
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _location(video_id: str) -> CachedTranscript:
+    return CachedTranscript(
+        bucket="therapy-transcripts",
+        key=f"transcripts/{video_id}/transcript.txt",
+    )
+
+
+# --- Unit Tests: Cache Key ---
+
+@pytest.mark.unit
+def test_should_build_same_key_for_same_audio_and_backend(fake_backend: FakeTranscriptionBackend) -> None:
+    assert transcript_cache_key(b"audio", fake_backend) == transcript_cache_key(b"audio", fake_backend)
+
+
+@pytest.mark.unit
+def test_should_build_different_keys_for_audio_version_and_options() -> None:
+    class LanguageBackend(FakeTranscriptionBackend):
+        def __init__(self, language: str, version: str = "1") -> None:
+            super().__init__(transcript_text="")
+            self.language = language
+            self.version = version
+
+        @property
+        def options(self) -> dict:
+            return {"language": self.language}
+
+    keys = {
+        transcript_cache_key(b"audio", LanguageBackend("en")),
+        transcript_cache_key(b"other audio", LanguageBackend("en")),
+        transcript_cache_key(b"audio", LanguageBackend("he")),
+        transcript_cache_key(b"audio", LanguageBackend("en", version="2")),
+    }
+
+    assert len(keys) == 4
+
+
+# --- Unit Tests: Index ---
+
+@pytest.mark.unit
+def test_should_evict_least_recently_used_entry() -> None:
+    cache = InMemoryTranscriptCache(max_entries=2, ttl_seconds=None)
+    cache.put("a", _location("a"))
+    cache.put("b", _location("b"))
+    cache.get("a")
+
+    cache.put("c", _location("c"))
+
+    assert cache.get("a") == _location("a")
+    assert cache.get("b") is None
+    assert cache.get("c") == _location("c")
+    assert cache.stats().evictions == 1
+
+
+@pytest.mark.unit
+def test_should_expire_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache = InMemoryTranscriptCache(ttl_seconds=60, clock=clock)
+    cache.put("a", _location("a"))
+
+    clock.now = 59
+    assert cache.get("a") == _location("a")
+    clock.now = 60
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats.expirations == 1
+    assert stats.size == 0
+
+
+@pytest.mark.unit
+def test_should_hand_evicted_and_expired_entries_to_on_evict() -> None:
+    clock = FakeClock()
+    evicted = []
+    cache = InMemoryTranscriptCache(max_entries=1, ttl_seconds=60, clock=clock, on_evict=evicted.append)
+    cache.put("a", _location("a"))
+    cache.put("b", _location("b"))
+
+    clock.now = 60
+    cache.get("b")
+
+    assert evicted == [_location("a"), _location("b")]
+
+
+@pytest.mark.unit
+def test_should_keep_working_when_on_evict_fails(caplog) -> None:
+    def fail(transcript: CachedTranscript) -> None:
+        raise ConnectionError("storage down")
+
+    cache = InMemoryTranscriptCache(max_entries=1, ttl_seconds=None, on_evict=fail)
+    cache.put("a", _location("a"))
+
+    cache.put("b", _location("b"))
+
+    assert cache.get("b") == _location("b")
+    assert "Failed to clean up evicted transcript" in caplog.text
+
+
+@pytest.mark.unit
+def test_should_report_hit_rate() -> None:
+    cache = InMemoryTranscriptCache()
+    cache.put("a", _location("a"))
+
+    cache.get("a")
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (3, 1)
+    assert stats.hit_rate == 0.75
+
+
+# --- Unit Tests: generate_transcript ---
+
+@pytest.mark.unit
+def test_should_transcribe_and_populate_cache_on_miss(
+    event: AudioExtractedEvent,
+    fake_backend: FakeTranscriptionBackend,
+    fake_storage: FakeStorageClient,
+) -> None:
+    cache = InMemoryTranscriptCache()
+
+    result = generate_transcript(event, fake_backend, fake_storage, cache=cache)
+
+    assert len(fake_backend.calls) == 1
+    assert cache.stats().size == 1
+    cache_key = transcript_cache_key(fake_backend.calls[0], fake_backend)
+    assert cache.get(cache_key) == CachedTranscript(
+        bucket=result.bucket,
+        key=cached_transcript_key(cache_key),
+    )
+    assert cached_transcript_key(cache_key).startswith("transcripts/by-hash/")
+
+
+def _audio_event(video_id: str) -> AudioExtractedEvent:
+    return AudioExtractedEvent(video_id=video_id, bucket="therapy-audio", key=f"audio/{video_id}/audio.mp3")
+
+
+@pytest.mark.unit
+def test_should_copy_stored_transcript_to_the_video_on_hit(fake_backend: FakeTranscriptionBackend) -> None:
+    storage = InMemoryStorageClient()
+    storage.objects[("therapy-audio", "audio/video-1/audio.mp3")] = b"same audio"
+    storage.objects[("therapy-audio", "audio/video-2/audio.mp3")] = b"same audio"
+    cache = InMemoryTranscriptCache()
+    generate_transcript(_audio_event("video-1"), fake_backend, storage, cache=cache)
+
+    result = generate_transcript(_audio_event("video-2"), fake_backend, storage, cache=cache)
+
+    assert len(fake_backend.calls) == 1
+    assert result.video_id == "video-2"
+    assert result.bucket == "therapy-transcripts"
+    assert result.key == "transcripts/video-2/transcript.txt"
+    assert storage.objects[("therapy-transcripts", result.key)] == fake_backend.transcript_text.encode("utf-8")
+    assert cache.stats().hit_rate == 0.5
+
+
+@pytest.mark.unit
+def test_should_not_serve_a_transcript_overwritten_by_reprocessing(fake_backend: FakeTranscriptionBackend) -> None:
+    storage = InMemoryStorageClient()
+    storage.objects[("therapy-audio", "audio/video-1/audio.mp3")] = b"same audio"
+    storage.objects[("therapy-audio", "audio/video-2/audio.mp3")] = b"same audio"
+    cache = InMemoryTranscriptCache()
+    generate_transcript(_audio_event("video-1"), fake_backend, storage, cache=cache)
+    # Reprocessing video-1 without the cache (e.g. with another backend) replaces its transcript.
+    generate_transcript(_audio_event("video-1"), FakeTranscriptionBackend("other model output"), storage)
+
+    result = generate_transcript(_audio_event("video-2"), fake_backend, storage, cache=cache)
+
+    assert storage.objects[("therapy-transcripts", result.key)] == fake_backend.transcript_text.encode("utf-8")
+
+
+@pytest.mark.unit
+def test_should_delete_stored_transcript_when_its_entry_is_evicted() -> None:
+    storage = InMemoryStorageClient()
+    storage.objects[("therapy-audio", "audio/video-1/audio.mp3")] = b"first audio"
+    storage.objects[("therapy-audio", "audio/video-2/audio.mp3")] = b"second audio"
+    cache = InMemoryTranscriptCache(
+        max_entries=1,
+        ttl_seconds=None,
+        on_evict=lambda cached: delete_cached_transcript(storage, cached),
+    )
+    backend = FakeTranscriptionBackend("hello")
+
+    generate_transcript(_audio_event("video-1"), backend, storage, cache=cache)
+    generate_transcript(_audio_event("video-2"), backend, storage, cache=cache)
+
+    by_hash = [key for (_, key) in storage.objects if key.startswith("transcripts/by-hash/")]
+    assert by_hash == [cached_transcript_key(transcript_cache_key(b"second audio", backend))]
+
+
+@pytest.mark.unit
+def test_should_transcribe_again_when_cached_transcript_was_deleted(fake_backend: FakeTranscriptionBackend) -> None:
+    storage = InMemoryStorageClient()
+    storage.objects[("therapy-audio", "audio/video-1/audio.mp3")] = b"same audio"
+    storage.objects[("therapy-audio", "audio/video-2/audio.mp3")] = b"same audio"
+    cache = InMemoryTranscriptCache()
+    generate_transcript(_audio_event("video-1"), fake_backend, storage, cache=cache)
+    # Another worker process evicted its own entry for the same audio and deleted the object.
+    cached = cache.get(transcript_cache_key(b"same audio", fake_backend))
+    delete_cached_transcript(storage, cached)
+
+    result = generate_transcript(_audio_event("video-2"), fake_backend, storage, cache=cache)
+
+    assert len(fake_backend.calls) == 2
+    assert storage.objects[("therapy-transcripts", result.key)] == fake_backend.transcript_text.encode("utf-8")
+    assert ("therapy-transcripts", cached.key) in storage.objects
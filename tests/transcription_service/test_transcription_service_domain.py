@@ -5,7 +5,9 @@ from typing import Optional
 import pytest
 
 from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.shared.transcript_format import StructuredTranscript, decode_transcript
 from src.transcription_service.domain import (
+    StructuredTranscriptionBackend,
     TranscriptCreatedEvent,
     TranscriptionBackend,
     generate_transcript,
@@ -131,3 +133,70 @@ def test_should_return_transcript_created_event_with_correct_metadata(
     assert result.bucket == "therapy-transcripts"
     assert result.key == f"transcripts/{event.video_id}/transcript.txt"
 
+
+@pytest.mark.unit
+def test_should_carry_upstream_timings_and_add_own_steps(
+    event: AudioExtractedEvent,
+    fake_backend: FakeTranscriptionBackend,
+    fake_storage: FakeStorageClient,
+) -> None:
+    event.timings = {"audio_extractor_convert": 3.0}
+
+    result = generate_transcript(event, fake_backend, fake_storage)
+
+    assert result.timings["audio_extractor_convert"] == 3.0
+    assert set(result.timings) == {
+        "audio_extractor_convert",
+        "transcription_download",
+        "transcription_transcribe",
+        "transcription_upload",
+    }
+
+
+class FakeStructuredTranscriptionBackend(StructuredTranscriptionBackend):
+    def transcribe_structured(self, audio_bytes: bytes) -> StructuredTranscript:
+        return StructuredTranscript(
+            speaker=["therapist", "client"],
+            start=[0.0, 1.5],
+            end=[1.0, 2.0],
+            text=["hello there", "hi"],
+            word_text=["hello", "there", "hi"],
+            word_start=[0.0, 0.5, 1.5],
+            word_end=[0.4, 1.0, 2.0],
+            word_utterance=[0, 0, 1],
+        )
+
+
+class RecordingStorageClient:
+    def __init__(self, audio_bytes: bytes) -> None:
+        self.audio_bytes = audio_bytes
+        self.uploads: dict[str, bytes] = {}
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return self.audio_bytes
+
+    def upload_file(self, bucket: str, key: str, content: bytes) -> None:
+        self.uploads[key] = content
+
+
+@pytest.mark.unit
+def test_should_store_structured_transcript_next_to_text(event: AudioExtractedEvent) -> None:
+    storage = RecordingStorageClient(b"audio")
+
+    result = generate_transcript(event, FakeStructuredTranscriptionBackend(), storage)
+
+    assert result.key == f"transcripts/{event.video_id}/transcript.txt"
+    assert result.structured_key == f"transcripts/{event.video_id}/transcript.columnar.jsonl"
+    assert storage.uploads[result.key] == b"hello there hi"
+    assert decode_transcript(storage.uploads[result.structured_key]).speaker == ["therapist", "client"]
+
+
+@pytest.mark.unit
+def test_should_leave_structured_key_unset_for_plain_backends(
+    event: AudioExtractedEvent,
+    fake_backend: FakeTranscriptionBackend,
+    fake_storage: FakeStorageClient,
+) -> None:
+    result = generate_transcript(event, fake_backend, fake_storage)
+
+    assert result.structured_key is None
@@ -1,7 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 
-from src.transcription_service.app import app
+from src.transcription_service.app import app, create_app
+from src.transcription_service.lifecycle import ReadinessGate, StartupReport
+from src.transcription_service.transcript_cache import InMemoryTranscriptCache
 
 
 @pytest.mark.unit
@@ -13,3 +15,55 @@ def test_should_return_ok_status_when_health_endpoint_called():
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.unit
+def test_should_expose_transcript_cache_stats_on_metrics_endpoint():
+    cache = InMemoryTranscriptCache()
+    cache.get("missing")
+    client = TestClient(create_app(cache=cache))
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["transcript_cache"]["misses"] == 1
+
+
+@pytest.mark.unit
+def test_should_expose_cache_attached_to_module_level_app():
+    cache = InMemoryTranscriptCache()
+    cache.get("missing")
+    app.state.cache = cache
+    try:
+        response = TestClient(app).get("/metrics")
+    finally:
+        app.state.cache = None
+
+    assert response.json()["transcript_cache"]["misses"] == 1
+
+
+@pytest.mark.unit
+def test_should_report_unavailable_until_backend_is_warm():
+    gate = ReadinessGate()
+    client = TestClient(create_app(readiness=gate))
+
+    starting = client.get("/health")
+    gate.mark_ready(StartupReport(backend="local", warmup_seconds=1.5, max_rss_bytes=1024))
+    ready = client.get("/health")
+
+    assert starting.status_code == 503
+    assert starting.json() == {"status": "starting"}
+    assert ready.status_code == 200
+    assert client.get("/metrics").json()["startup"]["warmup_seconds"] == 1.5
+
+
+@pytest.mark.unit
+def test_should_report_failed_warmup():
+    gate = ReadinessGate()
+    gate.mark_failed(RuntimeError("model file missing"))
+    client = TestClient(create_app(readiness=gate))
+
+    response = client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "failed", "error": "model file missing"}
@@ -4,6 +4,7 @@ from typing import Callable, Any
 import pika
 import pytest
 
+from src.transcription_service.remote_asr import RemoteASRError, RemoteASRUnavailableError
 from src.transcription_service.rabbitmq_consumer import (
     RabbitMQConsumerConfig,
     RabbitMQAudioExtractedConsumer,
@@ -285,3 +286,121 @@ def test_should_handle_malformed_message_gracefully(
         pass
     
     assert len(fake_publisher.published_events) == 0
+
+
+@pytest.mark.unit
+def test_should_process_concurrently_and_ack_through_connection_thread(
+    config: RabbitMQConsumerConfig,
+    fake_storage: FakeStorageClient,
+    fake_backend: FakeTranscriptionBackend,
+    fake_publisher: FakeTranscriptEventPublisher,
+    mock_channel,
+    mock_connection,
+    mock_pika,
+    message_body: bytes,
+    video_id: str,
+    mocker,
+) -> None:
+    mock_connection.add_callback_threadsafe.side_effect = lambda fn: fn()
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+
+    def deliver_one_message():
+        mock_channel._consume_callback(mock_channel, fake_method, None, message_body)
+
+    mock_channel.start_consuming.side_effect = deliver_one_message
+
+    consumer = RabbitMQAudioExtractedConsumer(
+        config=config,
+        storage_client=fake_storage,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        max_in_flight=8,
+    )
+    consumer.run_forever()
+
+    mock_channel.basic_qos.assert_called_once_with(prefetch_count=8)
+    mock_connection.add_callback_threadsafe.assert_called_once()
+    mock_channel.basic_ack.assert_called_once_with(delivery_tag=42)
+    assert [e.video_id for e in fake_publisher.published_events] == [video_id]
+
+
+class RaisingBackend(FakeTranscriptionBackend):
+    def __init__(self, error: Exception) -> None:
+        super().__init__("unused")
+        self.error = error
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        raise self.error
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "error, requeue",
+    [
+        (RemoteASRError("Transcript job j1 failed: could not decode audio"), False),
+        (ValueError("Downloaded audio is empty"), False),
+        (RemoteASRUnavailableError("POST /v2/transcript failed with 503"), True),
+        (ConnectionError("storage unreachable"), True),
+    ],
+)
+def test_should_requeue_only_transient_failures_when_processing_concurrently(
+    config: RabbitMQConsumerConfig,
+    fake_storage: FakeStorageClient,
+    fake_publisher: FakeTranscriptEventPublisher,
+    mock_channel,
+    mock_connection,
+    mock_pika,
+    message_body: bytes,
+    mocker,
+    error: Exception,
+    requeue: bool,
+) -> None:
+    mock_connection.add_callback_threadsafe.side_effect = lambda fn: fn()
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+    mock_channel.start_consuming.side_effect = lambda: mock_channel._consume_callback(
+        mock_channel, fake_method, None, message_body
+    )
+
+    consumer = RabbitMQAudioExtractedConsumer(
+        config=config,
+        storage_client=fake_storage,
+        backend=RaisingBackend(error),
+        publisher=fake_publisher,
+        max_in_flight=8,
+    )
+    consumer.run_forever()
+
+    mock_channel.basic_nack.assert_called_once_with(delivery_tag=42, requeue=requeue)
+    mock_channel.basic_ack.assert_not_called()
+
+
+@pytest.mark.unit
+def test_should_dead_letter_malformed_messages_when_processing_concurrently(
+    config: RabbitMQConsumerConfig,
+    fake_storage: FakeStorageClient,
+    fake_backend: FakeTranscriptionBackend,
+    fake_publisher: FakeTranscriptEventPublisher,
+    mock_channel,
+    mock_connection,
+    mock_pika,
+    mocker,
+) -> None:
+    fake_method = mocker.MagicMock()
+    fake_method.delivery_tag = 42
+    mock_channel.start_consuming.side_effect = lambda: mock_channel._consume_callback(
+        mock_channel, fake_method, None, b"not json"
+    )
+
+    consumer = RabbitMQAudioExtractedConsumer(
+        config=config,
+        storage_client=fake_storage,
+        backend=fake_backend,
+        publisher=fake_publisher,
+        max_in_flight=8,
+    )
+    consumer.run_forever()
+
+    mock_channel.basic_nack.assert_called_once_with(delivery_tag=42, requeue=False)
+    assert fake_backend.calls == []
@@ -3,7 +3,7 @@ import json
 import pika
 import pytest
 
-from src.transcription_service.domain import TranscriptCreatedEvent
+from src.transcription_service.domain import TranscriptCreatedEvent, TranscriptPartialEvent
 from src.transcription_service.rabbitmq_publisher import (
     RabbitMQConfig,
     RabbitMQTranscriptEventPublisher,
@@ -114,3 +114,28 @@ def test_should_close_connection_after_publishing(
     publisher.publish_transcript_created(event)
 
     mock_connection.close.assert_called_once()
+
+
+@pytest.mark.unit
+def test_should_publish_partial_event_to_partial_queue(
+    config: RabbitMQConfig,
+    mocker,
+    mock_connection,
+    mock_channel,
+) -> None:
+    mocker.patch("pika.BlockingConnection", return_value=mock_connection)
+    partial = TranscriptPartialEvent(
+        video_id="video-123",
+        segment_index=0,
+        start=0.0,
+        end=302.5,
+        bucket="therapy-transcripts",
+        key="transcripts/video-123/partials/00000.txt",
+    )
+
+    RabbitMQTranscriptEventPublisher(config).publish_transcript_partial(partial)
+
+    mock_channel.queue_declare.assert_called_once_with(queue="transcript.partial", durable=True)
+    call_kwargs = mock_channel.basic_publish.call_args.kwargs
+    assert call_kwargs["routing_key"] == "transcript.partial"
+    assert json.loads(call_kwargs["body"].decode("utf-8")) == partial.model_dump()
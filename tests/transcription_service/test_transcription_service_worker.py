@@ -1,6 +1,7 @@
 import pytest
 
 from src.audio_extractor_service.domain import AudioExtractedEvent
+from src.transcription_service.domain import IncrementalTranscriptionBackend, TranscriptSegment
 from src.transcription_service.worker import process_audio_extracted_event
 from tests.transcription_service.conftest import (
     FakeTranscriptionBackend,
@@ -9,6 +10,16 @@ from tests.transcription_service.conftest import (
 )
 
 
+class FakeIncrementalTranscriptionBackend(IncrementalTranscriptionBackend):
+    def __init__(self, texts: list[str]) -> None:
+        self.texts = texts
+
+    def transcribe_segments(self, audio_bytes: bytes, checkpoint=None):
+        for index, text in enumerate(self.texts):
+            end = None if index == len(self.texts) - 1 else float(index + 1)
+            yield TranscriptSegment(index=index, start=float(index), end=end, text=text)
+
+
 # --- Unit Tests ---
 
 
@@ -64,3 +75,34 @@ def test_should_publish_exactly_one_event_equal_to_returned_event(
     assert len(fake_publisher.published_events) == 1
     assert fake_publisher.published_events[0] == result
 
+
+
+@pytest.mark.unit
+def test_should_publish_partials_before_final_event(
+    event: AudioExtractedEvent,
+    fake_publisher: FakeTranscriptEventPublisher,
+    fake_storage: FakeStorageClient,
+) -> None:
+    backend = FakeIncrementalTranscriptionBackend(["first part", "", "second part"])
+
+    result = process_audio_extracted_event(event, fake_storage, backend, fake_publisher, publish_partials=True)
+
+    assert [partial.segment_index for partial in fake_publisher.partial_events] == [0, 1, 2]
+    assert fake_publisher.partial_events[2].key == f"transcripts/{event.video_id}/partials/00002.txt"
+    assert fake_publisher.published_events == [result]
+    assert result.segment_count == 3
+    assert fake_storage.upload_called_with["content"] == b"first part second part"
+
+
+@pytest.mark.unit
+def test_should_not_publish_partials_unless_enabled(
+    event: AudioExtractedEvent,
+    fake_publisher: FakeTranscriptEventPublisher,
+    fake_storage: FakeStorageClient,
+) -> None:
+    backend = FakeIncrementalTranscriptionBackend(["first part", "second part"])
+
+    result = process_audio_extracted_event(event, fake_storage, backend, fake_publisher)
+
+    assert fake_publisher.partial_events == []
+    assert result.segment_count is None
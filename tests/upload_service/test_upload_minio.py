@@ -105,6 +105,22 @@ def test_should_include_uploaded_at_timestamp_in_event(
     assert before <= event.uploaded_at <= after
 
 
+@pytest.mark.unit
+def test_should_record_storage_timing_in_event(
+    client: TestClient,
+    fake_publisher: FakeVideoEventPublisher,
+) -> None:
+    response = client.post(
+        "/videos",
+        files={"file": ("session1.mp4", BytesIO(b"data"), "video/mp4")},
+    )
+    
+    assert response.status_code == 201
+    event = fake_publisher.published_events[0]
+    assert set(event.timings) == {"upload_store"}
+    assert event.timings["upload_store"] >= 0
+
+
 @pytest.mark.unit
 def test_should_return_400_when_file_is_empty(client: TestClient) -> None:
     response = client.post(
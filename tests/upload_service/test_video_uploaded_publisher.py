@@ -5,6 +5,7 @@ import pika
 import pytest
 
 from src.upload_service.domain import VideoUploadedEvent
+from src.shared.timings import ENQUEUED_AT_HEADER
 from src.upload_service.rabbitmq_publisher import (
     RabbitMQConfig,
     RabbitMQVideoEventPublisher,
@@ -106,6 +107,23 @@ def test_should_publish_event_as_json_to_correct_queue(
     assert "uploaded_at" in body_dict
 
 
+@pytest.mark.unit
+def test_should_stamp_enqueue_time_in_message_headers(
+    config: RabbitMQConfig,
+    event: VideoUploadedEvent,
+    mocker,
+    mock_connection,
+    mock_channel,
+):
+    mocker.patch("pika.BlockingConnection", return_value=mock_connection)
+
+    publisher = RabbitMQVideoEventPublisher(config)
+    publisher.publish_video_uploaded(event)
+
+    properties = mock_channel.basic_publish.call_args.kwargs.get("properties")
+    assert ENQUEUED_AT_HEADER in properties.headers
+
+
 @pytest.mark.unit
 def test_should_close_connection_after_publishing(
     config: RabbitMQConfig,